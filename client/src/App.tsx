@@ -1,4 +1,6 @@
+import { lazy, Suspense } from "react";
 import { Switch, Route, Redirect } from "wouter";
+import { Loader2 } from "lucide-react";
 import { queryClient } from "./lib/queryClient";
 import { QueryClientProvider } from "@tanstack/react-query";
 import { Toaster } from "@/components/ui/toaster";
@@ -8,180 +10,192 @@ import { SidebarProvider, SidebarTrigger } from "@/components/ui/sidebar";
 import { AppSidebar } from "@/components/app-sidebar";
 import { ProtectedRoute, InstitutionProtectedRoute } from "@/components/ProtectedRoute";
 
-import Login from "@/pages/Login";
-import Signup from "@/pages/Signup";
-import Apply from "@/pages/Apply";
-import Dashboard from "@/pages/Dashboard";
-import Approvals from "@/pages/Approvals";
-import Members from "@/pages/Members";
-import Roles from "@/pages/Roles";
-import Events from "@/pages/Events";
-import Tasks from "@/pages/Tasks";
-import Finance from "@/pages/Finance";
-import Social from "@/pages/Social";
-import Settings from "@/pages/Settings";
-import NotFound from "@/pages/not-found";
-import Committee from "@/pages/Committee";
-import Teams from "@/pages/Teams";
-import Permissions from "@/pages/Permissions";
-import Landing from "@/pages/Landing";
-import InstitutionOnboarding from "@/pages/institution/Onboarding";
-import InstitutionDashboard from "@/pages/institution/Dashboard";
-import InstitutionClubs from "@/pages/institution/Clubs";
-import InstitutionFinance from "@/pages/institution/Finance";
-import InstitutionMembers from "@/pages/institution/Members";
-import InstitutionAnalytics from "@/pages/institution/Analytics";
-import InstitutionReports from "@/pages/institution/Reports";
-import InstitutionElections from "@/pages/institution/Elections";
-import VotePage from "@/pages/Vote";
+// Every page is its own chunk so a visitor only downloads the routes they open.
+// /vote and /apply links skip this shell entirely (see PublicApp.tsx).
+const Login = lazy(() => import("@/pages/Login"));
+const Signup = lazy(() => import("@/pages/Signup"));
+const Apply = lazy(() => import("@/pages/Apply"));
+const Dashboard = lazy(() => import("@/pages/Dashboard"));
+const Approvals = lazy(() => import("@/pages/Approvals"));
+const Members = lazy(() => import("@/pages/Members"));
+const Roles = lazy(() => import("@/pages/Roles"));
+const Events = lazy(() => import("@/pages/Events"));
+const Tasks = lazy(() => import("@/pages/Tasks"));
+const Finance = lazy(() => import("@/pages/Finance"));
+const Social = lazy(() => import("@/pages/Social"));
+const Settings = lazy(() => import("@/pages/Settings"));
+const NotFound = lazy(() => import("@/pages/not-found"));
+const Committee = lazy(() => import("@/pages/Committee"));
+const Teams = lazy(() => import("@/pages/Teams"));
+const Permissions = lazy(() => import("@/pages/Permissions"));
+const Landing = lazy(() => import("@/pages/Landing"));
+const InstitutionOnboarding = lazy(() => import("@/pages/institution/Onboarding"));
+const InstitutionDashboard = lazy(() => import("@/pages/institution/Dashboard"));
+const InstitutionClubs = lazy(() => import("@/pages/institution/Clubs"));
+const InstitutionFinance = lazy(() => import("@/pages/institution/Finance"));
+const InstitutionMembers = lazy(() => import("@/pages/institution/Members"));
+const InstitutionAnalytics = lazy(() => import("@/pages/institution/Analytics"));
+const InstitutionReports = lazy(() => import("@/pages/institution/Reports"));
+const InstitutionElections = lazy(() => import("@/pages/institution/Elections"));
+const VotePage = lazy(() => import("@/pages/Vote"));
+
+function PageFallback() {
+  return (
+    <div className="flex h-full min-h-[50vh] w-full items-center justify-center" data-testid="page-loading">
+      <Loader2 className="h-6 w-6 animate-spin text-muted-foreground" />
+    </div>
+  );
+}
 
 function AppRoutes() {
   const { isAuthenticated, user } = useAuth();
 
   return (
-    <Switch>
-      <Route path="/login">
-        {isAuthenticated ? <Redirect to="/dashboard" /> : <Login />}
-      </Route>
-      <Route path="/signup">
-        {isAuthenticated ? <Redirect to="/dashboard" /> : <Signup />}
-      </Route>
-      <Route path="/apply/:clubCode" component={Apply} />
-
-      <Route path="/">
-        {isAuthenticated ? (
-          <Redirect to={user?.kind === 'institution' ? '/institution/dashboard' : '/dashboard'} />
-        ) : (
-          <Landing />
-        )}
-      </Route>
-
-      <Route path="/vote/:accessCode" component={VotePage} />
-
-      <Route path="/institution/onboarding">
-        {isAuthenticated && user?.kind === 'institution' ? (
-          <Redirect to="/institution/dashboard" />
-        ) : (
-          <InstitutionOnboarding />
-        )}
-      </Route>
-
-      <Route path="/institution/dashboard">
-        <InstitutionProtectedRoute>
-          <InstitutionDashboard />
-        </InstitutionProtectedRoute>
-      </Route>
-
-      <Route path="/institution/clubs">
-        <InstitutionProtectedRoute>
-          <InstitutionClubs />
-        </InstitutionProtectedRoute>
-      </Route>
-
-      <Route path="/institution/elections">
-        <InstitutionProtectedRoute>
-          <InstitutionElections />
-        </InstitutionProtectedRoute>
-      </Route>
-
-      <Route path="/institution/finance">
-        <InstitutionProtectedRoute>
-          <InstitutionFinance />
-        </InstitutionProtectedRoute>
-      </Route>
-
-      <Route path="/institution/members">
-        <InstitutionProtectedRoute>
-          <InstitutionMembers />
-        </InstitutionProtectedRoute>
-      </Route>
-
-      <Route path="/institution/analytics">
-        <InstitutionProtectedRoute>
-          <InstitutionAnalytics />
-        </InstitutionProtectedRoute>
-      </Route>
-
-      <Route path="/institution/reports">
-        <InstitutionProtectedRoute>
-          <InstitutionReports />
-        </InstitutionProtectedRoute>
-      </Route>
-
-      <Route path="/dashboard">
-        <ProtectedRoute>
-          <Dashboard />
-        </ProtectedRoute>
-      </Route>
-
-      <Route path="/approvals">
-        <ProtectedRoute requiredRoles={['President', 'Vice-President']}>
-          <Approvals />
-        </ProtectedRoute>
-      </Route>
-
-      <Route path="/members">
-        <ProtectedRoute>
-          <Members />
-        </ProtectedRoute>
-      </Route>
-
-      <Route path="/teams">
-        <ProtectedRoute>
-          <Teams />
-        </ProtectedRoute>
-      </Route>
-
-      <Route path="/roles">
-        <ProtectedRoute requiredRoles={['President']}>
-          <Roles />
-        </ProtectedRoute>
-      </Route>
-
-      <Route path="/events">
-        <ProtectedRoute>
-          <Events />
-        </ProtectedRoute>
-      </Route>
-
-      <Route path="/tasks">
-        <ProtectedRoute>
-          <Tasks />
-        </ProtectedRoute>
-      </Route>
-
-      <Route path="/finance">
-        <ProtectedRoute>
-          <Finance />
-        </ProtectedRoute>
-      </Route>
-
-      <Route path="/social">
-        <ProtectedRoute>
-          <Social />
-        </ProtectedRoute>
-      </Route>
-
-      <Route path="/committee">
-        <ProtectedRoute requiredRoles={['President', 'Vice-President']}>
-          <Committee />
-        </ProtectedRoute>
-      </Route>
-
-      <Route path="/settings">
-        <ProtectedRoute requiredRoles={['President']}>
-          <Settings />
-        </ProtectedRoute>
-      </Route>
-
-      <Route path="/permissions">
-        <ProtectedRoute>
-          <Permissions />
-        </ProtectedRoute>
-      </Route>
-
-      <Route component={NotFound} />
-    </Switch>
+    <Suspense fallback={<PageFallback />}>
+      <Switch>
+        <Route path="/login">
+          {isAuthenticated ? <Redirect to="/dashboard" /> : <Login />}
+        </Route>
+        <Route path="/signup">
+          {isAuthenticated ? <Redirect to="/dashboard" /> : <Signup />}
+        </Route>
+        <Route path="/apply/:clubCode" component={Apply} />
+
+        <Route path="/">
+          {isAuthenticated ? (
+            <Redirect to={user?.kind === 'institution' ? '/institution/dashboard' : '/dashboard'} />
+          ) : (
+            <Landing />
+          )}
+        </Route>
+
+        <Route path="/vote/:accessCode" component={VotePage} />
+
+        <Route path="/institution/onboarding">
+          {isAuthenticated && user?.kind === 'institution' ? (
+            <Redirect to="/institution/dashboard" />
+          ) : (
+            <InstitutionOnboarding />
+          )}
+        </Route>
+
+        <Route path="/institution/dashboard">
+          <InstitutionProtectedRoute>
+            <InstitutionDashboard />
+          </InstitutionProtectedRoute>
+        </Route>
+
+        <Route path="/institution/clubs">
+          <InstitutionProtectedRoute>
+            <InstitutionClubs />
+          </InstitutionProtectedRoute>
+        </Route>
+
+        <Route path="/institution/elections">
+          <InstitutionProtectedRoute>
+            <InstitutionElections />
+          </InstitutionProtectedRoute>
+        </Route>
+
+        <Route path="/institution/finance">
+          <InstitutionProtectedRoute>
+            <InstitutionFinance />
+          </InstitutionProtectedRoute>
+        </Route>
+
+        <Route path="/institution/members">
+          <InstitutionProtectedRoute>
+            <InstitutionMembers />
+          </InstitutionProtectedRoute>
+        </Route>
+
+        <Route path="/institution/analytics">
+          <InstitutionProtectedRoute>
+            <InstitutionAnalytics />
+          </InstitutionProtectedRoute>
+        </Route>
+
+        <Route path="/institution/reports">
+          <InstitutionProtectedRoute>
+            <InstitutionReports />
+          </InstitutionProtectedRoute>
+        </Route>
+
+        <Route path="/dashboard">
+          <ProtectedRoute>
+            <Dashboard />
+          </ProtectedRoute>
+        </Route>
+
+        <Route path="/approvals">
+          <ProtectedRoute requiredRoles={['President', 'Vice-President']}>
+            <Approvals />
+          </ProtectedRoute>
+        </Route>
+
+        <Route path="/members">
+          <ProtectedRoute>
+            <Members />
+          </ProtectedRoute>
+        </Route>
+
+        <Route path="/teams">
+          <ProtectedRoute>
+            <Teams />
+          </ProtectedRoute>
+        </Route>
+
+        <Route path="/roles">
+          <ProtectedRoute requiredRoles={['President']}>
+            <Roles />
+          </ProtectedRoute>
+        </Route>
+
+        <Route path="/events">
+          <ProtectedRoute>
+            <Events />
+          </ProtectedRoute>
+        </Route>
+
+        <Route path="/tasks">
+          <ProtectedRoute>
+            <Tasks />
+          </ProtectedRoute>
+        </Route>
+
+        <Route path="/finance">
+          <ProtectedRoute>
+            <Finance />
+          </ProtectedRoute>
+        </Route>
+
+        <Route path="/social">
+          <ProtectedRoute>
+            <Social />
+          </ProtectedRoute>
+        </Route>
+
+        <Route path="/committee">
+          <ProtectedRoute requiredRoles={['President', 'Vice-President']}>
+            <Committee />
+          </ProtectedRoute>
+        </Route>
+
+        <Route path="/settings">
+          <ProtectedRoute requiredRoles={['President']}>
+            <Settings />
+          </ProtectedRoute>
+        </Route>
+
+        <Route path="/permissions">
+          <ProtectedRoute>
+            <Permissions />
+          </ProtectedRoute>
+        </Route>
+
+        <Route component={NotFound} />
+      </Switch>
+    </Suspense>
   );
 }
 
@@ -0,0 +1,52 @@
+import { lazy, Suspense, type ReactNode } from "react";
+import { Switch, Route } from "wouter";
+import { Loader2 } from "lucide-react";
+import { queryClient } from "./lib/queryClient";
+import { QueryClientProvider } from "@tanstack/react-query";
+import { Toaster } from "@/components/ui/toaster";
+
+// Minimal entry for the public /vote and /apply links. It leaves out the
+// auth provider, sidebar and dashboard routes so those visitors only load
+// the page they opened.
+const VotePage = lazy(() => import("@/pages/Vote"));
+const Apply = lazy(() => import("@/pages/Apply"));
+
+// Navigating anywhere else (e.g. "Go to login" after applying) loads the
+// full app in place. It brings its own providers, so it renders outside
+// the public ones.
+const FullApp = lazy(() => import("./App"));
+
+function PublicProviders({ children }: { children: ReactNode }) {
+  return (
+    <QueryClientProvider client={queryClient}>
+      {children}
+      <Toaster />
+    </QueryClientProvider>
+  );
+}
+
+export default function PublicApp() {
+  return (
+    <Suspense
+      fallback={
+        <div className="flex min-h-screen items-center justify-center">
+          <Loader2 className="h-6 w-6 animate-spin text-muted-foreground" />
+        </div>
+      }
+    >
+      <Switch>
+        <Route path="/vote/:accessCode">
+          <PublicProviders>
+            <VotePage />
+          </PublicProviders>
+        </Route>
+        <Route path="/apply/:clubCode">
+          <PublicProviders>
+            <Apply />
+          </PublicProviders>
+        </Route>
+        <Route component={FullApp} />
+      </Switch>
+    </Suspense>
+  );
+}
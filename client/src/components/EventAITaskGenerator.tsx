@@ -1,6 +1,6 @@
 import { useState } from 'react';
 import { useMutation } from '@tanstack/react-query';
-import { apiRequest } from '@/lib/queryClient';
+import { apiStream } from '@/lib/queryClient';
 import { Dialog, DialogContent, DialogDescription, DialogFooter, DialogHeader, DialogTitle, DialogTrigger } from '@/components/ui/dialog';
 import { Button } from '@/components/ui/button';
 import { Textarea } from '@/components/ui/textarea';
@@ -14,7 +14,7 @@ import { Skeleton } from '@/components/ui/skeleton';
 import { useToast } from '@/hooks/use-toast';
 import { Sparkles, Loader2, RefreshCw, Copy, Check } from 'lucide-react';
 import type { Event as ClubEvent } from '@shared/schema';
-import type { AIResponse, AITask } from '@/types/ai';
+import type { AIResponse, AITask, AITaskStreamEvent } from '@/types/ai';
 
 type EventAITaskGeneratorProps = {
   event: ClubEvent;
@@ -54,15 +54,50 @@ export function EventAITaskGenerator({ event, onTasksInsert }: EventAITaskGenera
     return details.join('\n');
   };
 
+  const emptyResponse = (): AIResponse => ({ tasks: [], budgetSuggestions: [], timeline: [], teamSuggestions: [] });
+
   const generateMutation = useMutation({
     mutationFn: async () => {
-      return await apiRequest<AIResponse>('POST', '/api/ai/generate-tasks', {
-        eventTitle: event.title,
-        eventDescription: buildEventDescription(),
-        goals: additionalNotes || undefined,
-        expectedDate: event.date,
-        expectedBudget: event.budget || undefined,
-      });
+      const outcome: { response: AIResponse | null; error: string | null } = { response: null, error: null };
+      const streamedTasks: AITask[] = [];
+
+      setAiResponse(null);
+      setSelectedTasks(new Set());
+
+      // Tasks are rendered one by one as the server parses them out of the completion
+      await apiStream(
+        '/api/ai/generate-tasks',
+        {
+          eventTitle: event.title,
+          eventDescription: buildEventDescription(),
+          goals: additionalNotes || undefined,
+          expectedDate: event.date,
+          expectedBudget: event.budget || undefined,
+        },
+        ({ event: name, data }) => {
+          if (name === 'task') {
+            const { index, task } = data as AITaskStreamEvent;
+            streamedTasks[index] = task;
+            setAiResponse((prev) => {
+              const next = prev ?? emptyResponse();
+              const tasks = [...next.tasks];
+              tasks[index] = task;
+              return { ...next, tasks };
+            });
+            setSelectedTasks((prev) => new Set(prev).add(index));
+          } else if (name === 'done') {
+            outcome.response = data as AIResponse;
+          } else if (name === 'error') {
+            outcome.error = (data as { message?: string }).message || 'Failed to generate AI suggestions.';
+          }
+        },
+      );
+
+      if (outcome.error) {
+        throw new Error(outcome.error);
+      }
+
+      return outcome.response ?? { ...emptyResponse(), tasks: streamedTasks.filter(Boolean) };
     },
     onSuccess: (data) => {
       setAiResponse(data);
@@ -180,7 +215,7 @@ export function EventAITaskGenerator({ event, onTasksInsert }: EventAITaskGenera
             )}
           </Button>
 
-          {generateMutation.isPending && (
+          {generateMutation.isPending && !aiResponse && (
             <div className="space-y-3">
               <Skeleton className="h-24" />
               <Skeleton className="h-24" />
@@ -190,7 +225,11 @@ export function EventAITaskGenerator({ event, onTasksInsert }: EventAITaskGenera
           {aiResponse && (
             <div className="space-y-3">
               <div className="flex gap-2">
-                <Button className="flex-1" onClick={handleInsertTasks} disabled={selectedTasks.size === 0}>
+                <Button
+                  className="flex-1"
+                  onClick={handleInsertTasks}
+                  disabled={selectedTasks.size === 0 || generateMutation.isPending}
+                >
                   Insert Selected ({selectedTasks.size})
                 </Button>
                 <Button
@@ -241,6 +280,7 @@ export function EventAITaskGenerator({ event, onTasksInsert }: EventAITaskGenera
                         </CardContent>
                       </Card>
                     ))}
+                    {generateMutation.isPending && <Skeleton className="h-24" />}
                   </div>
                 )}
               </ScrollArea>
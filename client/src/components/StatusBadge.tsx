@@ -15,10 +15,10 @@ export function StatusBadge({ status }: StatusBadgeProps) {
     if (normalized === 'approved' || normalized === 'completed' || normalized === 'done' || normalized === 'posted') {
       return 'default';
     }
-    if (normalized === 'rejected' || normalized === 'cancelled') {
+    if (normalized === 'rejected' || normalized === 'cancelled' || normalized === 'failed') {
       return 'destructive';
     }
-    if (normalized === 'in progress' || normalized === 'ongoing' || normalized === 'scheduled') {
+    if (normalized === 'in progress' || normalized === 'ongoing' || normalized === 'scheduled' || normalized === 'publishing') {
       return 'outline';
     }
     return 'secondary';
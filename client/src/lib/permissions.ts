@@ -1,12 +1,31 @@
 // Frontend permission utilities
-import type { Permission, PermissionSet } from '@shared/permissions';
+import {
+  hasPermissionBit,
+  toPermissionMask,
+  type Permission,
+  type PermissionMask,
+  type PermissionSet,
+} from '@shared/permissions';
+
+// The session's permission object is stable between logins, so its mask is
+// computed once and every check after that is a single bit test.
+const maskCache = new WeakMap<PermissionSet, PermissionMask>();
+
+function maskOf(permissions: PermissionSet): PermissionMask {
+  let mask = maskCache.get(permissions);
+  if (mask === undefined) {
+    mask = toPermissionMask(permissions);
+    maskCache.set(permissions, mask);
+  }
+  return mask;
+}
 
 export function hasPermission(
   permissions: PermissionSet | null | undefined,
   permission: Permission,
 ): boolean {
   if (!permissions) return false;
-  return permissions[permission] === true;
+  return hasPermissionBit(maskOf(permissions), permission);
 }
 
 export function hasAnyPermission(
@@ -24,4 +43,3 @@ export function hasAllPermissions(
   if (!permissions) return false;
   return permissionList.every((perm) => hasPermission(permissions, perm));
 }
-
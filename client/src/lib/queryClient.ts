@@ -77,6 +77,58 @@ export async function apiRequest<T = unknown>(
   return text as unknown as T;
 }
 
+export type StreamEvent = { event: string; data: unknown };
+
+// POSTs to an SSE endpoint and invokes onEvent for every event as it arrives.
+export async function apiStream(
+  url: string,
+  data: unknown,
+  onEvent: (event: StreamEvent) => void,
+  signal?: AbortSignal,
+): Promise<void> {
+  const res = await fetch(url, {
+    method: "POST",
+    headers: { ...buildHeaders(true), Accept: "text/event-stream" },
+    body: JSON.stringify(data),
+    credentials: "include",
+    signal,
+  });
+
+  await throwIfResNotOk(res);
+
+  if (!res.body) {
+    throw new Error("Streaming is not supported by this browser");
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = "";
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffered += decoder.decode(value, { stream: true });
+
+    let boundary = buffered.indexOf("\n\n");
+    while (boundary !== -1) {
+      const block = buffered.slice(0, boundary);
+      buffered = buffered.slice(boundary + 2);
+
+      let event = "message";
+      const dataLines: string[] = [];
+      block.split("\n").forEach((line) => {
+        if (line.startsWith("event:")) event = line.slice(6).trim();
+        else if (line.startsWith("data:")) dataLines.push(line.slice(5).trimStart());
+      });
+
+      if (dataLines.length > 0) {
+        onEvent({ event, data: JSON.parse(dataLines.join("\n")) });
+      }
+      boundary = buffered.indexOf("\n\n");
+    }
+  }
+}
+
 type UnauthorizedBehavior = "returnNull" | "throw";
 export function getQueryFn<T>({ on401: unauthorizedBehavior }: { on401: UnauthorizedBehavior }): QueryFunction<T> {
   return async ({ queryKey }) => {
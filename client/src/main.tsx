@@ -1,5 +1,10 @@
 import { createRoot } from "react-dom/client";
-import App from "./App";
 import "./index.css";
 
-createRoot(document.getElementById("root")!).render(<App />);
+// Public election and application links get a separate, much smaller entry.
+// Matches exactly PublicApp's /vote/:accessCode and /apply/:clubCode.
+const isPublicRoute = /^\/(vote|apply)\/[^/]+\/?$/.test(window.location.pathname);
+const root = createRoot(document.getElementById("root")!);
+
+const entry = isPublicRoute ? import("./PublicApp") : import("./App");
+entry.then(({ default: Root }) => root.render(<Root />));
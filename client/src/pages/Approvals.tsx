@@ -9,11 +9,14 @@ import { CheckCircle, XCircle, Mail, Phone, Linkedin, Globe } from 'lucide-react
 import { Skeleton } from '@/components/ui/skeleton';
 import { Avatar, AvatarFallback } from '@/components/ui/avatar';
 import { Badge } from '@/components/ui/badge';
+import { Checkbox } from '@/components/ui/checkbox';
 import type { PendingMember } from '@shared/schema';
-import type { MessageResponse } from '@/types/api';
+import type { BatchApprovalResponse, MessageResponse } from '@/types/api';
 
 export default function Approvals() {
   const [selectedId, setSelectedId] = useState<string | null>(null);
+  const [checkedIds, setCheckedIds] = useState<Set<string>>(new Set());
+  const [batchRole, setBatchRole] = useState('Member');
   const { toast } = useToast();
 
   const { data: pendingMembers = [], isLoading } = useQuery<PendingMember[]>({
@@ -32,6 +35,15 @@ export default function Approvals() {
     }
   }, [pendingMembers, selectedId]);
 
+  // Drop checked ids that are no longer pending (approved elsewhere, etc.)
+  useEffect(() => {
+    setCheckedIds((current) => {
+      const pendingIds = new Set(pendingMembers.map((member) => member.id));
+      const next = new Set(Array.from(current).filter((id) => pendingIds.has(id)));
+      return next.size === current.size ? current : next;
+    });
+  }, [pendingMembers]);
+
   const approveMutation = useMutation({
     mutationFn: async (data: { id: string; role: string }) => {
       return await apiRequest<MessageResponse>('POST', `/api/members/approve/${data.id}`, { role: data.role });
@@ -63,6 +75,55 @@ export default function Approvals() {
     },
   });
 
+  const onBatchSuccess = (result: BatchApprovalResponse, title: string) => {
+    queryClient.invalidateQueries({ queryKey: ['/api/members/pending'] });
+    queryClient.invalidateQueries({ queryKey: ['/api/members'] });
+    queryClient.invalidateQueries({ queryKey: ['/api/dashboard/stats'] });
+    setCheckedIds(new Set());
+    toast({
+      title,
+      description: result.skipped.length
+        ? `${result.message}. ${result.skipped.length} skipped (already a member or no longer pending).`
+        : result.message,
+    });
+  };
+
+  const approveManyMutation = useMutation({
+    mutationFn: async (data: { ids: string[]; role: string }) => {
+      return await apiRequest<BatchApprovalResponse>('POST', '/api/members/approve-many', data);
+    },
+    onSuccess: (result) => onBatchSuccess(result, 'Members approved'),
+    onError: (error: Error) => {
+      toast({ title: 'Approval failed', description: error.message, variant: 'destructive' });
+    },
+  });
+
+  const rejectManyMutation = useMutation({
+    mutationFn: async (ids: string[]) => {
+      return await apiRequest<BatchApprovalResponse>('POST', '/api/members/reject-many', { ids });
+    },
+    onSuccess: (result) => onBatchSuccess(result, 'Applications rejected'),
+    onError: (error: Error) => {
+      toast({ title: 'Rejection failed', description: error.message, variant: 'destructive' });
+    },
+  });
+
+  const allChecked = pendingMembers.length > 0 && checkedIds.size === pendingMembers.length;
+  const batchPending = approveManyMutation.isPending || rejectManyMutation.isPending;
+
+  const toggleAll = (checked: boolean) => {
+    setCheckedIds(checked ? new Set(pendingMembers.map((member) => member.id)) : new Set());
+  };
+
+  const toggleOne = (id: string, checked: boolean) => {
+    setCheckedIds((current) => {
+      const next = new Set(current);
+      if (checked) next.add(id);
+      else next.delete(id);
+      return next;
+    });
+  };
+
   const [selectedRole, setSelectedRole] = useState('Member');
 
   const selected = pendingMembers.find((m) => m.id === selectedId) || null;
@@ -89,8 +150,55 @@ export default function Approvals() {
 
       <div className="grid lg:grid-cols-2 gap-6">
         <Card>
-          <CardHeader>
-            <CardTitle className="text-lg">Applications ({pendingMembers?.length || 0})</CardTitle>
+          <CardHeader className="space-y-3">
+            <div className="flex items-center justify-between gap-3">
+              <CardTitle className="text-lg">Applications ({pendingMembers?.length || 0})</CardTitle>
+              {pendingMembers.length > 0 && (
+                <label className="flex items-center gap-2 text-sm text-muted-foreground cursor-pointer">
+                  <Checkbox
+                    checked={allChecked ? true : checkedIds.size > 0 ? 'indeterminate' : false}
+                    onCheckedChange={(value) => toggleAll(value === true)}
+                    data-testid="checkbox-select-all"
+                  />
+                  Select all
+                </label>
+              )}
+            </div>
+            {checkedIds.size > 0 && (
+              <div className="flex flex-wrap items-center gap-2 rounded-lg border border-border bg-muted/40 p-3">
+                <span className="text-sm font-medium mr-auto">{checkedIds.size} selected</span>
+                <Select value={batchRole} onValueChange={setBatchRole}>
+                  <SelectTrigger className="w-40" data-testid="select-batch-role">
+                    <SelectValue />
+                  </SelectTrigger>
+                  <SelectContent>
+                    <SelectItem value="Council Head">Council Head</SelectItem>
+                    <SelectItem value="Member">Member</SelectItem>
+                  </SelectContent>
+                </Select>
+                <Button
+                  size="sm"
+                  className="gap-2"
+                  onClick={() => approveManyMutation.mutate({ ids: Array.from(checkedIds), role: batchRole })}
+                  disabled={batchPending}
+                  data-testid="button-approve-selected"
+                >
+                  <CheckCircle className="h-4 w-4" />
+                  Approve
+                </Button>
+                <Button
+                  size="sm"
+                  variant="destructive"
+                  className="gap-2"
+                  onClick={() => rejectManyMutation.mutate(Array.from(checkedIds))}
+                  disabled={batchPending}
+                  data-testid="button-reject-selected"
+                >
+                  <XCircle className="h-4 w-4" />
+                  Reject
+                </Button>
+              </div>
+            )}
           </CardHeader>
           <CardContent>
             {!pendingMembers || pendingMembers.length === 0 ? (
@@ -111,6 +219,13 @@ export default function Approvals() {
                     data-testid={`applicant-${member.id}`}
                   >
                     <div className="flex items-center gap-3">
+                      <Checkbox
+                        checked={checkedIds.has(member.id)}
+                        onCheckedChange={(value) => toggleOne(member.id, value === true)}
+                        onClick={(event) => event.stopPropagation()}
+                        aria-label={`Select ${member.name}`}
+                        data-testid={`checkbox-applicant-${member.id}`}
+                      />
                       <Avatar>
                         <AvatarFallback>{getInitials(member.name)}</AvatarFallback>
                       </Avatar>
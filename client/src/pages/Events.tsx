@@ -155,7 +155,7 @@ export default function Events() {
   });
 
   const updateEventMutation = useMutation({
-    mutationFn: async ({ id, data }: { id: string; data: CreateEventInput }) => {
+    mutationFn: async ({ id, data }: { id: string; data: CreateEventInput & { version: number } }) => {
       return await apiRequest<ClubEvent>('PATCH', `/api/events/${id}`, data);
     },
     onSuccess: () => {
@@ -170,6 +170,8 @@ export default function Events() {
       });
     },
     onError: (error: any) => {
+      // A 409 means the row changed; refetch so the next edit starts from it
+      queryClient.invalidateQueries({ queryKey: ['/api/events'] });
       toast({
         title: 'Unable to update event',
         description: error.message,
@@ -248,7 +250,8 @@ export default function Events() {
     };
 
     if (editingEvent) {
-      updateEventMutation.mutate({ id: editingEvent.id, data: payload });
+      // With the version we loaded, a concurrent edit is reported instead of overwritten
+      updateEventMutation.mutate({ id: editingEvent.id, data: { ...payload, version: editingEvent.version } });
     } else {
       createEventMutation.mutate(payload);
     }
@@ -309,8 +309,12 @@ export default function Social() {
                     <span>{new Date(post.scheduledDate).toLocaleString()}</span>
                   </div>
                 )}
+                {post.status === 'Failed' && post.lastError && (
+                  <p className="text-xs text-destructive">Publishing failed: {post.lastError}</p>
+                )}
                 <div className="flex items-center gap-2 text-xs text-muted-foreground">
                   <span>Created {new Date(post.createdAt).toLocaleDateString()}</span>
+                  {post.postedAt && <span>• Posted {new Date(post.postedAt).toLocaleString()}</span>}
                 </div>
               </CardContent>
             </Card>
@@ -82,7 +82,7 @@ export default function Tasks() {
   });
 
   const updateTaskMutation = useMutation({
-    mutationFn: async ({ id, data }: { id: string; data: CreateTaskInput }) => {
+    mutationFn: async ({ id, data }: { id: string; data: CreateTaskInput & { version: number } }) => {
       return await apiRequest<ClubTask>('PATCH', `/api/tasks/${id}`, data);
     },
     onSuccess: () => {
@@ -94,6 +94,8 @@ export default function Tasks() {
       toast({ title: 'Task updated' });
     },
     onError: (error: any) => {
+      // A 409 means the row changed; refetch so the next edit starts from it
+      queryClient.invalidateQueries({ queryKey: ['/api/tasks'] });
       toast({ title: 'Unable to update task', description: error.message, variant: 'destructive' });
     },
   });
@@ -239,7 +241,8 @@ export default function Tasks() {
     };
 
     if (editingTask) {
-      updateTaskMutation.mutate({ id: editingTask.id, data: payload });
+      // With the version we loaded, a concurrent edit is reported instead of overwritten
+      updateTaskMutation.mutate({ id: editingTask.id, data: { ...payload, version: editingTask.version } });
     } else {
       createTaskMutation.mutate(payload);
     }
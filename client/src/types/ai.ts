@@ -28,3 +28,9 @@ export type AIResponse = {
   teamSuggestions: TeamSuggestion[];
 };
 
+// Payload of the `task` event sent by /api/ai/generate-tasks in streaming mode
+export type AITaskStreamEvent = {
+  index: number;
+  task: AITask;
+};
+
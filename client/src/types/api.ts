@@ -54,6 +54,12 @@ export interface MessageResponse {
   message: string;
 }
 
+export interface BatchApprovalResponse extends MessageResponse {
+  approved?: string[];
+  rejected?: string[];
+  skipped: string[];
+}
+
 export interface InviteLink {
   url: string;
   code: string;
@@ -246,4 +252,5 @@ export interface InstitutionAnalyticsResponse {
 
 export interface InstitutionHeatmapResponse {
   heatmap: Array<{ date: string; intensity: number }>;
+  granularity: 'day' | 'week' | 'month';
 }
@@ -0,0 +1,11 @@
+ALTER TABLE "social_posts" ADD COLUMN IF NOT EXISTS "claimed_at" timestamp;
+ALTER TABLE "social_posts" ADD COLUMN IF NOT EXISTS "posted_at" timestamp;
+ALTER TABLE "social_posts" ADD COLUMN IF NOT EXISTS "last_error" text;
+
+CREATE INDEX IF NOT EXISTS "social_posts_due_idx"
+  ON "social_posts" ("scheduled_date")
+  WHERE "status" = 'Scheduled';
+
+CREATE INDEX IF NOT EXISTS "social_posts_lease_idx"
+  ON "social_posts" ("claimed_at")
+  WHERE "status" = 'Publishing';
@@ -0,0 +1,21 @@
+-- Search over members, events and tasks (GET /api/search, /api/institution/search).
+-- The full-text expressions must stay identical to userSearchDocument,
+-- eventSearchDocument and taskSearchDocument in shared/schema.ts.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS "users_club_idx" ON "users" ("club_id");
+CREATE INDEX IF NOT EXISTS "events_club_idx" ON "events" ("club_id");
+CREATE INDEX IF NOT EXISTS "tasks_club_idx" ON "tasks" ("club_id");
+
+CREATE INDEX IF NOT EXISTS "users_search_idx"
+  ON "users" USING gin (to_tsvector('simple', "name" || ' ' || "email" || ' ' || coalesce("id_number", '')));
+CREATE INDEX IF NOT EXISTS "users_name_trgm_idx" ON "users" USING gin (lower("name") gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS "users_email_trgm_idx" ON "users" USING gin (lower("email") gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS "users_id_number_trgm_idx" ON "users" USING gin (lower("id_number") gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS "events_search_idx"
+  ON "events" USING gin (to_tsvector('simple', "title" || ' ' || coalesce("description", '')));
+CREATE INDEX IF NOT EXISTS "events_title_trgm_idx" ON "events" USING gin (lower("title") gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS "tasks_search_idx" ON "tasks" USING gin (to_tsvector('simple', "title"));
+CREATE INDEX IF NOT EXISTS "tasks_title_trgm_idx" ON "tasks" USING gin (lower("title") gin_trgm_ops);
@@ -0,0 +1,21 @@
+CREATE TABLE IF NOT EXISTS "institution_daily_activity" (
+  "institution_id" varchar NOT NULL REFERENCES "institutions"("id") ON DELETE CASCADE,
+  "club_id" varchar NOT NULL REFERENCES "clubs"("id") ON DELETE CASCADE,
+  "day" date NOT NULL,
+  "events" integer NOT NULL DEFAULT 0,
+  "tasks" integer NOT NULL DEFAULT 0,
+  PRIMARY KEY ("club_id", "day")
+);
+
+CREATE INDEX IF NOT EXISTS "institution_daily_activity_institution_day_idx"
+  ON "institution_daily_activity" ("institution_id", "day");
+
+CREATE TABLE IF NOT EXISTS "institution_activity_rollups" (
+  "institution_id" varchar PRIMARY KEY REFERENCES "institutions"("id") ON DELETE CASCADE,
+  "rolled_up_through" date NOT NULL,
+  "updated_at" timestamp NOT NULL DEFAULT now()
+);
+
+-- Backs the date-range filter on the live part of the heatmap
+CREATE INDEX IF NOT EXISTS "events_club_date_idx" ON "events" ("club_id", "date");
+CREATE INDEX IF NOT EXISTS "tasks_club_created_at_idx" ON "tasks" ("club_id", "created_at");
@@ -0,0 +1,5 @@
+CREATE TABLE IF NOT EXISTS "rate_limit_buckets" (
+  "key" text PRIMARY KEY,
+  "tokens" double precision NOT NULL,
+  "updated_at" timestamp with time zone NOT NULL DEFAULT now()
+);
@@ -0,0 +1,7 @@
+-- Institution-wide reads filter by club_id IN (SELECT id FROM clubs WHERE
+-- institution_id = ...), see TenantScope in server/storage.ts. These keep
+-- both sides of that subquery on an index.
+CREATE INDEX IF NOT EXISTS "clubs_institution_idx" ON "clubs" ("institution_id");
+CREATE INDEX IF NOT EXISTS "pending_members_club_idx" ON "pending_members" ("club_id");
+CREATE INDEX IF NOT EXISTS "finance_club_idx" ON "finance" ("club_id");
+CREATE INDEX IF NOT EXISTS "social_posts_club_idx" ON "social_posts" ("club_id");
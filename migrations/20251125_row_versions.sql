@@ -0,0 +1,8 @@
+-- Row versions for optimistic concurrency on PATCH /api/tasks/:id,
+-- /api/events/:id, /api/finance/:id and /api/social/:id. Every update
+-- increments the version; a request that sends one is only applied if it
+-- still matches.
+ALTER TABLE "events" ADD COLUMN IF NOT EXISTS "version" integer DEFAULT 1 NOT NULL;
+ALTER TABLE "tasks" ADD COLUMN IF NOT EXISTS "version" integer DEFAULT 1 NOT NULL;
+ALTER TABLE "finance" ADD COLUMN IF NOT EXISTS "version" integer DEFAULT 1 NOT NULL;
+ALTER TABLE "social_posts" ADD COLUMN IF NOT EXISTS "version" integer DEFAULT 1 NOT NULL;
@@ -0,0 +1,97 @@
+-- Append-only finance ledger with running balances, current per-club totals
+-- and monthly rollups, all maintained by the finance write paths. Existing
+-- entries are backfilled at the end; `npm run finance:reconcile` checks the
+-- result.
+CREATE TABLE IF NOT EXISTS "finance_ledger" (
+  "id" bigserial PRIMARY KEY,
+  "club_id" varchar NOT NULL REFERENCES "clubs"("id") ON DELETE CASCADE,
+  "finance_id" varchar,
+  "action" text NOT NULL,
+  "month" text NOT NULL,
+  "category" text NOT NULL,
+  "spend_change" numeric(12, 2) NOT NULL,
+  "balance_change" numeric(12, 2) NOT NULL,
+  "balance_after" numeric(12, 2) NOT NULL,
+  "created_at" timestamp NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS "finance_ledger_club_idx" ON "finance_ledger" ("club_id", "id");
+
+CREATE TABLE IF NOT EXISTS "finance_balances" (
+  "club_id" varchar PRIMARY KEY REFERENCES "clubs"("id") ON DELETE CASCADE,
+  "balance" numeric(12, 2) NOT NULL DEFAULT 0,
+  "spend" numeric(12, 2) NOT NULL DEFAULT 0,
+  "pending" integer NOT NULL DEFAULT 0,
+  "updated_at" timestamp NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS "finance_monthly_rollups" (
+  "club_id" varchar NOT NULL REFERENCES "clubs"("id") ON DELETE CASCADE,
+  "month" text NOT NULL,
+  "category" text NOT NULL,
+  "spend" numeric(12, 2) NOT NULL DEFAULT 0,
+  "balance_change" numeric(12, 2) NOT NULL DEFAULT 0,
+  PRIMARY KEY ("club_id", "month", "category")
+);
+
+-- Backfill from the entries already there. Months are created_at as stored,
+-- which is UTC, like financeMonth in server/finance-ledger.ts. Categories repeat
+-- FINANCE_CATEGORY_KEYWORDS in server/finance-ledger.ts: the first keyword
+-- found in the lowercased name wins.
+CREATE TEMP TABLE finance_backfill AS
+SELECT
+  f.club_id,
+  to_char(f.created_at, 'YYYY-MM') AS month,
+  CASE
+    WHEN position('marketing' IN lower(f.transaction_name)) > 0 THEN 'Marketing'
+    WHEN position('promo' IN lower(f.transaction_name)) > 0 THEN 'Marketing'
+    WHEN position('sponsor' IN lower(f.transaction_name)) > 0 THEN 'Marketing'
+    WHEN position('logistics' IN lower(f.transaction_name)) > 0 THEN 'Logistics'
+    WHEN position('venue' IN lower(f.transaction_name)) > 0 THEN 'Logistics'
+    WHEN position('travel' IN lower(f.transaction_name)) > 0 THEN 'Logistics'
+    WHEN position('operations' IN lower(f.transaction_name)) > 0 THEN 'Operations'
+    WHEN position('ops' IN lower(f.transaction_name)) > 0 THEN 'Operations'
+    WHEN position('print' IN lower(f.transaction_name)) > 0 THEN 'Operations'
+    WHEN position('design' IN lower(f.transaction_name)) > 0 THEN 'PR'
+    WHEN position('media' IN lower(f.transaction_name)) > 0 THEN 'PR'
+    WHEN position('pr' IN lower(f.transaction_name)) > 0 THEN 'PR'
+    ELSE 'Operations'
+  END AS category,
+  CASE WHEN f.type = 'expense' THEN f.amount ELSE 0 END AS spend,
+  CASE
+    WHEN f.status <> 'Approved' THEN 0
+    WHEN f.type = 'income' THEN f.amount
+    WHEN f.type = 'expense' THEN -f.amount
+    ELSE 0
+  END AS balance,
+  CASE WHEN f.status = 'Pending' THEN 1 ELSE 0 END AS pending
+FROM "finance" f;
+
+INSERT INTO "finance_balances" ("club_id", "balance", "spend", "pending")
+SELECT club_id, sum(balance), sum(spend), sum(pending)
+FROM finance_backfill
+GROUP BY club_id
+ON CONFLICT ("club_id") DO NOTHING;
+
+INSERT INTO "finance_monthly_rollups" ("club_id", "month", "category", "spend", "balance_change")
+SELECT club_id, month, category, sum(spend), sum(balance)
+FROM finance_backfill
+GROUP BY club_id, month, category
+ON CONFLICT ("club_id", "month", "category") DO NOTHING;
+
+-- One opening "adjusted" ledger row per club, month and category, running
+-- balances in month order; skipped for clubs that already have a ledger
+INSERT INTO "finance_ledger"
+  ("club_id", "finance_id", "action", "month", "category", "spend_change", "balance_change", "balance_after")
+SELECT club_id, NULL, 'adjusted', month, category, spend, balance,
+       sum(balance) OVER (PARTITION BY club_id ORDER BY month, category)
+FROM (
+  SELECT club_id, month, category, sum(spend) AS spend, sum(balance) AS balance
+  FROM finance_backfill
+  GROUP BY club_id, month, category
+) AS opening
+WHERE (spend <> 0 OR balance <> 0)
+  AND NOT EXISTS (SELECT 1 FROM "finance_ledger" l WHERE l.club_id = opening.club_id)
+ORDER BY club_id, month, category;
+
+DROP TABLE finance_backfill;
@@ -0,0 +1,98 @@
+// Micro-benchmark for the institution analytics engine.
+// Usage: npx tsx scripts/bench-analytics.ts [maxRows]
+//
+// Builds synthetic institutions of growing size and times the single-pass
+// index against the per-club / per-month filtering it replaced. The engine
+// should scale linearly: ns/row stays flat as the row count grows.
+import type { Club, User, Event, Task, Finance } from "@shared/schema";
+import {
+  buildAnalyticsIndex,
+  buildClubBudgetUsage,
+  buildClubHealth,
+  buildEventsPerMonth,
+} from "../server/analytics";
+
+const CLUBS = 200;
+const NAIVE_LIMIT = 100_000;
+const maxRows = parseInt(process.argv[2] || "1000000", 10);
+
+function makeData(rows: number) {
+  const now = Date.now();
+  const clubs = Array.from({ length: CLUBS }, (_, i) => ({ id: `club-${i}`, name: `Club ${i}`, department: "CS" })) as Club[];
+  const clubId = (i: number) => `club-${i % CLUBS}`;
+  // Split rows roughly like a real institution: tasks dominate, then members, events, finance
+  const users = Array.from({ length: Math.floor(rows * 0.3) }, (_, i) => ({
+    id: `u-${i}`, clubId: clubId(i), canLogin: i % 7 === 0, isPresident: i < CLUBS, role: "Member",
+  })) as User[];
+  const events = Array.from({ length: Math.floor(rows * 0.15) }, (_, i) => ({
+    id: `e-${i}`, clubId: clubId(i), status: i % 3 === 0 ? "Completed" : "Planning",
+    budget: String(i % 500), date: new Date(now - (i % 400) * 86_400_000),
+  })) as Event[];
+  const tasks = Array.from({ length: Math.floor(rows * 0.45) }, (_, i) => ({
+    id: `t-${i}`, clubId: clubId(i), status: i % 2 ? "Done" : "Pending",
+  })) as Task[];
+  const financeEntries = Array.from({ length: Math.floor(rows * 0.1) }, (_, i) => ({
+    id: `f-${i}`, clubId: clubId(i), type: i % 4 ? "expense" : "income",
+    status: i % 3 ? "Approved" : "Pending", amount: String((i % 900) + 0.5),
+  })) as Finance[];
+  return { clubs, users, events, tasks, financeEntries };
+}
+
+// Reference implementation of the previous builders (filter per club / per month)
+function naive(data: ReturnType<typeof makeData>) {
+  const now = new Date();
+  const months = [];
+  for (let i = 11; i >= 0; i--) {
+    const date = new Date(now.getFullYear(), now.getMonth() - i, 1);
+    months.push(data.events.filter((event) => {
+      const eventDate = new Date(event.date);
+      return eventDate.getMonth() === date.getMonth() && eventDate.getFullYear() === date.getFullYear();
+    }).length);
+  }
+  const perClub = data.clubs.map((club) => {
+    const clubEvents = data.events.filter((event) => event.clubId === club.id);
+    const clubTasks = data.tasks.filter((task) => task.clubId === club.id);
+    const done = data.tasks.filter((task) => task.clubId === club.id && task.status === "Done").length;
+    const members = data.users.filter((user) => user.clubId === club.id).length;
+    const spent = data.financeEntries
+      .filter((entry) => entry.clubId === club.id && entry.type === "expense" && entry.status === "Approved")
+      .reduce((sum, entry) => sum + parseFloat(entry.amount), 0);
+    return clubEvents.length + clubTasks.length + done + members + spent;
+  });
+  return { months, perClub };
+}
+
+function engine(data: ReturnType<typeof makeData>) {
+  const index = buildAnalyticsIndex(data);
+  return {
+    monthly: buildEventsPerMonth(index, 12),
+    health: buildClubHealth(index),
+    budget: buildClubBudgetUsage(index),
+  };
+}
+
+function time(fn: () => unknown, runs = 3) {
+  fn(); // warm-up
+  let best = Infinity;
+  for (let i = 0; i < runs; i++) {
+    const start = process.hrtime.bigint();
+    fn();
+    best = Math.min(best, Number(process.hrtime.bigint() - start) / 1e6);
+  }
+  return best;
+}
+
+console.log(`clubs=${CLUBS}`);
+console.log("rows".padStart(10), "engine ms".padStart(12), "ns/row".padStart(9), "naive ms".padStart(12));
+
+for (let rows = 1_000; rows <= maxRows; rows *= 10) {
+  const data = makeData(rows);
+  const engineMs = time(() => engine(data));
+  const naiveMs = rows <= NAIVE_LIMIT ? time(() => naive(data), 1) : NaN;
+  console.log(
+    String(rows).padStart(10),
+    engineMs.toFixed(2).padStart(12),
+    ((engineMs * 1e6) / rows).toFixed(1).padStart(9),
+    (Number.isNaN(naiveMs) ? "skipped" : naiveMs.toFixed(2)).padStart(12),
+  );
+}
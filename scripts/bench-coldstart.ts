@@ -0,0 +1,110 @@
+// Cold-start benchmark for the serverless entry (api/index.ts).
+// Usage: npx tsx scripts/bench-coldstart.ts [runs] [path]
+//
+// Every run is a fresh Node process, like a new Vercel instance: it times
+// the import of api/index, then the first request through the handler
+// (route registration included) and a second, warm one. Without
+// DATABASE_URL the in-memory storage backend is used, so the numbers cover
+// module loading and routing rather than database latency.
+import { spawn } from "child_process";
+import { createServer } from "http";
+import type { AddressInfo } from "net";
+import { fileURLToPath } from "url";
+
+const runs = parseInt(process.argv[2] || "10", 10);
+const requestPath = process.argv[3] || "/api/clubs/verify/BENCH01";
+
+type Sample = { importMs: number; firstRequestMs: number; warmRequestMs: number; status: number; heapMb: number };
+
+async function measureOnce(): Promise<Sample> {
+  const importStart = performance.now();
+  const { default: handler } = await import("../api/index");
+  const importMs = performance.now() - importStart;
+
+  const server = createServer((req, res) => handler(req, res));
+  await new Promise<void>((resolve) => server.listen(0, "127.0.0.1", resolve));
+  const { port } = server.address() as AddressInfo;
+  const url = `http://127.0.0.1:${port}${requestPath}`;
+
+  const firstStart = performance.now();
+  const first = await fetch(url);
+  await first.arrayBuffer();
+  const firstRequestMs = performance.now() - firstStart;
+
+  const warmStart = performance.now();
+  await (await fetch(url)).arrayBuffer();
+  const warmRequestMs = performance.now() - warmStart;
+
+  server.close();
+  return {
+    importMs,
+    firstRequestMs,
+    warmRequestMs,
+    status: first.status,
+    heapMb: process.memoryUsage().heapUsed / 1e6,
+  };
+}
+
+function runChild(): Promise<Sample> {
+  return new Promise((resolve, reject) => {
+    const child = spawn(process.execPath, [...process.execArgv, fileURLToPath(import.meta.url), "--child"], {
+      env: {
+        ...process.env,
+        STORAGE_BACKEND: process.env.STORAGE_BACKEND || (process.env.DATABASE_URL ? "postgres" : "memory"),
+        SOCIAL_DISPATCHER: "off",
+      },
+      stdio: ["ignore", "pipe", "inherit"],
+    });
+    let output = "";
+    child.stdout.on("data", (chunk) => (output += chunk));
+    child.on("error", reject);
+    child.on("exit", (code) => {
+      // The app logs to stdout too; the sample is the last line
+      const line = output.trim().split("\n").pop() || "";
+      try {
+        resolve(JSON.parse(line) as Sample);
+      } catch {
+        reject(new Error(`benchmark child exited with ${code} without a sample`));
+      }
+    });
+  });
+}
+
+const median = (values: number[]) => {
+  const sorted = [...values].sort((a, b) => a - b);
+  const mid = Math.floor(sorted.length / 2);
+  return sorted.length % 2 ? sorted[mid] : (sorted[mid - 1] + sorted[mid]) / 2;
+};
+
+async function main() {
+  if (process.argv.includes("--child")) {
+    const sample = await measureOnce();
+    console.log(JSON.stringify(sample));
+    process.exit(0); // pools and timers would otherwise keep the process up
+  }
+
+  console.log(`${runs} cold starts, first request GET ${requestPath}`);
+  const samples: Sample[] = [];
+  for (let i = 0; i < runs; i++) {
+    samples.push(await runChild());
+  }
+
+  const row = (label: string, pick: (sample: Sample) => number, unit = "ms") => {
+    const values = samples.map(pick);
+    console.log(
+      `${label.padEnd(16)} median ${median(values).toFixed(1).padStart(8)}${unit}` +
+        `  min ${Math.min(...values).toFixed(1).padStart(8)}${unit}  max ${Math.max(...values).toFixed(1).padStart(8)}${unit}`,
+    );
+  };
+  row("import", (sample) => sample.importMs);
+  row("first request", (sample) => sample.firstRequestMs);
+  row("cold total", (sample) => sample.importMs + sample.firstRequestMs);
+  row("warm request", (sample) => sample.warmRequestMs);
+  row("heap", (sample) => sample.heapMb, "MB");
+  console.log(`status ${samples[0].status}`);
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
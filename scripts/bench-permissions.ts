@@ -0,0 +1,104 @@
+// Micro-benchmark for permission checks.
+// Usage: npx tsx scripts/bench-permissions.ts [iterations]
+//
+// Simulates what an authenticated dashboard request does: resolve the
+// user's effective permissions, then run seven checks. The "object" path is
+// the previous implementation (merge a PermissionSet per request, look up
+// string keys); the "mask" path uses the precomputed bitmasks.
+import {
+  ALL_PERMISSIONS,
+  getUserPermissionMask,
+  hasPermissionBit,
+  toPermissionMask,
+  type Permission,
+  type PermissionSet,
+} from "@shared/permissions";
+
+const iterations = parseInt(process.argv[2] || "2000000", 10);
+
+const DASHBOARD_CHECKS: Permission[] = [
+  "view_dashboard_stats",
+  "view_approvals",
+  "view_members",
+  "manage_events",
+  "manage_tasks",
+  "manage_finance",
+  "manage_social",
+];
+
+const customRole: PermissionSet = { manage_events: true, manage_tasks: true, view_members: true, manage_social: false };
+const users = [
+  { isPresident: true, role: "President" },
+  { isPresident: false, role: "Vice-President" },
+  { isPresident: false, role: "Council Head" },
+];
+
+// Previous implementation, kept inline for comparison
+function legacyUserPermissions(isPresident: boolean, role: string, custom: PermissionSet | null): PermissionSet {
+  if (isPresident) {
+    const permissions: PermissionSet = {};
+    ALL_PERMISSIONS.forEach((perm) => {
+      permissions[perm] = true;
+    });
+    return permissions;
+  }
+  if (role === "Vice-President") {
+    const permissions: PermissionSet = {};
+    ALL_PERMISSIONS.forEach((perm) => {
+      if (perm !== "manage_settings" && perm !== "manage_committee") permissions[perm] = true;
+    });
+    return permissions;
+  }
+  return custom || {};
+}
+
+function legacyHasPermission(permissions: PermissionSet | null | undefined, permission: Permission) {
+  if (!permissions) return false;
+  return permissions[permission] === true;
+}
+
+function runLegacy() {
+  let granted = 0;
+  for (let i = 0; i < iterations; i++) {
+    const user = users[i % users.length];
+    const permissions = legacyUserPermissions(user.isPresident, user.role, customRole);
+    for (const check of DASHBOARD_CHECKS) {
+      if (legacyHasPermission(permissions, check)) granted++;
+    }
+  }
+  return granted;
+}
+
+// The custom role mask is computed once, as the server does at role load
+const customRoleMask = toPermissionMask(customRole);
+
+function runMask() {
+  let granted = 0;
+  for (let i = 0; i < iterations; i++) {
+    const user = users[i % users.length];
+    const mask = getUserPermissionMask(user.isPresident, user.role, customRoleMask);
+    for (const check of DASHBOARD_CHECKS) {
+      if (hasPermissionBit(mask, check)) granted++;
+    }
+  }
+  return granted;
+}
+
+function time(label: string, fn: () => number) {
+  fn(); // warm-up
+  const start = process.hrtime.bigint();
+  const granted = fn();
+  const ms = Number(process.hrtime.bigint() - start) / 1e6;
+  console.log(
+    label.padEnd(8),
+    `${ms.toFixed(1)} ms`.padStart(12),
+    `${((ms * 1e6) / iterations).toFixed(1)} ns/request`.padStart(18),
+    `granted=${granted}`,
+  );
+  return ms;
+}
+
+console.log(`${iterations} simulated requests x ${DASHBOARD_CHECKS.length} checks`);
+const legacyMs = time("object", runLegacy);
+const maskMs = time("mask", runMask);
+console.log(`speedup: ${(legacyMs / maskMs).toFixed(1)}x`);
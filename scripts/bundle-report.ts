@@ -0,0 +1,123 @@
+// Per-route bundle size report for the production client build.
+// Usage: npm run build && npx tsx scripts/bundle-report.ts [--json]
+//
+// Reads the Vite manifest, follows the static imports from the entry, the
+// app shell and the route's page chunk, and sums the gzipped JS + CSS a
+// first visit to that route downloads. Exits non-zero when a route goes
+// over its budget so CI can catch regressions.
+import fs from "fs";
+import path from "path";
+import { gzipSync } from "zlib";
+
+type ManifestChunk = {
+  file: string;
+  src?: string;
+  isEntry?: boolean;
+  imports?: string[];
+  dynamicImports?: string[];
+  css?: string[];
+};
+
+type RouteBudget = {
+  route: string;
+  shell: string;
+  page: string;
+  budgetKb: number;
+};
+
+const ENTRY = "src/main.tsx";
+
+// Gzipped KB per route, including the shared entry and shell chunks
+const ROUTE_BUDGETS: RouteBudget[] = [
+  { route: "/vote/:accessCode", shell: "src/PublicApp.tsx", page: "src/pages/Vote.tsx", budgetKb: 110 },
+  { route: "/apply/:clubCode", shell: "src/PublicApp.tsx", page: "src/pages/Apply.tsx", budgetKb: 110 },
+  { route: "/login", shell: "src/App.tsx", page: "src/pages/Login.tsx", budgetKb: 200 },
+  { route: "/", shell: "src/App.tsx", page: "src/pages/Landing.tsx", budgetKb: 260 },
+  { route: "/dashboard", shell: "src/App.tsx", page: "src/pages/Dashboard.tsx", budgetKb: 320 },
+  { route: "/events", shell: "src/App.tsx", page: "src/pages/Events.tsx", budgetKb: 300 },
+  { route: "/institution/dashboard", shell: "src/App.tsx", page: "src/pages/institution/Dashboard.tsx", budgetKb: 340 },
+  { route: "/institution/analytics", shell: "src/App.tsx", page: "src/pages/institution/Analytics.tsx", budgetKb: 360 },
+  { route: "/institution/elections", shell: "src/App.tsx", page: "src/pages/institution/Elections.tsx", budgetKb: 300 },
+];
+
+const outDir = path.resolve(import.meta.dirname, "..", "dist", "public");
+const manifestPath = path.join(outDir, ".vite", "manifest.json");
+
+if (!fs.existsSync(manifestPath)) {
+  console.error(`No Vite manifest at ${manifestPath}. Run \`npm run build\` first.`);
+  process.exit(1);
+}
+
+const manifest: Record<string, ManifestChunk> = JSON.parse(fs.readFileSync(manifestPath, "utf-8"));
+const gzipCache = new Map<string, number>();
+
+function gzipSize(file: string) {
+  if (!gzipCache.has(file)) {
+    gzipCache.set(file, gzipSync(fs.readFileSync(path.join(outDir, file))).length);
+  }
+  return gzipCache.get(file)!;
+}
+
+// Files loaded up front for the given chunks: their static imports, recursively, plus CSS
+function collectFiles(keys: string[]) {
+  const files = new Set<string>();
+  const seen = new Set<string>();
+  const visit = (key: string) => {
+    if (seen.has(key)) return;
+    seen.add(key);
+    const chunk = manifest[key];
+    if (!chunk) throw new Error(`Chunk ${key} is not in the manifest`);
+    files.add(chunk.file);
+    chunk.css?.forEach((css) => files.add(css));
+    chunk.imports?.forEach(visit);
+  };
+  keys.forEach(visit);
+  return files;
+}
+
+const kb = (bytes: number) => bytes / 1024;
+
+const rows = ROUTE_BUDGETS.map((budget) => {
+  const files = Array.from(collectFiles([ENTRY, budget.shell, budget.page]));
+  const js = files.filter((file) => file.endsWith(".js")).reduce((sum, file) => sum + gzipSize(file), 0);
+  const css = files.filter((file) => file.endsWith(".css")).reduce((sum, file) => sum + gzipSize(file), 0);
+  const total = kb(js + css);
+  return {
+    route: budget.route,
+    chunks: files.length,
+    jsKb: Number(kb(js).toFixed(1)),
+    cssKb: Number(kb(css).toFixed(1)),
+    totalKb: Number(total.toFixed(1)),
+    budgetKb: budget.budgetKb,
+    ok: total <= budget.budgetKb,
+  };
+});
+
+if (process.argv.includes("--json")) {
+  console.log(JSON.stringify(rows, null, 2));
+} else {
+  console.log(
+    "route".padEnd(26),
+    "chunks".padStart(7),
+    "js kB".padStart(8),
+    "css kB".padStart(8),
+    "total".padStart(8),
+    "budget".padStart(8),
+  );
+  rows.forEach((row) => {
+    console.log(
+      row.route.padEnd(26),
+      String(row.chunks).padStart(7),
+      row.jsKb.toFixed(1).padStart(8),
+      row.cssKb.toFixed(1).padStart(8),
+      row.totalKb.toFixed(1).padStart(8),
+      `${row.budgetKb}${row.ok ? "" : " !"}`.padStart(8),
+    );
+  });
+}
+
+const failures = rows.filter((row) => !row.ok);
+if (failures.length) {
+  console.error(`\n${failures.length} route(s) over budget: ${failures.map((row) => row.route).join(", ")}`);
+  process.exit(1);
+}
@@ -0,0 +1,38 @@
+// Checks every club's finance books against its finance rows.
+// Usage: npx tsx scripts/reconcile-finance.ts [--repair] [clubId...]
+//
+// The ledger, finance_balances and finance_monthly_rollups are kept by the
+// finance write paths (server/finance-ledger.ts). This recomputes them from
+// the rows and lists every difference; exits 1 if there are any. --repair
+// appends "adjusted" ledger rows and rewrites the stored totals.
+import "dotenv/config";
+import { db } from "../server/db";
+import { storage } from "../server/storage";
+import { clubs } from "../shared/schema";
+
+async function main() {
+  const args = process.argv.slice(2);
+  const repair = args.includes("--repair");
+  const only = args.filter((arg) => !arg.startsWith("--"));
+  const clubIds = only.length ? only : (await db.select({ id: clubs.id }).from(clubs)).map((club) => club.id);
+
+  let unbalanced = 0;
+  for (const clubId of clubIds) {
+    const discrepancies = await storage.reconcileFinanceLedger(clubId, repair);
+    if (discrepancies.length === 0) continue;
+    unbalanced += 1;
+    console.log(`${clubId}${repair ? " (repaired)" : ""}`);
+    for (const { source, month, category, field, expected, actual } of discrepancies) {
+      const where = month ? ` ${month} ${category}` : "";
+      console.log(`  ${source}${where} ${field}: expected ${expected}, stored ${actual}`);
+    }
+  }
+
+  console.log(`${clubIds.length} clubs checked, ${unbalanced} ${repair ? "repaired" : "out of balance"}`);
+  process.exit(unbalanced && !repair ? 1 : 0);
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
@@ -0,0 +1,294 @@
+// AI event-planning helpers shared by the buffered and streaming
+// variants of /api/ai/generate-tasks.
+
+export type AIPlanInput = {
+  eventTitle: string;
+  eventDescription?: string;
+  goals?: string;
+  team?: string;
+  expectedDate?: string;
+  expectedBudget?: string | number;
+};
+
+export type AITaskSuggestion = {
+  title: string;
+  description: string;
+  assignedTo: string;
+  dueDate: string;
+  priority: string;
+};
+
+export type AIPlanResponse = {
+  tasks: AITaskSuggestion[];
+  budgetSuggestions: Array<{ item: string; estimatedAmount: string }>;
+  timeline: Array<{ day: string; milestone: string }>;
+  teamSuggestions: Array<{ role: string; responsibility: string }>;
+};
+
+export const GROQ_MODEL = 'llama-3.1-8b-instant'; // Free tier model
+
+const GROQ_SYSTEM_PROMPT =
+  'You are an expert event planning assistant for club management. Generate structured task plans, budget suggestions, timelines, and team assignments based on event details. Always respond with valid JSON only, no markdown formatting.';
+
+function describeEvent(input: AIPlanInput) {
+  return `Event Title: ${input.eventTitle}
+${input.eventDescription ? `Description: ${input.eventDescription}` : ''}
+${input.goals ? `Goals: ${input.goals}` : ''}
+${input.team ? `Team/Department: ${input.team}` : ''}
+${input.expectedDate ? `Expected Date: ${input.expectedDate}` : ''}
+${input.expectedBudget ? `Expected Budget: ${input.expectedBudget}` : ''}`;
+}
+
+// "tasks" is deliberately the first key so streaming clients receive
+// task objects before the rest of the plan is generated.
+export function buildGroqMessages(input: AIPlanInput) {
+  return [
+    { role: 'system', content: GROQ_SYSTEM_PROMPT },
+    {
+      role: 'user',
+      content: `Generate a comprehensive event planning breakdown for the following event:
+
+${describeEvent(input)}
+
+Provide a JSON response with this exact structure:
+{
+  "tasks": [
+    {
+      "title": "Task title",
+      "description": "Detailed task description",
+      "assignedTo": "Suggested team or role (e.g., PR Team, Finance Team, Operations, Creatives)",
+      "dueDate": "YYYY-MM-DD format, calculated based on event date",
+      "priority": "High, Medium, or Low"
+    }
+  ],
+  "budgetSuggestions": [
+    {
+      "item": "Budget item name",
+      "estimatedAmount": "Amount as number or string"
+    }
+  ],
+  "timeline": [
+    {
+      "day": "Day number or relative day (e.g., 'Day -30', 'Week 1')",
+      "milestone": "Milestone description"
+    }
+  ],
+  "teamSuggestions": [
+    {
+      "role": "Team or role name",
+      "responsibility": "What this team should handle"
+    }
+  ]
+}
+
+Generate 5-8 relevant tasks, 3-5 budget items, 4-6 timeline milestones, and 2-4 team suggestions.`,
+    },
+  ];
+}
+
+export function buildGeminiPrompt(input: AIPlanInput) {
+  return `You are an expert event planning assistant. Generate a comprehensive event planning breakdown for:
+
+${describeEvent(input)}
+
+Respond with ONLY valid JSON (no markdown, no code blocks) in this exact structure:
+{
+  "tasks": [
+    {
+      "title": "Task title",
+      "description": "Detailed description",
+      "assignedTo": "Suggested team (PR, Finance, Operations, Creatives)",
+      "dueDate": "YYYY-MM-DD",
+      "priority": "High, Medium, or Low"
+    }
+  ],
+  "budgetSuggestions": [
+    {
+      "item": "Item name",
+      "estimatedAmount": "Amount"
+    }
+  ],
+  "timeline": [
+    {
+      "day": "Day description",
+      "milestone": "Milestone"
+    }
+  ],
+  "teamSuggestions": [
+    {
+      "role": "Team name",
+      "responsibility": "Responsibility"
+    }
+  ]
+}
+
+Generate 5-8 tasks, 3-5 budget items, 4-6 timeline milestones, and 2-4 team suggestions.`;
+}
+
+// Parse JSON from a completion (may be wrapped in markdown code blocks)
+export function parseAIJson(content: string) {
+  let jsonText = content.trim();
+  if (jsonText.startsWith('```')) {
+    jsonText = jsonText.replace(/^```(?:json)?\n?/i, '').replace(/\n?```$/i, '');
+  }
+  return JSON.parse(jsonText);
+}
+
+export function normalizeAITask(task: any): AITaskSuggestion {
+  return {
+    title: String(task?.title || 'Untitled Task'),
+    description: String(task?.description || ''),
+    assignedTo: String(task?.assignedTo || task?.assigned_to || 'Unassigned'),
+    dueDate: String(task?.dueDate || task?.due_date || ''),
+    priority: String(task?.priority || 'Medium'),
+  };
+}
+
+// Validate and normalize the response structure
+export function normalizeAIResponse(aiResponse: any): AIPlanResponse {
+  return {
+    tasks: Array.isArray(aiResponse?.tasks) ? aiResponse.tasks.map(normalizeAITask) : [],
+    budgetSuggestions: Array.isArray(aiResponse?.budgetSuggestions) ? aiResponse.budgetSuggestions.map((item: any) => ({
+      item: String(item.item || ''),
+      estimatedAmount: String(item.estimatedAmount || item.estimated_amount || '0'),
+    })) : [],
+    timeline: Array.isArray(aiResponse?.timeline) ? aiResponse.timeline.map((item: any) => ({
+      day: String(item.day || ''),
+      milestone: String(item.milestone || ''),
+    })) : [],
+    teamSuggestions: Array.isArray(aiResponse?.teamSuggestions) ? aiResponse.teamSuggestions.map((item: any) => ({
+      role: String(item.role || ''),
+      responsibility: String(item.responsibility || ''),
+    })) : [],
+  };
+}
+
+type Container = { type: 'object' | 'array'; key: string | null; start: number };
+
+/**
+ * Incremental JSON scanner that emits each element of the top-level
+ * "tasks" array as soon as its closing brace arrives. Text outside the
+ * root object (markdown fences, preamble) is ignored.
+ */
+export class TaskStreamParser {
+  private text = '';
+  private pos = 0;
+  private stack: Container[] = [];
+  private inString = false;
+  private escaped = false;
+  private stringStart = -1;
+  private lastString: string | null = null;
+  private currentKey: string | null = null;
+  private collected: AITaskSuggestion[] = [];
+
+  push(chunk: string): AITaskSuggestion[] {
+    this.text += chunk;
+    const found: AITaskSuggestion[] = [];
+
+    for (; this.pos < this.text.length; this.pos++) {
+      const ch = this.text[this.pos];
+
+      if (this.inString) {
+        if (this.escaped) {
+          this.escaped = false;
+        } else if (ch === '\\') {
+          this.escaped = true;
+        } else if (ch === '"') {
+          this.inString = false;
+          try {
+            this.lastString = JSON.parse(this.text.slice(this.stringStart, this.pos + 1));
+          } catch {
+            this.lastString = null;
+          }
+        }
+        continue;
+      }
+
+      switch (ch) {
+        case '"':
+          this.inString = true;
+          this.stringStart = this.pos;
+          break;
+        case ':':
+          this.currentKey = this.lastString;
+          break;
+        case ',':
+          this.currentKey = null;
+          break;
+        case '{':
+        case '[': {
+          const parent = this.stack[this.stack.length - 1];
+          this.stack.push({
+            type: ch === '{' ? 'object' : 'array',
+            key: parent?.type === 'object' ? this.currentKey : null,
+            start: this.pos,
+          });
+          this.currentKey = null;
+          break;
+        }
+        case '}':
+        case ']': {
+          const closed = this.stack.pop();
+          const parent = this.stack[this.stack.length - 1];
+          if (
+            closed?.type === 'object' &&
+            this.stack.length === 2 &&
+            parent.type === 'array' &&
+            parent.key === 'tasks'
+          ) {
+            try {
+              found.push(normalizeAITask(JSON.parse(this.text.slice(closed.start, this.pos + 1))));
+            } catch {
+              // malformed element; the final parse decides what survives
+            }
+          }
+          this.currentKey = null;
+          break;
+        }
+      }
+    }
+
+    this.collected.push(...found);
+    return found;
+  }
+
+  get tasks() {
+    return this.collected;
+  }
+
+  get taskCount() {
+    return this.collected.length;
+  }
+
+  get content() {
+    return this.text;
+  }
+}
+
+// Yields the data payload of each server-sent event in an upstream body.
+export async function* readEventStream(body: ReadableStream<Uint8Array>): AsyncGenerator<string> {
+  const decoder = new TextDecoder();
+  const reader = body.getReader();
+  let buffered = '';
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffered += decoder.decode(value, { stream: true });
+
+    let newline = buffered.indexOf('\n');
+    while (newline !== -1) {
+      const line = buffered.slice(0, newline).replace(/\r$/, '');
+      buffered = buffered.slice(newline + 1);
+      if (line.startsWith('data:')) {
+        yield line.slice(5).trimStart();
+      }
+      newline = buffered.indexOf('\n');
+    }
+  }
+
+  const tail = buffered.trim();
+  if (tail.startsWith('data:')) {
+    yield tail.slice(5).trimStart();
+  }
+}
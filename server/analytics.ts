@@ -0,0 +1,176 @@
+import type { Club, User, Event, Task, Finance } from "@shared/schema";
+
+// Single-pass analytics engine for institution charts. Every collection is
+// walked once, rows are grouped by club ordinal and month offset, and the
+// per-club / per-month totals land in typed-array accumulators. The chart
+// builders below read from the index instead of re-filtering the raw arrays
+// once per club or per month bucket.
+
+export type AnalyticsInput = {
+  clubs: Club[];
+  users: User[];
+  events: Event[];
+  tasks: Task[];
+  financeEntries: Finance[];
+};
+
+export type AnalyticsIndex = {
+  clubs: Club[];
+  clubOrdinal: Map<string, number>;
+  months: number;
+  monthLabels: string[];
+  // Per-club accumulators (indexed by club ordinal)
+  members: Uint32Array;
+  coreMembers: Uint32Array;
+  events: Uint32Array;
+  completedEvents: Uint32Array;
+  tasks: Uint32Array;
+  doneTasks: Uint32Array;
+  assignedBudget: Float64Array;
+  approvedExpense: Float64Array;
+  totalExpense: Float64Array;
+  presidents: Array<User | undefined>;
+  vicePresidents: Array<User | undefined>;
+  // Per-month accumulators (index 0 is the oldest month in the window)
+  eventsPerMonth: Uint32Array;
+};
+
+export function toNumber(value: any): number {
+  if (value === null || value === undefined) return 0;
+  const parsed = typeof value === "number" ? value : parseFloat(String(value));
+  return Number.isFinite(parsed) ? parsed : 0;
+}
+
+export function buildAnalyticsIndex(data: AnalyticsInput, months = 12, now = new Date()): AnalyticsIndex {
+  const clubCount = data.clubs.length;
+  const clubOrdinal = new Map<string, number>();
+  data.clubs.forEach((club, index) => clubOrdinal.set(club.id, index));
+
+  const index: AnalyticsIndex = {
+    clubs: data.clubs,
+    clubOrdinal,
+    months,
+    monthLabels: [],
+    members: new Uint32Array(clubCount),
+    coreMembers: new Uint32Array(clubCount),
+    events: new Uint32Array(clubCount),
+    completedEvents: new Uint32Array(clubCount),
+    tasks: new Uint32Array(clubCount),
+    doneTasks: new Uint32Array(clubCount),
+    assignedBudget: new Float64Array(clubCount),
+    approvedExpense: new Float64Array(clubCount),
+    totalExpense: new Float64Array(clubCount),
+    presidents: new Array(clubCount),
+    vicePresidents: new Array(clubCount),
+    eventsPerMonth: new Uint32Array(months),
+  };
+
+  // Months are keyed as year * 12 + month so a bucket is a single subtraction away
+  const lastMonthKey = now.getFullYear() * 12 + now.getMonth();
+  const firstMonthKey = lastMonthKey - (months - 1);
+  for (let i = 0; i < months; i++) {
+    const date = new Date(now.getFullYear(), now.getMonth() - (months - 1) + i, 1);
+    index.monthLabels.push(date.toLocaleString("default", { month: "short", year: "numeric" }));
+  }
+
+  for (const user of data.users) {
+    const ordinal = clubOrdinal.get(user.clubId);
+    if (ordinal === undefined) continue;
+    index.members[ordinal] += 1;
+    if (user.canLogin) index.coreMembers[ordinal] += 1;
+    if (user.isPresident && !index.presidents[ordinal]) index.presidents[ordinal] = user;
+    if (user.role === "Vice-President" && !index.vicePresidents[ordinal]) index.vicePresidents[ordinal] = user;
+  }
+
+  for (const event of data.events) {
+    const ordinal = clubOrdinal.get(event.clubId);
+    if (ordinal === undefined) continue;
+    index.events[ordinal] += 1;
+    if (event.status === "Completed") index.completedEvents[ordinal] += 1;
+    index.assignedBudget[ordinal] += toNumber(event.budget);
+
+    const date = event.date instanceof Date ? event.date : new Date(event.date as unknown as string);
+    const bucket = date.getFullYear() * 12 + date.getMonth() - firstMonthKey;
+    if (bucket >= 0 && bucket < months) index.eventsPerMonth[bucket] += 1;
+  }
+
+  for (const task of data.tasks) {
+    const ordinal = clubOrdinal.get(task.clubId);
+    if (ordinal === undefined) continue;
+    index.tasks[ordinal] += 1;
+    if (task.status === "Done") index.doneTasks[ordinal] += 1;
+  }
+
+  for (const entry of data.financeEntries) {
+    if (entry.type !== "expense") continue;
+    const ordinal = clubOrdinal.get(entry.clubId);
+    if (ordinal === undefined) continue;
+    const amount = toNumber(entry.amount);
+    index.totalExpense[ordinal] += amount;
+    if (entry.status === "Approved") index.approvedExpense[ordinal] += amount;
+  }
+
+  return index;
+}
+
+export function sumOf(values: Uint32Array | Float64Array) {
+  let total = 0;
+  for (let i = 0; i < values.length; i++) total += values[i];
+  return total;
+}
+
+// Last `months` buckets of the index window (the window must cover them)
+export function buildEventsPerMonth(index: AnalyticsIndex, months = 6) {
+  const start = Math.max(0, index.months - months);
+  const result: { month: string; count: number }[] = [];
+  for (let i = start; i < index.months; i++) {
+    result.push({ month: index.monthLabels[i], count: index.eventsPerMonth[i] });
+  }
+  return result;
+}
+
+export function calculateClubPerformanceScore(index: AnalyticsIndex, ordinal: number) {
+  const totalTasks = index.tasks[ordinal] || 1;
+  const score =
+    index.events[ordinal] * 10 +
+    (index.doneTasks[ordinal] / totalTasks) * 40 +
+    index.members[ordinal] * 2 -
+    index.approvedExpense[ordinal] * 0.01;
+
+  return Math.max(0, Math.min(100, Number(score.toFixed(2))));
+}
+
+export function buildClubBudgetUsage(index: AnalyticsIndex) {
+  return index.clubs.map((club, ordinal) => ({
+    clubId: club.id,
+    clubName: club.name,
+    department: club.department,
+    assignedBudget: Number(index.assignedBudget[ordinal].toFixed(2)),
+    spentBudget: Number(index.approvedExpense[ordinal].toFixed(2)),
+  }));
+}
+
+export function buildClubHealth(index: AnalyticsIndex) {
+  return index.clubs.map((club, ordinal) => {
+    const totalTasks = index.tasks[ordinal] || 1;
+    const clubEvents = index.events[ordinal];
+    return {
+      clubId: club.id,
+      clubName: club.name,
+      department: club.department,
+      performanceScore: calculateClubPerformanceScore(index, ordinal),
+      taskEfficiency: Math.round((index.doneTasks[ordinal] / totalTasks) * 100),
+      eventSuccessIndex: clubEvents ? Math.round((index.completedEvents[ordinal] / clubEvents) * 100) : 0,
+    };
+  });
+}
+
+export function buildTaskBreakdown(tasks: Task[]) {
+  const breakdown = { Pending: 0, "In Progress": 0, Done: 0 };
+  tasks.forEach((task) => {
+    if (task.status === "Done") breakdown.Done += 1;
+    else if (task.status === "In Progress") breakdown["In Progress"] += 1;
+    else breakdown.Pending += 1;
+  });
+  return breakdown;
+}
@@ -1,5 +1,7 @@
 import express from "express";
 import cookieParser from "cookie-parser";
+import { compressJsonResponses } from "./compression";
+import { admissionGate } from "./rate-limit";
 
 export function log(message: string, source = "express") {
     const formattedTime = new Date().toLocaleTimeString("en-US", {
@@ -14,6 +16,17 @@ export function log(message: string, source = "express") {
 
 const app = express();
 
+// Behind a load balancer or Vercel, req.ip (used for rate limiting) is only
+// the client's address when the proxy hops are trusted, e.g. TRUST_PROXY=1
+const trustProxy = process.env.TRUST_PROXY;
+if (trustProxy) {
+    const hops = Number(trustProxy);
+    app.set("trust proxy", trustProxy === "true" ? true : Number.isInteger(hops) ? hops : trustProxy);
+}
+
+// Sheds load before the body is even parsed
+app.use("/api", admissionGate());
+
 declare module 'http' {
     interface IncomingMessage {
         rawBody: unknown
@@ -28,6 +41,12 @@ app.use(express.json({
 app.use(express.urlencoded({ extended: false }));
 app.use(cookieParser());
 
+// Registered before the logger so the logger still sees every JSON body
+const compressionThreshold = parseInt(process.env.API_COMPRESSION_THRESHOLD || "1024", 10);
+if (compressionThreshold > 0) {
+    app.use("/api", compressJsonResponses(compressionThreshold));
+}
+
 app.use((req, res, next) => {
     const start = Date.now();
     const path = req.path;
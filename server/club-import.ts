@@ -0,0 +1,245 @@
+import type { Readable } from "stream";
+import { StringDecoder } from "string_decoder";
+import { loadExcelJS } from "./lazy";
+
+// Parsing and row validation for bulk club onboarding
+// (POST /api/institution/clubs/import). The route does the set-based
+// database checks and the insert; this module only turns an uploaded CSV
+// or XLSX file into typed rows and reports per-row problems.
+
+export const CLUB_IMPORT_MAX_ROWS = 2000;
+export const CLUB_IMPORT_MAX_BYTES = 5 * 1024 * 1024;
+
+export type ClubImportRow = {
+  row: number; // 1-based record number in the file, header included
+  clubName: string;
+  department: string | null;
+  description: string | null;
+  logo: string | null;
+  presidentName: string | null;
+  presidentEmail: string | null;
+  presidentPhone: string | null;
+  enrollmentNumber: string | null;
+  presidentPassword: string | null;
+};
+
+type ImportField = Exclude<keyof ClubImportRow, "row">;
+
+// Header cells are matched after lowercasing and dropping spaces, _ and -
+const COLUMN_ALIASES: Record<string, ImportField> = {
+  clubname: "clubName",
+  club: "clubName",
+  name: "clubName",
+  department: "department",
+  description: "description",
+  logo: "logo",
+  logourl: "logo",
+  presidentname: "presidentName",
+  presidentemail: "presidentEmail",
+  presidentphone: "presidentPhone",
+  enrollmentnumber: "enrollmentNumber",
+  presidentenrollmentnumber: "enrollmentNumber",
+  presidentpassword: "presidentPassword",
+};
+
+export class ClubImportError extends Error {}
+
+const EMAIL_PATTERN = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+
+// Streaming RFC 4180 parser: quoted fields, doubled quotes, CRLF and
+// newlines inside quotes. Yields one array of cells per record.
+export async function* parseCsv(chunks: AsyncIterable<Buffer | string>): AsyncGenerator<string[]> {
+  let field = "";
+  let record: string[] = [];
+  let inQuotes = false;
+  let pendingQuote = false; // saw a quote inside a quoted field, next char decides
+  let skipLineFeed = false;
+  let first = true;
+  // Keeps multi-byte characters intact when they straddle two chunks
+  const decoder = new StringDecoder("utf8");
+
+  for await (const chunk of chunks) {
+    let text = typeof chunk === "string" ? chunk : decoder.write(chunk);
+    if (first) {
+      text = text.replace(/^\uFEFF/, "");
+      first = false;
+    }
+
+    for (let i = 0; i < text.length; i++) {
+      const char = text[i];
+      if (skipLineFeed) {
+        skipLineFeed = false;
+        if (char === "\n") continue;
+      }
+
+      if (inQuotes) {
+        if (pendingQuote) {
+          pendingQuote = false;
+          if (char === '"') {
+            field += '"';
+            continue;
+          }
+          inQuotes = false;
+        } else if (char === '"') {
+          pendingQuote = true;
+          continue;
+        } else {
+          field += char;
+          continue;
+        }
+      }
+
+      if (char === '"' && field === "") {
+        inQuotes = true;
+      } else if (char === ",") {
+        record.push(field);
+        field = "";
+      } else if (char === "\n" || char === "\r") {
+        record.push(field);
+        yield record;
+        record = [];
+        field = "";
+        skipLineFeed = char === "\r";
+      } else {
+        field += char;
+      }
+    }
+  }
+
+  if (inQuotes && !pendingQuote) {
+    throw new ClubImportError("CSV ends inside a quoted field");
+  }
+  if (field !== "" || record.length) {
+    record.push(field);
+    yield record;
+  }
+}
+
+// Passes the upload through while enforcing the size limit
+async function* limitBytes(stream: Readable, maxBytes: number): AsyncGenerator<Buffer> {
+  let total = 0;
+  for await (const chunk of stream) {
+    total += chunk.length;
+    if (total > maxBytes) {
+      stream.destroy();
+      throw new ClubImportError(`File is larger than ${Math.round(maxBytes / 1024 / 1024)}MB`);
+    }
+    yield chunk;
+  }
+}
+
+async function* xlsxRecords(stream: Readable): AsyncGenerator<string[]> {
+  // XLSX is a zip with its directory at the end, so it has to be buffered
+  const chunks: Buffer[] = [];
+  for await (const chunk of limitBytes(stream, CLUB_IMPORT_MAX_BYTES)) chunks.push(chunk);
+
+  const ExcelJS = await loadExcelJS();
+  const workbook = new ExcelJS.Workbook();
+  try {
+    await workbook.xlsx.load(Buffer.concat(chunks) as any);
+  } catch {
+    throw new ClubImportError("Could not read the XLSX file");
+  }
+  const sheet = workbook.worksheets[0];
+  if (!sheet) return;
+
+  for (let r = 1; r <= sheet.rowCount; r++) {
+    const row = sheet.getRow(r);
+    const cells: string[] = [];
+    for (let c = 1; c <= row.cellCount; c++) {
+      cells.push(row.getCell(c).text ?? "");
+    }
+    yield cells;
+  }
+}
+
+export function isXlsxUpload(contentType: string | undefined) {
+  return !!contentType && contentType.includes("spreadsheetml");
+}
+
+export async function readClubImportRows(stream: Readable, contentType: string | undefined): Promise<ClubImportRow[]> {
+  const records = isXlsxUpload(contentType)
+    ? xlsxRecords(stream)
+    : parseCsv(limitBytes(stream, CLUB_IMPORT_MAX_BYTES));
+
+  let columns: Array<ImportField | null> | null = null;
+  const rows: ClubImportRow[] = [];
+  let line = 0;
+
+  for await (const record of records) {
+    line += 1;
+    if (record.every((cell) => cell.trim() === "")) continue;
+
+    if (!columns) {
+      columns = record.map((cell) => COLUMN_ALIASES[cell.trim().toLowerCase().replace(/[\s_-]/g, "")] ?? null);
+      if (!columns.includes("clubName")) {
+        throw new ClubImportError("Header row must include a clubName column");
+      }
+      continue;
+    }
+
+    if (rows.length >= CLUB_IMPORT_MAX_ROWS) {
+      throw new ClubImportError(`Imports are limited to ${CLUB_IMPORT_MAX_ROWS} clubs per file`);
+    }
+
+    const row: ClubImportRow = {
+      row: line,
+      clubName: "",
+      department: null,
+      description: null,
+      logo: null,
+      presidentName: null,
+      presidentEmail: null,
+      presidentPhone: null,
+      enrollmentNumber: null,
+      presidentPassword: null,
+    };
+    columns.forEach((field, index) => {
+      const value = (record[index] ?? "").trim();
+      if (!field) return;
+      if (field === "clubName") row.clubName = value;
+      else row[field] = value || null;
+    });
+    if (row.presidentEmail) row.presidentEmail = row.presidentEmail.toLowerCase();
+    rows.push(row);
+  }
+
+  if (!columns) {
+    throw new ClubImportError("File is empty");
+  }
+  return rows;
+}
+
+// Checks that need no database access: required fields, email format and
+// duplicates within the file. Returns errors keyed by row number.
+export function validateClubImportRows(rows: ClubImportRow[]) {
+  const errors = new Map<number, string[]>();
+  const addError = (row: number, message: string) => {
+    if (!errors.has(row)) errors.set(row, []);
+    errors.get(row)!.push(message);
+  };
+
+  const firstRowByEmail = new Map<string, number>();
+  for (const row of rows) {
+    if (!row.clubName) addError(row.row, "Club name is required");
+
+    if (row.presidentEmail) {
+      if (!EMAIL_PATTERN.test(row.presidentEmail)) {
+        addError(row.row, "President email is not valid");
+      }
+      if (!row.presidentName) {
+        addError(row.row, "President name is required when a president email is given");
+      }
+      const seenAt = firstRowByEmail.get(row.presidentEmail);
+      if (seenAt !== undefined) {
+        addError(row.row, `President email is also used on row ${seenAt}`);
+      } else {
+        firstRowByEmail.set(row.presidentEmail, row.row);
+      }
+    } else if (row.presidentName) {
+      addError(row.row, "President email is required when a president name is given");
+    }
+  }
+
+  return errors;
+}
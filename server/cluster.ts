@@ -0,0 +1,122 @@
+import cluster, { type Worker } from "cluster";
+import os from "os";
+import type { Server } from "http";
+import { log } from "./app";
+import { relayInvalidations } from "./invalidation";
+
+// CLUSTER_WORKERS: unset, 0 or 1 keeps the single-process server; "auto"
+// forks one worker per available core; any other number forks that many.
+export function getClusterWorkerCount() {
+  // Workers can't share an in-memory store, so it always runs one process
+  if (process.env.STORAGE_BACKEND === "memory") return 0;
+  const setting = (process.env.CLUSTER_WORKERS || "").trim().toLowerCase();
+  if (setting === "auto") {
+    return typeof os.availableParallelism === "function" ? os.availableParallelism() : os.cpus().length;
+  }
+  const parsed = parseInt(setting, 10);
+  return Number.isFinite(parsed) && parsed > 1 ? parsed : 0;
+}
+
+export function getShutdownTimeoutMs() {
+  const parsed = parseInt(process.env.SHUTDOWN_TIMEOUT_MS || "", 10);
+  return Number.isFinite(parsed) && parsed > 0 ? parsed : 10000;
+}
+
+const RESTART_BASE_DELAY_MS = 500;
+const RESTART_MAX_DELAY_MS = 30000;
+// A worker that dies sooner than this after forking counts as crash-looping
+const STABLE_UPTIME_MS = 10000;
+
+export function runClusterPrimary(workerCount: number) {
+  let shuttingDown = false;
+  let restartDelay = RESTART_BASE_DELAY_MS;
+  const startedAt = new Map<number, number>();
+
+  const fork = () => {
+    const worker = cluster.fork();
+    startedAt.set(worker.id, Date.now());
+    relayInvalidations(worker);
+    return worker;
+  };
+
+  log(`primary ${process.pid} forking ${workerCount} workers`, "cluster");
+  for (let i = 0; i < workerCount; i++) fork();
+
+  cluster.on("exit", (worker: Worker, code, signal) => {
+    const uptime = Date.now() - (startedAt.get(worker.id) ?? 0);
+    startedAt.delete(worker.id);
+    if (shuttingDown) return;
+
+    // Back off while workers keep dying during startup; reset once one stays up
+    restartDelay = uptime < STABLE_UPTIME_MS
+      ? Math.min(restartDelay * 2, RESTART_MAX_DELAY_MS)
+      : RESTART_BASE_DELAY_MS;
+    log(
+      `worker ${worker.process.pid} exited (${signal || code}), restarting in ${restartDelay}ms`,
+      "cluster",
+    );
+    setTimeout(() => {
+      if (!shuttingDown) fork();
+    }, restartDelay);
+  });
+
+  const shutdown = (signal: NodeJS.Signals) => {
+    if (shuttingDown) return;
+    shuttingDown = true;
+    log(`primary received ${signal}, draining workers`, "cluster");
+
+    const workers = Object.values(cluster.workers || {}).filter((worker): worker is Worker => !!worker);
+    workers.forEach((worker) => worker.process.kill("SIGTERM"));
+
+    // Workers drain on their own; only force-kill the ones that overrun
+    const forceTimer = setTimeout(() => {
+      Object.values(cluster.workers || {}).forEach((worker) => worker?.process.kill("SIGKILL"));
+      process.exit(1);
+    }, getShutdownTimeoutMs() + 2000);
+    forceTimer.unref();
+
+    const waitForExit = () => {
+      if (Object.keys(cluster.workers || {}).length === 0) {
+        process.exit(0);
+      }
+    };
+    cluster.on("exit", waitForExit);
+    waitForExit();
+  };
+
+  process.on("SIGTERM", shutdown);
+  process.on("SIGINT", shutdown);
+}
+
+// Stops accepting connections, lets in-flight requests finish and then runs
+// the cleanup hooks. Used by workers and by the single-process server alike.
+export function installGracefulShutdown(server: Server, cleanup: () => Promise<void>) {
+  let closing = false;
+
+  const shutdown = (signal: NodeJS.Signals) => {
+    if (closing) return;
+    closing = true;
+    log(`received ${signal}, draining in-flight requests`, "server");
+
+    const timeout = setTimeout(() => {
+      console.error("Graceful shutdown timed out, closing remaining connections");
+      server.closeAllConnections();
+    }, getShutdownTimeoutMs());
+    timeout.unref();
+
+    server.close(async () => {
+      clearTimeout(timeout);
+      try {
+        await cleanup();
+      } catch (error) {
+        console.error("Shutdown cleanup error:", error);
+      }
+      process.exit(0);
+    });
+    // Keep-alive sockets with no request in flight would otherwise hold close() open
+    server.closeIdleConnections();
+  };
+
+  process.on("SIGTERM", shutdown);
+  process.on("SIGINT", shutdown);
+}
@@ -0,0 +1,78 @@
+import type { Request, Response, NextFunction } from "express";
+import zlib from "zlib";
+
+export type ContentEncoding = "br" | "gzip";
+
+// Picks brotli over gzip when the client accepts both; q=0 means refused
+export function negotiateEncoding(acceptEncoding: string | undefined): ContentEncoding | null {
+  if (!acceptEncoding) return null;
+  const accepted = new Set<string>();
+  for (const part of acceptEncoding.split(",")) {
+    const [name, ...params] = part.trim().toLowerCase().split(";");
+    const q = params.find((param) => param.trim().startsWith("q="));
+    if (q && parseFloat(q.trim().slice(2)) === 0) continue;
+    accepted.add(name.trim());
+  }
+  if (accepted.has("br")) return "br";
+  if (accepted.has("gzip") || accepted.has("*")) return "gzip";
+  return null;
+}
+
+function compress(body: Buffer, encoding: ContentEncoding): Promise<Buffer> {
+  return new Promise((resolve, reject) => {
+    const done = (error: Error | null, result: Buffer) => (error ? reject(error) : resolve(result));
+    if (encoding === "br") {
+      // Low quality keeps per-request CPU close to gzip while still beating it on size
+      zlib.brotliCompress(body, { params: { [zlib.constants.BROTLI_PARAM_QUALITY]: 4 } }, done);
+    } else {
+      zlib.gzip(body, { level: 6 }, done);
+    }
+  });
+}
+
+// Compresses res.json() bodies above `threshold` bytes. Small payloads go out
+// as-is since compressing them costs more than the bytes saved. Streaming
+// responses (SSE, file downloads) don't go through res.json and are untouched.
+// ETags and 304s work as with res.send; the ETag is that of the uncompressed
+// body, the same whichever encoding was negotiated.
+export function compressJsonResponses(threshold: number) {
+  return (req: Request, res: Response, next: NextFunction) => {
+    const originalJson = res.json;
+
+    res.json = function (body?: any) {
+      const encoding = negotiateEncoding(req.headers["accept-encoding"]);
+      const payload = Buffer.from(JSON.stringify(body) ?? "");
+      if (!encoding || payload.length < threshold || res.headersSent || res.getHeader("Content-Encoding")) {
+        return originalJson.call(this, body);
+      }
+
+      res.vary("Accept-Encoding");
+      // res.send would set the ETag and answer conditional requests with 304;
+      // do the same on the uncompressed payload before spending CPU on it
+      const generateETag = req.app.get("etag fn");
+      if (typeof generateETag === "function" && !res.getHeader("ETag")) {
+        res.setHeader("ETag", generateETag(payload, "utf8"));
+      }
+      if (req.fresh) {
+        res.status(304).end();
+        return res;
+      }
+
+      compress(payload, encoding)
+        .then((compressed) => {
+          if (res.headersSent) return;
+          res.setHeader("Content-Type", "application/json; charset=utf-8");
+          res.setHeader("Content-Encoding", encoding);
+          res.setHeader("Content-Length", compressed.length);
+          res.end(compressed);
+        })
+        .catch((error) => {
+          console.error("Response compression error:", error);
+          if (!res.headersSent) originalJson.call(res, body);
+        });
+      return res;
+    };
+
+    next();
+  };
+}
@@ -1,18 +1,78 @@
-import { Pool, neonConfig } from '@neondatabase/serverless';
-import { drizzle } from 'drizzle-orm/neon-serverless';
+import { Pool as NeonPool, neonConfig } from '@neondatabase/serverless';
+import { drizzle as drizzleNeon, type NeonDatabase } from 'drizzle-orm/neon-serverless';
+import { drizzle as drizzleNodePg } from 'drizzle-orm/node-postgres';
+import pg from 'pg';
 import * as schema from "@shared/schema";
+import { registerMetricsSource } from "./metrics";
 
 
-if (!process.env.DATABASE_URL) {
+// With STORAGE_BACKEND=memory nothing queries the database; the pool is still
+// built so imports resolve, but it never opens a connection.
+if (!process.env.DATABASE_URL && process.env.STORAGE_BACKEND !== "memory") {
   throw new Error(
     "DATABASE_URL must be set. Did you forget to provision a database?",
   );
 }
 
-console.log("Initializing database connection...");
+const readIntEnv = (name: string, fallback: number) => {
+  const parsed = parseInt(process.env[name] || "", 10);
+  return Number.isFinite(parsed) && parsed >= 0 ? parsed : fallback;
+};
 
-export const pool = new Pool({ connectionString: process.env.DATABASE_URL });
-export const db = drizzle({ client: pool, schema });
+// DB_DRIVER=pg talks to a plain Postgres over TCP (local benchmarking);
+// the default neon driver uses Neon's serverless protocol.
+export const dbConfig = {
+  driver: (process.env.DB_DRIVER || "neon").toLowerCase() === "pg" ? "pg" as const : "neon" as const,
+  max: readIntEnv("DB_POOL_MAX", 10),
+  idleTimeoutMillis: readIntEnv("DB_IDLE_TIMEOUT_MS", 10000),
+  connectionTimeoutMillis: readIntEnv("DB_CONNECTION_TIMEOUT_MS", 5000),
+  statementTimeoutMs: readIntEnv("DB_STATEMENT_TIMEOUT_MS", 30000),
+  preparedStatements: process.env.DB_PREPARED_STATEMENTS !== "off",
+};
+
+console.log(`Initializing database connection (driver=${dbConfig.driver}, pool max=${dbConfig.max})...`);
+
+const poolOptions = {
+  connectionString: process.env.DATABASE_URL,
+  max: dbConfig.max,
+  idleTimeoutMillis: dbConfig.idleTimeoutMillis,
+  connectionTimeoutMillis: dbConfig.connectionTimeoutMillis,
+  // 0 disables the server-side timeout, matching Postgres semantics
+  statement_timeout: dbConfig.statementTimeoutMs || undefined,
+  application_name: "club-central",
+};
+
+export const pool = dbConfig.driver === "pg" ? new pg.Pool(poolOptions) : new NeonPool(poolOptions);
+
+pool.on("error", (err: Error) => {
+  console.error("Database pool error:", err);
+});
+
+// Both drivers expose the same drizzle query API; the node-postgres instance
+// is typed as the neon one so callers don't need to care which is active.
+export const db: NeonDatabase<typeof schema> =
+  dbConfig.driver === "pg"
+    ? (drizzleNodePg({ client: pool as pg.Pool, schema }) as unknown as NeonDatabase<typeof schema>)
+    : drizzleNeon({ client: pool as NeonPool, schema });
+
+// Named prepared statements are parsed and planned once per connection.
+// An empty name falls back to an unnamed statement, which is what poolers
+// without prepared statement support (DB_PREPARED_STATEMENTS=off) need.
+export function statementName(name: string) {
+  return dbConfig.preparedStatements ? name : "";
+}
+
+export function getPoolStats() {
+  return {
+    driver: dbConfig.driver,
+    max: dbConfig.max,
+    total: pool.totalCount,
+    idle: pool.idleCount,
+    waiting: pool.waitingCount,
+  };
+}
+
+registerMetricsSource("dbPool", getPoolStats);
 
 try {
   console.log("Database initialized successfully");
@@ -0,0 +1,191 @@
+import type { Finance } from "@shared/schema";
+
+// How finance rows add up to the per-club books kept in finance_ledger,
+// finance_balances and finance_monthly_rollups. Amounts are handled in
+// integer cents so sums stay exact however many writes are folded in.
+
+export type FinanceCategoryTotals = Record<"Operations" | "PR" | "Logistics" | "Marketing", number>;
+export type FinanceCategory = keyof FinanceCategoryTotals;
+
+// First match wins. migrations/20251126_finance_ledger.sql repeats this list
+// for its backfill.
+const FINANCE_CATEGORY_KEYWORDS: Record<string, FinanceCategory> = {
+  marketing: "Marketing",
+  promo: "Marketing",
+  sponsor: "Marketing",
+  logistics: "Logistics",
+  venue: "Logistics",
+  travel: "Logistics",
+  operations: "Operations",
+  ops: "Operations",
+  print: "Operations",
+  design: "PR",
+  media: "PR",
+  pr: "PR",
+};
+
+export function categorizeFinanceEntry(entry: Pick<Finance, "transactionName">): FinanceCategory {
+  const name = (entry.transactionName || "").toLowerCase();
+  for (const keyword in FINANCE_CATEGORY_KEYWORDS) {
+    if (name.includes(keyword)) {
+      return FINANCE_CATEGORY_KEYWORDS[keyword];
+    }
+  }
+  return "Operations";
+}
+
+export const emptyCategoryTotals = (): FinanceCategoryTotals => ({ Operations: 0, PR: 0, Logistics: 0, Marketing: 0 });
+
+export const toCents = (amount: string | number | null | undefined) => Math.round(Number(amount || 0) * 100);
+export const fromCents = (cents: number) => cents / 100;
+// numeric(12,2) literal for SQL
+export const centsToDecimal = (cents: number) => (cents / 100).toFixed(2);
+
+// YYYY-MM an entry is reported under: the month it was created in, in UTC.
+// created_at holds UTC (drizzle writes toISOString()), so this matches
+// to_char(created_at, 'YYYY-MM') in SQL whatever the server's time zone.
+export function financeMonth(createdAt: Date | string): string {
+  const date = new Date(createdAt);
+  return `${date.getUTCFullYear()}-${String(date.getUTCMonth() + 1).padStart(2, "0")}`;
+}
+
+// What one row adds to its club's books. Spend counts every expense whatever
+// its status; the balance only moves once an entry is approved.
+export type FinanceContribution = {
+  month: string;
+  category: FinanceCategory;
+  spend: number;
+  balance: number;
+  pending: number;
+};
+
+export function financeContribution(entry: Finance): FinanceContribution {
+  const cents = toCents(entry.amount);
+  const approved = entry.status === "Approved";
+  return {
+    month: financeMonth(entry.createdAt),
+    category: categorizeFinanceEntry(entry),
+    spend: entry.type === "expense" ? cents : 0,
+    balance: approved ? (entry.type === "income" ? cents : entry.type === "expense" ? -cents : 0) : 0,
+    pending: entry.status === "Pending" ? 1 : 0,
+  };
+}
+
+// One ledger row: a change in spend and balance under one month and category
+export type LedgerEffect = { month: string; category: FinanceCategory; spend: number; balance: number };
+
+const effectKey = (effect: Pick<LedgerEffect, "month" | "category">) => `${effect.month}|${effect.category}`;
+
+// The difference a write made, from the row before it (none for a create)
+// to the row after it (none for a delete). A rename that moves an entry to
+// another category yields two effects; a receipt change yields none.
+export function ledgerEffects(before: Finance | undefined, after: Finance | undefined) {
+  const effects = new Map<string, LedgerEffect>();
+  const add = (contribution: FinanceContribution, sign: 1 | -1) => {
+    const key = effectKey(contribution);
+    const effect = effects.get(key) ?? { month: contribution.month, category: contribution.category, spend: 0, balance: 0 };
+    effect.spend += sign * contribution.spend;
+    effect.balance += sign * contribution.balance;
+    effects.set(key, effect);
+  };
+  const old = before ? financeContribution(before) : undefined;
+  const updated = after ? financeContribution(after) : undefined;
+  if (old) add(old, -1);
+  if (updated) add(updated, 1);
+
+  return {
+    effects: Array.from(effects.values()).filter((effect) => effect.spend !== 0 || effect.balance !== 0),
+    pending: (updated?.pending ?? 0) - (old?.pending ?? 0),
+  };
+}
+
+// Books of one club recomputed from its finance rows, the reference every
+// stored total is reconciled against
+export function summarizeFinance(entries: Finance[]) {
+  const totals = { balance: 0, spend: 0, pending: 0 };
+  const months = new Map<string, LedgerEffect>();
+  for (const entry of entries) {
+    const contribution = financeContribution(entry);
+    totals.balance += contribution.balance;
+    totals.spend += contribution.spend;
+    totals.pending += contribution.pending;
+    const key = effectKey(contribution);
+    const month = months.get(key) ?? { month: contribution.month, category: contribution.category, spend: 0, balance: 0 };
+    month.spend += contribution.spend;
+    month.balance += contribution.balance;
+    months.set(key, month);
+  }
+  return { totals, months };
+}
+
+// A stored total that disagrees with the finance rows. Money is in currency
+// units, pending in entries.
+export type FinanceDiscrepancy = {
+  source: "balances" | "rollups" | "ledger";
+  month?: string;
+  category?: string;
+  field: "balance" | "spend" | "pending" | "balanceAfter";
+  expected: number;
+  actual: number;
+};
+
+// What is stored for one club, in cents: its finance_balances row, its
+// rollups, its ledger summed per month and category, and the running
+// balance on its last ledger row
+export type StoredFinanceBooks = {
+  totals: { balance: number; spend: number; pending: number };
+  rollups: LedgerEffect[];
+  ledger: LedgerEffect[];
+  lastBalance: number;
+};
+
+function perMonthDifferences(expected: Map<string, LedgerEffect>, stored: LedgerEffect[]) {
+  const actual = new Map(stored.map((effect) => [effectKey(effect), effect]));
+  const keys = new Set([...Array.from(expected.keys()), ...Array.from(actual.keys())]);
+  return Array.from(keys, (key) => {
+    const [month, category] = key.split("|");
+    const zero = { month, category: category as FinanceCategory, spend: 0, balance: 0 };
+    return { expected: expected.get(key) ?? zero, actual: actual.get(key) ?? zero };
+  });
+}
+
+export function findDiscrepancies(expected: ReturnType<typeof summarizeFinance>, stored: StoredFinanceBooks) {
+  const found: FinanceDiscrepancy[] = [];
+  const compare = (
+    source: FinanceDiscrepancy["source"],
+    field: FinanceDiscrepancy["field"],
+    expectedValue: number,
+    actualValue: number,
+    key: Pick<FinanceDiscrepancy, "month" | "category"> = {},
+  ) => {
+    if (expectedValue === actualValue) return;
+    const scale = field === "pending" ? (value: number) => value : fromCents;
+    found.push({ source, ...key, field, expected: scale(expectedValue), actual: scale(actualValue) });
+  };
+
+  compare("balances", "balance", expected.totals.balance, stored.totals.balance);
+  compare("balances", "spend", expected.totals.spend, stored.totals.spend);
+  compare("balances", "pending", expected.totals.pending, stored.totals.pending);
+  compare("ledger", "balanceAfter", expected.totals.balance, stored.lastBalance);
+  for (const [source, rows] of [["rollups", stored.rollups], ["ledger", stored.ledger]] as const) {
+    for (const { expected: want, actual } of perMonthDifferences(expected.months, rows)) {
+      const key = { month: want.month, category: want.category };
+      compare(source, "spend", want.spend, actual.spend, key);
+      compare(source, "balance", want.balance, actual.balance, key);
+    }
+  }
+  return found;
+}
+
+// Ledger rows that bring the ledger's per-month sums in line with the
+// finance rows; appended with action "adjusted" by a repair
+export function ledgerAdjustments(expected: ReturnType<typeof summarizeFinance>, ledger: LedgerEffect[]): LedgerEffect[] {
+  return perMonthDifferences(expected.months, ledger)
+    .map(({ expected: want, actual }) => ({
+      month: want.month,
+      category: want.category,
+      spend: want.spend - actual.spend,
+      balance: want.balance - actual.balance,
+    }))
+    .filter((effect) => effect.spend !== 0 || effect.balance !== 0);
+}
@@ -1,10 +1,15 @@
 import "dotenv/config";
+import cluster from "cluster";
 import { registerRoutes } from "./routes";
 import { setupVite, serveStatic, log } from "./vite";
 import { app } from "./app";
+import { pool } from "./db";
+import { startSocialDispatcher, stopSocialDispatcher } from "./social-dispatcher";
+import { startInvalidationListener } from "./invalidation";
+import { getClusterWorkerCount, installGracefulShutdown, runClusterPrimary } from "./cluster";
 import { Request, Response, NextFunction } from "express";
 
-(async () => {
+async function startServer() {
   const server = await registerRoutes(app);
 
   app.use((err: any, _req: Request, res: Response, _next: NextFunction) => {
@@ -29,7 +34,27 @@ import { Request, Response, NextFunction } from "express";
   // this serves both the API and the client.
   // It is the only port that is not firewalled.
   const port = parseInt(process.env.PORT || '5000', 10);
+  // Cluster workers share this port; the primary hands out connections
   server.listen(port, "0.0.0.0", () => {
-    log(`serving on port ${port}`);
+    log(cluster.isWorker ? `worker ${process.pid} serving on port ${port}` : `serving on port ${port}`);
   });
-})();
+
+  startInvalidationListener();
+  installGracefulShutdown(server, async () => {
+    await stopSocialDispatcher();
+    await pool.end();
+  });
+
+  // Publishes scheduled social posts once they are due. Safe to run on every
+  // instance because posts are claimed with FOR UPDATE SKIP LOCKED.
+  if (process.env.SOCIAL_DISPATCHER !== "off") {
+    startSocialDispatcher();
+  }
+}
+
+const workerCount = getClusterWorkerCount();
+if (workerCount && cluster.isPrimary) {
+  runClusterPrimary(workerCount);
+} else {
+  startServer();
+}
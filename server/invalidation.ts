@@ -0,0 +1,105 @@
+import cluster, { type Worker } from "cluster";
+import { randomUUID } from "crypto";
+import { pool } from "./db";
+import { log } from "./app";
+
+// Cache invalidation bus. In-process caches subscribe to a scope and drop
+// the given key when any process publishes it. Messages travel over cluster
+// IPC between workers on one box, or over Postgres LISTEN/NOTIFY when
+// CACHE_INVALIDATION=postgres so that separate hosts see them too.
+
+type InvalidationHandler = (key: string) => void;
+type InvalidationMessage = { type: typeof IPC_TYPE; scope: string; key: string; origin: string };
+
+const IPC_TYPE = "cache:invalidate";
+const NOTIFY_CHANNEL = "club_central_invalidate";
+const instanceId = randomUUID();
+const handlers = new Map<string, Set<InvalidationHandler>>();
+
+const usePostgres = () => process.env.CACHE_INVALIDATION === "postgres";
+let listening = false;
+
+export function onInvalidate(scope: string, handler: InvalidationHandler) {
+  if (!handlers.has(scope)) handlers.set(scope, new Set());
+  handlers.get(scope)!.add(handler);
+}
+
+function deliver(scope: string, key: string) {
+  handlers.get(scope)?.forEach((handler) => {
+    try {
+      handler(key);
+    } catch (error) {
+      console.error("Cache invalidation handler error:", { scope, key, error });
+    }
+  });
+}
+
+export function publishInvalidation(scope: string, key: string) {
+  deliver(scope, key);
+
+  const message: InvalidationMessage = { type: IPC_TYPE, scope, key, origin: instanceId };
+  if (usePostgres()) {
+    pool
+      .query("SELECT pg_notify($1, $2)", [NOTIFY_CHANNEL, JSON.stringify(message)])
+      .catch((error: any) => console.error("Cache invalidation notify error:", error));
+  } else if (cluster.isWorker && process.send) {
+    process.send(message);
+  }
+}
+
+const isInvalidationMessage = (message: any): message is InvalidationMessage =>
+  message && message.type === IPC_TYPE && typeof message.scope === "string" && typeof message.key === "string";
+
+// Primary side: fan a worker's message out to every other worker
+export function relayInvalidations(worker: Worker) {
+  worker.on("message", (message) => {
+    if (!isInvalidationMessage(message)) return;
+    for (const other of Object.values(cluster.workers || {})) {
+      if (other && other.id !== worker.id && other.isConnected()) {
+        other.send(message);
+      }
+    }
+  });
+}
+
+async function listenForNotifications() {
+  const client = await pool.connect();
+  client.on("notification", (notification: { channel: string; payload?: string }) => {
+    if (notification.channel !== NOTIFY_CHANNEL || !notification.payload) return;
+    try {
+      const message = JSON.parse(notification.payload);
+      if (isInvalidationMessage(message) && message.origin !== instanceId) {
+        deliver(message.scope, message.key);
+      }
+    } catch (error) {
+      console.error("Cache invalidation payload error:", error);
+    }
+  });
+  client.on("error", (error: Error) => {
+    console.error("Cache invalidation listener error:", error);
+    client.release(error);
+    setTimeout(() => listenForNotifications().catch(retryListen), 5000).unref();
+  });
+  await client.query(`LISTEN ${NOTIFY_CHANNEL}`);
+  log(`listening for cache invalidations on ${NOTIFY_CHANNEL}`, "cache");
+}
+
+function retryListen(error: unknown) {
+  console.error("Cache invalidation listen failed, retrying:", error);
+  setTimeout(() => listenForNotifications().catch(retryListen), 5000).unref();
+}
+
+// Worker / single-process side. The Postgres listener holds one pooled
+// connection for the lifetime of the process.
+export function startInvalidationListener() {
+  if (listening) return;
+  listening = true;
+
+  if (usePostgres()) {
+    listenForNotifications().catch(retryListen);
+  } else if (cluster.isWorker) {
+    process.on("message", (message) => {
+      if (isInvalidationMessage(message)) deliver(message.scope, message.key);
+    });
+  }
+}
@@ -0,0 +1,46 @@
+import type { NextFunction, Request, RequestHandler, Response } from "express";
+import type ArchiverType from "archiver";
+import type BcryptType from "bcryptjs";
+import type ExcelJSType from "exceljs";
+import type PDFDocumentType from "pdfkit";
+
+// A serverless cold start pays for every module evaluated before the first
+// response. Packages only a few routes need, and route groups that are
+// rarely hit, load on first use instead. The promise is cached; a failed
+// load is forgotten so the next request retries it.
+export function lazy<T>(load: () => Promise<T>): () => Promise<T> {
+  let pending: Promise<T> | undefined;
+  return () => {
+    if (!pending) {
+      pending = load().catch((error) => {
+        pending = undefined;
+        throw error;
+      });
+    }
+    return pending;
+  };
+}
+
+// CommonJS packages come back as { default: module.exports } under native
+// ESM (the production bundle) and as the exports object itself under some
+// loaders, so take whichever is there
+function lazyDefault<T>(load: () => Promise<any>): () => Promise<T> {
+  return lazy(async () => {
+    const mod = await load();
+    return (mod.default ?? mod) as T;
+  });
+}
+
+export const loadBcrypt = lazyDefault<typeof BcryptType>(() => import("bcryptjs"));
+export const loadExcelJS = lazyDefault<typeof ExcelJSType>(() => import("exceljs"));
+export const loadPdfKit = lazyDefault<typeof PDFDocumentType>(() => import("pdfkit"));
+export const loadArchiver = lazyDefault<typeof ArchiverType>(() => import("archiver"));
+
+// Mounts a router that is imported on the first request under its path.
+// Until then neither the module nor anything it imports is evaluated.
+export function lazyRouter(load: () => Promise<RequestHandler>): RequestHandler {
+  const getRouter = lazy(load);
+  return (req: Request, res: Response, next: NextFunction) => {
+    getRouter().then((router) => router(req, res, next), next);
+  };
+}
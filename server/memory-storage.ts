@@ -0,0 +1,898 @@
+import { randomUUID } from "crypto";
+import { getTableColumns, is, SQL } from "drizzle-orm";
+import type { PgTable } from "drizzle-orm/pg-core";
+import {
+  institutions,
+  institutionUsers,
+  institutionAnalytics,
+  clubs,
+  users,
+  pendingMembers,
+  roles,
+  events,
+  teams,
+  teamMembers,
+  tasks,
+  finance,
+  socialPosts,
+  elections,
+  electionCandidates,
+  electionVotes,
+  type Institution,
+  type InstitutionUser,
+  type InstitutionAnalytics,
+  type Club,
+  type User,
+  type PendingMember,
+  type Role,
+  type Event,
+  type Team,
+  type TeamMember,
+  type Task,
+  type Finance,
+  type SocialPost,
+  type Election,
+  type ElectionCandidate,
+  type ElectionVote,
+  type InsertInstitution,
+  type InsertInstitutionUser,
+  type InsertInstitutionAnalytics,
+  type InsertClub,
+  type InsertUser,
+  type InsertPendingMember,
+  type InsertRole,
+  type InsertEvent,
+  type InsertTeam,
+  type InsertTeamMember,
+  type InsertTask,
+  type InsertFinance,
+  type InsertSocialPost,
+  type InsertElection,
+  type InsertElectionCandidate,
+  type InsertElectionVote,
+} from "@shared/schema";
+import type {
+  IStorage,
+  ClubWithPresident,
+  MemberSearchResult,
+  EventSearchResult,
+  TaskSearchResult,
+  ActivityHeatmapRange,
+  ActivityHeatmapBucket,
+  TenantScope,
+  ClubReference,
+  ConditionalUpdate,
+  UpdateCondition,
+  ClubFinanceTotals,
+  FinanceMonthlyTotals,
+} from "./storage";
+import { fromCents, summarizeFinance } from "./finance-ledger";
+
+// IStorage kept entirely in process memory, selected with
+// STORAGE_BACKEND=memory. It lets the server, the API contract suite and the
+// testsprite scripts run without a database: state starts empty on every
+// boot and is lost on exit. Rows get the same defaults and value types the
+// Postgres columns would give them (uuid ids, Date timestamps, decimal
+// strings), and lookups the routes make by id, club, email or code go
+// through hash indexes rather than scans.
+
+type Row = { id: string };
+
+class UniqueViolationError extends Error {
+  // Same SQLSTATE Postgres reports, so route error handling behaves alike
+  code = "23505";
+}
+
+// Column defaults and value coercion derived from the drizzle table
+// definition, so new columns need no changes here
+function columnRules(table: PgTable) {
+  const columns = Object.entries(getTableColumns(table));
+
+  const defaults = () => {
+    const row: Record<string, unknown> = {};
+    for (const [key, column] of columns) {
+      if (column.defaultFn) {
+        row[key] = column.defaultFn();
+      } else if (column.default !== undefined && !is(column.default, SQL)) {
+        row[key] = column.default;
+      } else if (column.default !== undefined || column.primary) {
+        // SQL defaults: gen_random_uuid(), now(), 0 and '{}'::jsonb
+        row[key] =
+          column.primary ? randomUUID()
+            : column.columnType === "PgTimestamp" ? new Date()
+            : column.columnType === "PgJsonb" ? {}
+            : column.columnType === "PgNumeric" ? "0"
+            : null;
+      } else {
+        row[key] = null;
+      }
+    }
+    return row;
+  };
+
+  const coerce = (values: Record<string, unknown>) => {
+    const row: Record<string, unknown> = {};
+    for (const [key, column] of columns) {
+      if (!(key in values) || values[key] === undefined) continue;
+      const value = values[key];
+      row[key] =
+        value === null ? null
+          : column.columnType === "PgTimestamp" ? (value instanceof Date ? value : new Date(value as string))
+          : column.columnType === "PgNumeric" ? String(value)
+          : value;
+    }
+    return row;
+  };
+
+  return { defaults, coerce };
+}
+
+// One table: rows by id plus hash indexes on the given fields. Rows are
+// copied on the way in and out, like rows read back from a database.
+class MemoryTable<T extends Row> {
+  private rows = new Map<string, T>();
+  private indexes = new Map<keyof T, Map<unknown, Set<string>>>();
+  private rules: ReturnType<typeof columnRules>;
+
+  constructor(
+    table: PgTable,
+    indexed: Array<keyof T> = [],
+    private unique: Array<keyof T> = [],
+  ) {
+    this.rules = columnRules(table);
+    for (const field of [...indexed, ...unique]) this.indexes.set(field, new Map());
+  }
+
+  get size() {
+    return this.rows.size;
+  }
+
+  get(id: string): T | undefined {
+    const row = this.rows.get(id);
+    return row ? { ...row } : undefined;
+  }
+
+  all(): T[] {
+    return Array.from(this.rows.values(), (row) => ({ ...row }));
+  }
+
+  where<K extends keyof T>(field: K, value: T[K]): T[] {
+    const index = this.indexes.get(field);
+    if (!index) return this.all().filter((row) => row[field] === value);
+    const ids = index.get(value);
+    return ids ? Array.from(ids, (id) => ({ ...this.rows.get(id)! })) : [];
+  }
+
+  first<K extends keyof T>(field: K, value: T[K]): T | undefined {
+    return this.where(field, value)[0];
+  }
+
+  whereIn<K extends keyof T>(field: K, values: Iterable<T[K]>): T[] {
+    return Array.from(new Set(values)).flatMap((value) => this.where(field, value));
+  }
+
+  // Throws before anything is written if `candidate` clashes on a unique field
+  assertUnique(candidate: Partial<T>, exceptId?: string) {
+    for (const field of this.unique) {
+      const value = candidate[field];
+      if (value === undefined || value === null) continue;
+      const ids = this.indexes.get(field)!.get(value);
+      if (ids && Array.from(ids).some((id) => id !== exceptId)) {
+        throw new UniqueViolationError(`duplicate key value violates unique constraint on ${String(field)}`);
+      }
+    }
+  }
+
+  insert(values: object): T {
+    const row = { ...this.rules.defaults(), ...this.rules.coerce(values as Record<string, unknown>) } as T;
+    this.assertUnique(row);
+    this.rows.set(row.id, row);
+    this.addToIndexes(row);
+    return { ...row };
+  }
+
+  update(id: string, patch: object): T | undefined {
+    const existing = this.rows.get(id);
+    if (!existing) return undefined;
+    const updated = { ...existing, ...this.rules.coerce(patch as Record<string, unknown>) } as T & { version?: number };
+    // Versioned tables (events, tasks, finance, social posts) count every write
+    if (typeof updated.version === "number") updated.version = (existing as T & { version: number }).version + 1;
+    this.assertUnique(updated, id);
+    this.removeFromIndexes(existing);
+    this.rows.set(id, updated);
+    this.addToIndexes(updated);
+    return { ...updated };
+  }
+
+  delete(id: string): T | undefined {
+    const existing = this.rows.get(id);
+    if (!existing) return undefined;
+    this.removeFromIndexes(existing);
+    this.rows.delete(id);
+    return existing;
+  }
+
+  deleteWhere<K extends keyof T>(field: K, value: T[K]): T[] {
+    return this.where(field, value).map((row) => this.delete(row.id)!);
+  }
+
+  private addToIndexes(row: T) {
+    this.indexes.forEach((index, field) => {
+      const value = row[field];
+      if (!index.has(value)) index.set(value, new Set());
+      index.get(value)!.add(row.id);
+    });
+  }
+
+  private removeFromIndexes(row: T) {
+    this.indexes.forEach((index, field) => {
+      const ids = index.get(row[field]);
+      ids?.delete(row.id);
+      if (ids && ids.size === 0) index.delete(row[field]);
+    });
+  }
+}
+
+const toTime = (value: Date | string | null | undefined) => (value ? new Date(value).getTime() : NaN);
+
+// UTC bucket start for the heatmap, matching date_trunc on UTC timestamps
+function bucketStart(time: number, granularity: ActivityHeatmapRange["granularity"]) {
+  const date = new Date(time);
+  const day = Date.UTC(date.getUTCFullYear(), date.getUTCMonth(), date.getUTCDate());
+  if (granularity === "month") return Date.UTC(date.getUTCFullYear(), date.getUTCMonth(), 1);
+  if (granularity === "week") return day - ((date.getUTCDay() + 6) % 7) * 86_400_000; // ISO weeks start on Monday
+  return day;
+}
+
+export class MemoryStorage implements IStorage {
+  private institutions = new MemoryTable<Institution>(institutions, [], ["code"]);
+  private institutionUsers = new MemoryTable<InstitutionUser>(institutionUsers, ["institutionId"], ["email"]);
+  private institutionAnalytics = new MemoryTable<InstitutionAnalytics>(institutionAnalytics, ["institutionId"]);
+  private clubs = new MemoryTable<Club>(clubs, ["institutionId"], ["clubCode"]);
+  private users = new MemoryTable<User>(users, ["clubId"], ["email"]);
+  private pendingMembers = new MemoryTable<PendingMember>(pendingMembers, ["clubId", "email"]);
+  private roles = new MemoryTable<Role>(roles, ["clubId"]);
+  private events = new MemoryTable<Event>(events, ["clubId"]);
+  private teams = new MemoryTable<Team>(teams, ["clubId"]);
+  private teamMembers = new MemoryTable<TeamMember>(teamMembers, ["teamId", "userId"]);
+  private tasks = new MemoryTable<Task>(tasks, ["clubId", "eventId", "teamId"]);
+  private finance = new MemoryTable<Finance>(finance, ["clubId"]);
+  private socialPosts = new MemoryTable<SocialPost>(socialPosts, ["clubId", "status"]);
+  private elections = new MemoryTable<Election>(elections, ["institutionId", "clubId"], ["accessCode"]);
+  private electionCandidates = new MemoryTable<ElectionCandidate>(electionCandidates, ["electionId"]);
+  private electionVotes = new MemoryTable<ElectionVote>(electionVotes, ["electionId"]);
+
+  private clubsIn(scope: TenantScope) {
+    const clubs = this.clubs.where("institutionId", scope.institutionId);
+    if (scope.department == null) return clubs;
+    const department = scope.department.toLowerCase();
+    return clubs.filter((club) => (club.department || "").toLowerCase() === department);
+  }
+
+  private clubIdsOf(scope: TenantScope) {
+    return this.clubsIn(scope).map((club) => club.id);
+  }
+
+  // Same checks, in the same order, as the database's conditional UPDATE
+  private updateInClub<T extends Row & { clubId: string; version: number }>(
+    table: MemoryTable<T>,
+    id: string,
+    condition: UpdateCondition,
+    data: object,
+    references: Partial<Record<ClubReference, string | null>> = {},
+  ): ConditionalUpdate<T> {
+    const current = table.get(id);
+    if (!current || current.clubId !== condition.clubId) return { status: "not_found" };
+    if (condition.version !== undefined && current.version !== condition.version) {
+      return { status: "version_conflict", current };
+    }
+    const referenced = { eventId: this.events, assignedToId: this.users, teamId: this.teams };
+    for (const field of Object.keys(referenced) as ClubReference[]) {
+      const referenceId = references[field];
+      if (referenceId && referenced[field].get(referenceId)?.clubId !== condition.clubId) {
+        return { status: "invalid_reference", field };
+      }
+    }
+    return { status: "updated", row: table.update(id, data)! };
+  }
+
+  // Institution operations
+  async getInstitution(id: string) {
+    return this.institutions.get(id);
+  }
+
+  async getInstitutionByCode(code: string) {
+    return this.institutions.first("code", code);
+  }
+
+  async createInstitution(data: InsertInstitution) {
+    return this.institutions.insert(data);
+  }
+
+  async updateInstitution(id: string, data: Partial<InsertInstitution>) {
+    return this.institutions.update(id, data);
+  }
+
+  // Institution user operations
+  async getInstitutionUser(id: string) {
+    return this.institutionUsers.get(id);
+  }
+
+  async getInstitutionUserByEmail(email: string) {
+    return this.institutionUsers.first("email", email);
+  }
+
+  async getInstitutionUsers(institutionId: string) {
+    return this.institutionUsers.where("institutionId", institutionId);
+  }
+
+  async createInstitutionUser(user: InsertInstitutionUser) {
+    return this.institutionUsers.insert(user);
+  }
+
+  async updateInstitutionUser(id: string, data: Partial<InsertInstitutionUser>) {
+    return this.institutionUsers.update(id, { ...data, updatedAt: new Date() });
+  }
+
+  // Institution analytics
+  async createInstitutionAnalytics(data: InsertInstitutionAnalytics) {
+    return this.institutionAnalytics.insert(data);
+  }
+
+  async getInstitutionAnalytics(institutionId: string, limit = 6) {
+    return this.institutionAnalytics
+      .where("institutionId", institutionId)
+      .sort((a, b) => toTime(b.snapshotDate) - toTime(a.snapshotDate))
+      .slice(0, limit);
+  }
+
+  // Club operations
+  async getClub(id: string) {
+    return this.clubs.get(id);
+  }
+
+  async getClubByCode(code: string) {
+    return this.clubs.first("clubCode", code);
+  }
+
+  async createClub(club: InsertClub) {
+    return this.clubs.insert(club);
+  }
+
+  async updateClub(id: string, data: Partial<InsertClub>) {
+    return this.clubs.update(id, data);
+  }
+
+  // Mirrors the ON DELETE CASCADE foreign keys on club_id
+  async deleteClub(id: string) {
+    for (const event of this.events.where("clubId", id)) await this.deleteEvent(event.id);
+    for (const team of this.teams.where("clubId", id)) await this.deleteTeam(team.id);
+    for (const election of this.elections.where("clubId", id)) await this.deleteElection(election.id);
+    for (const user of this.users.where("clubId", id)) this.teamMembers.deleteWhere("userId", user.id);
+    this.users.deleteWhere("clubId", id);
+    this.pendingMembers.deleteWhere("clubId", id);
+    this.roles.deleteWhere("clubId", id);
+    this.tasks.deleteWhere("clubId", id);
+    this.finance.deleteWhere("clubId", id);
+    this.socialPosts.deleteWhere("clubId", id);
+    this.clubs.delete(id);
+  }
+
+  async getClubsByInstitution(scope: TenantScope) {
+    return this.clubsIn(scope);
+  }
+
+  async findExistingClubCodes(codes: string[]) {
+    return this.clubs.whereIn("clubCode", codes).map((club) => club.clubCode);
+  }
+
+  // All-or-nothing like the database transaction: every constraint is
+  // checked before the first row is written
+  async createClubsWithPresidents(entries: ClubWithPresident[]) {
+    const codes = new Set<string>();
+    const emails = new Set<string>();
+    for (const entry of entries) {
+      this.clubs.assertUnique({ clubCode: entry.club.clubCode });
+      if (codes.has(entry.club.clubCode)) throw new UniqueViolationError("duplicate club code in import");
+      codes.add(entry.club.clubCode);
+      if (entry.president) {
+        this.users.assertUnique({ email: entry.president.email });
+        if (emails.has(entry.president.email)) throw new UniqueViolationError("duplicate president email in import");
+        emails.add(entry.president.email);
+      }
+    }
+
+    return entries.map((entry) => {
+      const club = this.clubs.insert(entry.club);
+      const president = entry.president ? this.users.insert({ ...entry.president, clubId: club.id }) : null;
+      return { club, president };
+    });
+  }
+
+  // User operations
+  async getUser(id: string) {
+    return this.users.get(id);
+  }
+
+  async getUserByEmail(email: string) {
+    return this.users.first("email", email);
+  }
+
+  async findExistingUserEmails(emails: string[]) {
+    const wanted = new Set(emails.map((email) => email.toLowerCase()));
+    return this.users.all().map((user) => user.email.toLowerCase()).filter((email) => wanted.has(email));
+  }
+
+  async getUsersByClub(clubId: string) {
+    return this.users.where("clubId", clubId);
+  }
+
+  async getUsersByInstitution(scope: TenantScope) {
+    return this.users.whereIn("clubId", this.clubIdsOf(scope));
+  }
+
+  async createUser(user: InsertUser) {
+    return this.users.insert(user);
+  }
+
+  async updateUser(id: string, data: Partial<InsertUser>) {
+    return this.users.update(id, data);
+  }
+
+  // Pending member operations
+  async getPendingMembersByClub(clubId: string) {
+    return this.pendingMembers.where("clubId", clubId);
+  }
+
+  async getPendingMembersByInstitution(scope: TenantScope) {
+    return this.pendingMembers.whereIn("clubId", this.clubIdsOf(scope));
+  }
+
+  async createPendingMember(member: InsertPendingMember) {
+    return this.pendingMembers.insert(member);
+  }
+
+  async getPendingMember(id: string) {
+    return this.pendingMembers.get(id);
+  }
+
+  async deletePendingMember(id: string) {
+    this.pendingMembers.delete(id);
+  }
+
+  // Same outcome as the INSERT ... SELECT DISTINCT ON (email) in the
+  // database version: the earliest application per email wins, emails that
+  // already have an account stay pending
+  async approvePendingMembers(clubId: string, ids: string[], role: string, canLogin: boolean) {
+    const applications = ids
+      .map((id) => this.pendingMembers.get(id))
+      .filter((pending): pending is PendingMember => !!pending && pending.clubId === clubId)
+      .sort((a, b) => toTime(a.appliedAt) - toTime(b.appliedAt));
+
+    const approvedEmails = new Set<string>();
+    for (const pending of applications) {
+      if (approvedEmails.has(pending.email) || this.users.first("email", pending.email)) continue;
+      this.users.insert({
+        clubId: pending.clubId,
+        name: pending.name,
+        email: pending.email,
+        password: pending.password,
+        phone: pending.phone,
+        idNumber: pending.idNumber,
+        linkedin: pending.linkedin,
+        portfolio: pending.portfolio,
+        role,
+        roleId: null,
+        isPresident: false,
+        isApproved: true,
+        canLogin,
+      });
+      approvedEmails.add(pending.email);
+    }
+
+    const approvedIds = applications
+      .filter((pending) => approvedEmails.has(pending.email))
+      .map((pending) => this.pendingMembers.delete(pending.id)!.id);
+    return { approvedIds };
+  }
+
+  async rejectPendingMembers(clubId: string, ids: string[]) {
+    return ids
+      .map((id) => this.pendingMembers.get(id))
+      .filter((pending): pending is PendingMember => !!pending && pending.clubId === clubId)
+      .map((pending) => this.pendingMembers.delete(pending.id)!.id);
+  }
+
+  // Role operations
+  async getRolesByClub(clubId: string) {
+    return this.roles.where("clubId", clubId);
+  }
+
+  async getRole(id: string) {
+    return this.roles.get(id);
+  }
+
+  async createRole(role: InsertRole) {
+    return this.roles.insert(role);
+  }
+
+  async updateRole(id: string, data: Partial<InsertRole>) {
+    return this.roles.update(id, data);
+  }
+
+  async deleteRole(id: string) {
+    this.roles.delete(id);
+  }
+
+  // Event operations
+  async getEventsByClub(clubId: string) {
+    return this.events.where("clubId", clubId);
+  }
+
+  async countEventsByStatus(clubId: string, status: string) {
+    return this.events.where("clubId", clubId).filter((event) => event.status === status).length;
+  }
+
+  async countUpcomingEvents(clubId: string, current: Date) {
+    return this.events.where("clubId", clubId).filter((event) => toTime(event.date) > current.getTime()).length;
+  }
+
+  async getEvent(id: string) {
+    return this.events.get(id);
+  }
+
+  async createEvent(event: InsertEvent) {
+    return this.events.insert(event);
+  }
+
+  async updateEventInClub(id: string, condition: UpdateCondition, data: Partial<InsertEvent>) {
+    return this.updateInClub(this.events, id, condition, data, data);
+  }
+
+  async deleteEvent(id: string) {
+    this.tasks.deleteWhere("eventId", id);
+    this.events.delete(id);
+  }
+
+  async getEventsByInstitution(scope: TenantScope) {
+    return this.events.whereIn("clubId", this.clubIdsOf(scope));
+  }
+
+  // Team operations
+  async getTeamsByClub(clubId: string) {
+    return this.teams.where("clubId", clubId);
+  }
+
+  async getTeam(id: string) {
+    return this.teams.get(id);
+  }
+
+  async createTeam(team: InsertTeam) {
+    return this.teams.insert(team);
+  }
+
+  async updateTeam(id: string, data: Partial<InsertTeam>) {
+    return this.teams.update(id, data);
+  }
+
+  async deleteTeam(id: string) {
+    this.teamMembers.deleteWhere("teamId", id);
+    for (const task of this.tasks.where("teamId", id)) this.tasks.update(task.id, { teamId: null });
+    this.teams.delete(id);
+  }
+
+  async getTeamMembersWithUsers(teamId: string) {
+    return this.teamMembers.where("teamId", teamId).flatMap((membership) => {
+      const user = this.users.get(membership.userId);
+      return user ? [{ membership, user }] : [];
+    });
+  }
+
+  async getTeamMember(teamId: string, userId: string) {
+    return this.teamMembers.where("teamId", teamId).find((membership) => membership.userId === userId);
+  }
+
+  async addTeamMember(member: InsertTeamMember) {
+    if (await this.getTeamMember(member.teamId, member.userId)) {
+      throw new UniqueViolationError("duplicate key value violates unique constraint team_members_team_user_idx");
+    }
+    return this.teamMembers.insert(member);
+  }
+
+  async updateTeamMember(id: string, data: Partial<InsertTeamMember>) {
+    return this.teamMembers.update(id, data);
+  }
+
+  async removeTeamMember(teamId: string, userId: string) {
+    const membership = await this.getTeamMember(teamId, userId);
+    if (membership) this.teamMembers.delete(membership.id);
+  }
+
+  // Task operations
+  async getTasksByClub(clubId: string) {
+    return this.tasks.where("clubId", clubId);
+  }
+
+  async getTasksByEvent(eventId: string) {
+    return this.tasks.where("eventId", eventId);
+  }
+
+  async getTask(id: string) {
+    return this.tasks.get(id);
+  }
+
+  async createTask(task: InsertTask) {
+    return this.tasks.insert(task);
+  }
+
+  async updateTaskInClub(id: string, condition: UpdateCondition, data: Partial<InsertTask>) {
+    return this.updateInClub(this.tasks, id, condition, data, data);
+  }
+
+  async deleteTask(id: string) {
+    this.tasks.delete(id);
+  }
+
+  async getTasksByInstitution(scope: TenantScope) {
+    return this.tasks.whereIn("clubId", this.clubIdsOf(scope));
+  }
+
+  async countTasksByStatus(clubId: string, status: string) {
+    return this.tasks.where("clubId", clubId).filter((task) => task.status === status).length;
+  }
+
+  async countTasksAssignedToUser(clubId: string, userId: string) {
+    return this.tasks
+      .where("clubId", clubId)
+      .filter((task) => task.assignedToId === userId && task.status !== "Done").length;
+  }
+
+  // Finance operations
+  async getFinanceByClub(clubId: string) {
+    return this.finance.where("clubId", clubId);
+  }
+
+  async getFinanceByInstitution(scope: TenantScope) {
+    return this.finance.whereIn("clubId", this.clubIdsOf(scope));
+  }
+
+  async getFinanceEntry(id: string) {
+    return this.finance.get(id);
+  }
+
+  async createFinanceEntry(entry: InsertFinance) {
+    return this.finance.insert(entry);
+  }
+
+  async updateFinanceEntry(id: string, data: Partial<InsertFinance>) {
+    return this.finance.update(id, data);
+  }
+
+  async updateFinanceEntryInClub(id: string, condition: UpdateCondition, data: Partial<InsertFinance>) {
+    return this.updateInClub(this.finance, id, condition, data);
+  }
+
+  async deleteFinanceEntry(id: string) {
+    this.finance.delete(id);
+  }
+
+  async sumFinanceByStatus(clubId: string, type: "income" | "expense", status: string) {
+    return this.finance
+      .where("clubId", clubId)
+      .filter((entry) => entry.type === type && entry.status === status)
+      .reduce((sum, entry) => sum + parseFloat(entry.amount), 0);
+  }
+
+  async countFinanceByStatus(clubId: string, status: string) {
+    return this.finance.where("clubId", clubId).filter((entry) => entry.status === status).length;
+  }
+
+  async getRecentFinanceByInstitution(scope: TenantScope, limit: number) {
+    return this.finance
+      .whereIn("clubId", this.clubIdsOf(scope))
+      .sort((a, b) => toTime(b.createdAt) - toTime(a.createdAt))
+      .slice(0, limit);
+  }
+
+  // Finance books: like the heatmap, nothing is stored, so totals are
+  // summed from the rows with the same rules the database ledger applies
+  async getFinanceTotals(clubId: string): Promise<ClubFinanceTotals> {
+    const { totals } = summarizeFinance(this.finance.where("clubId", clubId));
+    return { clubId, balance: fromCents(totals.balance), spend: fromCents(totals.spend), pending: totals.pending };
+  }
+
+  async getFinanceTotalsByInstitution(scope: TenantScope) {
+    return Promise.all(this.clubIdsOf(scope).map((clubId) => this.getFinanceTotals(clubId)));
+  }
+
+  async getFinanceMonthlyByInstitution(scope: TenantScope): Promise<FinanceMonthlyTotals[]> {
+    const { months } = summarizeFinance(this.finance.whereIn("clubId", this.clubIdsOf(scope)));
+    return Array.from(months.values())
+      .sort((a, b) => a.month.localeCompare(b.month))
+      .map((effect) => ({ ...effect, spend: fromCents(effect.spend), balance: fromCents(effect.balance) }));
+  }
+
+  // Nothing stored, nothing to disagree
+  async reconcileFinanceLedger(_clubId: string, _repair = false) {
+    return [];
+  }
+
+  // Social post operations
+  async getSocialPostsByClub(clubId: string) {
+    return this.socialPosts.where("clubId", clubId);
+  }
+
+  async getSocialPostsByInstitution(scope: TenantScope) {
+    return this.socialPosts.whereIn("clubId", this.clubIdsOf(scope));
+  }
+
+  async getSocialPost(id: string) {
+    return this.socialPosts.get(id);
+  }
+
+  async createSocialPost(post: InsertSocialPost) {
+    return this.socialPosts.insert(post);
+  }
+
+  async updateSocialPostInClub(id: string, condition: UpdateCondition, data: Partial<InsertSocialPost>) {
+    return this.updateInClub(this.socialPosts, id, condition, data);
+  }
+
+  async deleteSocialPost(id: string) {
+    this.socialPosts.delete(id);
+  }
+
+  async countSocialPostsByStatus(clubId: string, status: string) {
+    return this.socialPosts.where("clubId", clubId).filter((post) => post.status === status).length;
+  }
+
+  // Single process, so claiming needs no locking
+  async claimDueSocialPosts(now: Date, limit: number, leaseExpiredBefore: Date) {
+    const due = [
+      ...this.socialPosts.where("status", "Scheduled").filter((post) => toTime(post.scheduledDate) <= now.getTime()),
+      ...this.socialPosts
+        .where("status", "Publishing")
+        .filter((post) => toTime(post.claimedAt) < leaseExpiredBefore.getTime()),
+    ]
+      .sort((a, b) => toTime(a.scheduledDate) - toTime(b.scheduledDate))
+      .slice(0, limit);
+    return due.map((post) => this.socialPosts.update(post.id, { status: "Publishing", claimedAt: now })!);
+  }
+
+  async markSocialPostsPosted(ids: string[], postedAt: Date) {
+    for (const id of ids) {
+      if (this.socialPosts.get(id)?.status === "Publishing") {
+        this.socialPosts.update(id, { status: "Posted", postedAt, claimedAt: null, lastError: null });
+      }
+    }
+  }
+
+  async markSocialPostFailed(id: string, error: string) {
+    if (this.socialPosts.get(id)?.status === "Publishing") {
+      this.socialPosts.update(id, { status: "Failed", claimedAt: null, lastError: error });
+    }
+  }
+
+  async countDueSocialPosts(now: Date) {
+    return this.socialPosts
+      .where("status", "Scheduled")
+      .filter((post) => toTime(post.scheduledDate) <= now.getTime()).length;
+  }
+
+  // Search: substring match on the same fields the database indexes cover,
+  // prefix matches first
+  private search<T>(rows: T[], fields: Array<(row: T) => string | null>, query: string, limit: number) {
+    const needle = query.trim().toLowerCase();
+    if (!needle) return [];
+    const ranked = rows.flatMap((row) => {
+      const values = fields.map((field) => (field(row) || "").toLowerCase());
+      if (!values.some((value) => value.includes(needle))) return [];
+      return [{ row, prefix: values[0].startsWith(needle) ? 0 : 1, key: values[0] }];
+    });
+    ranked.sort((a, b) => a.prefix - b.prefix || a.key.localeCompare(b.key));
+    return ranked.slice(0, limit).map((entry) => entry.row);
+  }
+
+  async searchMembers(clubIds: string[], query: string, limit: number): Promise<MemberSearchResult[]> {
+    const rows = this.search(
+      this.users.whereIn("clubId", clubIds),
+      [(user) => user.name, (user) => user.email, (user) => user.idNumber],
+      query,
+      limit,
+    );
+    return rows.map(({ id, clubId, name, email, role, idNumber, canLogin }) => ({
+      id, clubId, name, email, role, idNumber, canLogin,
+    }));
+  }
+
+  async searchEvents(clubIds: string[], query: string, limit: number): Promise<EventSearchResult[]> {
+    const rows = this.search(
+      this.events.whereIn("clubId", clubIds),
+      [(event) => event.title, (event) => event.description],
+      query,
+      limit,
+    );
+    return rows.map(({ id, clubId, title, status, date }) => ({ id, clubId, title, status, date }));
+  }
+
+  async searchTasks(clubIds: string[], query: string, limit: number): Promise<TaskSearchResult[]> {
+    const rows = this.search(this.tasks.whereIn("clubId", clubIds), [(task) => task.title], query, limit);
+    return rows.map(({ id, clubId, eventId, title, status, dueDate }) => ({
+      id, clubId, eventId, title, status, dueDate,
+    }));
+  }
+
+  // Institution activity heatmap: nothing to roll up, buckets are computed
+  // from the rows directly
+  async refreshInstitutionActivity(_institutionId: string) {}
+
+  async getActivityHeatmap(
+    _institutionId: string,
+    clubIds: string[],
+    range: ActivityHeatmapRange,
+  ): Promise<ActivityHeatmapBucket[]> {
+    const from = range.from ? Date.parse(`${range.from}T00:00:00Z`) : bucketStart(Date.now(), "day") - 365 * 86_400_000;
+    const to = range.to ? Date.parse(`${range.to}T00:00:00Z`) + 86_400_000 : Infinity;
+    const buckets = new Map<number, number>();
+    const add = (time: number, weight: number) => {
+      if (!(time >= from && time < to)) return;
+      const key = bucketStart(time, range.granularity);
+      buckets.set(key, (buckets.get(key) || 0) + weight);
+    };
+    // Same weights as the database version: an event counts 1, a task 0.5
+    this.events.whereIn("clubId", clubIds).forEach((event) => add(toTime(event.date), 1));
+    this.tasks.whereIn("clubId", clubIds).forEach((task) => add(toTime(task.createdAt), 0.5));
+
+    return Array.from(buckets.entries())
+      .sort(([a], [b]) => a - b)
+      .map(([time, intensity]) => ({ date: new Date(time).toISOString().slice(0, 10), intensity }));
+  }
+
+  // Election operations
+  async createElection(election: InsertElection) {
+    return this.elections.insert(election);
+  }
+
+  async getElection(id: string) {
+    return this.elections.get(id);
+  }
+
+  async getElectionByAccessCode(code: string) {
+    return this.elections.first("accessCode", code);
+  }
+
+  async getElectionsByInstitution(institutionId: string) {
+    return this.elections.where("institutionId", institutionId);
+  }
+
+  async createElectionCandidate(candidate: InsertElectionCandidate) {
+    return this.electionCandidates.insert(candidate);
+  }
+
+  async getElectionCandidate(id: string) {
+    return this.electionCandidates.get(id);
+  }
+
+  async getElectionCandidates(electionId: string) {
+    return this.electionCandidates.where("electionId", electionId);
+  }
+
+  async createElectionVote(vote: InsertElectionVote) {
+    return this.electionVotes.insert(vote);
+  }
+
+  async getElectionVoteByToken(electionId: string, voterToken: string) {
+    return this.electionVotes.where("electionId", electionId).find((vote) => vote.voterToken === voterToken);
+  }
+
+  async incrementCandidateVote(candidateId: string) {
+    const candidate = this.electionCandidates.get(candidateId);
+    if (candidate) this.electionCandidates.update(candidateId, { voteCount: candidate.voteCount + 1 });
+  }
+
+  async deleteElection(id: string) {
+    this.electionVotes.deleteWhere("electionId", id);
+    this.electionCandidates.deleteWhere("electionId", id);
+    this.elections.delete(id);
+  }
+}
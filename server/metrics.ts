@@ -0,0 +1,28 @@
+// Lightweight in-process metrics registry. Subsystems register a snapshot
+// function and GET /api/internal/metrics reports all of them at once.
+
+type MetricsSource = () => Record<string, unknown> | Promise<Record<string, unknown>>;
+
+const sources = new Map<string, MetricsSource>();
+
+export function registerMetricsSource(name: string, source: MetricsSource) {
+  sources.set(name, source);
+}
+
+export async function collectMetrics() {
+  const snapshot: Record<string, unknown> = {
+    pid: process.pid,
+    uptimeSeconds: Math.round(process.uptime()),
+    memory: process.memoryUsage(),
+  };
+
+  for (const [name, source] of Array.from(sources.entries())) {
+    try {
+      snapshot[name] = await source();
+    } catch (error: any) {
+      snapshot[name] = { error: error?.message || String(error) };
+    }
+  }
+
+  return snapshot;
+}
@@ -0,0 +1,216 @@
+import type { Request, Response, NextFunction } from "express";
+import { pool } from "./db";
+import { registerMetricsSource } from "./metrics";
+
+// Token-bucket rate limiting for the expensive public endpoints (bcrypt
+// logins, applications, votes, LLM calls) and a global admission gate that
+// sheds /api load once too many requests are in flight.
+//
+// Buckets live in process memory by default. With RATE_LIMIT_STORE=postgres
+// they live in the rate_limit_buckets table so that cluster workers and
+// separate instances share one budget per key.
+
+export type BucketPolicy = {
+  capacity: number; // burst size
+  refillPerSecond: number;
+};
+
+export type TakeResult = { allowed: boolean; remaining: number; retryAfterSeconds: number };
+
+export interface RateLimitStore {
+  take(key: string, policy: BucketPolicy): Promise<TakeResult>;
+}
+
+// Every request spends a token, rejected ones included, down to a floor of
+// -1. A client that keeps retrying stays limited; one that waits for
+// Retry-After always gets in. Both stores apply exactly this rule.
+const BUCKET_FLOOR = -1;
+
+function toTakeResult(tokens: number, policy: BucketPolicy): TakeResult {
+  const allowed = tokens >= 0;
+  return {
+    allowed,
+    remaining: Math.max(0, Math.floor(tokens)),
+    retryAfterSeconds: allowed ? 0 : Math.max(1, Math.ceil((1 - tokens) / policy.refillPerSecond)),
+  };
+}
+
+export class MemoryRateLimitStore implements RateLimitStore {
+  private buckets = new Map<string, { tokens: number; updatedAt: number; fullAt: number }>();
+
+  constructor(sweepIntervalMs = 60_000) {
+    // Buckets that have refilled completely carry no state worth keeping
+    const sweeper = setInterval(() => {
+      const now = Date.now();
+      for (const [key, bucket] of Array.from(this.buckets.entries())) {
+        if (bucket.fullAt <= now) this.buckets.delete(key);
+      }
+    }, sweepIntervalMs);
+    sweeper.unref();
+  }
+
+  get size() {
+    return this.buckets.size;
+  }
+
+  async take(key: string, policy: BucketPolicy): Promise<TakeResult> {
+    const now = Date.now();
+    const bucket = this.buckets.get(key);
+    const refilled = bucket
+      ? Math.min(policy.capacity, bucket.tokens + ((now - bucket.updatedAt) / 1000) * policy.refillPerSecond)
+      : policy.capacity;
+    const tokens = Math.max(BUCKET_FLOOR, refilled - 1);
+    const fullAt = now + ((policy.capacity - tokens) / policy.refillPerSecond) * 1000;
+    this.buckets.set(key, { tokens, updatedAt: now, fullAt });
+    return toTakeResult(tokens, policy);
+  }
+}
+
+// One atomic upsert per request; the refill is computed from the stored
+// timestamp on the database clock so instances never disagree about time.
+export class PostgresRateLimitStore implements RateLimitStore {
+  constructor(cleanupIntervalMs = 10 * 60_000) {
+    const cleanup = setInterval(() => {
+      pool
+        .query("DELETE FROM rate_limit_buckets WHERE updated_at < now() - interval '1 hour'")
+        .catch((error: any) => console.error("Rate limit cleanup error:", error));
+    }, cleanupIntervalMs);
+    cleanup.unref();
+  }
+
+  async take(key: string, policy: BucketPolicy): Promise<TakeResult> {
+    const result = await pool.query(
+      `INSERT INTO rate_limit_buckets AS b (key, tokens, updated_at)
+       VALUES ($1, $2::float8 - 1, clock_timestamp())
+       ON CONFLICT (key) DO UPDATE SET
+         tokens = greatest($4::float8,
+           least($2::float8, b.tokens + extract(epoch FROM clock_timestamp() - b.updated_at) * $3::float8) - 1),
+         updated_at = clock_timestamp()
+       RETURNING tokens`,
+      [key, policy.capacity, policy.refillPerSecond, BUCKET_FLOOR],
+    );
+    return toTakeResult(Number(result.rows[0].tokens), policy);
+  }
+}
+
+const rateLimitingEnabled = process.env.RATE_LIMIT !== "off";
+const storeKind = process.env.RATE_LIMIT_STORE === "postgres" ? "postgres" : "memory";
+let store: RateLimitStore | null = null;
+
+function getStore(): RateLimitStore {
+  if (!store) {
+    store = storeKind === "postgres" ? new PostgresRateLimitStore() : new MemoryRateLimitStore();
+  }
+  return store;
+}
+
+const limitedCounts = new Map<string, number>();
+
+export type RateLimitOptions = BucketPolicy & {
+  name: string;
+  // Bucket key for the request, e.g. the client IP or user id. Returning
+  // null skips this limiter for the request.
+  key: (req: Request) => string | null | undefined;
+  message?: string;
+};
+
+// Express middleware spending one token from the request's bucket. Answers
+// 429 with Retry-After when the bucket is empty. Store errors fail open so
+// a database hiccup never locks users out.
+export function rateLimit(options: RateLimitOptions) {
+  const policy: BucketPolicy = { capacity: options.capacity, refillPerSecond: options.refillPerSecond };
+  const message = options.message || "Too many requests, please try again later";
+
+  return async (req: Request, res: Response, next: NextFunction) => {
+    if (!rateLimitingEnabled) return next();
+    const key = options.key(req);
+    if (!key) return next();
+
+    let result: TakeResult;
+    try {
+      result = await getStore().take(`${options.name}:${key}`, policy);
+    } catch (error) {
+      console.error("Rate limit store error:", error);
+      return next();
+    }
+
+    res.setHeader("RateLimit-Limit", policy.capacity);
+    res.setHeader("RateLimit-Remaining", result.remaining);
+    if (result.allowed) return next();
+
+    limitedCounts.set(options.name, (limitedCounts.get(options.name) || 0) + 1);
+    res.setHeader("Retry-After", result.retryAfterSeconds);
+    res.status(429).json({ message });
+  };
+}
+
+// Key helpers for rateLimit(). req.ip honours the TRUST_PROXY setting.
+export const byIp = (req: Request) => req.ip || req.socket.remoteAddress || "unknown";
+export const byBodyField = (field: string) => (req: Request) => {
+  const value = req.body?.[field];
+  return typeof value === "string" && value.trim() ? value.trim().toLowerCase() : null;
+};
+// One bucket per client and body value, e.g. per IP and login email
+export const byIpAndBodyField = (field: string) => {
+  const byField = byBodyField(field);
+  return (req: Request) => {
+    const value = byField(req);
+    return value ? `${byIp(req)}:${value}` : null;
+  };
+};
+
+const readIntEnv = (name: string, fallback: number) => {
+  const parsed = parseInt(process.env[name] || "", 10);
+  return Number.isFinite(parsed) && parsed >= 0 ? parsed : fallback;
+};
+
+const admission = {
+  maxConcurrent: readIntEnv("API_MAX_CONCURRENT", 200),
+  retryAfterSeconds: Math.max(1, readIntEnv("API_RETRY_AFTER_SECONDS", 2)),
+  inFlight: 0,
+  peakInFlight: 0,
+  shed: 0,
+};
+
+// Caps the number of /api requests handled at once per process. Past the
+// cap, new requests get an immediate 503 with Retry-After instead of
+// queueing behind work the database and event loop can't finish in time.
+// API_MAX_CONCURRENT=0 disables the gate.
+export function admissionGate() {
+  return (_req: Request, res: Response, next: NextFunction) => {
+    if (admission.maxConcurrent === 0) return next();
+
+    if (admission.inFlight >= admission.maxConcurrent) {
+      admission.shed += 1;
+      res.setHeader("Retry-After", admission.retryAfterSeconds);
+      return res.status(503).json({ message: "Server is busy, please retry shortly" });
+    }
+
+    admission.inFlight += 1;
+    admission.peakInFlight = Math.max(admission.peakInFlight, admission.inFlight);
+    let released = false;
+    const release = () => {
+      if (released) return;
+      released = true;
+      admission.inFlight -= 1;
+    };
+    // "close" covers clients that disconnect before the response finishes
+    res.once("finish", release);
+    res.once("close", release);
+    next();
+  };
+}
+
+registerMetricsSource("admission", () => ({
+  maxConcurrent: admission.maxConcurrent,
+  inFlight: admission.inFlight,
+  peakInFlight: admission.peakInFlight,
+  shed: admission.shed,
+}));
+
+registerMetricsSource("rateLimit", () => ({
+  enabled: rateLimitingEnabled,
+  store: storeKind,
+  trackedBuckets: store instanceof MemoryRateLimitStore ? store.size : undefined,
+  limited: Object.fromEntries(limitedCounts),
+}));
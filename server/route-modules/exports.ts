@@ -0,0 +1,153 @@
+import { Router, type Response } from "express";
+import type ExcelJSType from "exceljs";
+import { loadExcelJS } from "../lazy";
+import {
+  authenticateToken,
+  buildTeamResponse,
+  requirePermission,
+  type AuthRequest,
+} from "../routes";
+import { storage } from "../storage";
+import { hasPermissionBit } from "@shared/permissions";
+
+// Excel exports of the club roster and teams (/api/export/*). Mounted
+// lazily by registerRoutes, so ExcelJS stays out of cold starts.
+
+const EXCEL_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet";
+
+const sendWorkbook = async (res: Response, workbook: ExcelJSType.Workbook, filename: string) => {
+  const buffer = await workbook.xlsx.writeBuffer();
+  res.setHeader("Content-Type", EXCEL_CONTENT_TYPE);
+  res.setHeader("Content-Disposition", `attachment; filename="${filename}"`);
+  res.send(Buffer.from(buffer));
+};
+
+const formatDateDisplay = (value?: Date | string | null) => {
+  if (!value) return "";
+  const date = value instanceof Date ? value : new Date(value);
+  if (isNaN(date.getTime())) return "";
+  return date.toLocaleDateString();
+};
+
+const fileDateStamp = () => {
+  const now = new Date();
+  return now.toISOString().split("T")[0];
+};
+
+export function createExportRouter() {
+  const router = Router();
+
+  router.get('/members', authenticateToken, requirePermission('view_members'), async (req: AuthRequest, res) => {
+    try {
+      const type = (req.query.type as string | undefined)?.toLowerCase();
+      const members = await storage.getUsersByClub(req.user!.clubId);
+
+      const filteredMembers =
+        type === 'regular'
+          ? members.filter((member) => !member.canLogin)
+          : type === 'core'
+            ? members.filter((member) => member.canLogin)
+            : members;
+
+      const ExcelJS = await loadExcelJS();
+      const workbook = new ExcelJS.Workbook();
+      const worksheet = workbook.addWorksheet('Members');
+      worksheet.columns = [
+        { header: '#', key: 'index', width: 6 },
+        { header: 'Name', key: 'name', width: 28 },
+        { header: 'Email', key: 'email', width: 32 },
+        { header: 'Role', key: 'role', width: 20 },
+        { header: 'Phone', key: 'phone', width: 18 },
+        { header: 'Can Login', key: 'canLogin', width: 12 },
+        { header: 'Joined On', key: 'joinedOn', width: 18 },
+      ];
+
+      filteredMembers.forEach((member, index) => {
+        worksheet.addRow({
+          index: index + 1,
+          name: member.name,
+          email: member.email,
+          role: member.role ?? '',
+          phone: member.phone ?? '',
+          canLogin: member.canLogin ? 'Yes' : 'No',
+          joinedOn: formatDateDisplay(member.createdAt),
+        });
+      });
+
+      worksheet.getRow(1).font = { bold: true };
+
+      const filename = type === 'regular'
+        ? `regular-members-${fileDateStamp()}.xlsx`
+        : type === 'core'
+          ? `core-members-${fileDateStamp()}.xlsx`
+          : `club-members-${fileDateStamp()}.xlsx`;
+
+      await sendWorkbook(res, workbook, filename);
+    } catch (error: any) {
+      console.error('Export members error:', error);
+      res.status(500).json({ message: 'Failed to export members' });
+    }
+  });
+
+  router.get('/teams', authenticateToken, async (req: AuthRequest, res) => {
+    try {
+      const canView = hasPermissionBit(req.user!.permissionMask, 'manage_teams') || hasPermissionBit(req.user!.permissionMask, 'view_members');
+      if (!canView) {
+        return res.status(403).json({ message: 'Insufficient permissions' });
+      }
+
+      const teams = await storage.getTeamsByClub(req.user!.clubId);
+      const teamResponses = await Promise.all(teams.map((team) => buildTeamResponse(team)));
+
+      const ExcelJS = await loadExcelJS();
+      const workbook = new ExcelJS.Workbook();
+      const worksheet = workbook.addWorksheet('Teams & Members');
+      worksheet.columns = [
+        { header: 'Team Name', key: 'teamName', width: 26 },
+        { header: 'Team Description', key: 'teamDescription', width: 32 },
+        { header: 'Team Leader', key: 'teamLeader', width: 24 },
+        { header: 'Member Name', key: 'memberName', width: 26 },
+        { header: 'Member Email', key: 'memberEmail', width: 32 },
+        { header: 'Member Phone', key: 'memberPhone', width: 18 },
+        { header: 'Member Role', key: 'memberRole', width: 18 },
+      ];
+
+      teamResponses.forEach((team) => {
+        if (team.members.length === 0) {
+          worksheet.addRow({
+            teamName: team.name,
+            teamDescription: team.description ?? '',
+            teamLeader: team.captain ? team.captain.name : '',
+            memberName: '',
+            memberEmail: '',
+            memberPhone: '',
+            memberRole: '',
+          });
+          return;
+        }
+
+        team.members.forEach((member) => {
+          worksheet.addRow({
+            teamName: team.name,
+            teamDescription: team.description ?? '',
+            teamLeader: team.captain ? team.captain.name : '',
+            memberName: member.name,
+            memberEmail: member.email,
+            memberPhone: member.phone ?? '',
+            memberRole: member.memberRole ?? '',
+          });
+        });
+      });
+
+      worksheet.getRow(1).font = { bold: true };
+
+      const filename = `teams-with-members-${fileDateStamp()}.xlsx`;
+      await sendWorkbook(res, workbook, filename);
+    } catch (error: any) {
+      console.error('Export teams error:', error);
+      res.status(500).json({ message: 'Failed to export teams' });
+    }
+  });
+
+  return router;
+}
@@ -0,0 +1,198 @@
+import { Router, type Response } from "express";
+import { PassThrough } from "stream";
+import { toNumber } from "../analytics";
+import { loadArchiver, loadPdfKit } from "../lazy";
+import {
+  authenticateInstitutionToken,
+  getScopedInstitutionData,
+  requireInstitutionRole,
+  type InstitutionAuthRequest,
+} from "../routes";
+
+// Institution PDF, CSV and ZIP reports (/api/institution/report/*). Mounted
+// lazily by registerRoutes, so PDFKit and archiver stay out of cold starts.
+
+async function createPdfResponse(res: Response, filename: string) {
+  const PDFDocument = await loadPdfKit();
+  const doc = new PDFDocument({ margin: 40 });
+  const stream = new PassThrough();
+  res.setHeader('Content-Type', 'application/pdf');
+  res.setHeader('Content-Disposition', `attachment; filename="${filename}"`);
+  doc.pipe(stream);
+  stream.pipe(res);
+  return doc;
+}
+
+export function createReportRouter() {
+  const router = Router();
+
+  router.get(
+    '/club/:id',
+    authenticateInstitutionToken,
+    requireInstitutionRole(['Institution Admin']),
+    async (req: InstitutionAuthRequest, res) => {
+      try {
+        const data = await getScopedInstitutionData(req);
+        const club = data.clubs.find((c) => c.id === req.params.id);
+        if (!club) {
+          return res.status(404).json({ message: 'Club not found' });
+        }
+
+        const doc = await createPdfResponse(res, `club-report-${club.id}.pdf`);
+        doc.fontSize(20).text('Club Performance Report', { align: 'center' });
+        doc.moveDown();
+        doc.fontSize(12).text(`Club: ${club.name}`);
+        doc.text(`Department: ${club.department || 'N/A'}`);
+        doc.text(`Institution: ${data.institution.name}`);
+        doc.moveDown();
+        const members = data.users.filter((user) => user.clubId === club.id);
+        doc.text(`Total Members: ${members.length}`);
+        doc.text(`Core Council Members: ${members.filter((member) => member.canLogin).length}`);
+        const events = data.events.filter((event) => event.clubId === club.id);
+        doc.text(`Events Hosted: ${events.length}`);
+        doc.text(`Tasks Created: ${data.tasks.filter((task) => task.clubId === club.id).length}`);
+        doc.end();
+      } catch (error: any) {
+        console.error('Club report error:', error);
+        res.status(500).json({ message: 'Failed to generate club report' });
+      }
+    },
+  );
+
+  router.get(
+    '/finance',
+    authenticateInstitutionToken,
+    requireInstitutionRole(['Institution Admin']),
+    async (req: InstitutionAuthRequest, res) => {
+      try {
+        const data = await getScopedInstitutionData(req);
+        const doc = await createPdfResponse(res, 'finance-summary.pdf');
+        doc.fontSize(20).text('Finance Summary Report', { align: 'center' }).moveDown();
+        const totalIncome = data.financeEntries
+          .filter((entry) => entry.type === 'income')
+          .reduce((sum, entry) => sum + toNumber(entry.amount), 0);
+        const totalExpense = data.financeEntries
+          .filter((entry) => entry.type === 'expense')
+          .reduce((sum, entry) => sum + toNumber(entry.amount), 0);
+        doc.fontSize(12).text(`Total Income: ₹${totalIncome.toFixed(2)}`);
+        doc.text(`Total Expense: ₹${totalExpense.toFixed(2)}`);
+        doc.moveDown().text('Pending Approvals:');
+        data.financeEntries
+          .filter((entry) => entry.status === 'Pending')
+          .slice(0, 10)
+          .forEach((entry) => {
+            doc.text(`• ${entry.transactionName} - ₹${toNumber(entry.amount).toFixed(2)}`);
+          });
+        doc.end();
+      } catch (error: any) {
+        console.error('Finance report error:', error);
+        res.status(500).json({ message: 'Failed to generate finance report' });
+      }
+    },
+  );
+
+  router.get(
+    '/events',
+    authenticateInstitutionToken,
+    requireInstitutionRole(['Institution Admin']),
+    async (req: InstitutionAuthRequest, res) => {
+      try {
+        const data = await getScopedInstitutionData(req);
+        const doc = await createPdfResponse(res, 'institution-events-report.pdf');
+        doc.fontSize(20).text('Institution Events Report', { align: 'center' }).moveDown();
+        data.events
+          .sort((a, b) => new Date(b.date as unknown as string).getTime() - new Date(a.date as unknown as string).getTime())
+          .slice(0, 25)
+          .forEach((event) => {
+            const club = data.clubs.find((c) => c.id === event.clubId);
+            doc.fontSize(12).text(`${event.title} (${event.status})`);
+            doc.text(`Club: ${club?.name || 'N/A'} • Date: ${new Date(event.date as unknown as string).toDateString()}`);
+            doc.moveDown(0.5);
+          });
+        doc.end();
+      } catch (error: any) {
+        console.error('Events report error:', error);
+        res.status(500).json({ message: 'Failed to generate events report' });
+      }
+    },
+  );
+
+  router.get(
+    '/members',
+    authenticateInstitutionToken,
+    requireInstitutionRole(['Institution Admin']),
+    async (req: InstitutionAuthRequest, res) => {
+      try {
+        const data = await getScopedInstitutionData(req);
+        const header = ['Member Name', 'Email', 'Club', 'Role', 'Core Member'];
+        const rows = data.users.map((user) => {
+          const club = data.clubs.find((c) => c.id === user.clubId);
+          return [
+            `"${user.name}"`,
+            user.email,
+            `"${club?.name || ''}"`,
+            user.role,
+            user.canLogin ? 'Yes' : 'No',
+          ].join(',');
+        });
+        const csv = [header.join(','), ...rows].join('\n');
+        res.setHeader('Content-Type', 'text/csv');
+        res.setHeader('Content-Disposition', 'attachment; filename="member-summary.csv"');
+        res.send(csv);
+      } catch (error: any) {
+        console.error('Member report error:', error);
+        res.status(500).json({ message: 'Failed to generate member report' });
+      }
+    },
+  );
+
+  router.get(
+    '/monthly',
+    authenticateInstitutionToken,
+    requireInstitutionRole(['Institution Admin']),
+    async (req: InstitutionAuthRequest, res) => {
+      try {
+        const data = await getScopedInstitutionData(req);
+        const archiver = await loadArchiver();
+        const archive = archiver('zip');
+        res.setHeader('Content-Type', 'application/zip');
+        res.setHeader('Content-Disposition', 'attachment; filename="institution-monthly-report.zip"');
+        archive.pipe(res);
+
+        const summary = [
+          `Institution: ${data.institution.name}`,
+          `Generated: ${new Date().toISOString()}`,
+          `Total Clubs: ${data.clubs.length}`,
+          `Total Members: ${data.users.length}`,
+          `Total Events: ${data.events.length}`,
+        ].join('\n');
+        archive.append(summary, { name: 'summary.txt' });
+
+        const membersCsv = [
+          ['Member Name', 'Email', 'Club', 'Role'].join(','),
+          ...data.users.map((user) => {
+            const club = data.clubs.find((c) => c.id === user.clubId);
+            return `"${user.name}",${user.email},"${club?.name || ''}",${user.role}`;
+          }),
+        ].join('\n');
+        archive.append(membersCsv, { name: 'members.csv' });
+
+        const financeCsv = [
+          ['Transaction', 'Type', 'Amount', 'Status', 'Club'].join(','),
+          ...data.financeEntries.map((entry) => {
+            const club = data.clubs.find((c) => c.id === entry.clubId);
+            return `"${entry.transactionName}",${entry.type},${toNumber(entry.amount)},${entry.status},"${club?.name || ''}"`;
+          }),
+        ].join('\n');
+        archive.append(financeCsv, { name: 'finance.csv' });
+
+        await archive.finalize();
+      } catch (error: any) {
+        console.error('Monthly report error:', error);
+        res.status(500).json({ message: 'Failed to generate monthly report' });
+      }
+    },
+  );
+
+  return router;
+}
@@ -1,10 +1,8 @@
 import type { Express, Request, Response, NextFunction } from "express";
 import { createServer, type Server } from "http";
 import { storage } from "./storage";
-import bcrypt from "bcryptjs";
 import jwt from "jsonwebtoken";
 import { randomBytes, createHash } from "crypto";
-import ExcelJS from "exceljs";
 import type {
   InsertEvent,
   InsertTask,
@@ -25,21 +23,61 @@ import type {
   PendingMember,
   Event,
   Task,
-  Finance,
   SocialPost,
 } from "@shared/schema";
 import {
   type Permission,
+  type PermissionMask,
   type PermissionSet,
-  getUserPermissions,
-  hasPermission,
+  fromPermissionMask,
+  getUserPermissionMask,
+  hasPermissionBit,
+  toPermissionMask,
   getPresidentPermissions,
   getVicePresidentPermissions,
   ALL_PERMISSIONS,
 } from "@shared/permissions";
-import PDFDocument from "pdfkit";
-import archiver from "archiver";
-import { PassThrough } from "stream";
+import {
+  type AIPlanInput,
+  type AIPlanResponse,
+  GROQ_MODEL,
+  buildGroqMessages,
+  buildGeminiPrompt,
+  normalizeAIResponse,
+  parseAIJson,
+  readEventStream,
+  TaskStreamParser,
+} from "./ai";
+import { collectMetrics } from "./metrics";
+import { onInvalidate, publishInvalidation } from "./invalidation";
+import { rateLimit, byIp, byIpAndBodyField } from "./rate-limit";
+import {
+  buildAnalyticsIndex,
+  buildClubBudgetUsage,
+  buildClubHealth,
+  buildEventsPerMonth,
+  buildTaskBreakdown,
+  calculateClubPerformanceScore,
+  sumOf,
+  toNumber,
+} from "./analytics";
+import {
+  ClubImportError,
+  readClubImportRows,
+  validateClubImportRows,
+  type ClubImportRow,
+} from "./club-import";
+import type {
+  ActivityHeatmapRange,
+  ClubReference,
+  ClubWithPresident,
+  ConditionalUpdate,
+  HeatmapGranularity,
+  TenantScope,
+  UpdateCondition,
+} from "./storage";
+import { lazyRouter, loadBcrypt } from "./lazy";
+import { categorizeFinanceEntry, emptyCategoryTotals } from "./finance-ledger";
 
 const JWT_SECRET = process.env.SESSION_SECRET || "your-secret-key-change-in-production";
 const APP_BASE_URL = process.env.APP_BASE_URL || process.env.CLIENT_URL || "https://app.clubcentral.local";
@@ -136,7 +174,7 @@ const sanitizeTeamMember = (membership: TeamMember, user: User): TeamMemberRespo
   };
 };
 
-const buildTeamResponse = async (team: Team) => {
+export const buildTeamResponse = async (team: Team) => {
   const memberRows = await storage.getTeamMembersWithUsers(team.id);
   const members = memberRows.map(({ membership, user }) => sanitizeTeamMember(membership, user));
   const captain = team.captainId ? members.find((member) => member.id === team.captainId) ?? null : null;
@@ -153,40 +191,39 @@ const buildTeamResponse = async (team: Team) => {
   };
 };
 
-const EXCEL_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet";
-
-const sendWorkbook = async (res: Response, workbook: ExcelJS.Workbook, filename: string) => {
-  const buffer = await workbook.xlsx.writeBuffer();
-  res.setHeader("Content-Type", EXCEL_CONTENT_TYPE);
-  res.setHeader("Content-Disposition", `attachment; filename="${filename}"`);
-  res.send(Buffer.from(buffer));
-};
-
-const formatDateDisplay = (value?: Date | string | null) => {
-  if (!value) return "";
-  const date = value instanceof Date ? value : new Date(value);
-  if (isNaN(date.getTime())) return "";
-  return date.toLocaleDateString();
-};
-
-const fileDateStamp = () => {
-  const now = new Date();
-  return now.toISOString().split("T")[0];
-};
-
 // JWT middleware
-interface AuthRequest extends Request {
+// Custom role permissions are read on every authenticated request but change
+// rarely. Each process caches them briefly; role edits publish an
+// invalidation so other workers drop their copy straight away.
+// The role JSON is folded into a bitmask once, when the role is loaded.
+const ROLE_CACHE_TTL_MS = 60_000;
+const rolePermissionCache = new Map<string, { mask: PermissionMask; expiresAt: number }>();
+onInvalidate("role", (roleId) => rolePermissionCache.delete(roleId));
+
+async function getRolePermissionMask(roleId: string): Promise<PermissionMask> {
+  const cached = rolePermissionCache.get(roleId);
+  if (cached && cached.expiresAt > Date.now()) {
+    return cached.mask;
+  }
+  const role = await storage.getRole(roleId);
+  const mask = role ? toPermissionMask(role.permissions as PermissionSet) : 0;
+  rolePermissionCache.set(roleId, { mask, expiresAt: Date.now() + ROLE_CACHE_TTL_MS });
+  return mask;
+}
+
+export interface AuthRequest extends Request {
   user?: {
     id: string;
     email: string;
     clubId: string;
     role: string;
     isPresident: boolean;
+    permissionMask: PermissionMask;
     permissions: PermissionSet;
   };
 }
 
-interface InstitutionAuthRequest extends Request {
+export interface InstitutionAuthRequest extends Request {
   institutionUser?: {
     id: string;
     institutionId: string;
@@ -196,7 +233,7 @@ interface InstitutionAuthRequest extends Request {
   };
 }
 
-const authenticateToken = async (req: AuthRequest, res: Response, next: NextFunction) => {
+export const authenticateToken = async (req: AuthRequest, res: Response, next: NextFunction) => {
   const authHeader = req.headers['authorization'];
   const token = authHeader && authHeader.split(' ')[1];
 
@@ -224,20 +261,10 @@ const authenticateToken = async (req: AuthRequest, res: Response, next: NextFunc
     }
 
     // Get custom role permissions if user has a roleId
-    let customRolePermissions: PermissionSet | null = null;
-    if (user.roleId) {
-      const customRole = await storage.getRole(user.roleId);
-      if (customRole) {
-        customRolePermissions = (customRole.permissions as PermissionSet) || null;
-      }
-    }
+    const customRoleMask = user.roleId ? await getRolePermissionMask(user.roleId) : 0;
 
     // Calculate effective permissions
-    const permissions = getUserPermissions(
-      user.isPresident,
-      user.role,
-      customRolePermissions,
-    );
+    const permissionMask = getUserPermissionMask(user.isPresident, user.role, customRoleMask);
 
     // Enhanced logging for debugging
     console.log('[AUTH SUCCESS]', {
@@ -255,7 +282,8 @@ const authenticateToken = async (req: AuthRequest, res: Response, next: NextFunc
       clubId: user.clubId,
       role: user.role,
       isPresident: user.isPresident,
-      permissions,
+      permissionMask,
+      permissions: fromPermissionMask(permissionMask),
     };
     next();
   } catch (error) {
@@ -264,7 +292,7 @@ const authenticateToken = async (req: AuthRequest, res: Response, next: NextFunc
   }
 };
 
-const authenticateInstitutionToken = async (req: InstitutionAuthRequest, res: Response, next: NextFunction) => {
+export const authenticateInstitutionToken = async (req: InstitutionAuthRequest, res: Response, next: NextFunction) => {
   const authHeader = req.headers['authorization'];
   const token = authHeader && authHeader.split(' ')[1];
 
@@ -301,13 +329,13 @@ const authenticateInstitutionToken = async (req: InstitutionAuthRequest, res: Re
 };
 
 // Permission checking middleware factory
-const requirePermission = (permission: Permission) => {
+export const requirePermission = (permission: Permission) => {
   return (req: AuthRequest, res: Response, next: NextFunction) => {
     if (!req.user) {
       return res.status(401).json({ message: 'Authentication required' });
     }
 
-    if (!hasPermission(req.user.permissions, permission)) {
+    if (!hasPermissionBit(req.user.permissionMask, permission)) {
       return res.status(403).json({ message: 'Insufficient permissions' });
     }
 
@@ -315,7 +343,7 @@ const requirePermission = (permission: Permission) => {
   };
 };
 
-const requireInstitutionRole = (roles: string[]) => {
+export const requireInstitutionRole = (roles: string[]) => {
   return (req: InstitutionAuthRequest, res: Response, next: NextFunction) => {
     if (!req.institutionUser) {
       return res.status(401).json({ message: 'Authentication required' });
@@ -334,58 +362,113 @@ function generateClubCode(): string {
   return randomBytes(4).toString('hex').toUpperCase();
 }
 
+// Draws codes in bulk and checks them against the clubs table with one
+// query per round instead of one lookup per code.
+async function allocateClubCodes(count: number): Promise<string[]> {
+  const allocated = new Set<string>();
+  while (allocated.size < count) {
+    const candidates = new Set<string>();
+    while (candidates.size < count - allocated.size + 8) {
+      const code = generateClubCode();
+      if (!allocated.has(code)) candidates.add(code);
+    }
+    const taken = new Set(await storage.findExistingClubCodes(Array.from(candidates)));
+    for (const code of Array.from(candidates)) {
+      if (!taken.has(code) && allocated.size < count) allocated.add(code);
+    }
+  }
+  return Array.from(allocated);
+}
+
+// bcryptjs is loaded on the first login or signup, not at cold start
+async function hashPassword(password: string) {
+  const bcrypt = await loadBcrypt();
+  return bcrypt.hash(password, 10);
+}
+
+async function verifyPassword(password: string, hash: string) {
+  const bcrypt = await loadBcrypt();
+  return bcrypt.compare(password, hash);
+}
+
+// bcryptjs yields between rounds, so a handful of hashes in flight keeps
+// the event loop responsive while a large import is hashed.
+const PASSWORD_HASH_CONCURRENCY = 8;
+
+async function hashPasswords(passwords: string[]): Promise<string[]> {
+  const hashes: string[] = new Array(passwords.length);
+  let next = 0;
+  const worker = async () => {
+    while (next < passwords.length) {
+      const index = next++;
+      hashes[index] = await hashPassword(passwords[index]);
+    }
+  };
+  await Promise.all(Array.from({ length: Math.min(PASSWORD_HASH_CONCURRENCY, passwords.length) }, worker));
+  return hashes;
+}
+
 function generateInstitutionCode(): string {
   return randomBytes(3).toString('hex').toUpperCase();
 }
 
-function generateTemporaryPassword(): string {
-  return randomBytes(6).toString('base64url').slice(0, 10);
+// PATCH bodies may carry the row's `version`; the update is then rejected
+// with 409 if someone else changed the row since the client read it
+function parseUpdateCondition(req: AuthRequest): UpdateCondition | string {
+  const version = req.body?.version;
+  if (version === undefined || version === null) {
+    return { clubId: req.user!.clubId };
+  }
+  if (!Number.isInteger(version) || version < 1) {
+    return "version must be a positive integer";
+  }
+  return { clubId: req.user!.clubId, version };
 }
 
-function filterClubsForInstitutionUser(clubs: Club[], ctx: InstitutionAuthRequest["institutionUser"]) {
-  if (!ctx) return [];
-  if (ctx.permissions.scope === "all") {
-    return clubs;
+const REFERENCE_ERRORS: Record<ClubReference, string> = {
+  eventId: "Event not found in this club",
+  assignedToId: "Assigned member not found in this club",
+  teamId: "Team not found in this club",
+};
+
+function sendConditionalUpdate<T>(res: Response, result: ConditionalUpdate<T>, notFoundMessage: string) {
+  switch (result.status) {
+    case "updated":
+      return res.json(result.row);
+    case "not_found":
+      return res.status(404).json({ message: notFoundMessage });
+    case "version_conflict":
+      return res.status(409).json({
+        message: "Someone else changed this in the meantime. Reload to see their changes.",
+        current: result.current,
+      });
+    case "invalid_reference":
+      return res.status(400).json({ message: REFERENCE_ERRORS[result.field] });
   }
-  const department = (ctx.department || "").toLowerCase();
-  return clubs.filter((club) => (club.department || "").toLowerCase() === department);
 }
 
-function calculateClubPerformanceScore(
-  clubId: string,
-  events: Event[],
-  tasks: Task[],
-  members: User[],
-  financeEntries: Finance[],
-) {
-  const clubEvents = events.filter((event) => event.clubId === clubId);
-  const clubTasks = tasks.filter((task) => task.clubId === clubId);
-  const clubMembers = members.filter((member) => member.clubId === clubId);
-  const completedTasks = clubTasks.filter((task) => task.status === "Done").length;
-  const totalTasks = clubTasks.length || 1;
-  const approvedExpenses = financeEntries.filter(
-    (entry) => entry.clubId === clubId && entry.type === "expense" && entry.status === "Approved",
-  );
-  const totalSpend = approvedExpenses.reduce((sum, entry) => sum + parseFloat(entry.amount), 0);
-
-  const score =
-    clubEvents.length * 10 +
-    (completedTasks / totalTasks) * 40 +
-    clubMembers.length * 2 -
-    totalSpend * 0.01;
+function generateTemporaryPassword(): string {
+  return randomBytes(6).toString('base64url').slice(0, 10);
+}
 
-  return Math.max(0, Math.min(100, Number(score.toFixed(2))));
+// Department-scoped roles only see their own department's clubs; storage
+// applies the scope inside each query
+function tenantScopeFor(ctx: NonNullable<InstitutionAuthRequest["institutionUser"]>): TenantScope {
+  return {
+    institutionId: ctx.institutionId,
+    department: ctx.permissions.scope === "all" ? null : ctx.department || "",
+  };
 }
 
-async function loadInstitutionCollections(institutionId: string) {
+async function loadInstitutionCollections(scope: TenantScope) {
   const [institution, clubs, users, events, tasks, financeEntries, pendingMembers] = await Promise.all([
-    storage.getInstitution(institutionId),
-    storage.getClubsByInstitution(institutionId),
-    storage.getUsersByInstitution(institutionId),
-    storage.getEventsByInstitution(institutionId),
-    storage.getTasksByInstitution(institutionId),
-    storage.getFinanceByInstitution(institutionId),
-    storage.getPendingMembersByInstitution(institutionId),
+    storage.getInstitution(scope.institutionId),
+    storage.getClubsByInstitution(scope),
+    storage.getUsersByInstitution(scope),
+    storage.getEventsByInstitution(scope),
+    storage.getTasksByInstitution(scope),
+    storage.getFinanceByInstitution(scope),
+    storage.getPendingMembersByInstitution(scope),
   ]);
 
   if (!institution) {
@@ -395,149 +478,75 @@ async function loadInstitutionCollections(institutionId: string) {
   return { institution, clubs, users, events, tasks, financeEntries, pendingMembers };
 }
 
+// Limits for the endpoints that are public or expensive per call. Logins are
+// limited per IP, and per IP and target account so one host can't keep
+// guessing one password. The account bucket is never keyed on the email
+// alone: anyone could then lock a known account out by failing on purpose.
+const loginIpLimit = rateLimit({ name: 'login:ip', key: byIp, capacity: 10, refillPerSecond: 1 / 6 });
+const loginAccountLimit = rateLimit({
+  name: 'login:account',
+  key: byIpAndBodyField('email'),
+  capacity: 5,
+  refillPerSecond: 1 / 30,
+  message: 'Too many login attempts for this account, please try again later',
+});
+const applyLimit = rateLimit({ name: 'apply:ip', key: byIp, capacity: 5, refillPerSecond: 1 / 60 });
+// A whole class may vote from one campus NAT address, so the burst is generous
+const voteLimit = rateLimit({ name: 'vote:ip', key: byIp, capacity: 60, refillPerSecond: 1 });
+const aiGenerateLimit = rateLimit({
+  name: 'ai:user',
+  key: (req) => (req as AuthRequest).user?.id,
+  capacity: 5,
+  refillPerSecond: 1 / 60,
+  message: 'AI generation limit reached, please try again in a minute',
+});
+
 function emitPresidentInviteLog(email: string, inviteLink: string, temporaryPassword: string) {
   console.log(
     `President invite prepared for ${email}. Login link: ${inviteLink}. Temporary password: ${temporaryPassword}`,
   );
 }
 
-function scopeInstitutionCollections(
-  data: Awaited<ReturnType<typeof loadInstitutionCollections>>,
-  ctx: InstitutionAuthRequest["institutionUser"],
-) {
-  const scopedClubs = filterClubsForInstitutionUser(data.clubs, ctx);
-  const allowedClubIds = new Set(scopedClubs.map((club) => club.id));
-
-  const scopedUsers = data.users.filter((user) => allowedClubIds.has(user.clubId));
-  const scopedEvents = data.events.filter((event) => allowedClubIds.has(event.clubId));
-  const scopedTasks = data.tasks.filter((task) => allowedClubIds.has(task.clubId));
-  const scopedFinance = data.financeEntries.filter((entry) => allowedClubIds.has(entry.clubId));
-  const scopedPendingMembers = data.pendingMembers.filter((pending) => allowedClubIds.has(pending.clubId));
-
-  return {
-    institution: data.institution,
-    clubs: scopedClubs,
-    users: scopedUsers,
-    events: scopedEvents,
-    tasks: scopedTasks,
-    financeEntries: scopedFinance,
-    pendingMembers: scopedPendingMembers,
-  };
-}
-
-async function getScopedInstitutionData(req: InstitutionAuthRequest) {
+export async function getScopedInstitutionData(req: InstitutionAuthRequest) {
   if (!req.institutionUser) {
     throw new Error("Institution context missing");
   }
-  const collections = await loadInstitutionCollections(req.institutionUser.institutionId);
-  return scopeInstitutionCollections(collections, req.institutionUser);
+  return loadInstitutionCollections(tenantScopeFor(req.institutionUser));
 }
 
-function createPdfResponse(res: Response, filename: string) {
-  const doc = new PDFDocument({ margin: 40 });
-  const stream = new PassThrough();
-  res.setHeader('Content-Type', 'application/pdf');
-  res.setHeader('Content-Disposition', `attachment; filename="${filename}"`);
-  doc.pipe(stream);
-  stream.pipe(res);
-  return doc;
-}
+const HEATMAP_GRANULARITIES: HeatmapGranularity[] = ["day", "week", "month"];
+const ISO_DAY_PATTERN = /^\d{4}-\d{2}-\d{2}$/;
 
-type FinanceCategoryTotals = Record<"Operations" | "PR" | "Logistics" | "Marketing", number>;
-type FinanceCategory = keyof FinanceCategoryTotals;
-
-const FINANCE_CATEGORY_KEYWORDS: Record<string, FinanceCategory> = {
-  marketing: "Marketing",
-  promo: "Marketing",
-  sponsor: "Marketing",
-  logistics: "Logistics",
-  venue: "Logistics",
-  travel: "Logistics",
-  operations: "Operations",
-  ops: "Operations",
-  print: "Operations",
-  design: "PR",
-  media: "PR",
-  pr: "PR",
-};
-
-function categorizeFinanceEntry(entry: Finance): FinanceCategory {
-  const name = (entry.transactionName || "").toLowerCase();
-  for (const keyword in FINANCE_CATEGORY_KEYWORDS) {
-    if (name.includes(keyword)) {
-      return FINANCE_CATEGORY_KEYWORDS[keyword];
-    }
-  }
-  return "Operations";
+function parseHeatmapDay(value: unknown): string | null | undefined {
+  if (value === undefined || value === "") return null;
+  const day = String(value);
+  if (!ISO_DAY_PATTERN.test(day) || Number.isNaN(Date.parse(`${day}T00:00:00Z`))) return undefined;
+  return day;
 }
 
-function toNumber(value: any): number {
-  if (value === null || value === undefined) return 0;
-  const parsed = typeof value === "number" ? value : parseFloat(String(value));
-  return Number.isFinite(parsed) ? parsed : 0;
-}
+// Query parameters of the heatmap endpoint; returns an error message when invalid
+function parseHeatmapRange(query: Request["query"]): ActivityHeatmapRange | string {
+  const from = parseHeatmapDay(query.from);
+  const to = parseHeatmapDay(query.to);
+  if (from === undefined || to === undefined) return "from and to must be dates in YYYY-MM-DD format";
+  if (from && to && from > to) return "from must not be after to";
 
-function buildEventsPerMonth(events: Event[], months = 6) {
-  const now = new Date();
-  const result: { month: string; count: number }[] = [];
-  for (let i = months - 1; i >= 0; i--) {
-    const date = new Date(now.getFullYear(), now.getMonth() - i, 1);
-    const label = date.toLocaleString('default', { month: 'short', year: 'numeric' });
-    result.push({
-      month: label,
-      count: events.filter((event) => {
-        const eventDate = new Date(event.date as unknown as string);
-        return eventDate.getMonth() === date.getMonth() && eventDate.getFullYear() === date.getFullYear();
-      }).length,
-    });
+  const granularity = String(query.granularity ?? "day") as HeatmapGranularity;
+  if (!HEATMAP_GRANULARITIES.includes(granularity)) {
+    return `granularity must be one of ${HEATMAP_GRANULARITIES.join(", ")}`;
   }
-  return result;
+  return { from, to, granularity };
 }
 
-function buildTaskBreakdown(tasks: Task[]) {
-  const breakdown = { Pending: 0, 'In Progress': 0, Done: 0 };
-  tasks.forEach((task) => {
-    if (task.status === 'Done') breakdown.Done += 1;
-    else if (task.status === 'In Progress') breakdown['In Progress'] += 1;
-    else breakdown.Pending += 1;
-  });
-  return breakdown;
-}
-
-function buildActivityHeatmap(events: Event[], tasks: Task[]) {
-  const heatmap = new Map<string, number>();
-
-  events.forEach((event) => {
-    const key = new Date(event.date as unknown as string).toISOString().split('T')[0];
-    heatmap.set(key, (heatmap.get(key) || 0) + 1);
-  });
-
-  tasks.forEach((task) => {
-    if (!task.createdAt) return;
-    const key = new Date(task.createdAt as unknown as string).toISOString().split('T')[0];
-    heatmap.set(key, (heatmap.get(key) || 0) + 0.5);
-  });
-
-  return Array.from(heatmap.entries()).map(([date, intensity]) => ({ date, intensity }));
-}
-
-function buildClubBudgetUsage(clubs: Club[], events: Event[], financeEntries: Finance[]) {
-  return clubs.map((club) => {
-    const clubEvents = events.filter((event) => event.clubId === club.id);
-    const clubFinance = financeEntries.filter((entry) => entry.clubId === club.id);
-    const assigned = clubEvents.reduce((sum, event) => sum + toNumber(event.budget), 0);
-    const spent = clubFinance
-      .filter((entry) => entry.type === 'expense' && entry.status === 'Approved')
-      .reduce((sum, entry) => sum + toNumber(entry.amount), 0);
-
-    return {
-      clubId: club.id,
-      clubName: club.name,
-      department: club.department,
-      assignedBudget: Number(assigned.toFixed(2)),
-      spentBudget: Number(spent.toFixed(2)),
-    };
-  });
+// Brings the institution's daily rollup up to yesterday, then aggregates the
+// requested range for the clubs the user can see
+async function loadActivityHeatmap(
+  institutionId: string,
+  clubs: Club[],
+  range: ActivityHeatmapRange = { from: null, to: null, granularity: "day" },
+) {
+  await storage.refreshInstitutionActivity(institutionId);
+  return storage.getActivityHeatmap(institutionId, clubs.map((club) => club.id), range);
 }
 
 export async function registerRoutes(app: Express): Promise<Server> {
@@ -553,7 +562,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
   });
 
   // Login
-  app.post('/api/auth/login', async (req, res) => {
+  app.post('/api/auth/login', loginIpLimit, loginAccountLimit, async (req, res) => {
     try {
       const { email, password } = req.body;
 
@@ -580,7 +589,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         storedPasswordPrefix: user.password?.substring(0, 10),
       });
 
-      const validPassword = await bcrypt.compare(password, user.password);
+      const validPassword = await verifyPassword(password, user.password);
       if (!validPassword) {
         console.error('[LOGIN FAILED] Password comparison failed for:', email);
         return res.status(401).json({ message: 'Invalid credentials' });
@@ -596,20 +605,10 @@ export async function registerRoutes(app: Express): Promise<Server> {
       const token = jwt.sign({ userId: user.id, scope: 'club' }, JWT_SECRET, { expiresIn: '30d' });
 
       // Get custom role permissions if user has a roleId
-      let customRolePermissions: PermissionSet | null = null;
-      if (user.roleId) {
-        const customRole = await storage.getRole(user.roleId);
-        if (customRole) {
-          customRolePermissions = (customRole.permissions as PermissionSet) || null;
-        }
-      }
+      const customRoleMask = user.roleId ? await getRolePermissionMask(user.roleId) : 0;
 
       // Calculate effective permissions
-      const permissions = getUserPermissions(
-        user.isPresident,
-        user.role,
-        customRolePermissions,
-      );
+      const permissions = fromPermissionMask(getUserPermissionMask(user.isPresident, user.role, customRoleMask));
 
       // Double-check club association before returning
       const verifiedClub = await storage.getClub(user.clubId);
@@ -691,7 +690,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         institutionCode = generateInstitutionCode();
       }
 
-      const hashedPassword = await bcrypt.hash(password, 10);
+      const hashedPassword = await hashPassword(password);
 
       const institution = await storage.createInstitution({
         name: institutionName,
@@ -731,7 +730,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
     }
   });
 
-  app.post('/api/auth/institution/login', async (req, res) => {
+  app.post('/api/auth/institution/login', loginIpLimit, loginAccountLimit, async (req, res) => {
     try {
       const { email, password } = req.body as { email?: string; password?: string };
       if (!email || !password) {
@@ -743,7 +742,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         return res.status(401).json({ message: 'Invalid credentials' });
       }
 
-      const validPassword = await bcrypt.compare(password, institutionUser.password);
+      const validPassword = await verifyPassword(password, institutionUser.password);
       if (!validPassword) {
         return res.status(401).json({ message: 'Invalid credentials' });
       }
@@ -797,7 +796,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
           return res.status(400).json({ message: 'Email already registered' });
         }
 
-        const hashedPassword = await bcrypt.hash(password, 10);
+        const hashedPassword = await hashPassword(password);
         const permissions = getInstitutionPermissions(role);
 
         const newUser = await storage.createInstitutionUser({
@@ -878,7 +877,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
           passwordToUse = presidentPassword && presidentPassword.trim() !== ''
             ? presidentPassword
             : generateTemporaryPassword();
-          hashedPassword = await bcrypt.hash(passwordToUse, 10);
+          hashedPassword = await hashPassword(passwordToUse);
         }
 
         const newClub = await storage.createClub({
@@ -931,6 +930,141 @@ export async function registerRoutes(app: Express): Promise<Server> {
     },
   );
 
+  // Bulk onboarding: the raw request body is a CSV (text/csv) or XLSX file
+  // with a header row. Valid rows are created in one transaction, invalid
+  // rows are skipped and reported. ?dryRun=true only validates.
+  app.post(
+    '/api/institution/clubs/import',
+    authenticateInstitutionToken,
+    requireInstitutionRole(['Institution Admin']),
+    async (req: InstitutionAuthRequest, res) => {
+      try {
+        const dryRun = req.query.dryRun === 'true';
+        const institution = await storage.getInstitution(req.institutionUser!.institutionId);
+        if (!institution) {
+          return res.status(404).json({ message: 'Institution not found' });
+        }
+
+        let rows: ClubImportRow[];
+        try {
+          rows = await readClubImportRows(req, req.headers['content-type']);
+        } catch (error) {
+          if (error instanceof ClubImportError) {
+            return res.status(400).json({ message: error.message });
+          }
+          throw error;
+        }
+        if (rows.length === 0) {
+          return res.status(400).json({ message: 'No clubs found in the file' });
+        }
+
+        const errors = validateClubImportRows(rows);
+        const presidentEmails = rows.map((row) => row.presidentEmail).filter((email): email is string => !!email);
+        const takenEmails = new Set(await storage.findExistingUserEmails(presidentEmails));
+        rows.forEach((row) => {
+          if (row.presidentEmail && takenEmails.has(row.presidentEmail)) {
+            errors.set(row.row, [...(errors.get(row.row) || []), 'President email already in use']);
+          }
+        });
+
+        const validRows = rows.filter((row) => !errors.has(row.row));
+        const report = rows.map((row) => ({
+          row: row.row,
+          clubName: row.clubName,
+          status: errors.has(row.row) ? 'error' : dryRun ? 'valid' : 'created',
+          errors: errors.get(row.row) || [],
+          clubId: null as string | null,
+          clubCode: null as string | null,
+          invite: null as { email: string; link: string; temporaryPassword: string } | null,
+        }));
+        const summary = () => ({
+          dryRun,
+          total: rows.length,
+          valid: validRows.length,
+          failed: rows.length - validRows.length,
+          created: dryRun ? 0 : validRows.length,
+          rows: report,
+        });
+
+        if (dryRun || validRows.length === 0) {
+          return res.json(summary());
+        }
+
+        const passwords = validRows.map((row) =>
+          row.presidentEmail
+            ? row.presidentPassword || generateTemporaryPassword()
+            : null,
+        );
+        const [clubCodes, hashes] = await Promise.all([
+          allocateClubCodes(validRows.length),
+          hashPasswords(passwords.filter((password): password is string => !!password)),
+        ]);
+
+        let hashIndex = 0;
+        const entries: ClubWithPresident[] = validRows.map((row, index) => {
+          const password = passwords[index];
+          return {
+            club: {
+              name: row.clubName,
+              collegeName: institution.name,
+              logoUrl: row.logo,
+              description: row.description,
+              clubCode: clubCodes[index],
+              institutionId: institution.id,
+              department: row.department,
+              presidentPassword: password ? encryptPassword(password) : null,
+            } as InsertClub,
+            president: password
+              ? {
+                  name: row.presidentName!,
+                  email: row.presidentEmail!,
+                  password: hashes[hashIndex++],
+                  phone: row.presidentPhone,
+                  idNumber: row.enrollmentNumber,
+                  linkedin: null,
+                  portfolio: null,
+                  role: 'President',
+                  roleId: null,
+                  isPresident: true,
+                  isApproved: true,
+                  canLogin: true,
+                }
+              : null,
+          };
+        });
+
+        let created;
+        try {
+          created = await storage.createClubsWithPresidents(entries);
+        } catch (error: any) {
+          // Another request took one of the emails or codes after validation
+          if (error?.code === '23505') {
+            return res.status(409).json({ message: 'Some clubs or presidents were created concurrently. Please retry the import.' });
+          }
+          throw error;
+        }
+
+        const reportByRow = new Map(report.map((entry) => [entry.row, entry]));
+        validRows.forEach((row, index) => {
+          const entry = reportByRow.get(row.row)!;
+          const { club, president } = created[index];
+          entry.clubId = club.id;
+          entry.clubCode = club.clubCode;
+          if (president) {
+            const link = `${APP_BASE_URL}/login?email=${encodeURIComponent(president.email)}`;
+            entry.invite = { email: president.email, link, temporaryPassword: passwords[index]! };
+            emitPresidentInviteLog(president.email, link, passwords[index]!);
+          }
+        });
+
+        res.status(201).json(summary());
+      } catch (error: any) {
+        console.error('Institution club import error:', error);
+        res.status(500).json({ message: 'Failed to import clubs' });
+      }
+    },
+  );
+
   app.post(
     '/api/institution/club/assign-president',
     authenticateInstitutionToken,
@@ -968,7 +1102,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         const passwordToUse = presidentPassword && presidentPassword.trim() !== ''
           ? presidentPassword
           : generateTemporaryPassword();
-        const hashedPassword = await bcrypt.hash(passwordToUse, 10);
+        const hashedPassword = await hashPassword(passwordToUse);
 
         // Update club with password for admin viewing
         await storage.updateClub(club.id, {
@@ -1029,23 +1163,19 @@ export async function registerRoutes(app: Express): Promise<Server> {
     try {
       const data = await getScopedInstitutionData(req);
       const now = new Date();
+      const analytics = buildAnalyticsIndex(data, 12, now);
 
       const totalClubs = data.clubs.length;
       const totalMembers = data.users.length;
       const totalCoreMembers = data.users.filter((user) => user.canLogin && !user.isPresident).length;
       const totalEvents = data.events.length;
-      const eventsThisMonth = data.events.filter((event) => {
-        const date = new Date(event.date as unknown as string);
-        return date.getMonth() === now.getMonth() && date.getFullYear() === now.getFullYear();
-      }).length;
+      const eventsThisMonth = analytics.eventsPerMonth[analytics.months - 1];
       const upcomingEvents = data.events.filter(
         (event) => new Date(event.date as unknown as string) > now,
       ).length;
 
-      const assignedBudget = data.events.reduce((sum, event) => sum + toNumber(event.budget), 0);
-      const spentBudget = data.financeEntries
-        .filter((entry) => entry.type === 'expense' && entry.status === 'Approved')
-        .reduce((sum, entry) => sum + toNumber(entry.amount), 0);
+      const assignedBudget = sumOf(analytics.assignedBudget);
+      const spentBudget = sumOf(analytics.approvedExpense);
       const pendingBudget = data.financeEntries
         .filter((entry) => entry.status === 'Pending')
         .reduce((sum, entry) => sum + toNumber(entry.amount), 0);
@@ -1059,21 +1189,17 @@ export async function registerRoutes(app: Express): Promise<Server> {
         approved: totalMembers,
       };
 
-      const eventsPerMonth = buildEventsPerMonth(data.events);
+      const eventsPerMonth = buildEventsPerMonth(analytics);
       const taskBreakdown = buildTaskBreakdown(data.tasks);
-      const heatmap = buildActivityHeatmap(data.events, data.tasks);
-      const budgetUsage = buildClubBudgetUsage(data.clubs, data.events, data.financeEntries);
+      const heatmap = await loadActivityHeatmap(data.institution.id, data.clubs);
+      const budgetUsage = buildClubBudgetUsage(analytics);
 
       const clubPerformance = await Promise.all(
-        data.clubs.map(async (club) => {
-          const score = calculateClubPerformanceScore(club.id, data.events, data.tasks, data.users, data.financeEntries);
+        data.clubs.map(async (club, ordinal) => {
+          const score = calculateClubPerformanceScore(analytics, ordinal);
           await storage.updateClub(club.id, { performanceIndex: score.toString() } as Partial<InsertClub>);
-          const president = data.users.find((user) => user.clubId === club.id && user.isPresident);
-          const vicePresident = data.users.find(
-            (user) => user.clubId === club.id && user.role === 'Vice-President',
-          );
-          const members = data.users.filter((user) => user.clubId === club.id);
-          const clubEvents = data.events.filter((event) => event.clubId === club.id);
+          const president = analytics.presidents[ordinal];
+          const vicePresident = analytics.vicePresidents[ordinal];
           return {
             clubId: club.id,
             clubName: club.name,
@@ -1081,13 +1207,13 @@ export async function registerRoutes(app: Express): Promise<Server> {
             performanceIndex: score,
             president: president ? sanitizeUser(president) : null,
             vicePresident: vicePresident ? sanitizeUser(vicePresident) : null,
-            members: members.length,
-            events: clubEvents.length,
+            members: analytics.members[ordinal],
+            events: analytics.events[ordinal],
           };
         }),
       );
 
-      const financeCategories: FinanceCategoryTotals = { Operations: 0, PR: 0, Logistics: 0, Marketing: 0 };
+      const financeCategories = emptyCategoryTotals();
       data.financeEntries.forEach((entry) => {
         if (entry.type !== 'expense') return;
         const category = categorizeFinanceEntry(entry);
@@ -1132,11 +1258,10 @@ export async function registerRoutes(app: Express): Promise<Server> {
   app.get('/api/institution/clubs', authenticateInstitutionToken, async (req: InstitutionAuthRequest, res) => {
     try {
       const data = await getScopedInstitutionData(req);
-      const clubs = data.clubs.map((club) => {
-        const clubMembers = data.users.filter((user) => user.clubId === club.id);
-        const president = clubMembers.find((member) => member.isPresident);
-        const vicePresident = clubMembers.find((member) => member.role === 'Vice-President');
-        const totalEvents = data.events.filter((event) => event.clubId === club.id).length;
+      const analytics = buildAnalyticsIndex(data);
+      const clubs = data.clubs.map((club, ordinal) => {
+        const president = analytics.presidents[ordinal];
+        const vicePresident = analytics.vicePresidents[ordinal];
         const performanceIndex = parseFloat(String(club.performanceIndex ?? 0));
         return {
           id: club.id,
@@ -1145,8 +1270,8 @@ export async function registerRoutes(app: Express): Promise<Server> {
           logoUrl: club.logoUrl,
           president: president ? sanitizeUser(president) : null,
           vicePresident: vicePresident ? sanitizeUser(vicePresident) : null,
-          totalMembers: clubMembers.length,
-          totalEvents,
+          totalMembers: analytics.members[ordinal],
+          totalEvents: analytics.events[ordinal],
           performanceIndex,
           presidentPassword: club.presidentPassword ? decryptPassword(club.presidentPassword) : null,
           quickActions: {
@@ -1317,54 +1442,38 @@ export async function registerRoutes(app: Express): Promise<Server> {
     }
   });
 
+  // Totals come from the per-club books the finance routes keep (see
+  // server/finance-ledger.ts); only the latest transactions are read as rows
   app.get('/api/institution/finance', authenticateInstitutionToken, async (req: InstitutionAuthRequest, res) => {
     try {
-      const data = await getScopedInstitutionData(req);
-      const clubSpend = data.clubs.map((club) => {
-        const entries = data.financeEntries.filter((entry) => entry.clubId === club.id && entry.type === 'expense');
-        const total = entries.reduce((sum, entry) => sum + toNumber(entry.amount), 0);
-        return {
-          clubId: club.id,
-          clubName: club.name,
-          department: club.department,
-          totalSpend: Number(total.toFixed(2)),
-        };
-      });
+      const scope = tenantScopeFor(req.institutionUser!);
+      const [clubs, totals, months, recentTransactions] = await Promise.all([
+        storage.getClubsByInstitution(scope),
+        storage.getFinanceTotalsByInstitution(scope),
+        storage.getFinanceMonthlyByInstitution(scope),
+        storage.getRecentFinanceByInstitution(scope, 20),
+      ]);
+
+      const totalsByClub = new Map(totals.map((entry) => [entry.clubId, entry]));
+      const clubSpend = clubs.map((club) => ({
+        clubId: club.id,
+        clubName: club.name,
+        department: club.department,
+        totalSpend: totalsByClub.get(club.id)?.spend ?? 0,
+      }));
 
       const monthlySpend: Record<string, number> = {};
-      data.financeEntries.forEach((entry) => {
-        if (entry.type !== 'expense') return;
-        const date = new Date(entry.createdAt as unknown as string);
-        const key = `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`;
-        monthlySpend[key] = (monthlySpend[key] || 0) + toNumber(entry.amount);
-      });
-
-      const pendingApprovals = data.financeEntries.filter((entry) => entry.status === 'Pending').length;
-      const categories: FinanceCategoryTotals = { Operations: 0, PR: 0, Logistics: 0, Marketing: 0 };
-      data.financeEntries.forEach((entry) => {
-        if (entry.type === 'expense') {
-          const category = categorizeFinanceEntry(entry);
-          categories[category] += toNumber(entry.amount);
-        }
+      const categories = emptyCategoryTotals();
+      months.forEach(({ month, category, spend }) => {
+        if (!spend) return;
+        monthlySpend[month] = Number(((monthlySpend[month] || 0) + spend).toFixed(2));
+        categories[category] = Number((categories[category] + spend).toFixed(2));
       });
 
-      const recentTransactions = data.financeEntries
-        .sort(
-          (a, b) =>
-            new Date(b.createdAt as unknown as string).getTime() -
-            new Date(a.createdAt as unknown as string).getTime(),
-        )
-        .slice(0, 20);
-
       res.json({
         metrics: {
-          totalSpent: Number(
-            data.financeEntries
-              .filter((entry) => entry.type === 'expense')
-              .reduce((sum, entry) => sum + toNumber(entry.amount), 0)
-              .toFixed(2),
-          ),
-          pendingApprovals,
+          totalSpent: Number(totals.reduce((sum, entry) => sum + entry.spend, 0).toFixed(2)),
+          pendingApprovals: totals.reduce((sum, entry) => sum + entry.pending, 0),
         },
         clubSpend,
         monthlySpend,
@@ -1543,36 +1652,19 @@ export async function registerRoutes(app: Express): Promise<Server> {
   app.get('/api/institution/analytics', authenticateInstitutionToken, async (req: InstitutionAuthRequest, res) => {
     try {
       const data = await getScopedInstitutionData(req);
-      const clubHealth = data.clubs.map((club) => {
-        const score = calculateClubPerformanceScore(club.id, data.events, data.tasks, data.users, data.financeEntries);
-        const totalTasks = data.tasks.filter((task) => task.clubId === club.id).length || 1;
-        const completedTasks = data.tasks.filter((task) => task.clubId === club.id && task.status === 'Done').length;
-        const taskEfficiency = Math.round((completedTasks / totalTasks) * 100);
-        const clubEvents = data.events.filter((event) => event.clubId === club.id);
-        const completedEvents = clubEvents.filter((event) => event.status === 'Completed').length;
-        const eventSuccessIndex = clubEvents.length ? Math.round((completedEvents / clubEvents.length) * 100) : 0;
+      const analytics = buildAnalyticsIndex(data);
+      const clubHealth = buildClubHealth(analytics);
 
-        return {
-          clubId: club.id,
-          clubName: club.name,
-          department: club.department,
-          performanceScore: score,
-          taskEfficiency,
-          eventSuccessIndex,
-        };
-      });
-
-      const totalTasks = data.tasks.length || 1;
-      const completedTasks = data.tasks.filter((task) => task.status === 'Done').length;
+      const totalTasks = sumOf(analytics.tasks) || 1;
+      const completedTasks = sumOf(analytics.doneTasks);
       const taskEfficiency = Math.round((completedTasks / totalTasks) * 100);
-      const assignedBudget = data.events.reduce((sum, event) => sum + toNumber(event.budget), 0) || 1;
-      const spentBudget = data.financeEntries
-        .filter((entry) => entry.type === 'expense')
-        .reduce((sum, entry) => sum + toNumber(entry.amount), 0);
+      const assignedBudget = sumOf(analytics.assignedBudget) || 1;
+      const spentBudget = sumOf(analytics.totalExpense);
       const budgetEffectiveness = Math.min(100, Math.round((spentBudget / assignedBudget) * 100));
-      const monthlyActivity = buildEventsPerMonth(data.events, 12);
-      const completedEvents = data.events.filter((event) => event.status === 'Completed').length;
-      const eventSuccessIndex = data.events.length ? Math.round((completedEvents / data.events.length) * 100) : 0;
+      const monthlyActivity = buildEventsPerMonth(analytics, 12);
+      const totalEvents = sumOf(analytics.events);
+      const completedEvents = sumOf(analytics.completedEvents);
+      const eventSuccessIndex = totalEvents ? Math.round((completedEvents / totalEvents) * 100) : 0;
 
       res.json({
         clubHealth: clubHealth.sort((a, b) => b.performanceScore - a.performanceScore),
@@ -1590,180 +1682,26 @@ export async function registerRoutes(app: Express): Promise<Server> {
 
   app.get('/api/institution/heatmap', authenticateInstitutionToken, async (req: InstitutionAuthRequest, res) => {
     try {
-      const data = await getScopedInstitutionData(req);
-      const heatmap = buildActivityHeatmap(data.events, data.tasks);
-      res.json({ heatmap });
+      const range = parseHeatmapRange(req.query);
+      if (typeof range === 'string') {
+        return res.status(400).json({ message: range });
+      }
+
+      // Only the club list is needed here, not the full institution dataset
+      const ctx = req.institutionUser!;
+      const clubs = await storage.getClubsByInstitution(tenantScopeFor(ctx));
+      const heatmap = await loadActivityHeatmap(ctx.institutionId, clubs, range);
+      res.json({ heatmap, granularity: range.granularity });
     } catch (error: any) {
       console.error('Institution heatmap error:', error);
       res.status(500).json({ message: 'Failed to load heatmap data' });
     }
   });
 
-  app.get(
-    '/api/institution/report/club/:id',
-    authenticateInstitutionToken,
-    requireInstitutionRole(['Institution Admin']),
-    async (req: InstitutionAuthRequest, res) => {
-      try {
-        const data = await getScopedInstitutionData(req);
-        const club = data.clubs.find((c) => c.id === req.params.id);
-        if (!club) {
-          return res.status(404).json({ message: 'Club not found' });
-        }
-
-        const doc = createPdfResponse(res, `club-report-${club.id}.pdf`);
-        doc.fontSize(20).text('Club Performance Report', { align: 'center' });
-        doc.moveDown();
-        doc.fontSize(12).text(`Club: ${club.name}`);
-        doc.text(`Department: ${club.department || 'N/A'}`);
-        doc.text(`Institution: ${data.institution.name}`);
-        doc.moveDown();
-        const members = data.users.filter((user) => user.clubId === club.id);
-        doc.text(`Total Members: ${members.length}`);
-        doc.text(`Core Council Members: ${members.filter((member) => member.canLogin).length}`);
-        const events = data.events.filter((event) => event.clubId === club.id);
-        doc.text(`Events Hosted: ${events.length}`);
-        doc.text(`Tasks Created: ${data.tasks.filter((task) => task.clubId === club.id).length}`);
-        doc.end();
-      } catch (error: any) {
-        console.error('Club report error:', error);
-        res.status(500).json({ message: 'Failed to generate club report' });
-      }
-    },
-  );
-
-  app.get(
-    '/api/institution/report/finance',
-    authenticateInstitutionToken,
-    requireInstitutionRole(['Institution Admin']),
-    async (req: InstitutionAuthRequest, res) => {
-      try {
-        const data = await getScopedInstitutionData(req);
-        const doc = createPdfResponse(res, 'finance-summary.pdf');
-        doc.fontSize(20).text('Finance Summary Report', { align: 'center' }).moveDown();
-        const totalIncome = data.financeEntries
-          .filter((entry) => entry.type === 'income')
-          .reduce((sum, entry) => sum + toNumber(entry.amount), 0);
-        const totalExpense = data.financeEntries
-          .filter((entry) => entry.type === 'expense')
-          .reduce((sum, entry) => sum + toNumber(entry.amount), 0);
-        doc.fontSize(12).text(`Total Income: ₹${totalIncome.toFixed(2)}`);
-        doc.text(`Total Expense: ₹${totalExpense.toFixed(2)}`);
-        doc.moveDown().text('Pending Approvals:');
-        data.financeEntries
-          .filter((entry) => entry.status === 'Pending')
-          .slice(0, 10)
-          .forEach((entry) => {
-            doc.text(`• ${entry.transactionName} - ₹${toNumber(entry.amount).toFixed(2)}`);
-          });
-        doc.end();
-      } catch (error: any) {
-        console.error('Finance report error:', error);
-        res.status(500).json({ message: 'Failed to generate finance report' });
-      }
-    },
-  );
-
-  app.get(
-    '/api/institution/report/events',
-    authenticateInstitutionToken,
-    requireInstitutionRole(['Institution Admin']),
-    async (req: InstitutionAuthRequest, res) => {
-      try {
-        const data = await getScopedInstitutionData(req);
-        const doc = createPdfResponse(res, 'institution-events-report.pdf');
-        doc.fontSize(20).text('Institution Events Report', { align: 'center' }).moveDown();
-        data.events
-          .sort((a, b) => new Date(b.date as unknown as string).getTime() - new Date(a.date as unknown as string).getTime())
-          .slice(0, 25)
-          .forEach((event) => {
-            const club = data.clubs.find((c) => c.id === event.clubId);
-            doc.fontSize(12).text(`${event.title} (${event.status})`);
-            doc.text(`Club: ${club?.name || 'N/A'} • Date: ${new Date(event.date as unknown as string).toDateString()}`);
-            doc.moveDown(0.5);
-          });
-        doc.end();
-      } catch (error: any) {
-        console.error('Events report error:', error);
-        res.status(500).json({ message: 'Failed to generate events report' });
-      }
-    },
-  );
-
-  app.get(
-    '/api/institution/report/members',
-    authenticateInstitutionToken,
-    requireInstitutionRole(['Institution Admin']),
-    async (req: InstitutionAuthRequest, res) => {
-      try {
-        const data = await getScopedInstitutionData(req);
-        const header = ['Member Name', 'Email', 'Club', 'Role', 'Core Member'];
-        const rows = data.users.map((user) => {
-          const club = data.clubs.find((c) => c.id === user.clubId);
-          return [
-            `"${user.name}"`,
-            user.email,
-            `"${club?.name || ''}"`,
-            user.role,
-            user.canLogin ? 'Yes' : 'No',
-          ].join(',');
-        });
-        const csv = [header.join(','), ...rows].join('\n');
-        res.setHeader('Content-Type', 'text/csv');
-        res.setHeader('Content-Disposition', 'attachment; filename="member-summary.csv"');
-        res.send(csv);
-      } catch (error: any) {
-        console.error('Member report error:', error);
-        res.status(500).json({ message: 'Failed to generate member report' });
-      }
-    },
-  );
-
-  app.get(
-    '/api/institution/report/monthly',
-    authenticateInstitutionToken,
-    requireInstitutionRole(['Institution Admin']),
-    async (req: InstitutionAuthRequest, res) => {
-      try {
-        const data = await getScopedInstitutionData(req);
-        const archive = archiver('zip');
-        res.setHeader('Content-Type', 'application/zip');
-        res.setHeader('Content-Disposition', 'attachment; filename="institution-monthly-report.zip"');
-        archive.pipe(res);
-
-        const summary = [
-          `Institution: ${data.institution.name}`,
-          `Generated: ${new Date().toISOString()}`,
-          `Total Clubs: ${data.clubs.length}`,
-          `Total Members: ${data.users.length}`,
-          `Total Events: ${data.events.length}`,
-        ].join('\n');
-        archive.append(summary, { name: 'summary.txt' });
-
-        const membersCsv = [
-          ['Member Name', 'Email', 'Club', 'Role'].join(','),
-          ...data.users.map((user) => {
-            const club = data.clubs.find((c) => c.id === user.clubId);
-            return `"${user.name}",${user.email},"${club?.name || ''}",${user.role}`;
-          }),
-        ].join('\n');
-        archive.append(membersCsv, { name: 'members.csv' });
-
-        const financeCsv = [
-          ['Transaction', 'Type', 'Amount', 'Status', 'Club'].join(','),
-          ...data.financeEntries.map((entry) => {
-            const club = data.clubs.find((c) => c.id === entry.clubId);
-            return `"${entry.transactionName}",${entry.type},${toNumber(entry.amount)},${entry.status},"${club?.name || ''}"`;
-          }),
-        ].join('\n');
-        archive.append(financeCsv, { name: 'finance.csv' });
-
-        await archive.finalize();
-      } catch (error: any) {
-        console.error('Monthly report error:', error);
-        res.status(500).json({ message: 'Failed to generate monthly report' });
-      }
-    },
+  // PDF, CSV and ZIP reports, see server/route-modules/reports.ts
+  app.use(
+    '/api/institution/report',
+    lazyRouter(() => import('./route-modules/reports').then(({ createReportRouter }) => createReportRouter())),
   );
 
   // ============================================================
@@ -1880,7 +1818,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
   // ============================================================
 
   // Member application
-  app.post('/api/members/apply', async (req, res) => {
+  app.post('/api/members/apply', applyLimit, async (req, res) => {
     try {
       const { clubCode, name, email, password, phone, idNumber, linkedin, portfolio } = req.body;
 
@@ -1896,7 +1834,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
       }
 
       // Hash password
-      const hashedPassword = await bcrypt.hash(password, 10);
+      const hashedPassword = await hashPassword(password);
 
       await storage.createPendingMember({
         clubId: club.id,
@@ -1966,6 +1904,63 @@ export async function registerRoutes(app: Express): Promise<Server> {
     }
   });
 
+  const MAX_BATCH_APPROVALS = 1000;
+
+  const parseIdList = (value: unknown): string[] | null => {
+    if (!Array.isArray(value) || value.length === 0 || value.length > MAX_BATCH_APPROVALS) return null;
+    if (!value.every((id) => typeof id === 'string' && id.length > 0)) return null;
+    return Array.from(new Set(value as string[]));
+  };
+
+  // Approve many applicants at once (requires view_approvals permission)
+  app.post('/api/members/approve-many', authenticateToken, requirePermission('view_approvals'), async (req: AuthRequest, res) => {
+    try {
+      const ids = parseIdList(req.body?.ids);
+      if (!ids) {
+        return res.status(400).json({ message: `ids must be a list of 1 to ${MAX_BATCH_APPROVALS} applicant ids` });
+      }
+      const role = req.body?.role === 'Council Head' ? 'Council Head' : 'Member';
+
+      const { approvedIds } = await storage.approvePendingMembers(req.user!.clubId, ids, role, role === 'Council Head');
+      const approved = new Set(approvedIds);
+
+      res.json({
+        message: `${approvedIds.length} member${approvedIds.length === 1 ? '' : 's'} approved`,
+        approved: approvedIds,
+        skipped: ids.filter((id) => !approved.has(id)),
+      });
+    } catch (error: any) {
+      console.error('Approve members error:', error);
+      res.status(500).json({ message: 'Server error' });
+    }
+  });
+
+  // Reject many applicants at once (admin only)
+  app.post('/api/members/reject-many', authenticateToken, async (req: AuthRequest, res) => {
+    try {
+      const isAdmin = req.user!.isPresident || req.user!.role === 'Vice-President';
+      if (!isAdmin) {
+        return res.status(403).json({ message: 'Access denied' });
+      }
+
+      const ids = parseIdList(req.body?.ids);
+      if (!ids) {
+        return res.status(400).json({ message: `ids must be a list of 1 to ${MAX_BATCH_APPROVALS} applicant ids` });
+      }
+
+      const rejectedIds = await storage.rejectPendingMembers(req.user!.clubId, ids);
+      const rejected = new Set(rejectedIds);
+      res.json({
+        message: `${rejectedIds.length} application${rejectedIds.length === 1 ? '' : 's'} rejected`,
+        rejected: rejectedIds,
+        skipped: ids.filter((id) => !rejected.has(id)),
+      });
+    } catch (error: any) {
+      console.error('Reject members error:', error);
+      res.status(500).json({ message: 'Server error' });
+    }
+  });
+
   // Reject member (admin only)
   app.delete('/api/members/reject/:id', authenticateToken, async (req: AuthRequest, res) => {
     try {
@@ -1998,56 +1993,11 @@ export async function registerRoutes(app: Express): Promise<Server> {
     }
   });
 
-  app.get('/api/export/members', authenticateToken, requirePermission('view_members'), async (req: AuthRequest, res) => {
-    try {
-      const type = (req.query.type as string | undefined)?.toLowerCase();
-      const members = await storage.getUsersByClub(req.user!.clubId);
-
-      const filteredMembers =
-        type === 'regular'
-          ? members.filter((member) => !member.canLogin)
-          : type === 'core'
-            ? members.filter((member) => member.canLogin)
-            : members;
-
-      const workbook = new ExcelJS.Workbook();
-      const worksheet = workbook.addWorksheet('Members');
-      worksheet.columns = [
-        { header: '#', key: 'index', width: 6 },
-        { header: 'Name', key: 'name', width: 28 },
-        { header: 'Email', key: 'email', width: 32 },
-        { header: 'Role', key: 'role', width: 20 },
-        { header: 'Phone', key: 'phone', width: 18 },
-        { header: 'Can Login', key: 'canLogin', width: 12 },
-        { header: 'Joined On', key: 'joinedOn', width: 18 },
-      ];
-
-      filteredMembers.forEach((member, index) => {
-        worksheet.addRow({
-          index: index + 1,
-          name: member.name,
-          email: member.email,
-          role: member.role ?? '',
-          phone: member.phone ?? '',
-          canLogin: member.canLogin ? 'Yes' : 'No',
-          joinedOn: formatDateDisplay(member.createdAt),
-        });
-      });
-
-      worksheet.getRow(1).font = { bold: true };
-
-      const filename = type === 'regular'
-        ? `regular-members-${fileDateStamp()}.xlsx`
-        : type === 'core'
-          ? `core-members-${fileDateStamp()}.xlsx`
-          : `club-members-${fileDateStamp()}.xlsx`;
-
-      await sendWorkbook(res, workbook, filename);
-    } catch (error: any) {
-      console.error('Export members error:', error);
-      res.status(500).json({ message: 'Failed to export members' });
-    }
-  });
+  // Excel exports, see server/route-modules/exports.ts
+  app.use(
+    '/api/export',
+    lazyRouter(() => import('./route-modules/exports').then(({ createExportRouter }) => createExportRouter())),
+  );
 
   // ============================================================
   // ROLE ROUTES
@@ -2121,6 +2071,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
       }
 
       const updated = await storage.updateRole(req.params.id, updates);
+      publishInvalidation("role", req.params.id);
       res.json(updated);
     } catch (error: any) {
       console.error('Update role error:', error);
@@ -2136,6 +2087,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
       }
 
       await storage.deleteRole(req.params.id);
+      publishInvalidation("role", req.params.id);
       res.json({ message: 'Role deleted successfully' });
     } catch (error: any) {
       console.error('Delete role error:', error);
@@ -2150,7 +2102,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
   app.get('/api/teams', authenticateToken, async (req: AuthRequest, res) => {
     try {
       // Allow viewing teams if user has manage_teams or view_members permission
-      const canView = hasPermission(req.user!.permissions, 'manage_teams') || hasPermission(req.user!.permissions, 'view_members');
+      const canView = hasPermissionBit(req.user!.permissionMask, 'manage_teams') || hasPermissionBit(req.user!.permissionMask, 'view_members');
       if (!canView) {
         return res.status(403).json({ message: 'Insufficient permissions' });
       }
@@ -2167,65 +2119,6 @@ export async function registerRoutes(app: Express): Promise<Server> {
     }
   });
 
-  app.get('/api/export/teams', authenticateToken, async (req: AuthRequest, res) => {
-    try {
-      const canView = hasPermission(req.user!.permissions, 'manage_teams') || hasPermission(req.user!.permissions, 'view_members');
-      if (!canView) {
-        return res.status(403).json({ message: 'Insufficient permissions' });
-      }
-
-      const teams = await storage.getTeamsByClub(req.user!.clubId);
-      const teamResponses = await Promise.all(teams.map((team) => buildTeamResponse(team)));
-
-      const workbook = new ExcelJS.Workbook();
-      const worksheet = workbook.addWorksheet('Teams & Members');
-      worksheet.columns = [
-        { header: 'Team Name', key: 'teamName', width: 26 },
-        { header: 'Team Description', key: 'teamDescription', width: 32 },
-        { header: 'Team Leader', key: 'teamLeader', width: 24 },
-        { header: 'Member Name', key: 'memberName', width: 26 },
-        { header: 'Member Email', key: 'memberEmail', width: 32 },
-        { header: 'Member Phone', key: 'memberPhone', width: 18 },
-        { header: 'Member Role', key: 'memberRole', width: 18 },
-      ];
-
-      teamResponses.forEach((team) => {
-        if (team.members.length === 0) {
-          worksheet.addRow({
-            teamName: team.name,
-            teamDescription: team.description ?? '',
-            teamLeader: team.captain ? team.captain.name : '',
-            memberName: '',
-            memberEmail: '',
-            memberPhone: '',
-            memberRole: '',
-          });
-          return;
-        }
-
-        team.members.forEach((member) => {
-          worksheet.addRow({
-            teamName: team.name,
-            teamDescription: team.description ?? '',
-            teamLeader: team.captain ? team.captain.name : '',
-            memberName: member.name,
-            memberEmail: member.email,
-            memberPhone: member.phone ?? '',
-            memberRole: member.memberRole ?? '',
-          });
-        });
-      });
-
-      worksheet.getRow(1).font = { bold: true };
-
-      const filename = `teams-with-members-${fileDateStamp()}.xlsx`;
-      await sendWorkbook(res, workbook, filename);
-    } catch (error: any) {
-      console.error('Export teams error:', error);
-      res.status(500).json({ message: 'Failed to export teams' });
-    }
-  });
-
   app.post('/api/teams', authenticateToken, requirePermission('manage_teams'), async (req: AuthRequest, res) => {
     try {
 
@@ -2570,9 +2463,9 @@ export async function registerRoutes(app: Express): Promise<Server> {
 
   app.patch('/api/events/:id', authenticateToken, async (req: AuthRequest, res) => {
     try {
-      const existing = await storage.getEvent(req.params.id);
-      if (!existing || existing.clubId !== req.user!.clubId) {
-        return res.status(404).json({ message: 'Event not found' });
+      const condition = parseUpdateCondition(req);
+      if (typeof condition === 'string') {
+        return res.status(400).json({ message: condition });
       }
 
       const { title, description, date, budget, status, assignedToId } = req.body as {
@@ -2619,23 +2512,16 @@ export async function registerRoutes(app: Express): Promise<Server> {
       }
 
       if (assignedToId !== undefined) {
-        if (!assignedToId) {
-          updates.assignedToId = null;
-        } else {
-          const member = await storage.getUser(assignedToId);
-          if (!member || member.clubId !== req.user!.clubId) {
-            return res.status(400).json({ message: 'Assigned member not found in this club' });
-          }
-          updates.assignedToId = member.id;
-        }
+        // Checked against the club as part of the update
+        updates.assignedToId = assignedToId || null;
       }
 
       if (Object.keys(updates).length === 0) {
         return res.status(400).json({ message: 'No valid updates provided' });
       }
 
-      const updated = await storage.updateEvent(existing.id, updates);
-      res.json(updated);
+      const result = await storage.updateEventInClub(req.params.id, condition, updates);
+      sendConditionalUpdate(res, result, 'Event not found');
     } catch (error: any) {
       console.error('Update event error:', error);
       res.status(500).json({ message: 'Server error' });
@@ -2734,12 +2620,12 @@ export async function registerRoutes(app: Express): Promise<Server> {
 
   app.patch('/api/tasks/:id', authenticateToken, async (req: AuthRequest, res) => {
     try {
-      const task = await storage.getTask(req.params.id);
-      if (!task || task.clubId !== req.user!.clubId) {
-        return res.status(404).json({ message: 'Task not found' });
+      const condition = parseUpdateCondition(req);
+      if (typeof condition === 'string') {
+        return res.status(400).json({ message: condition });
       }
 
-      const { assignedToId, teamId, dueDate, eventId, ...rest } = req.body as {
+      const { title, description, status, assignedToId, teamId, dueDate, eventId } = req.body as {
         title?: string;
         description?: string;
         status?: string;
@@ -2749,38 +2635,26 @@ export async function registerRoutes(app: Express): Promise<Server> {
         dueDate?: string | null;
       };
 
-      const updates: Partial<InsertTask> = { ...rest };
+      const updates: Partial<InsertTask> = {};
+
+      if (title !== undefined) updates.title = title;
+      if (description !== undefined) updates.description = description;
+      if (status !== undefined) updates.status = status;
 
+      // The event, assignee and team are checked against the club as part of the update
       if (eventId !== undefined) {
-        const event = await storage.getEvent(eventId);
-        if (!event || event.clubId !== req.user!.clubId) {
+        if (!eventId) {
           return res.status(400).json({ message: 'Event not found in this club' });
         }
-        updates.eventId = event.id;
+        updates.eventId = eventId;
       }
 
       if (assignedToId !== undefined) {
-        if (!assignedToId) {
-          updates.assignedToId = null;
-        } else {
-          const assignee = await storage.getUser(assignedToId);
-          if (!assignee || assignee.clubId !== req.user!.clubId) {
-            return res.status(400).json({ message: 'Assigned member not found in this club' });
-          }
-          updates.assignedToId = assignee.id;
-        }
+        updates.assignedToId = assignedToId || null;
       }
 
       if (teamId !== undefined) {
-        if (!teamId) {
-          updates.teamId = null;
-        } else {
-          const team = await storage.getTeam(teamId);
-          if (!team || team.clubId !== req.user!.clubId) {
-            return res.status(400).json({ message: 'Team not found in this club' });
-          }
-          updates.teamId = team.id;
-        }
+        updates.teamId = teamId || null;
       }
 
       if (dueDate !== undefined) {
@@ -2795,8 +2669,12 @@ export async function registerRoutes(app: Express): Promise<Server> {
         }
       }
 
-      const updated = await storage.updateTask(task.id, updates);
-      res.json(updated);
+      if (Object.keys(updates).length === 0) {
+        return res.status(400).json({ message: 'No valid updates provided' });
+      }
+
+      const result = await storage.updateTaskInClub(req.params.id, condition, updates);
+      sendConditionalUpdate(res, result, 'Task not found');
     } catch (error: any) {
       console.error('Update task error:', error);
       res.status(500).json({ message: 'Server error' });
@@ -2824,8 +2702,8 @@ export async function registerRoutes(app: Express): Promise<Server> {
 
   app.get('/api/finance', authenticateToken, async (req: AuthRequest, res) => {
     // Allow access if user has manage_finance or approve_finance permission
-    const canManage = hasPermission(req.user!.permissions, 'manage_finance');
-    const canApprove = hasPermission(req.user!.permissions, 'approve_finance');
+    const canManage = hasPermissionBit(req.user!.permissionMask, 'manage_finance');
+    const canApprove = hasPermissionBit(req.user!.permissionMask, 'approve_finance');
     if (!canManage && !canApprove) {
       return res.status(403).json({ message: 'Insufficient permissions to view finance' });
     }
@@ -2881,9 +2759,9 @@ export async function registerRoutes(app: Express): Promise<Server> {
 
   app.patch('/api/finance/:id', authenticateToken, requirePermission('manage_finance'), async (req: AuthRequest, res) => {
     try {
-      const entry = await storage.getFinanceEntry(req.params.id);
-      if (!entry || entry.clubId !== req.user!.clubId) {
-        return res.status(404).json({ message: 'Entry not found' });
+      const condition = parseUpdateCondition(req);
+      if (typeof condition === 'string') {
+        return res.status(400).json({ message: condition });
       }
 
       const { transactionName, type, amount, receiptUrl, status } = req.body as {
@@ -2921,8 +2799,8 @@ export async function registerRoutes(app: Express): Promise<Server> {
         return res.status(400).json({ message: 'No updates provided' });
       }
 
-      const updated = await storage.updateFinanceEntry(entry.id, updates);
-      res.json(updated);
+      const result = await storage.updateFinanceEntryInClub(req.params.id, condition, updates);
+      sendConditionalUpdate(res, result, 'Entry not found');
     } catch (error: any) {
       console.error('Update finance error:', error);
       res.status(500).json({ message: 'Server error' });
@@ -2981,9 +2859,9 @@ export async function registerRoutes(app: Express): Promise<Server> {
 
   app.patch('/api/social/:id', authenticateToken, async (req: AuthRequest, res) => {
     try {
-      const post = await storage.getSocialPost(req.params.id);
-      if (!post) {
-        return res.status(404).json({ message: 'Post not found' });
+      const condition = parseUpdateCondition(req);
+      if (typeof condition === 'string') {
+        return res.status(400).json({ message: condition });
       }
 
       const { caption, imageUrl, platform, scheduledDate, status } = req.body as {
@@ -2999,7 +2877,13 @@ export async function registerRoutes(app: Express): Promise<Server> {
       if (caption !== undefined) updates.caption = caption;
       if (imageUrl !== undefined) updates.imageUrl = imageUrl ?? null;
       if (platform !== undefined) updates.platform = platform;
-      if (status !== undefined) updates.status = status;
+      if (status !== undefined) {
+        updates.status = status;
+        if (status === 'Scheduled') {
+          // Rescheduling a failed post clears its last dispatch error
+          updates.lastError = null;
+        }
+      }
       if (scheduledDate !== undefined) {
         if (!scheduledDate) {
           updates.scheduledDate = null;
@@ -3012,8 +2896,12 @@ export async function registerRoutes(app: Express): Promise<Server> {
         }
       }
 
-      const updated = await storage.updateSocialPost(req.params.id, updates);
-      res.json(updated);
+      if (Object.keys(updates).length === 0) {
+        return res.status(400).json({ message: 'No updates provided' });
+      }
+
+      const result = await storage.updateSocialPostInClub(req.params.id, condition, updates);
+      sendConditionalUpdate(res, result, 'Post not found');
     } catch (error: any) {
       console.error('Update social post error:', error);
       res.status(500).json({ message: 'Server error' });
@@ -3034,7 +2922,63 @@ export async function registerRoutes(app: Express): Promise<Server> {
   // AI TASK ASSISTANT ROUTES
   // ============================================================
 
-  app.post('/api/ai/generate-tasks', authenticateToken, requirePermission('manage_tasks'), async (req: AuthRequest, res) => {
+  const sendSSE = (res: Response, event: string, data: unknown) => {
+    res.write(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+  };
+
+  const requestAICompletion = async (input: AIPlanInput, apiKey: string, useGroq: boolean, stream: boolean, signal?: AbortSignal) => {
+    if (useGroq) {
+      // Groq API (LLaMA 3 - Free tier)
+      const groqResponse = await fetch('https://api.groq.com/openai/v1/chat/completions', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${apiKey}`,
+        },
+        body: JSON.stringify({
+          model: GROQ_MODEL,
+          messages: buildGroqMessages(input),
+          temperature: 0.7,
+          max_tokens: 2000,
+          stream,
+        }),
+        signal,
+      });
+
+      if (!groqResponse.ok) {
+        const errorText = await groqResponse.text();
+        throw new Error(`Groq API error: ${groqResponse.status} - ${errorText}`);
+      }
+      return groqResponse;
+    }
+
+    // Google Gemini API (Free tier)
+    const method = stream ? 'streamGenerateContent?alt=sse&' : 'generateContent?';
+    const geminiResponse = await fetch(`https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:${method}key=${apiKey}`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({
+        contents: [{
+          parts: [{
+            text: buildGeminiPrompt(input),
+          }]
+        }]
+      }),
+      signal,
+    });
+
+    if (!geminiResponse.ok) {
+      const errorText = await geminiResponse.text();
+      throw new Error(`Gemini API error: ${geminiResponse.status} - ${errorText}`);
+    }
+    return geminiResponse;
+  };
+
+  app.post('/api/ai/generate-tasks', authenticateToken, requirePermission('manage_tasks'), aiGenerateLimit, async (req: AuthRequest, res) => {
+    const wantsStream = (req.headers.accept || '').includes('text/event-stream');
+
     try {
       const { eventTitle, eventDescription, goals, team, expectedDate, expectedBudget } = req.body as {
         eventTitle?: string;
@@ -3059,198 +3003,167 @@ export async function registerRoutes(app: Express): Promise<Server> {
 
       // Use Groq API (free LLaMA 3) by default, fallback to Gemini if only that key is set
       const useGroq = !!process.env.GROQ_API_KEY;
-      const useGemini = !useGroq && !!process.env.GEMINI_API_KEY;
+      const input: AIPlanInput = { eventTitle, eventDescription, goals, team, expectedDate, expectedBudget };
+
+      if (!wantsStream) {
+        const response = await requestAICompletion(input, apiKey, useGroq, false);
+        const data = await response.json();
+        const content = useGroq
+          ? data.choices?.[0]?.message?.content
+          : data.candidates?.[0]?.content?.parts?.[0]?.text;
+        if (!content) {
+          throw new Error(`No response from ${useGroq ? 'Groq' : 'Gemini'} API`);
+        }
 
-      let aiResponse: any;
+        return res.json(normalizeAIResponse(parseAIJson(content)));
+      }
 
-      if (useGroq) {
-        // Groq API (LLaMA 3 - Free tier)
-        const groqResponse = await fetch('https://api.groq.com/openai/v1/chat/completions', {
-          method: 'POST',
-          headers: {
-            'Content-Type': 'application/json',
-            'Authorization': `Bearer ${apiKey}`,
-          },
-          body: JSON.stringify({
-            model: 'llama-3.1-8b-instant', // Free tier model
-            messages: [
-              {
-                role: 'system',
-                content: `You are an expert event planning assistant for club management. Generate structured task plans, budget suggestions, timelines, and team assignments based on event details. Always respond with valid JSON only, no markdown formatting.`,
-              },
-              {
-                role: 'user',
-                content: `Generate a comprehensive event planning breakdown for the following event:
-
-Event Title: ${eventTitle}
-${eventDescription ? `Description: ${eventDescription}` : ''}
-${goals ? `Goals: ${goals}` : ''}
-${team ? `Team/Department: ${team}` : ''}
-${expectedDate ? `Expected Date: ${expectedDate}` : ''}
-${expectedBudget ? `Expected Budget: ${expectedBudget}` : ''}
-
-Provide a JSON response with this exact structure:
-{
-  "tasks": [
-    {
-      "title": "Task title",
-      "description": "Detailed task description",
-      "assignedTo": "Suggested team or role (e.g., PR Team, Finance Team, Operations, Creatives)",
-      "dueDate": "YYYY-MM-DD format, calculated based on event date",
-      "priority": "High, Medium, or Low"
-    }
-  ],
-  "budgetSuggestions": [
-    {
-      "item": "Budget item name",
-      "estimatedAmount": "Amount as number or string"
-    }
-  ],
-  "timeline": [
-    {
-      "day": "Day number or relative day (e.g., 'Day -30', 'Week 1')",
-      "milestone": "Milestone description"
-    }
-  ],
-  "teamSuggestions": [
-    {
-      "role": "Team or role name",
-      "responsibility": "What this team should handle"
-    }
-  ]
-}
+      // Streaming mode: forward upstream tokens and emit each task as soon as it parses
+      const upstreamAbort = new AbortController();
+      // The request has already emitted 'close' once express.json read the
+      // body; only the response's 'close' tells us the client went away
+      res.on('close', () => {
+        if (!res.writableEnded) upstreamAbort.abort();
+      });
 
-Generate 5-8 relevant tasks, 3-5 budget items, 4-6 timeline milestones, and 2-4 team suggestions.`,
-              },
-            ],
-            temperature: 0.7,
-            max_tokens: 2000,
-          }),
-        });
+      const response = await requestAICompletion(input, apiKey, useGroq, true, upstreamAbort.signal);
+      if (!response.body) {
+        throw new Error(`No response from ${useGroq ? 'Groq' : 'Gemini'} API`);
+      }
 
-        if (!groqResponse.ok) {
-          const errorText = await groqResponse.text();
-          throw new Error(`Groq API error: ${groqResponse.status} - ${errorText}`);
+      res.status(200).set({
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache, no-transform',
+        'Connection': 'keep-alive',
+        'X-Accel-Buffering': 'no',
+      });
+      res.flushHeaders();
+
+      const parser = new TaskStreamParser();
+      for await (const payload of readEventStream(response.body)) {
+        if (payload === '[DONE]') break;
+
+        let token: string | undefined;
+        try {
+          const chunk = JSON.parse(payload);
+          token = useGroq
+            ? chunk.choices?.[0]?.delta?.content
+            : chunk.candidates?.[0]?.content?.parts?.[0]?.text;
+        } catch {
+          continue;
         }
+        if (!token) continue;
 
-        const groqData = await groqResponse.json();
-        const content = groqData.choices?.[0]?.message?.content;
-        if (!content) {
-          throw new Error('No response from Groq API');
-        }
+        sendSSE(res, 'token', { text: token });
+        const firstIndex = parser.taskCount;
+        parser.push(token).forEach((task, offset) => {
+          sendSSE(res, 'task', { index: firstIndex + offset, task });
+        });
+      }
 
-        // Parse JSON from response (may be wrapped in markdown code blocks)
-        let jsonText = content.trim();
-        if (jsonText.startsWith('```')) {
-          jsonText = jsonText.replace(/^```(?:json)?\n?/i, '').replace(/\n?```$/i, '');
-        }
-        aiResponse = JSON.parse(jsonText);
-      } else if (useGemini) {
-        // Google Gemini API (Free tier)
-        const geminiResponse = await fetch(`https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent?key=${apiKey}`, {
-          method: 'POST',
-          headers: {
-            'Content-Type': 'application/json',
-          },
-          body: JSON.stringify({
-            contents: [{
-              parts: [{
-                text: `You are an expert event planning assistant. Generate a comprehensive event planning breakdown for:
-
-Event Title: ${eventTitle}
-${eventDescription ? `Description: ${eventDescription}` : ''}
-${goals ? `Goals: ${goals}` : ''}
-${team ? `Team/Department: ${team}` : ''}
-${expectedDate ? `Expected Date: ${expectedDate}` : ''}
-${expectedBudget ? `Expected Budget: ${expectedBudget}` : ''}
-
-Respond with ONLY valid JSON (no markdown, no code blocks) in this exact structure:
-{
-  "tasks": [
-    {
-      "title": "Task title",
-      "description": "Detailed description",
-      "assignedTo": "Suggested team (PR, Finance, Operations, Creatives)",
-      "dueDate": "YYYY-MM-DD",
-      "priority": "High, Medium, or Low"
-    }
-  ],
-  "budgetSuggestions": [
-    {
-      "item": "Item name",
-      "estimatedAmount": "Amount"
-    }
-  ],
-  "timeline": [
-    {
-      "day": "Day description",
-      "milestone": "Milestone"
-    }
-  ],
-  "teamSuggestions": [
-    {
-      "role": "Team name",
-      "responsibility": "Responsibility"
-    }
-  ]
-}
+      let finalResponse: AIPlanResponse;
+      try {
+        finalResponse = normalizeAIResponse(parseAIJson(parser.content));
+      } catch (parseError) {
+        if (parser.taskCount === 0) throw parseError;
+        // Keep the tasks we already delivered even if the tail of the completion was malformed
+        finalResponse = normalizeAIResponse({ tasks: parser.tasks });
+      }
 
-Generate 5-8 tasks, 3-5 budget items, 4-6 timeline milestones, and 2-4 team suggestions.`
-              }]
-            }]
-          }),
-        });
+      sendSSE(res, 'done', finalResponse);
+      res.end();
+    } catch (error: any) {
+      if (error?.name === 'AbortError') {
+        return;
+      }
+      console.error('AI generate tasks error:', error);
+      const message = error.message || 'Failed to generate AI suggestions. Please try again.';
+      if (res.headersSent) {
+        sendSSE(res, 'error', { message });
+        return res.end();
+      }
+      res.status(500).json({ message });
+    }
+  });
 
-        if (!geminiResponse.ok) {
-          const errorText = await geminiResponse.text();
-          throw new Error(`Gemini API error: ${geminiResponse.status} - ${errorText}`);
-        }
+  // ============================================================
+  // SEARCH
+  // ============================================================
 
-        const geminiData = await geminiResponse.json();
-        const content = geminiData.candidates?.[0]?.content?.parts?.[0]?.text;
-        if (!content) {
-          throw new Error('No response from Gemini API');
-        }
+  const SEARCH_TYPES = ['members', 'events', 'tasks'] as const;
+  type SearchType = typeof SEARCH_TYPES[number];
+  const SEARCH_DEFAULT_LIMIT = 10;
+  const SEARCH_MAX_LIMIT = 50;
 
-        // Parse JSON from response
-        let jsonText = content.trim();
-        if (jsonText.startsWith('```')) {
-          jsonText = jsonText.replace(/^```(?:json)?\n?/i, '').replace(/\n?```$/i, '');
-        }
-        aiResponse = JSON.parse(jsonText);
-      } else {
-        throw new Error('No AI API key configured');
-      }
-
-      // Validate and normalize the response structure
-      const normalizedResponse = {
-        tasks: Array.isArray(aiResponse.tasks) ? aiResponse.tasks.map((task: any) => ({
-          title: String(task.title || 'Untitled Task'),
-          description: String(task.description || ''),
-          assignedTo: String(task.assignedTo || task.assigned_to || 'Unassigned'),
-          dueDate: String(task.dueDate || task.due_date || ''),
-          priority: String(task.priority || 'Medium'),
-        })) : [],
-        budgetSuggestions: Array.isArray(aiResponse.budgetSuggestions) ? aiResponse.budgetSuggestions.map((item: any) => ({
-          item: String(item.item || ''),
-          estimatedAmount: String(item.estimatedAmount || item.estimated_amount || '0'),
-        })) : [],
-        timeline: Array.isArray(aiResponse.timeline) ? aiResponse.timeline.map((item: any) => ({
-          day: String(item.day || ''),
-          milestone: String(item.milestone || ''),
-        })) : [],
-        teamSuggestions: Array.isArray(aiResponse.teamSuggestions) ? aiResponse.teamSuggestions.map((item: any) => ({
-          role: String(item.role || ''),
-          responsibility: String(item.responsibility || ''),
-        })) : [],
-      };
+  const parseSearchParams = (req: Request) => {
+    const query = String(req.query.q ?? '').trim().slice(0, 100);
+    const requested = String(req.query.types ?? '').split(',').map((type) => type.trim()).filter(Boolean);
+    const types = (requested.length ? requested : SEARCH_TYPES).filter((type): type is SearchType =>
+      (SEARCH_TYPES as readonly string[]).includes(type),
+    );
+    const parsedLimit = parseInt(String(req.query.limit ?? ''), 10);
+    const limit = Number.isFinite(parsedLimit) && parsedLimit > 0 ? Math.min(parsedLimit, SEARCH_MAX_LIMIT) : SEARCH_DEFAULT_LIMIT;
+    return { query, types, limit };
+  };
 
-      res.json(normalizedResponse);
+  const runSearch = async (clubIds: string[], query: string, types: SearchType[], limit: number) => {
+    const [members, events, tasks] = await Promise.all([
+      types.includes('members') ? storage.searchMembers(clubIds, query, limit) : [],
+      types.includes('events') ? storage.searchEvents(clubIds, query, limit) : [],
+      types.includes('tasks') ? storage.searchTasks(clubIds, query, limit) : [],
+    ]);
+    return { members, events, tasks };
+  };
+
+  // Typeahead search within the user's club. Each result type needs the
+  // same permission as the page that lists it.
+  app.get('/api/search', authenticateToken, async (req: AuthRequest, res) => {
+    try {
+      const { query, types, limit } = parseSearchParams(req);
+      if (query.length < 2) {
+        return res.status(400).json({ message: 'Search query must be at least 2 characters' });
+      }
+
+      const mask = req.user!.permissionMask;
+      const allowed = types.filter((type) =>
+        type === 'members' ? hasPermissionBit(mask, 'view_members')
+          : type === 'events' ? hasPermissionBit(mask, 'manage_events')
+          : hasPermissionBit(mask, 'manage_tasks'),
+      );
+
+      const results = await runSearch([req.user!.clubId], query, allowed, limit);
+      res.json({ query, ...results });
     } catch (error: any) {
-      console.error('AI generate tasks error:', error);
-      res.status(500).json({
-        message: error.message || 'Failed to generate AI suggestions. Please try again.'
+      console.error('Search error:', error);
+      res.status(500).json({ message: 'Server error' });
+    }
+  });
+
+  // Search across the clubs an institution user can see (department-scoped
+  // users only get their department's clubs)
+  app.get('/api/institution/search', authenticateInstitutionToken, async (req: InstitutionAuthRequest, res) => {
+    try {
+      const { query, types, limit } = parseSearchParams(req);
+      if (query.length < 2) {
+        return res.status(400).json({ message: 'Search query must be at least 2 characters' });
+      }
+
+      const scopedClubs = await storage.getClubsByInstitution(tenantScopeFor(req.institutionUser!));
+      const clubNames = new Map(scopedClubs.map((club) => [club.id, club.name]));
+
+      const results = await runSearch(Array.from(clubNames.keys()), query, types, limit);
+      const withClubName = <T extends { clubId: string }>(rows: T[]) =>
+        rows.map((row) => ({ ...row, clubName: clubNames.get(row.clubId) ?? null }));
+
+      res.json({
+        query,
+        members: withClubName(results.members),
+        events: withClubName(results.events),
+        tasks: withClubName(results.tasks),
       });
+    } catch (error: any) {
+      console.error('Institution search error:', error);
+      res.status(500).json({ message: 'Server error' });
     }
   });
 
@@ -3266,14 +3179,14 @@ Generate 5-8 tasks, 3-5 budget items, 4-6 timeline milestones, and 2-4 team sugg
 
       console.log('[DASHBOARD STATS]', { clubId, userId, email: req.user!.email });
 
-      const userPerms = req.user!.permissions;
-      const canViewStats = hasPermission(userPerms, 'view_dashboard_stats');
-      const canViewApprovals = hasPermission(userPerms, 'view_approvals');
-      const canViewMembers = hasPermission(userPerms, 'view_members');
-      const canManageEvents = hasPermission(userPerms, 'manage_events');
-      const canManageTasks = hasPermission(userPerms, 'manage_tasks');
-      const canManageFinance = hasPermission(userPerms, 'manage_finance');
-      const canManageSocial = hasPermission(userPerms, 'manage_social');
+      const userPerms = req.user!.permissionMask;
+      const canViewStats = hasPermissionBit(userPerms, 'view_dashboard_stats');
+      const canViewApprovals = hasPermissionBit(userPerms, 'view_approvals');
+      const canViewMembers = hasPermissionBit(userPerms, 'view_members');
+      const canManageEvents = hasPermissionBit(userPerms, 'manage_events');
+      const canManageTasks = hasPermissionBit(userPerms, 'manage_tasks');
+      const canManageFinance = hasPermissionBit(userPerms, 'manage_finance');
+      const canManageSocial = hasPermissionBit(userPerms, 'manage_social');
 
       // Only fetch data if user has permission to view stats
       if (!canViewStats) {
@@ -3308,7 +3221,7 @@ Generate 5-8 tasks, 3-5 budget items, 4-6 timeline milestones, and 2-4 team sugg
       }
 
       if (canManageFinance) {
-        promises.push(storage.getFinanceByClub(clubId));
+        promises.push(storage.getFinanceTotals(clubId));
       } else {
         promises.push(Promise.resolve([]));
       }
@@ -3319,7 +3232,7 @@ Generate 5-8 tasks, 3-5 budget items, 4-6 timeline milestones, and 2-4 team sugg
         promises.push(Promise.resolve([]));
       }
 
-      const [pendingMembers, members, events, tasks, finance, socialPosts] = await Promise.all(promises);
+      const [pendingMembers, members, events, tasks, financeTotals, socialPosts] = await Promise.all(promises);
 
       const coreMembersCount = canViewMembers
         ? members.filter(
@@ -3330,18 +3243,6 @@ Generate 5-8 tasks, 3-5 budget items, 4-6 timeline milestones, and 2-4 team sugg
         ).length
         : 0;
 
-      const totalIncome = canManageFinance
-        ? finance
-          .filter((f: Finance) => f.type === 'income' && f.status === 'Approved')
-          .reduce((sum: number, f: Finance) => sum + parseFloat(f.amount), 0)
-        : 0;
-
-      const totalExpense = canManageFinance
-        ? finance
-          .filter((f: Finance) => f.type === 'expense' && f.status === 'Approved')
-          .reduce((sum: number, f: Finance) => sum + parseFloat(f.amount), 0)
-        : 0;
-
       const response = {
         pendingMembers: canViewApprovals ? pendingMembers.length : null,
         totalMembers: canViewMembers ? members.length : null,
@@ -3350,8 +3251,8 @@ Generate 5-8 tasks, 3-5 budget items, 4-6 timeline milestones, and 2-4 team sugg
         upcomingEvents: canManageEvents ? events.filter((e: Event) => new Date(e.date) > new Date()).length : null,
         pendingTasks: canManageTasks ? tasks.filter((t: Task) => t.status === 'Pending').length : null,
         myTasks: canManageTasks ? tasks.filter((t: Task) => t.assignedToId === userId && t.status !== 'Done').length : null,
-        balance: canManageFinance ? totalIncome - totalExpense : null,
-        pendingTransactions: canManageFinance ? finance.filter((f: Finance) => f.status === 'Pending').length : null,
+        balance: canManageFinance ? financeTotals.balance : null,
+        pendingTransactions: canManageFinance ? financeTotals.pending : null,
         scheduledPosts: canManageSocial ? socialPosts.filter((p: SocialPost) => p.status === 'Scheduled').length : null,
         draftPosts: canManageSocial ? socialPosts.filter((p: SocialPost) => p.status === 'Draft').length : null,
       };
@@ -3594,6 +3495,28 @@ Generate 5-8 tasks, 3-5 budget items, 4-6 timeline milestones, and 2-4 team sugg
     }
   });
 
+  // ============================================================
+  // INTERNAL INSTRUMENTATION
+  // ============================================================
+
+  // Process-level metrics (dispatcher lag/throughput, etc). Disabled unless METRICS_TOKEN is set.
+  app.get('/api/internal/metrics', async (req, res) => {
+    const metricsToken = process.env.METRICS_TOKEN;
+    if (!metricsToken) {
+      return res.status(404).json({ message: 'Not found' });
+    }
+    if (req.headers['x-metrics-token'] !== metricsToken) {
+      return res.status(403).json({ message: 'Access denied' });
+    }
+
+    try {
+      res.json(await collectMetrics());
+    } catch (error: any) {
+      console.error('Metrics error:', error);
+      res.status(500).json({ message: 'Failed to collect metrics' });
+    }
+  });
+
   const httpServer = createServer(app);
   // ============================================================
   // ELECTION ROUTES
@@ -3781,7 +3704,7 @@ Generate 5-8 tasks, 3-5 budget items, 4-6 timeline milestones, and 2-4 team sugg
   });
 
   // Cast a vote
-  app.post('/api/elections/:accessCode/vote', async (req, res) => {
+  app.post('/api/elections/:accessCode/vote', voteLimit, async (req, res) => {
     try {
       const { accessCode } = req.params;
       const { candidateId } = req.body;
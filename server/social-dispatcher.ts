@@ -0,0 +1,253 @@
+import fs from "fs";
+import path from "path";
+import type { SocialPost } from "@shared/schema";
+import { storage } from "./storage";
+import { log } from "./app";
+import { registerMetricsSource } from "./metrics";
+
+// ============================================================
+// PUBLISHERS
+// ============================================================
+
+export interface SocialPublisher {
+  name: string;
+  publish(post: SocialPost): Promise<void>;
+}
+
+// Mock sink: only logs what would have been published
+export class LogPublisher implements SocialPublisher {
+  name = "log";
+
+  async publish(post: SocialPost) {
+    log(`publish ${post.platform} post ${post.id} for club ${post.clubId}`, "social");
+  }
+}
+
+// Appends one JSON line per published post; handy for local runs and tests
+export class FilePublisher implements SocialPublisher {
+  name = "file";
+
+  constructor(private filePath: string) {}
+
+  async publish(post: SocialPost) {
+    await fs.promises.mkdir(path.dirname(this.filePath), { recursive: true });
+    const line = JSON.stringify({
+      id: post.id,
+      clubId: post.clubId,
+      platform: post.platform,
+      caption: post.caption,
+      imageUrl: post.imageUrl,
+      scheduledDate: post.scheduledDate,
+      publishedAt: new Date().toISOString(),
+    });
+    await fs.promises.appendFile(this.filePath, `${line}\n`);
+  }
+}
+
+// Forwards each post to an external integration endpoint
+export class WebhookPublisher implements SocialPublisher {
+  name = "webhook";
+
+  constructor(private url: string, private timeoutMs = 10000) {}
+
+  async publish(post: SocialPost) {
+    const response = await fetch(this.url, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify(post),
+      signal: AbortSignal.timeout(this.timeoutMs),
+    });
+    if (!response.ok) {
+      throw new Error(`Webhook responded with ${response.status}`);
+    }
+  }
+}
+
+export function createPublisherFromEnv(): SocialPublisher {
+  const kind = (process.env.SOCIAL_PUBLISHER || "log").toLowerCase();
+  if (kind === "file") {
+    return new FilePublisher(process.env.SOCIAL_PUBLISHER_FILE || path.resolve("social-outbox.jsonl"));
+  }
+  if (kind === "webhook") {
+    if (!process.env.SOCIAL_PUBLISHER_URL) {
+      throw new Error("SOCIAL_PUBLISHER_URL must be set when SOCIAL_PUBLISHER=webhook");
+    }
+    return new WebhookPublisher(process.env.SOCIAL_PUBLISHER_URL);
+  }
+  return new LogPublisher();
+}
+
+// ============================================================
+// DISPATCHER
+// ============================================================
+
+type DispatcherOptions = {
+  publisher: SocialPublisher;
+  intervalMs: number;
+  batchSize: number;
+  concurrency: number;
+  leaseMs: number;
+};
+
+const THROUGHPUT_WINDOW_MS = 60_000;
+
+export class SocialPostDispatcher {
+  private timer: NodeJS.Timeout | null = null;
+  private inFlight: Promise<void> | null = null;
+  private stopped = true;
+  private completions: Array<{ at: number; count: number }> = [];
+  private stats = {
+    ticks: 0,
+    claimed: 0,
+    posted: 0,
+    failed: 0,
+    lastTickAt: null as string | null,
+    lastBatchSize: 0,
+    lastLagMs: 0,
+    maxLagMs: 0,
+  };
+
+  constructor(private options: DispatcherOptions) {}
+
+  start() {
+    if (!this.stopped) return;
+    this.stopped = false;
+    this.schedule(0);
+    log(
+      `social dispatcher started (publisher=${this.options.publisher.name}, interval=${this.options.intervalMs}ms, batch=${this.options.batchSize})`,
+      "social",
+    );
+  }
+
+  async stop() {
+    this.stopped = true;
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    await this.inFlight;
+  }
+
+  private schedule(delay: number) {
+    this.timer = setTimeout(() => {
+      this.inFlight = this.tick()
+        .catch((error) => console.error("Social dispatcher tick error:", error))
+        .finally(() => {
+          this.inFlight = null;
+          if (!this.stopped) this.schedule(this.options.intervalMs);
+        });
+    }, delay);
+    this.timer.unref();
+  }
+
+  // Keeps claiming while batches come back full, so a large backlog is
+  // drained without waiting for the next poll interval.
+  async tick() {
+    const { batchSize, leaseMs } = this.options;
+    this.stats.ticks += 1;
+    this.stats.lastTickAt = new Date().toISOString();
+
+    let batch: SocialPost[];
+    do {
+      const now = new Date();
+      batch = await storage.claimDueSocialPosts(now, batchSize, new Date(now.getTime() - leaseMs));
+      this.stats.lastBatchSize = batch.length;
+      if (batch.length) {
+        await this.dispatchBatch(batch, now);
+      }
+    } while (batch.length === batchSize && !this.stopped);
+  }
+
+  private async dispatchBatch(batch: SocialPost[], claimedAt: Date) {
+    this.stats.claimed += batch.length;
+
+    let batchLag = 0;
+    batch.forEach((post) => {
+      if (post.scheduledDate) {
+        batchLag = Math.max(batchLag, claimedAt.getTime() - new Date(post.scheduledDate).getTime());
+      }
+    });
+    this.stats.lastLagMs = batchLag;
+    this.stats.maxLagMs = Math.max(this.stats.maxLagMs, batchLag);
+
+    const postedIds: string[] = [];
+    const { publisher, concurrency } = this.options;
+
+    for (let i = 0; i < batch.length; i += concurrency) {
+      const slice = batch.slice(i, i + concurrency);
+      const results = await Promise.allSettled(slice.map((post) => publisher.publish(post)));
+
+      for (let j = 0; j < results.length; j++) {
+        const result = results[j];
+        if (result.status === "fulfilled") {
+          postedIds.push(slice[j].id);
+        } else {
+          const message = result.reason?.message || String(result.reason);
+          console.error("Social publish error:", { postId: slice[j].id, error: message });
+          await storage.markSocialPostFailed(slice[j].id, message.slice(0, 500));
+          this.stats.failed += 1;
+        }
+      }
+    }
+
+    await storage.markSocialPostsPosted(postedIds, new Date());
+    this.stats.posted += postedIds.length;
+    this.recordCompletions(postedIds.length);
+  }
+
+  private recordCompletions(count: number) {
+    const now = Date.now();
+    this.completions.push({ at: now, count });
+    while (this.completions.length && this.completions[0].at < now - THROUGHPUT_WINDOW_MS) {
+      this.completions.shift();
+    }
+  }
+
+  getStats() {
+    const cutoff = Date.now() - THROUGHPUT_WINDOW_MS;
+    const postedLastMinute = this.completions
+      .filter((entry) => entry.at >= cutoff)
+      .reduce((sum, entry) => sum + entry.count, 0);
+
+    return {
+      running: !this.stopped,
+      publisher: this.options.publisher.name,
+      ...this.stats,
+      postedLastMinute,
+    };
+  }
+}
+
+const readIntEnv = (name: string, fallback: number) => {
+  const parsed = parseInt(process.env[name] || "", 10);
+  return Number.isFinite(parsed) && parsed > 0 ? parsed : fallback;
+};
+
+let activeDispatcher: SocialPostDispatcher | null = null;
+
+export function startSocialDispatcher(publisher: SocialPublisher = createPublisherFromEnv()) {
+  if (activeDispatcher) return activeDispatcher;
+
+  activeDispatcher = new SocialPostDispatcher({
+    publisher,
+    intervalMs: readIntEnv("SOCIAL_DISPATCH_INTERVAL_MS", 15000),
+    batchSize: readIntEnv("SOCIAL_DISPATCH_BATCH_SIZE", 100),
+    concurrency: readIntEnv("SOCIAL_DISPATCH_CONCURRENCY", 10),
+    leaseMs: readIntEnv("SOCIAL_DISPATCH_LEASE_MS", 5 * 60 * 1000),
+  });
+
+  const dispatcher = activeDispatcher;
+  registerMetricsSource("socialDispatcher", async () => {
+    const backlog = await storage.countDueSocialPosts(new Date());
+    return { ...dispatcher.getStats(), backlog };
+  });
+
+  dispatcher.start();
+  return dispatcher;
+}
+
+export async function stopSocialDispatcher() {
+  if (!activeDispatcher) return;
+  await activeDispatcher.stop();
+  activeDispatcher = null;
+}
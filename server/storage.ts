@@ -47,9 +47,302 @@ import {
   type Election,
   type ElectionCandidate,
   type ElectionVote,
+  userSearchDocument,
+  eventSearchDocument,
+  taskSearchDocument,
+  institutionDailyActivity,
+  institutionActivityRollups,
+  financeLedger,
+  financeBalances,
+  financeMonthlyRollups,
 } from "@shared/schema";
-import { db } from "./db";
-import { eq, and, sql, inArray } from "drizzle-orm";
+import { db, statementName } from "./db";
+import { MemoryStorage } from "./memory-storage";
+import {
+  centsToDecimal,
+  findDiscrepancies,
+  financeMonth,
+  ledgerAdjustments,
+  ledgerEffects,
+  summarizeFinance,
+  toCents,
+  type FinanceCategory,
+  type FinanceDiscrepancy,
+  type LedgerEffect,
+} from "./finance-ledger";
+import { eq, and, or, lt, lte, asc, desc, sql, inArray, type SQL } from "drizzle-orm";
+import type { PgColumn } from "drizzle-orm/pg-core";
+
+// Lookups on the request hot path (the auth middlewares run the first four
+// on every authenticated request) are built once and executed as prepared
+// statements instead of being rebuilt and re-planned per call.
+const prepared = {
+  userById: db
+    .select()
+    .from(users)
+    .where(eq(users.id, sql.placeholder("id")))
+    .prepare(statementName("user_by_id")),
+  clubById: db
+    .select()
+    .from(clubs)
+    .where(eq(clubs.id, sql.placeholder("id")))
+    .prepare(statementName("club_by_id")),
+  roleById: db
+    .select()
+    .from(roles)
+    .where(eq(roles.id, sql.placeholder("id")))
+    .prepare(statementName("role_by_id")),
+  institutionUserById: db
+    .select()
+    .from(institutionUsers)
+    .where(eq(institutionUsers.id, sql.placeholder("id")))
+    .prepare(statementName("institution_user_by_id")),
+  userByEmail: db
+    .select()
+    .from(users)
+    .where(eq(users.email, sql.placeholder("email")))
+    .prepare(statementName("user_by_email")),
+  teamById: db
+    .select()
+    .from(teams)
+    .where(eq(teams.id, sql.placeholder("id")))
+    .prepare(statementName("team_by_id")),
+};
+
+// One club from a bulk import, with the president account to create for it
+export type ClubWithPresident = {
+  club: InsertClub;
+  president: Omit<InsertUser, "clubId"> | null;
+};
+
+export type MemberSearchResult = Pick<User, "id" | "clubId" | "name" | "email" | "role" | "idNumber" | "canLogin">;
+export type EventSearchResult = Pick<Event, "id" | "clubId" | "title" | "status" | "date">;
+export type TaskSearchResult = Pick<Task, "id" | "clubId" | "eventId" | "title" | "status" | "dueDate">;
+
+// Below this length trigram indexes can't narrow anything down, so short
+// queries only use the full-text prefix match.
+const MIN_TRIGRAM_QUERY_LENGTH = 3;
+
+// Every word of the query has to match the start of a token: "jo sm" -> "jo:* & sm:*"
+function toPrefixTsQuery(query: string): string | null {
+  const terms = query.toLowerCase().split(/[^\p{L}\p{N}]+/u).filter(Boolean);
+  return terms.length ? terms.map((term) => `${term}:*`).join(" & ") : null;
+}
+
+const escapeLike = (query: string) => query.toLowerCase().replace(/[\\%_]/g, "\\$&");
+const toContainsPattern = (query: string) => `%${escapeLike(query)}%`;
+const toPrefixPattern = (query: string) => `${escapeLike(query)}%`;
+
+// WHERE clause shared by the search methods. Full-text matches use the
+// *_search_idx indexes; substring matches use the *_trgm_idx ones.
+function buildSearchFilter(document: SQL, query: string, trigramColumns: SQL[]) {
+  const tsQuery = toPrefixTsQuery(query);
+  const conditions: SQL[] = [];
+  if (tsQuery) conditions.push(sql`${document} @@ to_tsquery('simple', ${tsQuery})`);
+  if (query.length >= MIN_TRIGRAM_QUERY_LENGTH) {
+    const pattern = toContainsPattern(query);
+    trigramColumns.forEach((column) => conditions.push(sql`${column} like ${pattern}`));
+  }
+  return conditions.length ? or(...conditions) : undefined;
+}
+
+export type HeatmapGranularity = "day" | "week" | "month";
+
+export type ActivityHeatmapRange = {
+  from: string | null; // YYYY-MM-DD, inclusive; null means one year back
+  to: string | null; // YYYY-MM-DD, inclusive; null means no upper bound
+  granularity: HeatmapGranularity;
+};
+
+export type ActivityHeatmapBucket = { date: string; intensity: number };
+
+// Heatmap weights: an event counts as one unit of activity, a new task as half.
+// The query casts them to numeric; untyped, Postgres would infer the
+// parameter as bigint from sum() and reject 0.5.
+const HEATMAP_EVENT_WEIGHT = 1;
+const HEATMAP_TASK_WEIGHT = 0.5;
+
+// Keeps multi-row inserts well below Postgres' 65535 bind parameter limit
+const INSERT_CHUNK_SIZE = 500;
+
+// The clubs an institution-side read covers: the whole institution, or with
+// `department` set, only that department's clubs (matched case-insensitively;
+// "" selects clubs without one). See tenantScopeFor in routes.ts.
+export type TenantScope = { institutionId: string; department?: string | null };
+
+function clubScopeCondition(scope: TenantScope) {
+  const inInstitution = eq(clubs.institutionId, scope.institutionId);
+  if (scope.department == null) return inInstitution;
+  return and(inInstitution, sql`lower(coalesce(${clubs.department}, '')) = ${scope.department.toLowerCase()}`);
+}
+
+// Scope as a subquery, so a *ByInstitution read is a single statement
+// instead of a club lookup followed by an IN list of every club id
+function scopedClubIds(scope: TenantScope) {
+  return db.select({ id: clubs.id }).from(clubs).where(clubScopeCondition(scope));
+}
+
+// Conditional updates behind the PATCH routes. The row is written only if it
+// belongs to the caller's club, every row the update points it at (event,
+// assignee, team) is in that club too, and, when the caller sent a version,
+// nobody has changed the row since. All of that is part of the UPDATE, so an
+// accepted edit is one round trip; only a rejected one reads the row back to
+// report why.
+export type ClubReference = "eventId" | "assignedToId" | "teamId";
+export type UpdateCondition = { clubId: string; version?: number };
+export type ConditionalUpdate<T> =
+  | { status: "updated"; row: T }
+  | { status: "not_found" }
+  | { status: "version_conflict"; current: T }
+  | { status: "invalid_reference"; field: ClubReference };
+
+const REFERENCED_TABLES = { eventId: events, assignedToId: users, teamId: teams };
+
+// events, tasks, finance and social_posts count every write in `version`
+const nextVersion = (column: PgColumn) => sql`${column} + 1`;
+
+const versionMatches = (column: PgColumn, condition: UpdateCondition) =>
+  condition.version === undefined ? undefined : eq(column, condition.version);
+
+// One EXISTS per reference the update sets; clearing a reference needs no check
+function referenceChecks(data: Partial<Record<ClubReference, string | null>>, clubId: string) {
+  return (Object.keys(REFERENCED_TABLES) as ClubReference[]).flatMap((field) => {
+    const id = data[field];
+    if (!id) return [];
+    const table = REFERENCED_TABLES[field];
+    return [{ field, check: sql`exists (select 1 from ${table} where ${table.id} = ${id} and ${table.clubId} = ${clubId})` }];
+  });
+}
+
+type ReferenceCheck = ReturnType<typeof referenceChecks>[number];
+
+function failedReference(checks: ReferenceCheck[]) {
+  if (checks.length === 0) return sql<ClubReference | null>`null`;
+  const cases = checks.map(({ field, check }) => sql`when not ${check} then ${field}`);
+  return sql<ClubReference | null>`case ${sql.join(cases, sql` `)} end`;
+}
+
+// Runs a conditional UPDATE and, if it matched nothing, reads the row back
+// to say why. When every check passes on the re-read, another write landed
+// between the two statements. A caller that sent a version lost that race
+// and gets a conflict. One that didn't never asked for that check, so the
+// update is tried again instead.
+async function runConditionalUpdate<T extends { version: number }>(
+  condition: UpdateCondition,
+  update: () => Promise<T | undefined>,
+  reread: () => Promise<{ row: T; failedReference: ClubReference | null } | undefined>,
+  attemptsLeft = 2,
+): Promise<ConditionalUpdate<T>> {
+  const updated = await update();
+  if (updated) return { status: "updated", row: updated };
+  const found = await reread();
+  if (!found) return { status: "not_found" };
+  if (condition.version !== undefined && found.row.version !== condition.version) {
+    return { status: "version_conflict", current: found.row };
+  }
+  if (found.failedReference) return { status: "invalid_reference", field: found.failedReference };
+  if (condition.version !== undefined) return { status: "version_conflict", current: found.row };
+  if (attemptsLeft > 1) return runConditionalUpdate(condition, update, reread, attemptsLeft - 1);
+  throw new Error("Conditional update kept racing with concurrent writes");
+}
+
+// Per-club books kept by the finance write paths, in currency units. Clubs
+// without finance entries have no stored row and read as zeros.
+export type ClubFinanceTotals = { clubId: string; balance: number; spend: number; pending: number };
+export type FinanceMonthlyTotals = { month: string; category: FinanceCategory; spend: number; balance: number };
+
+type Transaction = Parameters<Parameters<typeof db.transaction>[0]>[0];
+
+function financeAction(before: Finance | undefined, after: Finance | undefined) {
+  if (!before) return "created";
+  if (!after) return "deleted";
+  return after.status === "Approved" && before.status !== "Approved" ? "approved" : "updated";
+}
+
+// Appends effects to a club's ledger and moves its finance_balances row and
+// rollups by the same amounts. The balances upsert comes first and locks the
+// club's row, so concurrent writes to one club append one after the other
+// and each running balance follows from the last.
+async function appendToLedger(
+  tx: Transaction,
+  clubId: string,
+  financeId: string | null,
+  action: string,
+  effects: LedgerEffect[],
+  pending: number,
+) {
+  const balanceChange = effects.reduce((sum, effect) => sum + effect.balance, 0);
+  const spendChange = effects.reduce((sum, effect) => sum + effect.spend, 0);
+  const [totals] = await tx
+    .insert(financeBalances)
+    .values({ clubId, balance: centsToDecimal(balanceChange), spend: centsToDecimal(spendChange), pending })
+    .onConflictDoUpdate({
+      target: financeBalances.clubId,
+      set: {
+        balance: sql`${financeBalances.balance} + excluded.balance`,
+        spend: sql`${financeBalances.spend} + excluded.spend`,
+        pending: sql`${financeBalances.pending} + excluded.pending`,
+        updatedAt: sql`now()`,
+      },
+    })
+    .returning({ balance: financeBalances.balance });
+  if (effects.length === 0) return;
+
+  let running = toCents(totals.balance) - balanceChange;
+  await tx.insert(financeLedger).values(
+    effects.map((effect) => {
+      running += effect.balance;
+      return {
+        clubId,
+        financeId,
+        action,
+        month: effect.month,
+        category: effect.category,
+        spendChange: centsToDecimal(effect.spend),
+        balanceChange: centsToDecimal(effect.balance),
+        balanceAfter: centsToDecimal(running),
+      };
+    }),
+  );
+  await tx
+    .insert(financeMonthlyRollups)
+    .values(
+      effects.map((effect) => ({
+        clubId,
+        month: effect.month,
+        category: effect.category,
+        spend: centsToDecimal(effect.spend),
+        balanceChange: centsToDecimal(effect.balance),
+      })),
+    )
+    .onConflictDoUpdate({
+      target: [financeMonthlyRollups.clubId, financeMonthlyRollups.month, financeMonthlyRollups.category],
+      set: {
+        spend: sql`${financeMonthlyRollups.spend} + excluded.spend`,
+        balanceChange: sql`${financeMonthlyRollups.balanceChange} + excluded.balance_change`,
+      },
+    });
+}
+
+// Records one finance write, given the row before it (none for a create) and
+// after it (none for a delete). Writes that change no money and no pending
+// count, like a receipt upload, leave the books alone.
+async function recordFinanceWrite(tx: Transaction, before: Finance | undefined, after: Finance | undefined) {
+  const { effects, pending } = ledgerEffects(before, after);
+  if (effects.length === 0 && pending === 0) return;
+  const entry = (after ?? before)!;
+  await appendToLedger(tx, entry.clubId, entry.id, financeAction(before, after), effects, pending);
+}
+
+const toFinanceTotals = (
+  clubId: string,
+  row?: { balance: string; spend: string; pending: number },
+): ClubFinanceTotals => ({
+  clubId,
+  balance: row ? parseFloat(row.balance) : 0,
+  spend: row ? parseFloat(row.spend) : 0,
+  pending: row?.pending ?? 0,
+});
 
 export interface IStorage {
   // Institution operations
@@ -75,22 +368,27 @@ export interface IStorage {
   createClub(club: InsertClub): Promise<Club>;
   updateClub(id: string, data: Partial<InsertClub>): Promise<Club | undefined>;
   deleteClub(id: string): Promise<void>;
-  getClubsByInstitution(institutionId: string): Promise<Club[]>;
+  getClubsByInstitution(scope: TenantScope): Promise<Club[]>;
+  findExistingClubCodes(codes: string[]): Promise<string[]>;
+  createClubsWithPresidents(entries: ClubWithPresident[]): Promise<Array<{ club: Club; president: User | null }>>;
 
   // User operations
   getUser(id: string): Promise<User | undefined>;
   getUserByEmail(email: string): Promise<User | undefined>;
+  findExistingUserEmails(emails: string[]): Promise<string[]>;
   getUsersByClub(clubId: string): Promise<User[]>;
-  getUsersByInstitution(institutionId: string): Promise<User[]>;
+  getUsersByInstitution(scope: TenantScope): Promise<User[]>;
   createUser(user: InsertUser): Promise<User>;
   updateUser(id: string, data: Partial<InsertUser>): Promise<User | undefined>;
 
   // Pending member operations
   getPendingMembersByClub(clubId: string): Promise<PendingMember[]>;
-  getPendingMembersByInstitution(institutionId: string): Promise<PendingMember[]>;
+  getPendingMembersByInstitution(scope: TenantScope): Promise<PendingMember[]>;
   createPendingMember(member: InsertPendingMember): Promise<PendingMember>;
   getPendingMember(id: string): Promise<PendingMember | undefined>;
   deletePendingMember(id: string): Promise<void>;
+  approvePendingMembers(clubId: string, ids: string[], role: string, canLogin: boolean): Promise<{ approvedIds: string[] }>;
+  rejectPendingMembers(clubId: string, ids: string[]): Promise<string[]>;
 
   // Role operations
   getRolesByClub(clubId: string): Promise<Role[]>;
@@ -103,12 +401,12 @@ export interface IStorage {
   getEventsByClub(clubId: string): Promise<Event[]>;
   getEvent(id: string): Promise<Event | undefined>;
   createEvent(event: InsertEvent): Promise<Event>;
-  updateEvent(id: string, data: Partial<InsertEvent>): Promise<Event | undefined>;
+  updateEventInClub(id: string, condition: UpdateCondition, data: Partial<InsertEvent>): Promise<ConditionalUpdate<Event>>;
   deleteEvent(id: string): Promise<void>;
 
   countEventsByStatus(clubId: string, status: string): Promise<number>;
   countUpcomingEvents(clubId: string, current: Date): Promise<number>;
-  getEventsByInstitution(institutionId: string): Promise<Event[]>;
+  getEventsByInstitution(scope: TenantScope): Promise<Event[]>;
 
   // Team operations
   getTeamsByClub(clubId: string): Promise<Team[]>;
@@ -126,9 +424,9 @@ export interface IStorage {
   getTasksByClub(clubId: string): Promise<Task[]>;
   getTasksByEvent(eventId: string): Promise<Task[]>;
   getTask(id: string): Promise<Task | undefined>;
-  getTasksByInstitution(institutionId: string): Promise<Task[]>;
+  getTasksByInstitution(scope: TenantScope): Promise<Task[]>;
   createTask(task: InsertTask): Promise<Task>;
-  updateTask(id: string, data: Partial<InsertTask>): Promise<Task | undefined>;
+  updateTaskInClub(id: string, condition: UpdateCondition, data: Partial<InsertTask>): Promise<ConditionalUpdate<Task>>;
   deleteTask(id: string): Promise<void>;
 
   countTasksByStatus(clubId: string, status: string): Promise<number>;
@@ -136,22 +434,49 @@ export interface IStorage {
 
   // Finance operations
   getFinanceByClub(clubId: string): Promise<Finance[]>;
-  getFinanceByInstitution(institutionId: string): Promise<Finance[]>;
+  getFinanceByInstitution(scope: TenantScope): Promise<Finance[]>;
   getFinanceEntry(id: string): Promise<Finance | undefined>;
   createFinanceEntry(entry: InsertFinance): Promise<Finance>;
   updateFinanceEntry(id: string, data: Partial<InsertFinance>): Promise<Finance | undefined>;
+  updateFinanceEntryInClub(
+    id: string,
+    condition: UpdateCondition,
+    data: Partial<InsertFinance>,
+  ): Promise<ConditionalUpdate<Finance>>;
   deleteFinanceEntry(id: string): Promise<void>;
   sumFinanceByStatus(clubId: string, type: 'income' | 'expense', status: string): Promise<number>;
   countFinanceByStatus(clubId: string, status: string): Promise<number>;
+  getRecentFinanceByInstitution(scope: TenantScope, limit: number): Promise<Finance[]>;
+  getFinanceTotals(clubId: string): Promise<ClubFinanceTotals>;
+  getFinanceTotalsByInstitution(scope: TenantScope): Promise<ClubFinanceTotals[]>;
+  getFinanceMonthlyByInstitution(scope: TenantScope): Promise<FinanceMonthlyTotals[]>;
+  reconcileFinanceLedger(clubId: string, repair?: boolean): Promise<FinanceDiscrepancy[]>;
 
   // Social post operations
   getSocialPostsByClub(clubId: string): Promise<SocialPost[]>;
-  getSocialPostsByInstitution(institutionId: string): Promise<SocialPost[]>;
+  getSocialPostsByInstitution(scope: TenantScope): Promise<SocialPost[]>;
   getSocialPost(id: string): Promise<SocialPost | undefined>;
   createSocialPost(post: InsertSocialPost): Promise<SocialPost>;
-  updateSocialPost(id: string, data: Partial<InsertSocialPost>): Promise<SocialPost | undefined>;
+  updateSocialPostInClub(
+    id: string,
+    condition: UpdateCondition,
+    data: Partial<InsertSocialPost>,
+  ): Promise<ConditionalUpdate<SocialPost>>;
   deleteSocialPost(id: string): Promise<void>;
   countSocialPostsByStatus(clubId: string, status: string): Promise<number>;
+  claimDueSocialPosts(now: Date, limit: number, leaseExpiredBefore: Date): Promise<SocialPost[]>;
+  markSocialPostsPosted(ids: string[], postedAt: Date): Promise<void>;
+  markSocialPostFailed(id: string, error: string): Promise<void>;
+  countDueSocialPosts(now: Date): Promise<number>;
+
+  // Search operations (scoped to the given clubs)
+  searchMembers(clubIds: string[], query: string, limit: number): Promise<MemberSearchResult[]>;
+  searchEvents(clubIds: string[], query: string, limit: number): Promise<EventSearchResult[]>;
+  searchTasks(clubIds: string[], query: string, limit: number): Promise<TaskSearchResult[]>;
+
+  // Institution activity heatmap
+  refreshInstitutionActivity(institutionId: string): Promise<void>;
+  getActivityHeatmap(institutionId: string, clubIds: string[], range: ActivityHeatmapRange): Promise<ActivityHeatmapBucket[]>;
 
   // Election operations
   createElection(election: InsertElection): Promise<Election>;
@@ -191,7 +516,7 @@ export class DatabaseStorage implements IStorage {
 
   // Institution user operations
   async getInstitutionUser(id: string): Promise<InstitutionUser | undefined> {
-    const [user] = await db.select().from(institutionUsers).where(eq(institutionUsers.id, id));
+    const [user] = await prepared.institutionUserById.execute({ id });
     return user || undefined;
   }
 
@@ -238,7 +563,7 @@ export class DatabaseStorage implements IStorage {
 
   // Club operations
   async getClub(id: string): Promise<Club | undefined> {
-    const [club] = await db.select().from(clubs).where(eq(clubs.id, id));
+    const [club] = await prepared.clubById.execute({ id });
     return club || undefined;
   }
 
@@ -261,32 +586,75 @@ export class DatabaseStorage implements IStorage {
     await db.delete(clubs).where(eq(clubs.id, id));
   }
 
-  async getClubsByInstitution(institutionId: string): Promise<Club[]> {
-    return await db.select().from(clubs).where(eq(clubs.institutionId, institutionId));
+  async getClubsByInstitution(scope: TenantScope): Promise<Club[]> {
+    return await db.select().from(clubs).where(clubScopeCondition(scope));
+  }
+
+  async findExistingClubCodes(codes: string[]): Promise<string[]> {
+    if (codes.length === 0) return [];
+    const rows = await db.select({ code: clubs.clubCode }).from(clubs).where(inArray(clubs.clubCode, codes));
+    return rows.map((row) => row.code);
+  }
+
+  // All clubs and presidents are written in one transaction: either the whole
+  // import lands or none of it does.
+  async createClubsWithPresidents(entries: ClubWithPresident[]): Promise<Array<{ club: Club; president: User | null }>> {
+    if (entries.length === 0) return [];
+
+    return await db.transaction(async (tx) => {
+      const createdClubs: Club[] = [];
+      for (let i = 0; i < entries.length; i += INSERT_CHUNK_SIZE) {
+        const chunk = entries.slice(i, i + INSERT_CHUNK_SIZE).map((entry) => entry.club);
+        createdClubs.push(...(await tx.insert(clubs).values(chunk).returning()));
+      }
+      const clubByCode = new Map(createdClubs.map((club) => [club.clubCode, club]));
+
+      const presidentRows: InsertUser[] = [];
+      entries.forEach((entry) => {
+        if (entry.president) {
+          presidentRows.push({ ...entry.president, clubId: clubByCode.get(entry.club.clubCode)!.id });
+        }
+      });
+      const createdPresidents: User[] = [];
+      for (let i = 0; i < presidentRows.length; i += INSERT_CHUNK_SIZE) {
+        createdPresidents.push(...(await tx.insert(users).values(presidentRows.slice(i, i + INSERT_CHUNK_SIZE)).returning()));
+      }
+      const presidentByClub = new Map(createdPresidents.map((user) => [user.clubId, user]));
+
+      return entries.map((entry) => {
+        const club = clubByCode.get(entry.club.clubCode)!;
+        return { club, president: presidentByClub.get(club.id) || null };
+      });
+    });
   }
 
   // User operations
   async getUser(id: string): Promise<User | undefined> {
-    const [user] = await db.select().from(users).where(eq(users.id, id));
+    const [user] = await prepared.userById.execute({ id });
     return user || undefined;
   }
 
   async getUserByEmail(email: string): Promise<User | undefined> {
-    const [user] = await db.select().from(users).where(eq(users.email, email));
+    const [user] = await prepared.userByEmail.execute({ email });
     return user || undefined;
   }
 
+  async findExistingUserEmails(emails: string[]): Promise<string[]> {
+    if (emails.length === 0) return [];
+    const normalized = emails.map((email) => email.toLowerCase());
+    const rows = await db
+      .select({ email: users.email })
+      .from(users)
+      .where(inArray(sql`lower(${users.email})`, normalized));
+    return rows.map((row) => row.email.toLowerCase());
+  }
+
   async getUsersByClub(clubId: string): Promise<User[]> {
     return await db.select().from(users).where(eq(users.clubId, clubId));
   }
 
-  async getUsersByInstitution(institutionId: string): Promise<User[]> {
-    const institutionClubs = await this.getClubsByInstitution(institutionId);
-    if (institutionClubs.length === 0) {
-      return [];
-    }
-    const clubIds = institutionClubs.map((club) => club.id);
-    return await db.select().from(users).where(inArray(users.clubId, clubIds));
+  async getUsersByInstitution(scope: TenantScope): Promise<User[]> {
+    return await db.select().from(users).where(inArray(users.clubId, scopedClubIds(scope)));
   }
 
   async createUser(user: InsertUser): Promise<User> {
@@ -304,13 +672,8 @@ export class DatabaseStorage implements IStorage {
     return await db.select().from(pendingMembers).where(eq(pendingMembers.clubId, clubId));
   }
 
-  async getPendingMembersByInstitution(institutionId: string): Promise<PendingMember[]> {
-    const institutionClubs = await this.getClubsByInstitution(institutionId);
-    if (institutionClubs.length === 0) {
-      return [];
-    }
-    const clubIds = institutionClubs.map((club) => club.id);
-    return await db.select().from(pendingMembers).where(inArray(pendingMembers.clubId, clubIds));
+  async getPendingMembersByInstitution(scope: TenantScope): Promise<PendingMember[]> {
+    return await db.select().from(pendingMembers).where(inArray(pendingMembers.clubId, scopedClubIds(scope)));
   }
 
   async createPendingMember(member: InsertPendingMember): Promise<PendingMember> {
@@ -327,13 +690,64 @@ export class DatabaseStorage implements IStorage {
     await db.delete(pendingMembers).where(eq(pendingMembers.id, id));
   }
 
+  // Moves the selected applications into users with one INSERT ... SELECT and
+  // removes them with one DELETE, both in a single transaction. Applicants
+  // whose email already belongs to a user are left pending (the caller
+  // reports them as skipped), as are ids from other clubs.
+  async approvePendingMembers(
+    clubId: string,
+    ids: string[],
+    role: string,
+    canLogin: boolean,
+  ): Promise<{ approvedIds: string[] }> {
+    if (ids.length === 0) return { approvedIds: [] };
+
+    return await db.transaction(async (tx) => {
+      const inserted = await tx.execute<{ email: string }>(sql`
+        INSERT INTO users (club_id, name, email, password, phone, id_number, linkedin, portfolio,
+                           role, role_id, is_president, is_approved, can_login)
+        SELECT DISTINCT ON (email)
+               club_id, name, email, password, phone, id_number, linkedin, portfolio,
+               ${role}, NULL, false, true, ${canLogin}
+        FROM pending_members
+        WHERE ${and(eq(pendingMembers.clubId, clubId), inArray(pendingMembers.id, ids))}
+        ORDER BY email, applied_at
+        ON CONFLICT (email) DO NOTHING
+        RETURNING email
+      `);
+      const emails = inserted.rows.map((row) => row.email);
+      if (emails.length === 0) return { approvedIds: [] };
+
+      const removed = await tx
+        .delete(pendingMembers)
+        .where(
+          and(
+            eq(pendingMembers.clubId, clubId),
+            inArray(pendingMembers.id, ids),
+            inArray(pendingMembers.email, emails),
+          ),
+        )
+        .returning({ id: pendingMembers.id });
+      return { approvedIds: removed.map((row) => row.id) };
+    });
+  }
+
+  async rejectPendingMembers(clubId: string, ids: string[]): Promise<string[]> {
+    if (ids.length === 0) return [];
+    const removed = await db
+      .delete(pendingMembers)
+      .where(and(eq(pendingMembers.clubId, clubId), inArray(pendingMembers.id, ids)))
+      .returning({ id: pendingMembers.id });
+    return removed.map((row) => row.id);
+  }
+
   // Role operations
   async getRolesByClub(clubId: string): Promise<Role[]> {
     return await db.select().from(roles).where(eq(roles.clubId, clubId));
   }
 
   async getRole(id: string): Promise<Role | undefined> {
-    const [role] = await db.select().from(roles).where(eq(roles.id, id));
+    const [role] = await prepared.roleById.execute({ id });
     return role || undefined;
   }
 
@@ -379,25 +793,61 @@ export class DatabaseStorage implements IStorage {
 
   async createEvent(event: InsertEvent): Promise<Event> {
     const [newEvent] = await db.insert(events).values(event).returning();
+    await this.markActivityChanged(newEvent.clubId, newEvent.date);
     return newEvent;
   }
 
-  async updateEvent(id: string, data: Partial<InsertEvent>): Promise<Event | undefined> {
-    const [updated] = await db.update(events).set(data).where(eq(events.id, id)).returning();
-    return updated || undefined;
+  async updateEventInClub(
+    id: string,
+    condition: UpdateCondition,
+    data: Partial<InsertEvent>,
+  ): Promise<ConditionalUpdate<Event>> {
+    // A reschedule also invalidates the heatmap rollup for the old date
+    const previous = data.date ? await this.getEvent(id) : undefined;
+    const checks = referenceChecks(data, condition.clubId);
+    const target = and(eq(events.id, id), eq(events.clubId, condition.clubId));
+    const result = await runConditionalUpdate(
+      condition,
+      async () => {
+        const [updated] = await db
+          .update(events)
+          .set({ ...data, version: nextVersion(events.version) })
+          .where(and(target, versionMatches(events.version, condition), ...checks.map(({ check }) => check)))
+          .returning();
+        return updated;
+      },
+      async () => {
+        const [found] = await db.select({ row: events, failedReference: failedReference(checks) }).from(events).where(target);
+        return found;
+      },
+    );
+    if (result.status === "updated" && previous) {
+      await this.markActivityChanged(result.row.clubId, previous.date, result.row.date);
+    }
+    return result;
   }
 
   async deleteEvent(id: string): Promise<void> {
+    // Deleting an event cascades to its tasks, so the earliest affected day
+    // may be a task's creation day rather than the event's own date
+    const [affected] = await db
+      .select({
+        clubId: events.clubId,
+        date: events.date,
+        firstTaskAt: sql<string | null>`min(${tasks.createdAt})`,
+      })
+      .from(events)
+      .leftJoin(tasks, eq(tasks.eventId, events.id))
+      .where(eq(events.id, id))
+      .groupBy(events.id);
     await db.delete(events).where(eq(events.id, id));
+    if (affected) {
+      await this.markActivityChanged(affected.clubId, affected.date, affected.firstTaskAt);
+    }
   }
 
-  async getEventsByInstitution(institutionId: string): Promise<Event[]> {
-    const institutionClubs = await this.getClubsByInstitution(institutionId);
-    if (!institutionClubs.length) {
-      return [];
-    }
-    const clubIds = institutionClubs.map((club) => club.id);
-    return await db.select().from(events).where(inArray(events.clubId, clubIds));
+  async getEventsByInstitution(scope: TenantScope): Promise<Event[]> {
+    return await db.select().from(events).where(inArray(events.clubId, scopedClubIds(scope)));
   }
 
   // Team operations
@@ -406,7 +856,7 @@ export class DatabaseStorage implements IStorage {
   }
 
   async getTeam(id: string): Promise<Team | undefined> {
-    const [team] = await db.select().from(teams).where(eq(teams.id, id));
+    const [team] = await prepared.teamById.execute({ id });
     return team || undefined;
   }
 
@@ -495,22 +945,38 @@ export class DatabaseStorage implements IStorage {
     return newTask;
   }
 
-  async updateTask(id: string, data: Partial<InsertTask>): Promise<Task | undefined> {
-    const [updated] = await db.update(tasks).set(data).where(eq(tasks.id, id)).returning();
-    return updated || undefined;
+  async updateTaskInClub(id: string, condition: UpdateCondition, data: Partial<InsertTask>): Promise<ConditionalUpdate<Task>> {
+    const checks = referenceChecks(data, condition.clubId);
+    const target = and(eq(tasks.id, id), eq(tasks.clubId, condition.clubId));
+    return runConditionalUpdate(
+      condition,
+      async () => {
+        const [updated] = await db
+          .update(tasks)
+          .set({ ...data, version: nextVersion(tasks.version) })
+          .where(and(target, versionMatches(tasks.version, condition), ...checks.map(({ check }) => check)))
+          .returning();
+        return updated;
+      },
+      async () => {
+        const [found] = await db.select({ row: tasks, failedReference: failedReference(checks) }).from(tasks).where(target);
+        return found;
+      },
+    );
   }
 
   async deleteTask(id: string): Promise<void> {
-    await db.delete(tasks).where(eq(tasks.id, id));
+    const [removed] = await db
+      .delete(tasks)
+      .where(eq(tasks.id, id))
+      .returning({ clubId: tasks.clubId, createdAt: tasks.createdAt });
+    if (removed) {
+      await this.markActivityChanged(removed.clubId, removed.createdAt);
+    }
   }
 
-  async getTasksByInstitution(institutionId: string): Promise<Task[]> {
-    const institutionClubs = await this.getClubsByInstitution(institutionId);
-    if (!institutionClubs.length) {
-      return [];
-    }
-    const clubIds = institutionClubs.map((club) => club.id);
-    return await db.select().from(tasks).where(inArray(tasks.clubId, clubIds));
+  async getTasksByInstitution(scope: TenantScope): Promise<Task[]> {
+    return await db.select().from(tasks).where(inArray(tasks.clubId, scopedClubIds(scope)));
   }
 
   async countTasksByStatus(clubId: string, status: string): Promise<number> {
@@ -534,13 +1000,8 @@ export class DatabaseStorage implements IStorage {
     return await db.select().from(finance).where(eq(finance.clubId, clubId));
   }
 
-  async getFinanceByInstitution(institutionId: string): Promise<Finance[]> {
-    const institutionClubs = await this.getClubsByInstitution(institutionId);
-    if (!institutionClubs.length) {
-      return [];
-    }
-    const clubIds = institutionClubs.map((club) => club.id);
-    return await db.select().from(finance).where(inArray(finance.clubId, clubIds));
+  async getFinanceByInstitution(scope: TenantScope): Promise<Finance[]> {
+    return await db.select().from(finance).where(inArray(finance.clubId, scopedClubIds(scope)));
   }
 
   async getFinanceEntry(id: string): Promise<Finance | undefined> {
@@ -548,18 +1009,63 @@ export class DatabaseStorage implements IStorage {
     return entry || undefined;
   }
 
+  // Every write below records itself in the club's ledger, balances and
+  // rollups in the same transaction. Updates lock the row first, so the
+  // ledger sees exactly the row they replaced.
   async createFinanceEntry(entry: InsertFinance): Promise<Finance> {
-    const [newEntry] = await db.insert(finance).values(entry).returning();
-    return newEntry;
+    return await db.transaction(async (tx) => {
+      const [newEntry] = await tx.insert(finance).values(entry).returning();
+      await recordFinanceWrite(tx, undefined, newEntry);
+      return newEntry;
+    });
   }
 
   async updateFinanceEntry(id: string, data: Partial<InsertFinance>): Promise<Finance | undefined> {
-    const [updated] = await db.update(finance).set(data).where(eq(finance.id, id)).returning();
-    return updated || undefined;
+    return await db.transaction(async (tx) => {
+      const [before] = await tx.select().from(finance).where(eq(finance.id, id)).for("update");
+      if (!before) return undefined;
+      const [updated] = await tx
+        .update(finance)
+        .set({ ...data, version: nextVersion(finance.version) })
+        .where(eq(finance.id, id))
+        .returning();
+      await recordFinanceWrite(tx, before, updated);
+      return updated;
+    });
+  }
+
+  // Finance rows reference nothing a PATCH can set, so with the row locked
+  // the version is the only check left
+  async updateFinanceEntryInClub(
+    id: string,
+    condition: UpdateCondition,
+    data: Partial<InsertFinance>,
+  ): Promise<ConditionalUpdate<Finance>> {
+    return await db.transaction(async (tx): Promise<ConditionalUpdate<Finance>> => {
+      const [before] = await tx
+        .select()
+        .from(finance)
+        .where(and(eq(finance.id, id), eq(finance.clubId, condition.clubId)))
+        .for("update");
+      if (!before) return { status: "not_found" };
+      if (condition.version !== undefined && before.version !== condition.version) {
+        return { status: "version_conflict", current: before };
+      }
+      const [updated] = await tx
+        .update(finance)
+        .set({ ...data, version: nextVersion(finance.version) })
+        .where(eq(finance.id, id))
+        .returning();
+      await recordFinanceWrite(tx, before, updated);
+      return { status: "updated", row: updated };
+    });
   }
 
   async deleteFinanceEntry(id: string): Promise<void> {
-    await db.delete(finance).where(eq(finance.id, id));
+    await db.transaction(async (tx) => {
+      const [deleted] = await tx.delete(finance).where(eq(finance.id, id)).returning();
+      if (deleted) await recordFinanceWrite(tx, deleted, undefined);
+    });
   }
 
   async sumFinanceByStatus(clubId: string, type: 'income' | 'expense', status: string): Promise<number> {
@@ -578,18 +1084,154 @@ export class DatabaseStorage implements IStorage {
     return Number(result[0]?.count ?? 0);
   }
 
+  async getRecentFinanceByInstitution(scope: TenantScope, limit: number): Promise<Finance[]> {
+    return await db
+      .select()
+      .from(finance)
+      .where(inArray(finance.clubId, scopedClubIds(scope)))
+      .orderBy(desc(finance.createdAt))
+      .limit(limit);
+  }
+
+  // Finance books: single-row reads of what the write paths maintain
+  async getFinanceTotals(clubId: string): Promise<ClubFinanceTotals> {
+    const [row] = await db.select().from(financeBalances).where(eq(financeBalances.clubId, clubId));
+    return toFinanceTotals(clubId, row);
+  }
+
+  async getFinanceTotalsByInstitution(scope: TenantScope): Promise<ClubFinanceTotals[]> {
+    const rows = await db
+      .select()
+      .from(financeBalances)
+      .where(inArray(financeBalances.clubId, scopedClubIds(scope)));
+    return rows.map((row) => toFinanceTotals(row.clubId, row));
+  }
+
+  // Rollups summed over the scope's clubs: one row per month and category
+  async getFinanceMonthlyByInstitution(scope: TenantScope): Promise<FinanceMonthlyTotals[]> {
+    const rows = await db
+      .select({
+        month: financeMonthlyRollups.month,
+        category: financeMonthlyRollups.category,
+        spend: sql<string>`sum(${financeMonthlyRollups.spend})`,
+        balance: sql<string>`sum(${financeMonthlyRollups.balanceChange})`,
+      })
+      .from(financeMonthlyRollups)
+      .where(inArray(financeMonthlyRollups.clubId, scopedClubIds(scope)))
+      .groupBy(financeMonthlyRollups.month, financeMonthlyRollups.category)
+      .orderBy(asc(financeMonthlyRollups.month));
+    return rows.map((row) => ({
+      month: row.month,
+      category: row.category as FinanceCategory,
+      spend: parseFloat(row.spend),
+      balance: parseFloat(row.balance),
+    }));
+  }
+
+  // Recomputes a club's books from its finance rows and checks them against
+  // finance_balances, the rollups, the ledger's sums per month and category
+  // and its last running balance, returning every difference. With repair,
+  // appends "adjusted" ledger rows for the ledger's difference and rewrites
+  // the balances row and rollups.
+  async reconcileFinanceLedger(clubId: string, repair = false): Promise<FinanceDiscrepancy[]> {
+    return await db.transaction(async (tx) => {
+      // Holding the club's balances row keeps finance writes out until the
+      // comparison is done
+      await tx.insert(financeBalances).values({ clubId }).onConflictDoNothing();
+      const [totals] = await tx.select().from(financeBalances).where(eq(financeBalances.clubId, clubId)).for("update");
+
+      const expected = summarizeFinance(await tx.select().from(finance).where(eq(finance.clubId, clubId)));
+      const rollups = await tx.select().from(financeMonthlyRollups).where(eq(financeMonthlyRollups.clubId, clubId));
+      const ledger = await tx
+        .select({
+          month: financeLedger.month,
+          category: financeLedger.category,
+          spend: sql<string>`sum(${financeLedger.spendChange})`,
+          balance: sql<string>`sum(${financeLedger.balanceChange})`,
+        })
+        .from(financeLedger)
+        .where(eq(financeLedger.clubId, clubId))
+        .groupBy(financeLedger.month, financeLedger.category);
+      const [last] = await tx
+        .select({ balanceAfter: financeLedger.balanceAfter })
+        .from(financeLedger)
+        .where(eq(financeLedger.clubId, clubId))
+        .orderBy(desc(financeLedger.id))
+        .limit(1);
+
+      const toEffect = (row: { month: string; category: string; spend: string; balance: string }): LedgerEffect => ({
+        month: row.month,
+        category: row.category as FinanceCategory,
+        spend: toCents(row.spend),
+        balance: toCents(row.balance),
+      });
+      const ledgerSums = ledger.map(toEffect);
+      const discrepancies = findDiscrepancies(expected, {
+        totals: { balance: toCents(totals.balance), spend: toCents(totals.spend), pending: totals.pending },
+        rollups: rollups.map((row) => toEffect({ ...row, balance: row.balanceChange })),
+        ledger: ledgerSums,
+        lastBalance: toCents(last?.balanceAfter),
+      });
+      if (!repair || discrepancies.length === 0) return discrepancies;
+
+      const adjustments = ledgerAdjustments(expected, ledgerSums);
+      const ledgerBalance = ledgerSums.reduce((sum, effect) => sum + effect.balance, 0);
+      if (adjustments.length === 0 && toCents(last?.balanceAfter) !== ledgerBalance) {
+        // Sums are right but the running balance drifted: restate it
+        adjustments.push({ month: financeMonth(new Date()), category: "Operations", spend: 0, balance: 0 });
+      }
+      let running = ledgerBalance;
+      if (adjustments.length) {
+        await tx.insert(financeLedger).values(
+          adjustments.map((effect) => {
+            running += effect.balance;
+            return {
+              clubId,
+              financeId: null,
+              action: "adjusted",
+              month: effect.month,
+              category: effect.category,
+              spendChange: centsToDecimal(effect.spend),
+              balanceChange: centsToDecimal(effect.balance),
+              balanceAfter: centsToDecimal(running),
+            };
+          }),
+        );
+      }
+
+      await tx.delete(financeMonthlyRollups).where(eq(financeMonthlyRollups.clubId, clubId));
+      const months = Array.from(expected.months.values()).filter((effect) => effect.spend !== 0 || effect.balance !== 0);
+      if (months.length) {
+        await tx.insert(financeMonthlyRollups).values(
+          months.map((effect) => ({
+            clubId,
+            month: effect.month,
+            category: effect.category,
+            spend: centsToDecimal(effect.spend),
+            balanceChange: centsToDecimal(effect.balance),
+          })),
+        );
+      }
+      await tx
+        .update(financeBalances)
+        .set({
+          balance: centsToDecimal(expected.totals.balance),
+          spend: centsToDecimal(expected.totals.spend),
+          pending: expected.totals.pending,
+          updatedAt: new Date(),
+        })
+        .where(eq(financeBalances.clubId, clubId));
+      return discrepancies;
+    });
+  }
+
   // Social post operations
   async getSocialPostsByClub(clubId: string): Promise<SocialPost[]> {
     return await db.select().from(socialPosts).where(eq(socialPosts.clubId, clubId));
   }
 
-  async getSocialPostsByInstitution(institutionId: string): Promise<SocialPost[]> {
-    const institutionClubs = await this.getClubsByInstitution(institutionId);
-    if (!institutionClubs.length) {
-      return [];
-    }
-    const clubIds = institutionClubs.map((club) => club.id);
-    return await db.select().from(socialPosts).where(inArray(socialPosts.clubId, clubIds));
+  async getSocialPostsByInstitution(scope: TenantScope): Promise<SocialPost[]> {
+    return await db.select().from(socialPosts).where(inArray(socialPosts.clubId, scopedClubIds(scope)));
   }
 
   async getSocialPost(id: string): Promise<SocialPost | undefined> {
@@ -602,9 +1244,30 @@ export class DatabaseStorage implements IStorage {
     return newPost;
   }
 
-  async updateSocialPost(id: string, data: Partial<InsertSocialPost>): Promise<SocialPost | undefined> {
-    const [updated] = await db.update(socialPosts).set(data).where(eq(socialPosts.id, id)).returning();
-    return updated || undefined;
+  async updateSocialPostInClub(
+    id: string,
+    condition: UpdateCondition,
+    data: Partial<InsertSocialPost>,
+  ): Promise<ConditionalUpdate<SocialPost>> {
+    const target = and(eq(socialPosts.id, id), eq(socialPosts.clubId, condition.clubId));
+    return runConditionalUpdate(
+      condition,
+      async () => {
+        const [updated] = await db
+          .update(socialPosts)
+          .set({ ...data, version: nextVersion(socialPosts.version) })
+          .where(and(target, versionMatches(socialPosts.version, condition)))
+          .returning();
+        return updated;
+      },
+      async () => {
+        const [found] = await db
+          .select({ row: socialPosts, failedReference: failedReference([]) })
+          .from(socialPosts)
+          .where(target);
+        return found;
+      },
+    );
   }
 
   async deleteSocialPost(id: string): Promise<void> {
@@ -619,6 +1282,250 @@ export class DatabaseStorage implements IStorage {
     return Number(result[0]?.count ?? 0);
   }
 
+  // Claims up to `limit` due posts for this dispatcher instance. SKIP LOCKED lets
+  // several server instances poll concurrently without blocking or double-claiming,
+  // and posts whose lease expired (dispatcher crashed mid-publish) are reclaimed.
+  // Status literals are inlined so the planner can match the partial indexes.
+  async claimDueSocialPosts(now: Date, limit: number, leaseExpiredBefore: Date): Promise<SocialPost[]> {
+    const due = db
+      .select({ id: socialPosts.id })
+      .from(socialPosts)
+      .where(
+        or(
+          and(sql`${socialPosts.status} = 'Scheduled'`, lte(socialPosts.scheduledDate, now)),
+          and(sql`${socialPosts.status} = 'Publishing'`, lt(socialPosts.claimedAt, leaseExpiredBefore)),
+        ),
+      )
+      .orderBy(asc(socialPosts.scheduledDate))
+      .limit(limit)
+      .for('update', { skipLocked: true });
+
+    return await db
+      .update(socialPosts)
+      .set({ status: 'Publishing', claimedAt: now, version: nextVersion(socialPosts.version) })
+      .where(inArray(socialPosts.id, due))
+      .returning();
+  }
+
+  async markSocialPostsPosted(ids: string[], postedAt: Date): Promise<void> {
+    if (!ids.length) return;
+    await db
+      .update(socialPosts)
+      .set({ status: 'Posted', postedAt, claimedAt: null, lastError: null, version: nextVersion(socialPosts.version) })
+      .where(and(inArray(socialPosts.id, ids), eq(socialPosts.status, 'Publishing')));
+  }
+
+  async markSocialPostFailed(id: string, error: string): Promise<void> {
+    await db
+      .update(socialPosts)
+      .set({ status: 'Failed', claimedAt: null, lastError: error, version: nextVersion(socialPosts.version) })
+      .where(and(eq(socialPosts.id, id), eq(socialPosts.status, 'Publishing')));
+  }
+
+  async countDueSocialPosts(now: Date): Promise<number> {
+    const result = await db
+      .select({ count: sql<number>`count(*)` })
+      .from(socialPosts)
+      .where(and(sql`${socialPosts.status} = 'Scheduled'`, lte(socialPosts.scheduledDate, now)));
+    return Number(result[0]?.count ?? 0);
+  }
+
+  // Search operations
+  async searchMembers(clubIds: string[], query: string, limit: number): Promise<MemberSearchResult[]> {
+    const filter = buildSearchFilter(userSearchDocument(users), query, [
+      sql`lower(${users.name})`,
+      sql`lower(${users.email})`,
+      sql`lower(${users.idNumber})`,
+    ]);
+    if (clubIds.length === 0 || !filter) return [];
+
+    // Names starting with the query rank first, then closest trigram match
+    const prefix = toPrefixPattern(query);
+    return await db
+      .select({
+        id: users.id,
+        clubId: users.clubId,
+        name: users.name,
+        email: users.email,
+        role: users.role,
+        idNumber: users.idNumber,
+        canLogin: users.canLogin,
+      })
+      .from(users)
+      .where(and(inArray(users.clubId, clubIds), filter))
+      .orderBy(
+        sql`lower(${users.name}) like ${prefix} desc`,
+        sql`similarity(lower(${users.name}), ${query.toLowerCase()}) desc`,
+        asc(users.name),
+      )
+      .limit(limit);
+  }
+
+  async searchEvents(clubIds: string[], query: string, limit: number): Promise<EventSearchResult[]> {
+    const filter = buildSearchFilter(eventSearchDocument(events), query, [sql`lower(${events.title})`]);
+    if (clubIds.length === 0 || !filter) return [];
+
+    const prefix = toPrefixPattern(query);
+    return await db
+      .select({
+        id: events.id,
+        clubId: events.clubId,
+        title: events.title,
+        status: events.status,
+        date: events.date,
+      })
+      .from(events)
+      .where(and(inArray(events.clubId, clubIds), filter))
+      .orderBy(
+        sql`lower(${events.title}) like ${prefix} desc`,
+        sql`similarity(lower(${events.title}), ${query.toLowerCase()}) desc`,
+        sql`${events.date} desc`,
+      )
+      .limit(limit);
+  }
+
+  async searchTasks(clubIds: string[], query: string, limit: number): Promise<TaskSearchResult[]> {
+    const filter = buildSearchFilter(taskSearchDocument(tasks), query, [sql`lower(${tasks.title})`]);
+    if (clubIds.length === 0 || !filter) return [];
+
+    const prefix = toPrefixPattern(query);
+    return await db
+      .select({
+        id: tasks.id,
+        clubId: tasks.clubId,
+        eventId: tasks.eventId,
+        title: tasks.title,
+        status: tasks.status,
+        dueDate: tasks.dueDate,
+      })
+      .from(tasks)
+      .where(and(inArray(tasks.clubId, clubIds), filter))
+      .orderBy(
+        sql`lower(${tasks.title}) like ${prefix} desc`,
+        sql`similarity(lower(${tasks.title}), ${query.toLowerCase()}) desc`,
+        asc(tasks.title),
+      )
+      .limit(limit);
+  }
+
+  // Institution activity heatmap
+  // A write dated before today invalidates the rollup from that day on. Future
+  // and same-day changes never touch stored days, so they skip the query.
+  private async markActivityChanged(clubId: string, ...moments: Array<Date | string | null | undefined>) {
+    const startOfToday = new Date();
+    startOfToday.setHours(0, 0, 0, 0);
+    const past = moments
+      .filter((moment): moment is Date | string => moment != null)
+      .map((moment) => new Date(moment))
+      .filter((moment) => moment < startOfToday);
+    if (past.length === 0) return;
+
+    const earliest = new Date(Math.min(...past.map((moment) => moment.getTime())));
+    await db.execute(sql`
+      UPDATE institution_activity_rollups AS r
+      SET rolled_up_through = ${earliest}::timestamp::date - 1, updated_at = now()
+      FROM clubs AS c
+      WHERE c.id = ${clubId}
+        AND r.institution_id = c.institution_id
+        AND r.rolled_up_through >= ${earliest}::timestamp::date
+    `);
+  }
+
+  // Folds every finished day since the last refresh into
+  // institution_daily_activity. Normally a no-op or a single day's work.
+  async refreshInstitutionActivity(institutionId: string): Promise<void> {
+    const upToDate = sql`
+      SELECT 1 FROM institution_activity_rollups
+      WHERE institution_id = ${institutionId} AND rolled_up_through >= current_date - 1
+    `;
+    if ((await db.execute(upToDate)).rows.length) return;
+
+    await db.transaction(async (tx) => {
+      // Concurrent requests for the same institution wait here, then find the work done
+      await tx.execute(sql`SELECT pg_advisory_xact_lock(hashtext(${"institution_activity:" + institutionId}))`);
+      if ((await tx.execute(upToDate)).rows.length) return;
+
+      const [state] = await tx
+        .select({ rolledUpThrough: institutionActivityRollups.rolledUpThrough })
+        .from(institutionActivityRollups)
+        .where(eq(institutionActivityRollups.institutionId, institutionId));
+      const since = state?.rolledUpThrough ?? null;
+      const after = since ? sql`${since}::date + 1` : sql`'-infinity'::timestamp`;
+
+      await tx
+        .delete(institutionDailyActivity)
+        .where(
+          and(
+            eq(institutionDailyActivity.institutionId, institutionId),
+            since ? sql`${institutionDailyActivity.day} > ${since}::date` : undefined,
+          ),
+        );
+      await tx.execute(sql`
+        INSERT INTO institution_daily_activity (institution_id, club_id, day, events, tasks)
+        SELECT ${institutionId}, activity.club_id, activity.day, sum(activity.events), sum(activity.tasks)
+        FROM (
+          SELECT e.club_id, date_trunc('day', e.date)::date AS day, 1 AS events, 0 AS tasks
+          FROM events e JOIN clubs c ON c.id = e.club_id
+          WHERE c.institution_id = ${institutionId} AND e.date >= ${after} AND e.date < current_date
+          UNION ALL
+          SELECT t.club_id, date_trunc('day', t.created_at)::date, 0, 1
+          FROM tasks t JOIN clubs c ON c.id = t.club_id
+          WHERE c.institution_id = ${institutionId} AND t.created_at >= ${after} AND t.created_at < current_date
+        ) AS activity
+        GROUP BY activity.club_id, activity.day
+      `);
+      await tx.execute(sql`
+        INSERT INTO institution_activity_rollups (institution_id, rolled_up_through)
+        VALUES (${institutionId}, current_date - 1)
+        ON CONFLICT (institution_id)
+        DO UPDATE SET rolled_up_through = excluded.rolled_up_through, updated_at = now()
+      `);
+    });
+  }
+
+  // Stored days come from institution_daily_activity; today and any scheduled
+  // events after it are aggregated live. Buckets are summed in SQL with
+  // date_trunc, so the response is one row per day/week/month with activity.
+  // Call refreshInstitutionActivity first so the stored days are complete.
+  async getActivityHeatmap(
+    institutionId: string,
+    clubIds: string[],
+    range: ActivityHeatmapRange,
+  ): Promise<ActivityHeatmapBucket[]> {
+    if (clubIds.length === 0) return [];
+
+    const from = range.from ? sql`${range.from}::date` : sql`current_date - 365`;
+    const storedUntil = range.to ? sql`least(${range.to}::date + 1, current_date)` : sql`current_date`;
+    const liveFrom = sql`greatest(${from}, current_date)`;
+    const liveUntil = (column: SQL) => (range.to ? sql`AND ${column} < ${range.to}::date + 1` : sql``);
+
+    const result = await db.execute<{ bucket: string; intensity: string | number }>(sql`
+      SELECT to_char(date_trunc(${range.granularity}, activity.day), 'YYYY-MM-DD') AS bucket,
+             sum(activity.events)::numeric * ${HEATMAP_EVENT_WEIGHT}::numeric
+               + sum(activity.tasks)::numeric * ${HEATMAP_TASK_WEIGHT}::numeric AS intensity
+      FROM (
+        SELECT day, events, tasks
+        FROM institution_daily_activity
+        WHERE ${and(
+          eq(institutionDailyActivity.institutionId, institutionId),
+          inArray(institutionDailyActivity.clubId, clubIds),
+        )}
+          AND day >= ${from} AND day < ${storedUntil}
+        UNION ALL
+        SELECT date_trunc('day', ${events.date})::date, 1, 0
+        FROM events
+        WHERE ${inArray(events.clubId, clubIds)} AND ${events.date} >= ${liveFrom} ${liveUntil(sql`${events.date}`)}
+        UNION ALL
+        SELECT date_trunc('day', ${tasks.createdAt})::date, 0, 1
+        FROM tasks
+        WHERE ${inArray(tasks.clubId, clubIds)} AND ${tasks.createdAt} >= ${liveFrom} ${liveUntil(sql`${tasks.createdAt}`)}
+      ) AS activity
+      GROUP BY 1
+      ORDER BY 1
+    `);
+    return result.rows.map((row) => ({ date: row.bucket, intensity: Number(row.intensity) }));
+  }
+
   // Election operations
   async createElection(election: InsertElection): Promise<Election> {
     const [newElection] = await db.insert(elections).values(election).returning();
@@ -682,4 +1589,7 @@ export class DatabaseStorage implements IStorage {
   }
 }
 
-export const storage = new DatabaseStorage();
+// STORAGE_BACKEND=memory swaps in the in-process store for hermetic test and
+// benchmark runs; anything else uses Postgres.
+export const storage: IStorage =
+  process.env.STORAGE_BACKEND === "memory" ? new MemoryStorage() : new DatabaseStorage();
@@ -1,10 +1,13 @@
 import express, { type Express } from "express";
 import fs from "fs";
 import path from "path";
+import zlib from "zlib";
+import { createHash } from "crypto";
 import { createServer as createViteServer, createLogger } from "vite";
 import { type Server } from "http";
 import viteConfig from "../vite.config";
 import { nanoid } from "nanoid";
+import { negotiateEncoding } from "./compression";
 
 const viteLogger = createLogger();
 
@@ -67,6 +70,17 @@ export async function setupVite(app: Express, server: Server) {
   });
 }
 
+// Vite puts content-hashed bundles under /assets, so they never change in place
+const IMMUTABLE_CACHE = "public, max-age=31536000, immutable";
+const REVALIDATE_CACHE = "public, max-age=0, must-revalidate";
+
+function listFiles(dir: string): string[] {
+  return fs.readdirSync(dir, { withFileTypes: true }).flatMap((entry) => {
+    const full = path.join(dir, entry.name);
+    return entry.isDirectory() ? listFiles(full) : [full];
+  });
+}
+
 export function serveStatic(app: Express) {
   const distPath = path.resolve(import.meta.dirname, "public");
 
@@ -76,10 +90,60 @@ export function serveStatic(app: Express) {
     );
   }
 
-  app.use(express.static(distPath));
+  // The build output is fixed for the life of the process, so look up the
+  // precompressed variants written by the build once instead of per request.
+  const files = new Set(listFiles(distPath).map((file) => "/" + path.relative(distPath, file).split(path.sep).join("/")));
+
+  app.use((req, res, next) => {
+    if ((req.method !== "GET" && req.method !== "HEAD") || !files.has(req.path)) return next();
+
+    const encoding = negotiateEncoding(req.headers["accept-encoding"]);
+    const variant = encoding && `${req.path}.${encoding === "br" ? "br" : "gz"}`;
+    res.vary("Accept-Encoding");
+    if (variant && files.has(variant)) {
+      // Type from the original name; send() keeps a Content-Type that is already set
+      res.type(path.extname(req.path));
+      res.setHeader("Content-Encoding", encoding!);
+      req.url = variant + req.url.slice(req.path.length);
+    }
+    next();
+  });
+
+  app.use(
+    express.static(distPath, {
+      index: false,
+      cacheControl: false,
+      setHeaders(res, filePath) {
+        const relative = path.relative(distPath, filePath);
+        res.setHeader("Cache-Control", relative.startsWith(`assets${path.sep}`) ? IMMUTABLE_CACHE : REVALIDATE_CACHE);
+      },
+    }),
+  );
+
+  // index.html is served for every client-side route, so keep it (and its
+  // compressed forms) in memory and let browsers revalidate with the ETag.
+  const indexHtml = fs.readFileSync(path.resolve(distPath, "index.html"));
+  const indexVariants: Record<string, Buffer> = {
+    br: zlib.brotliCompressSync(indexHtml),
+    gzip: zlib.gzipSync(indexHtml, { level: 9 }),
+  };
+  const indexEtag = `"${createHash("sha1").update(indexHtml).digest("base64url")}"`;
 
   // fall through to index.html if the file doesn't exist
-  app.use("*", (_req, res) => {
-    res.sendFile(path.resolve(distPath, "index.html"));
+  app.use("*", (req, res) => {
+    res.setHeader("Content-Type", "text/html; charset=utf-8");
+    res.setHeader("Cache-Control", "no-cache");
+    res.setHeader("ETag", indexEtag);
+    res.vary("Accept-Encoding");
+
+    if (req.fresh) {
+      return res.status(304).end();
+    }
+
+    const encoding = negotiateEncoding(req.headers["accept-encoding"]);
+    const body = encoding ? indexVariants[encoding] : indexHtml;
+    if (encoding) res.setHeader("Content-Encoding", encoding);
+    res.setHeader("Content-Length", body.length);
+    res.status(200).end(req.method === "HEAD" ? undefined : body);
   });
 }
@@ -98,28 +98,85 @@ export const PERMISSION_METADATA: Record<Permission, { label: string; descriptio
   },
 };
 
+// ============================================================
+// BITMASKS
+// ============================================================
+// Each permission owns one bit (its position in ALL_PERMISSIONS), so a
+// user's effective permissions fit in a single integer and every check is
+// one AND. Append new permissions to the end of ALL_PERMISSIONS to keep
+// existing bits stable.
+
+export type PermissionMask = number;
+
+export const PERMISSION_BITS = Object.fromEntries(
+  ALL_PERMISSIONS.map((perm, index) => [perm, 1 << index]),
+) as Record<Permission, number>;
+
+export const ALL_PERMISSIONS_MASK: PermissionMask = (1 << ALL_PERMISSIONS.length) - 1;
+
+export const PRESIDENT_PERMISSION_MASK: PermissionMask = ALL_PERMISSIONS_MASK;
+
+// Vice-President has all permissions except manage_settings and manage_committee (for changing VP)
+export const VICE_PRESIDENT_PERMISSION_MASK: PermissionMask =
+  ALL_PERMISSIONS_MASK & ~(PERMISSION_BITS.manage_settings | PERMISSION_BITS.manage_committee);
+
+export function toPermissionMask(permissions: PermissionSet | null | undefined): PermissionMask {
+  if (!permissions) return 0;
+  let mask = 0;
+  for (const perm of ALL_PERMISSIONS) {
+    if (permissions[perm] === true) mask |= PERMISSION_BITS[perm];
+  }
+  return mask;
+}
+
+// At most 2^n distinct sets exist, so each one is built once and shared.
+// The objects are frozen because every holder of a mask gets the same one.
+const permissionSetsByMask = new Map<PermissionMask, Readonly<PermissionSet>>();
+
+export function fromPermissionMask(mask: PermissionMask): PermissionSet {
+  let permissions = permissionSetsByMask.get(mask);
+  if (!permissions) {
+    const built: PermissionSet = {};
+    ALL_PERMISSIONS.forEach((perm) => {
+      if (mask & PERMISSION_BITS[perm]) built[perm] = true;
+    });
+    permissions = Object.freeze(built);
+    permissionSetsByMask.set(mask, permissions);
+  }
+  return permissions as PermissionSet;
+}
+
+// Effective mask for a user; customRoleMask comes from toPermissionMask at role load
+export function getUserPermissionMask(isPresident: boolean, role: string, customRoleMask: PermissionMask): PermissionMask {
+  if (isPresident) return PRESIDENT_PERMISSION_MASK;
+  if (role === 'Vice-President') return VICE_PRESIDENT_PERMISSION_MASK;
+  return customRoleMask;
+}
+
+export function hasPermissionBit(mask: PermissionMask, permission: Permission): boolean {
+  return (mask & PERMISSION_BITS[permission]) !== 0;
+}
+
+// ============================================================
+// PERMISSION SETS
+// ============================================================
+
 // President has all permissions
 export function getPresidentPermissions(): PermissionSet {
-  const permissions: PermissionSet = {};
-  ALL_PERMISSIONS.forEach((perm) => {
-    permissions[perm] = true;
-  });
-  return permissions;
+  return fromPermissionMask(PRESIDENT_PERMISSION_MASK);
 }
 
 // Vice-President has all permissions except manage_settings and manage_committee (for changing VP)
 export function getVicePresidentPermissions(): PermissionSet {
-  const permissions: PermissionSet = {};
-  ALL_PERMISSIONS.forEach((perm) => {
-    if (perm !== 'manage_settings' && perm !== 'manage_committee') {
-      permissions[perm] = true;
-    }
-  });
-  return permissions;
+  return fromPermissionMask(VICE_PRESIDENT_PERMISSION_MASK);
 }
 
-// Check if a permission set has a specific permission
-export function hasPermission(permissions: PermissionSet | null | undefined, permission: Permission): boolean {
+// Check if a permission set (or mask) has a specific permission
+export function hasPermission(
+  permissions: PermissionSet | PermissionMask | null | undefined,
+  permission: Permission,
+): boolean {
+  if (typeof permissions === 'number') return (permissions & PERMISSION_BITS[permission]) !== 0;
   if (!permissions) return false;
   return permissions[permission] === true;
 }
@@ -141,4 +198,3 @@ export function getUserPermissions(
   }
   return customRolePermissions || {};
 }
-
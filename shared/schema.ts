@@ -8,7 +8,13 @@ import {
   jsonb,
   boolean,
   decimal,
+  index,
   uniqueIndex,
+  primaryKey,
+  date,
+  doublePrecision,
+  bigserial,
+  type AnyPgColumn,
 } from "drizzle-orm/pg-core";
 import { relations } from "drizzle-orm";
 import { createInsertSchema } from "drizzle-zod";
@@ -69,7 +75,22 @@ export const clubs = pgTable("clubs", {
   clubCode: varchar("club_code", { length: 8 }).notNull().unique(),
   presidentPassword: text("president_password"), // Encrypted password for admin viewing
   createdAt: timestamp("created_at").defaultNow().notNull(),
-});
+}, (table) => ({
+  // Institution reads select their clubs through this (see TenantScope in server/storage.ts)
+  institutionIdx: index("clubs_institution_idx").on(table.institutionId),
+}));
+
+// Search documents for the GIN full-text indexes below. The search queries in
+// server/storage.ts build the same expressions, which is what lets Postgres
+// match them to the indexes.
+export const userSearchDocument = (columns: { name: AnyPgColumn; email: AnyPgColumn; idNumber: AnyPgColumn }) =>
+  sql`to_tsvector('simple', ${columns.name} || ' ' || ${columns.email} || ' ' || coalesce(${columns.idNumber}, ''))`;
+
+export const eventSearchDocument = (columns: { title: AnyPgColumn; description: AnyPgColumn }) =>
+  sql`to_tsvector('simple', ${columns.title} || ' ' || coalesce(${columns.description}, ''))`;
+
+export const taskSearchDocument = (columns: { title: AnyPgColumn }) =>
+  sql`to_tsvector('simple', ${columns.title})`;
 
 // Users table - for approved members with login access
 export const users = pgTable("users", {
@@ -88,7 +109,14 @@ export const users = pgTable("users", {
   isApproved: boolean("is_approved").default(true).notNull(),
   canLogin: boolean("can_login").default(true).notNull(), // Only President/VP/Heads can login
   createdAt: timestamp("created_at").defaultNow().notNull(),
-});
+}, (table) => ({
+  clubIdx: index("users_club_idx").on(table.clubId),
+  searchIdx: index("users_search_idx").using("gin", userSearchDocument(table)),
+  // Trigram indexes (pg_trgm) serve substring / typeahead matches
+  nameTrgmIdx: index("users_name_trgm_idx").using("gin", sql`lower(${table.name}) gin_trgm_ops`),
+  emailTrgmIdx: index("users_email_trgm_idx").using("gin", sql`lower(${table.email}) gin_trgm_ops`),
+  idNumberTrgmIdx: index("users_id_number_trgm_idx").using("gin", sql`lower(${table.idNumber}) gin_trgm_ops`),
+}));
 
 // Pending members table - applications awaiting approval
 export const pendingMembers = pgTable("pending_members", {
@@ -102,7 +130,9 @@ export const pendingMembers = pgTable("pending_members", {
   linkedin: text("linkedin"),
   portfolio: text("portfolio"),
   appliedAt: timestamp("applied_at").defaultNow().notNull(),
-});
+}, (table) => ({
+  clubIdx: index("pending_members_club_idx").on(table.clubId),
+}));
 
 // Custom roles table
 export const roles = pgTable("roles", {
@@ -124,8 +154,15 @@ export const events = pgTable("events", {
   status: text("status").notNull().default("Planning"), // Planning, Ongoing, Completed
   assignedToId: varchar("assigned_to_id").references(() => users.id),
   createdById: varchar("created_by_id").notNull().references(() => users.id),
+  // Bumped by every update; a PATCH that sends it only applies on a match
+  version: integer("version").default(1).notNull(),
   createdAt: timestamp("created_at").defaultNow().notNull(),
-});
+}, (table) => ({
+  clubIdx: index("events_club_idx").on(table.clubId),
+  clubDateIdx: index("events_club_date_idx").on(table.clubId, table.date),
+  searchIdx: index("events_search_idx").using("gin", eventSearchDocument(table)),
+  titleTrgmIdx: index("events_title_trgm_idx").using("gin", sql`lower(${table.title}) gin_trgm_ops`),
+}));
 
 // Teams table
 export const teams = pgTable("teams", {
@@ -163,8 +200,14 @@ export const tasks = pgTable("tasks", {
   teamId: varchar("team_id").references(() => teams.id, { onDelete: "set null" }),
   dueDate: timestamp("due_date"),
   status: text("status").notNull().default("Pending"), // Pending, In Progress, Done
+  version: integer("version").default(1).notNull(), // see events.version
   createdAt: timestamp("created_at").defaultNow().notNull(),
-});
+}, (table) => ({
+  clubIdx: index("tasks_club_idx").on(table.clubId),
+  clubCreatedAtIdx: index("tasks_club_created_at_idx").on(table.clubId, table.createdAt),
+  searchIdx: index("tasks_search_idx").using("gin", taskSearchDocument(table)),
+  titleTrgmIdx: index("tasks_title_trgm_idx").using("gin", sql`lower(${table.title}) gin_trgm_ops`),
+}));
 
 // Finance table
 export const finance = pgTable("finance", {
@@ -177,20 +220,121 @@ export const finance = pgTable("finance", {
   status: text("status").notNull().default("Pending"), // Pending, Approved
   approvedById: varchar("approved_by_id").references(() => users.id),
   createdById: varchar("created_by_id").notNull().references(() => users.id),
+  version: integer("version").default(1).notNull(), // see events.version
   createdAt: timestamp("created_at").defaultNow().notNull(),
-});
+}, (table) => ({
+  clubIdx: index("finance_club_idx").on(table.clubId),
+}));
 
 // Social posts table
-export const socialPosts = pgTable("social_posts", {
-  id: varchar("id").primaryKey().default(sql`gen_random_uuid()`),
-  clubId: varchar("club_id").notNull().references(() => clubs.id, { onDelete: "cascade" }),
-  caption: text("caption").notNull(),
-  imageUrl: text("image_url"),
-  platform: text("platform").notNull(), // Instagram, Twitter, Facebook, LinkedIn
-  scheduledDate: timestamp("scheduled_date"),
-  status: text("status").notNull().default("Draft"), // Draft, Scheduled, Posted
-  createdById: varchar("created_by_id").notNull().references(() => users.id),
-  createdAt: timestamp("created_at").defaultNow().notNull(),
+export const socialPosts = pgTable(
+  "social_posts",
+  {
+    id: varchar("id").primaryKey().default(sql`gen_random_uuid()`),
+    clubId: varchar("club_id").notNull().references(() => clubs.id, { onDelete: "cascade" }),
+    caption: text("caption").notNull(),
+    imageUrl: text("image_url"),
+    platform: text("platform").notNull(), // Instagram, Twitter, Facebook, LinkedIn
+    scheduledDate: timestamp("scheduled_date"),
+    status: text("status").notNull().default("Draft"), // Draft, Scheduled, Publishing, Posted, Failed
+    claimedAt: timestamp("claimed_at"), // Lease taken by the scheduled post dispatcher
+    postedAt: timestamp("posted_at"),
+    lastError: text("last_error"),
+    createdById: varchar("created_by_id").notNull().references(() => users.id),
+    version: integer("version").default(1).notNull(), // see events.version
+    createdAt: timestamp("created_at").defaultNow().notNull(),
+  },
+  (table) => ({
+    clubIdx: index("social_posts_club_idx").on(table.clubId),
+    // Due-time index used by the dispatcher to claim the next batch of scheduled posts
+    dueIdx: index("social_posts_due_idx").on(table.scheduledDate).where(sql`status = 'Scheduled'`),
+    leaseIdx: index("social_posts_lease_idx").on(table.claimedAt).where(sql`status = 'Publishing'`),
+  }),
+);
+
+// Append-only ledger of finance writes. Each create, approval, edit or delete
+// of a finance row appends what it changed in its club's spend and balance,
+// one row per month and category touched, with the club's running balance
+// after it. Rows are never updated and outlive the entry they describe.
+export const financeLedger = pgTable(
+  "finance_ledger",
+  {
+    id: bigserial("id", { mode: "number" }).primaryKey(),
+    clubId: varchar("club_id").notNull().references(() => clubs.id, { onDelete: "cascade" }),
+    financeId: varchar("finance_id"), // null for reconciliation adjustments
+    action: text("action").notNull(), // created, approved, updated, deleted, adjusted
+    month: text("month").notNull(), // YYYY-MM
+    category: text("category").notNull(),
+    spendChange: decimal("spend_change", { precision: 12, scale: 2 }).notNull(),
+    balanceChange: decimal("balance_change", { precision: 12, scale: 2 }).notNull(),
+    balanceAfter: decimal("balance_after", { precision: 12, scale: 2 }).notNull(),
+    createdAt: timestamp("created_at").defaultNow().notNull(),
+  },
+  (table) => ({
+    clubIdx: index("finance_ledger_club_idx").on(table.clubId, table.id),
+  }),
+);
+
+// Current books per club, moved in the same transaction as each ledger append
+export const financeBalances = pgTable("finance_balances", {
+  clubId: varchar("club_id")
+    .primaryKey()
+    .references(() => clubs.id, { onDelete: "cascade" }),
+  balance: decimal("balance", { precision: 12, scale: 2 }).notNull().default("0"),
+  spend: decimal("spend", { precision: 12, scale: 2 }).notNull().default("0"),
+  pending: integer("pending").notNull().default(0),
+  updatedAt: timestamp("updated_at").defaultNow().notNull(),
+});
+
+// Ledger totals per club, month and category
+export const financeMonthlyRollups = pgTable(
+  "finance_monthly_rollups",
+  {
+    clubId: varchar("club_id").notNull().references(() => clubs.id, { onDelete: "cascade" }),
+    month: text("month").notNull(),
+    category: text("category").notNull(),
+    spend: decimal("spend", { precision: 12, scale: 2 }).notNull().default("0"),
+    balanceChange: decimal("balance_change", { precision: 12, scale: 2 }).notNull().default("0"),
+  },
+  (table) => ({
+    pk: primaryKey({ columns: [table.clubId, table.month, table.category] }),
+  }),
+);
+
+// Per-club daily activity behind the institution heatmap. Only days before
+// today are stored; today and scheduled future events are counted live.
+export const institutionDailyActivity = pgTable(
+  "institution_daily_activity",
+  {
+    institutionId: varchar("institution_id")
+      .notNull()
+      .references(() => institutions.id, { onDelete: "cascade" }),
+    clubId: varchar("club_id").notNull().references(() => clubs.id, { onDelete: "cascade" }),
+    day: date("day", { mode: "string" }).notNull(),
+    events: integer("events").notNull().default(0),
+    tasks: integer("tasks").notNull().default(0),
+  },
+  (table) => ({
+    pk: primaryKey({ columns: [table.clubId, table.day] }),
+    institutionDayIdx: index("institution_daily_activity_institution_day_idx").on(table.institutionId, table.day),
+  }),
+);
+
+// Last day folded into institution_daily_activity. Edits to past events or
+// tasks move it back so the next refresh recomputes from that day.
+export const institutionActivityRollups = pgTable("institution_activity_rollups", {
+  institutionId: varchar("institution_id")
+    .primaryKey()
+    .references(() => institutions.id, { onDelete: "cascade" }),
+  rolledUpThrough: date("rolled_up_through", { mode: "string" }).notNull(),
+  updatedAt: timestamp("updated_at").defaultNow().notNull(),
+});
+
+// Shared token buckets for RATE_LIMIT_STORE=postgres (see server/rate-limit.ts)
+export const rateLimitBuckets = pgTable("rate_limit_buckets", {
+  key: text("key").primaryKey(),
+  tokens: doublePrecision("tokens").notNull(),
+  updatedAt: timestamp("updated_at", { withTimezone: true }).defaultNow().notNull(),
 });
 
 // Relations
@@ -393,11 +537,13 @@ export const insertRoleSchema = createInsertSchema(roles).omit({
 
 export const insertEventSchema = createInsertSchema(events).omit({
   id: true,
+  version: true,
   createdAt: true,
 });
 
 export const insertTaskSchema = createInsertSchema(tasks).omit({
   id: true,
+  version: true,
   createdAt: true,
 });
 
@@ -413,11 +559,13 @@ export const insertTeamMemberSchema = createInsertSchema(teamMembers).omit({
 
 export const insertFinanceSchema = createInsertSchema(finance).omit({
   id: true,
+  version: true,
   createdAt: true,
 });
 
 export const insertSocialPostSchema = createInsertSchema(socialPosts).omit({
   id: true,
+  version: true,
   createdAt: true,
 });
 
@@ -1,4 +1,7 @@
 import asyncio
+import os
+import sys
+from pathlib import Path
 from playwright import async_api
 from playwright.async_api import expect
 
@@ -115,6 +118,25 @@ async def run_test():
             await browser.close()
         if pw:
             await pw.stop()
+
+
+async def run_perf_test():
+    # Performance mode: Landing, Login, Vote and both dashboards under mobile
+    # CPU and network throttling, checked against testsprite_tests/perf/budgets.py
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from testsprite_tests.perf.measure import run_perf_budgets
+
+    pw = None
+    browser = None
+    try:
+        pw = await async_api.async_playwright().start()
+        browser = await pw.chromium.launch(headless=True, args=["--disable-dev-shm-usage"])
+        await run_perf_budgets(pw, browser)
+    finally:
+        if browser:
+            await browser.close()
+        if pw:
+            await pw.stop()
             
-asyncio.run(run_test())
+asyncio.run(run_perf_test() if os.environ.get("TC011_MODE") == "perf" else run_test())
     
\ No newline at end of file
@@ -0,0 +1,9 @@
+"""HTTP-level contract and latency tests for the ClubCentral API.
+
+The TC0xx scripts next to this package drive the UI through Chromium. These
+tests call the same /api routes directly over one pooled httpx client, check
+status codes and response shapes (mirroring shared/schema.ts), and hold each
+endpoint to a latency budget. Run against a live server with:
+
+    python -m testsprite_tests.api_tests
+"""
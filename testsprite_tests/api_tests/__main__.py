@@ -0,0 +1,74 @@
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from .budgets import check_budgets
+from .cases import CASES
+from .client import BASE_URL, ApiClient
+from .fixtures import seed
+
+REPORT_PATH = Path(os.environ.get(
+    "API_TEST_REPORT",
+    Path(__file__).resolve().parent.parent / "tmp" / "api_test_results.json",
+))
+
+
+async def run_case(api, fixtures, case):
+    started = time.perf_counter()
+    error = ""
+    try:
+        await case.run(api, fixtures)
+        status = "PASSED"
+    except AssertionError as exc:
+        status, error = "FAILED", str(exc) or "assertion failed"
+    except Exception as exc:  # transport errors, bad JSON, ...
+        status, error = "ERROR", f"{type(exc).__name__}: {exc}"
+    return {
+        "testId": case.test_id,
+        "title": case.title,
+        "testStatus": status,
+        "testError": error,
+        "durationMs": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+async def main():
+    started = time.perf_counter()
+    api = ApiClient()
+    try:
+        fixtures = await seed(api)
+        results = await asyncio.gather(*(run_case(api, fixtures, case) for case in CASES))
+    finally:
+        await api.aclose()
+
+    budgets = check_budgets(api.timings)
+    report = {
+        "baseUrl": BASE_URL,
+        "durationMs": round((time.perf_counter() - started) * 1000, 1),
+        "results": results,
+        "latency": budgets,
+    }
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(json.dumps(report, indent=2))
+
+    for result in results:
+        line = f"{result['testStatus']:<6} {result['testId']} {result['title']} ({result['durationMs']}ms)"
+        print(line if not result["testError"] else f"{line}\n       {result['testError']}")
+    over_budget = [row for row in budgets if not row["withinBudget"]]
+    for row in over_budget:
+        print(f"SLOW   {row['route']}: p95 {row['p95Ms']}ms > budget {row['budgetMs']}ms")
+
+    failed = [result for result in results if result["testStatus"] != "PASSED"]
+    print(
+        f"\n{len(results) - len(failed)}/{len(results)} cases passed, "
+        f"{len(over_budget)} endpoint(s) over budget in {report['durationMs'] / 1000:.1f}s "
+        f"(report: {REPORT_PATH})"
+    )
+    return 1 if failed or over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,54 @@
+"""Per-endpoint latency budgets in milliseconds, checked against p95.
+
+Keys are "METHOD /route/template" as recorded by ApiClient. Login and
+signup routes hash or compare bcrypt passwords, so they get more room.
+API_BUDGET_SCALE stretches every budget, e.g. 3 on a slow CI runner or
+against a remote database.
+"""
+import math
+import os
+
+DEFAULT_BUDGET_MS = 400
+
+BUDGETS_MS = {
+    "POST /api/auth/login": 1000,
+    "POST /api/auth/institution/login": 1000,
+    "POST /api/institution/create": 1200,
+    "POST /api/institution/club/create": 1200,
+    "POST /api/members/apply": 1000,
+    "GET /api/clubs/verify/:clubCode": 250,
+    "GET /api/user/permissions": 250,
+    "GET /api/club": 250,
+    "GET /api/events": 300,
+    "POST /api/events": 400,
+    "GET /api/members/pending": 300,
+    "GET /api/dashboard/stats": 600,
+    "GET /api/search": 400,
+    "GET /api/institution/heatmap": 600,
+    "GET /api/institution/dashboard": 1500,
+}
+
+BUDGET_SCALE = float(os.environ.get("API_BUDGET_SCALE", "1"))
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+
+def check_budgets(timings):
+    """Returns one row per endpoint with its p50/p95 and whether it met its budget."""
+    rows = []
+    for route, samples in sorted(timings.items()):
+        budget = BUDGETS_MS.get(route, DEFAULT_BUDGET_MS) * BUDGET_SCALE
+        p95 = percentile(samples, 0.95)
+        rows.append({
+            "route": route,
+            "calls": len(samples),
+            "p50Ms": round(percentile(samples, 0.5), 1),
+            "p95Ms": round(p95, 1),
+            "budgetMs": round(budget, 1),
+            "withinBudget": p95 <= budget,
+        })
+    return rows
@@ -0,0 +1,271 @@
+"""API-level equivalents of TC010 (JWT validation) and TC012 (authentication,
+authorization and error handling). Every case gets the shared ApiClient and
+the seeded Fixtures and runs concurrently with the others, so a case must
+not change state another case reads."""
+from dataclasses import dataclass
+
+from . import schemas
+from .client import expect_status
+from .fixtures import PASSWORD, expired_token, make_jwt
+
+
+@dataclass
+class Case:
+    test_id: str
+    title: str
+    run: object
+
+
+CASES = []
+
+
+def case(test_id, title):
+    def register(fn):
+        CASES.append(Case(test_id, title, fn))
+        return fn
+    return register
+
+
+def expect_message(response, *statuses):
+    expect_status(response, *statuses)
+    schemas.assert_shape(response.json(), schemas.MESSAGE)
+    return response.json()["message"]
+
+
+# ---------------------------------------------------------------------------
+# TC010 - JWT validation and session handling
+# ---------------------------------------------------------------------------
+
+@case("TC010", "Login returns a club token and the AuthResponse shape")
+async def login_returns_token(api, fx):
+    response = expect_status(await api.post("/api/auth/login", json={
+        "email": fx.president_email,
+        "password": PASSWORD,
+    }), 200)
+    body = response.json()
+    schemas.assert_shape(body, schemas.CLUB_AUTH_RESPONSE)
+    assert body["user"]["accountType"] == "club"
+    assert body["user"]["isPresident"] is True
+    assert "password" not in body["user"]
+
+
+@case("TC010", "Protected routes reject requests without a token")
+async def missing_token(api, fx):
+    for path in ("/api/club", "/api/events", "/api/user/permissions", "/api/institution/dashboard"):
+        expect_message(await api.get(path), 401)
+
+
+@case("TC010", "Malformed and foreign-signed tokens are rejected")
+async def invalid_tokens(api, fx):
+    expect_message(await api.get("/api/club", token="not-a-jwt"), 403)
+    forged = make_jwt({"userId": fx.president_id, "scope": "club"}, secret="not-the-server-secret")
+    expect_message(await api.get("/api/club", token=forged), 403)
+
+
+@case("TC010", "Expired tokens are rejected")
+async def expired_tokens(api, fx):
+    expect_message(await api.get("/api/club", token=expired_token(fx.president_id)), 403)
+
+
+@case("TC010", "Club and institution tokens only open their own scope")
+async def token_scopes(api, fx):
+    assert expect_message(await api.get("/api/club", token=fx.institution_token), 403) == "Invalid token scope"
+    assert expect_message(
+        await api.get("/api/institution/dashboard", token=fx.president_token), 403
+    ) == "Invalid token scope"
+
+
+@case("TC010", "A valid token returns the caller's permissions")
+async def permissions_for_token(api, fx):
+    body = expect_status(await api.get("/api/user/permissions", token=fx.president_token), 200).json()
+    assert isinstance(body.get("permissions"), dict)
+    assert body["permissions"].get("manage_settings") is True
+
+    body = expect_status(await api.get("/api/user/permissions", token=fx.member_token), 200).json()
+    assert not any(body["permissions"].values()), "a Council Head without a custom role has no permissions"
+
+
+@case("TC010", "Institution login returns an institution token")
+async def institution_login(api, fx):
+    expect_message(await api.post("/api/auth/institution/login", json={"email": fx.admin_email}), 400)
+    body = expect_status(await api.post("/api/auth/institution/login", json={
+        "email": fx.admin_email,
+        "password": PASSWORD,
+    }), 200).json()
+    schemas.assert_shape(body, schemas.INSTITUTION_AUTH_RESPONSE)
+    assert body["user"]["accountType"] == "institution"
+
+    # Club accounts are not institution accounts
+    expect_message(await api.post("/api/auth/institution/login", json={
+        "email": fx.president_email,
+        "password": PASSWORD,
+    }), 401)
+
+
+# ---------------------------------------------------------------------------
+# TC012 - authentication, authorization and error handling
+# ---------------------------------------------------------------------------
+
+@case("TC012", "Wrong passwords and unknown accounts get 401")
+async def bad_credentials(api, fx):
+    assert expect_message(await api.post("/api/auth/login", json={
+        "email": fx.president_email,
+        "password": "wrong-password",
+    }), 401) == "Invalid credentials"
+    assert expect_message(await api.post("/api/auth/login", json={
+        "email": "nobody@example.test",
+        "password": PASSWORD,
+    }), 401) == "Invalid credentials"
+
+
+@case("TC012", "Self-service club registration is closed")
+async def register_president_closed(api, fx):
+    expect_message(await api.post("/api/auth/register-president", json={}), 403)
+
+
+@case("TC012", "Members without a permission get 403")
+async def insufficient_permissions(api, fx):
+    assert expect_message(await api.get("/api/events", token=fx.member_token), 403) == "Insufficient permissions"
+    expect_message(await api.post("/api/events", token=fx.member_token, json={
+        "title": "Not allowed",
+        "date": "2030-01-01",
+        "status": "Planning",
+    }), 403)
+    expect_message(await api.get("/api/members/pending", token=fx.member_token), 403)
+
+
+@case("TC012", "Institution-only actions are closed to club tokens and lesser roles")
+async def institution_authorization(api, fx):
+    expect_message(await api.post("/api/institution/club/create", token=fx.president_token, json={
+        "clubName": "Not allowed",
+    }), 403)
+    expect_message(await api.post("/api/institution/club/create", token=fx.institution_token, json={}), 400)
+
+
+@case("TC012", "Event validation errors return 400 with a message")
+async def event_validation(api, fx):
+    expect_message(await api.post("/api/events", token=fx.president_token, json={"title": "No date"}), 400)
+    expect_message(await api.post("/api/events", token=fx.president_token, json={
+        "title": "Bad status",
+        "date": "2030-01-01",
+        "status": "Someday",
+    }), 400)
+    expect_message(await api.post("/api/events", token=fx.president_token, json={
+        "title": "Bad date",
+        "date": "not-a-date",
+        "status": "Planning",
+    }), 400)
+
+
+@case("TC012", "Events round-trip with the events table shape")
+async def event_round_trip(api, fx):
+    created = expect_status(await api.post("/api/events", token=fx.president_token, json={
+        "title": "Contract Test Meetup",
+        "description": "Created by the API contract suite",
+        "date": "2030-01-15T10:00:00.000Z",
+        "budget": 1500,
+        "status": "Planning",
+    }), 200).json()
+    schemas.assert_shape(created, schemas.EVENT)
+    assert created["clubId"] == fx.club_id
+
+    listed = expect_status(await api.get("/api/events", token=fx.president_token), 200).json()
+    schemas.assert_list_of(listed, schemas.EVENT)
+    assert any(event["id"] == created["id"] for event in listed)
+
+    expect_message(await api.patch(
+        "/api/events/does-not-exist", route="/api/events/:id", token=fx.president_token, json={"title": "x"}
+    ), 404)
+
+
+@case("TC012", "Event edits carrying a stale version get 409")
+async def event_version_conflict(api, fx):
+    created = expect_status(await api.post("/api/events", token=fx.president_token, json={
+        "title": "Versioned Meetup",
+        "date": "2030-02-01T10:00:00.000Z",
+        "status": "Planning",
+    }), 200).json()
+    route = "/api/events/:id"
+    updated = expect_status(await api.patch(
+        f"/api/events/{created['id']}", route=route, token=fx.president_token,
+        json={"title": "Versioned Meetup (moved)", "version": created["version"]},
+    ), 200).json()
+    assert updated["version"] == created["version"] + 1
+
+    stale = await api.patch(
+        f"/api/events/{created['id']}", route=route, token=fx.president_token,
+        json={"title": "Lost update", "version": created["version"]},
+    )
+    expect_message(stale, 409)
+    assert stale.json()["current"]["title"] == "Versioned Meetup (moved)"
+
+
+@case("TC012", "Club codes are verified and unknown ones get 404")
+async def club_code_verification(api, fx):
+    body = expect_status(await api.get(
+        f"/api/clubs/verify/{fx.club_code}", route="/api/clubs/verify/:clubCode"
+    ), 200).json()
+    schemas.assert_shape(body, schemas.CLUB_VERIFY)
+    expect_message(await api.get("/api/clubs/verify/ZZZZZZZZ", route="/api/clubs/verify/:clubCode"), 404)
+    expect_message(await api.post("/api/members/apply", json={
+        "clubCode": "ZZZZZZZZ",
+        "name": "Nobody",
+        "email": "nobody@example.test",
+        "password": PASSWORD,
+    }), 404)
+
+
+@case("TC012", "Club and dashboard reads match their shapes")
+async def club_reads(api, fx):
+    club = expect_status(await api.get("/api/club", token=fx.president_token), 200).json()
+    schemas.assert_shape(club, schemas.CLUB)
+    stats = expect_status(await api.get("/api/dashboard/stats", token=fx.president_token), 200).json()
+    schemas.assert_shape(stats, schemas.DASHBOARD_STATS)
+
+
+@case("TC012", "Finance writes move the dashboard balance")
+async def finance_balance(api, fx):
+    async def books():
+        stats = expect_status(await api.get("/api/dashboard/stats", token=fx.president_token), 200).json()
+        return stats["balance"], stats["pendingTransactions"]
+
+    balance, pending = await books()
+    created = expect_status(await api.post("/api/finance", token=fx.president_token, json={
+        "transactionName": "Contract Test Sponsorship",
+        "type": "income",
+        "amount": "125.50",
+    }), 200).json()
+    assert await books() == (balance, pending + 1)
+
+    approved = expect_status(await api.patch(
+        f"/api/finance/{created['id']}/approve", route="/api/finance/:id/approve", token=fx.president_token,
+    ), 200).json()
+    assert await books() == (round(balance + 125.5, 2), pending)
+
+    expect_status(await api.patch(
+        f"/api/finance/{created['id']}", route="/api/finance/:id", token=fx.president_token,
+        json={"amount": "100", "version": approved["version"]},
+    ), 200)
+    assert await books() == (round(balance + 100, 2), pending)
+
+    expect_status(await api.delete(
+        f"/api/finance/{created['id']}", route="/api/finance/:id", token=fx.president_token,
+    ), 200)
+    assert await books() == (balance, pending)
+
+
+@case("TC012", "Query parameter validation returns 400")
+async def query_validation(api, fx):
+    expect_message(await api.get("/api/search", token=fx.president_token, params={"q": "a"}), 400)
+    body = expect_status(await api.get("/api/search", token=fx.president_token, params={"q": "API"}), 200).json()
+    schemas.assert_shape(body, schemas.SEARCH_RESULTS)
+
+    expect_message(await api.get(
+        "/api/institution/heatmap", token=fx.institution_token, params={"from": "yesterday"}
+    ), 400)
+    body = expect_status(await api.get("/api/institution/heatmap", token=fx.institution_token, params={
+        "from": "2030-01-01",
+        "to": "2030-12-31",
+        "granularity": "month",
+    }), 200).json()
+    schemas.assert_list_of(body["heatmap"], schemas.HEATMAP_BUCKET, "body.heatmap")
@@ -0,0 +1,57 @@
+import os
+import time
+from collections import defaultdict
+
+import httpx
+
+BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:5000")
+
+
+class ApiClient:
+    """Thin wrapper over one pooled httpx.AsyncClient shared by every case.
+
+    Each call is timed and filed under its route template (``route=``), so
+    /api/events/123 and /api/events/456 count towards the same budget.
+    """
+
+    def __init__(self, base_url=BASE_URL, max_connections=20):
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            headers={"Accept": "application/json"},
+        )
+        self.timings = defaultdict(list)  # "GET /api/events" -> [ms, ...]
+
+    async def request(self, method, path, *, route=None, token=None, headers=None, **kwargs):
+        headers = dict(headers or {})
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        started = time.perf_counter()
+        response = await self._client.request(method, path, headers=headers, **kwargs)
+        self.timings[f"{method} {route or path}"].append((time.perf_counter() - started) * 1000)
+        return response
+
+    async def get(self, path, **kwargs):
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path, **kwargs):
+        return await self.request("POST", path, **kwargs)
+
+    async def patch(self, path, **kwargs):
+        return await self.request("PATCH", path, **kwargs)
+
+    async def delete(self, path, **kwargs):
+        return await self.request("DELETE", path, **kwargs)
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+def expect_status(response, *expected):
+    if response.status_code not in expected:
+        raise AssertionError(
+            f"{response.request.method} {response.request.url.path}: expected {' or '.join(map(str, expected))}, "
+            f"got {response.status_code} {response.text[:200]}"
+        )
+    return response
@@ -0,0 +1,115 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass
+
+from .client import expect_status
+
+# Must match the server's SESSION_SECRET to mint tokens (e.g. already expired ones)
+SESSION_SECRET = os.environ.get("SESSION_SECRET", "your-secret-key-change-in-production")
+PASSWORD = "Contract-Test-1!"
+
+
+@dataclass
+class Fixtures:
+    """Accounts created once per run; every case reads from them."""
+
+    admin_email: str
+    institution_token: str
+    institution_id: str
+    club_id: str
+    club_code: str
+    president_email: str
+    president_token: str
+    president_id: str
+    member_email: str
+    member_token: str
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def make_jwt(payload, secret=SESSION_SECRET):
+    """HS256 token identical to what jsonwebtoken.sign produces."""
+    header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+    body = _b64(json.dumps(payload, separators=(",", ":")).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{body}".encode(), hashlib.sha256).digest()
+    return f"{header}.{body}.{_b64(signature)}"
+
+
+def expired_token(user_id, scope="club"):
+    issued = int(time.time()) - 3600
+    return make_jwt({"userId": user_id, "scope": scope, "iat": issued, "exp": issued + 60})
+
+
+async def seed(api):
+    """Creates an institution, a club with a president, and an approved
+    Council Head with login access but no permissions. Emails are unique per
+    run so the suite can be pointed at a shared database repeatedly."""
+    run = uuid.uuid4().hex[:10]
+    admin_email = f"api-admin-{run}@example.test"
+    president_email = f"api-president-{run}@example.test"
+    member_email = f"api-member-{run}@example.test"
+
+    response = expect_status(await api.post("/api/institution/create", json={
+        "institutionName": f"API Contract Institute {run}",
+        "institutionType": "College",
+        "adminName": "API Admin",
+        "adminEmail": admin_email,
+        "password": PASSWORD,
+    }), 201)
+    institution = response.json()
+    institution_token = institution["token"]
+
+    response = expect_status(await api.post("/api/institution/club/create", token=institution_token, json={
+        "clubName": f"API Contract Club {run}",
+        "department": "Computer Science",
+        "presidentName": "API President",
+        "presidentEmail": president_email,
+        "presidentPassword": PASSWORD,
+    }), 201)
+    club = response.json()["club"]
+
+    response = expect_status(await api.post("/api/auth/login", json={
+        "email": president_email,
+        "password": PASSWORD,
+    }), 200)
+    president = response.json()
+
+    expect_status(await api.post("/api/members/apply", json={
+        "clubCode": club["clubCode"],
+        "name": "API Member",
+        "email": member_email,
+        "password": PASSWORD,
+    }), 200)
+    pending = expect_status(await api.get("/api/members/pending", token=president["token"]), 200).json()
+    applicant = next(entry for entry in pending if entry["email"] == member_email)
+    expect_status(await api.post(
+        f"/api/members/approve/{applicant['id']}",
+        route="/api/members/approve/:id",
+        token=president["token"],
+        json={"role": "Council Head"},
+    ), 200)
+
+    response = expect_status(await api.post("/api/auth/login", json={
+        "email": member_email,
+        "password": PASSWORD,
+    }), 200)
+
+    return Fixtures(
+        admin_email=admin_email,
+        institution_token=institution_token,
+        institution_id=institution["institution"]["id"],
+        club_id=club["id"],
+        club_code=club["clubCode"],
+        president_email=president_email,
+        president_token=president["token"],
+        president_id=president["user"]["id"],
+        member_email=member_email,
+        member_token=response.json()["token"],
+    )
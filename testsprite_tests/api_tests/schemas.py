@@ -0,0 +1,156 @@
+"""Response shapes, kept in step with shared/schema.ts and client/src/types/api.ts.
+
+A shape maps each field to the Python type(s) its JSON value may have.
+Timestamps arrive as ISO strings and decimals as strings. Extra fields are
+allowed, so adding a column does not break the contract; removing or
+retyping one does.
+"""
+
+NoneType = type(None)
+STR = str
+OPT_STR = (str, NoneType)
+NUMBER = (int, float)
+OPT_NUMBER_STR = (str, int, float, NoneType)  # decimal columns
+BOOL = bool
+DICT = dict
+LIST = list
+
+MESSAGE = {"message": STR}
+
+# users table without the password column (sanitizeUser)
+PUBLIC_USER = {
+    "id": STR,
+    "clubId": STR,
+    "name": STR,
+    "email": STR,
+    "phone": OPT_STR,
+    "idNumber": OPT_STR,
+    "linkedin": OPT_STR,
+    "portfolio": OPT_STR,
+    "role": STR,
+    "roleId": OPT_STR,
+    "isPresident": BOOL,
+    "isApproved": BOOL,
+    "canLogin": BOOL,
+    "createdAt": STR,
+}
+
+CLUB = {
+    "id": STR,
+    "institutionId": OPT_STR,
+    "name": STR,
+    "collegeName": STR,
+    "department": OPT_STR,
+    "logoUrl": OPT_STR,
+    "description": OPT_STR,
+    "performanceIndex": OPT_NUMBER_STR,
+    "clubCode": STR,
+    "createdAt": STR,
+}
+
+INSTITUTION = {
+    "id": STR,
+    "name": STR,
+    "type": STR,
+    "code": STR,
+    "phone": OPT_STR,
+    "adminEmail": OPT_STR,
+    "createdAt": STR,
+}
+
+EVENT = {
+    "id": STR,
+    "clubId": STR,
+    "title": STR,
+    "description": OPT_STR,
+    "date": STR,
+    "budget": OPT_NUMBER_STR,
+    "status": STR,
+    "assignedToId": OPT_STR,
+    "createdById": STR,
+    "version": NUMBER,
+    "createdAt": STR,
+}
+
+PENDING_MEMBER = {
+    "id": STR,
+    "clubId": STR,
+    "name": STR,
+    "email": STR,
+    "appliedAt": STR,
+}
+
+# AuthResponse<ClubAuthUser>
+CLUB_AUTH_RESPONSE = {
+    "token": STR,
+    "user": {
+        "accountType": STR,
+        "id": STR,
+        "name": STR,
+        "email": STR,
+        "role": STR,
+        "isPresident": BOOL,
+        "clubId": STR,
+        "permissions": DICT,
+    },
+}
+
+# AuthResponse<InstitutionAuthUser>
+INSTITUTION_AUTH_RESPONSE = {
+    "token": STR,
+    "user": {
+        "accountType": STR,
+        "id": STR,
+        "name": STR,
+        "email": STR,
+        "role": STR,
+        "institutionId": STR,
+        "department": OPT_STR,
+        "permissions": DICT,
+    },
+}
+
+CLUB_VERIFY = {"name": STR, "collegeName": STR, "description": OPT_STR}
+
+DASHBOARD_STATS = {
+    "pendingMembers": (int, NoneType),
+    "totalMembers": (int, NoneType),
+    "activeEvents": (int, NoneType),
+    "pendingTasks": (int, NoneType),
+    "balance": (int, float, NoneType),
+    "pendingTransactions": (int, NoneType),
+}
+
+INSTITUTION_HEATMAP = {"heatmap": LIST, "granularity": STR}
+HEATMAP_BUCKET = {"date": STR, "intensity": NUMBER}
+
+SEARCH_RESULTS = {"query": STR, "members": LIST, "events": LIST, "tasks": LIST}
+
+
+def assert_shape(value, shape, path="body"):
+    """Raises AssertionError naming the first field that does not match."""
+    if isinstance(shape, dict):
+        if not isinstance(value, dict):
+            raise AssertionError(f"{path}: expected object, got {type(value).__name__}")
+        for field, field_shape in shape.items():
+            if field not in value:
+                raise AssertionError(f"{path}.{field}: missing")
+            assert_shape(value[field], field_shape, f"{path}.{field}")
+        return
+    expected = shape if isinstance(shape, tuple) else (shape,)
+    # bool is a subclass of int; don't let True pass for a number
+    if isinstance(value, bool) and bool not in expected:
+        raise AssertionError(f"{path}: expected {_names(expected)}, got bool")
+    if not isinstance(value, expected):
+        raise AssertionError(f"{path}: expected {_names(expected)}, got {type(value).__name__}")
+
+
+def assert_list_of(value, shape, path="body"):
+    if not isinstance(value, list):
+        raise AssertionError(f"{path}: expected array, got {type(value).__name__}")
+    for index, item in enumerate(value):
+        assert_shape(item, shape, f"{path}[{index}]")
+
+
+def _names(types):
+    return " | ".join("null" if t is NoneType else t.__name__ for t in types)
@@ -0,0 +1,10 @@
+"""Timing and trace capture for the TC0xx Playwright scripts.
+
+The scripts stay exactly as testsprite generates them. The harness runs
+each one in its own process with Playwright instrumented, so every
+navigation, locator resolution, click/fill, wait and assertion becomes a
+timed span and every /api response is recorded. Traces and HARs are kept
+for failing tests and tests with slow steps. Run with:
+
+    python -m testsprite_tests.harness [TC003 TC010 ...]
+"""
@@ -0,0 +1,258 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from testsprite_tests.api_tests.budgets import percentile
+
+from .impact import normalize_path, select, update_impact_map
+from .sharding import load_durations, pack, record_durations
+from .spans import SLOW_STEP_MS
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+TMP_DIR = TESTS_DIR / "tmp"
+TIMINGS_DIR = TMP_DIR / "timings"
+ARTIFACTS_DIR = TMP_DIR / "artifacts"
+REPORT_PATH = TMP_DIR / "timing_report.json"
+SHARDS_DIR = TMP_DIR / "shards"
+
+
+def discover(selected):
+    scripts = sorted(TESTS_DIR.glob("TC*.py"))
+    if selected:
+        scripts = [script for script in scripts if any(script.name.startswith(prefix) for prefix in selected)]
+    return scripts
+
+
+async def run_script(script, timeout_s, isolate, extra_env):
+    test_id = script.name.split("_")[0]
+    output = TIMINGS_DIR / f"{test_id}.json"
+    async with contextlib.AsyncExitStack() as stack:
+        env = {**os.environ, **extra_env}
+        if isolate:
+            # Own clone of the seeded template and own server, on a free port
+            from testsprite_tests.snapshots import isolated_server
+            env["TESTSPRITE_BASE_URL"] = await stack.enter_async_context(isolated_server(test_id))
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "testsprite_tests.harness.run_one",
+            str(script), str(output), str(ARTIFACTS_DIR / test_id),
+            cwd=TESTS_DIR.parent, env=env,
+        )
+        try:
+            await asyncio.wait_for(process.wait(), timeout_s)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return {"script": script.name, "testId": test_id, "testStatus": "ERROR",
+                    "testError": f"timed out after {timeout_s}s", "durationMs": timeout_s * 1000,
+                    "slowSteps": 0, "artifacts": [], "spans": [], "apiCalls": []}
+    if not output.exists():
+        return {"script": script.name, "testId": test_id, "testStatus": "ERROR",
+                "testError": f"harness exited with {process.returncode} without a result",
+                "durationMs": 0, "slowSteps": 0, "artifacts": [], "spans": [], "apiCalls": []}
+    return json.loads(output.read_text())
+
+
+async def run_lane(lane, timeout_s, isolate, extra_env):
+    """Runs one lane's scripts back to back; lanes run side by side."""
+    started = time.perf_counter()
+    results = [await run_script(script, timeout_s, isolate, extra_env) for script in lane["scripts"]]
+    return results, {
+        "tests": [result["testId"] for result in results],
+        "expectedMs": round(lane["expectedMs"], 1),
+        "actualMs": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def parse_shard(value):
+    try:
+        index, total = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected I/N, e.g. 2/4")
+    if not 1 <= index <= total:
+        raise argparse.ArgumentTypeError("shard index must be between 1 and N")
+    return index, total
+
+
+def time_by_kind(spans):
+    totals = defaultdict(float)
+    for span in spans:
+        totals[span["kind"]] += span.get("durationMs", 0)
+    return {kind: round(total, 1) for kind, total in sorted(totals.items())}
+
+
+def aggregate_api_calls(results):
+    grouped = defaultdict(list)
+    for result in results:
+        for call in result["apiCalls"]:
+            grouped[(call["method"], normalize_path(call["path"]))].append(call)
+    rows = []
+    for (method, path), calls in grouped.items():
+        durations = [call["durationMs"] for call in calls]
+        rows.append({
+            "route": f"{method} {path}",
+            "calls": len(calls),
+            "totalMs": round(sum(durations), 1),
+            "p50Ms": round(percentile(durations, 0.5), 1),
+            "p95Ms": round(percentile(durations, 0.95), 1),
+            "maxMs": round(max(durations), 1),
+            "errors": sum(1 for call in calls if call["status"] is None or call["status"] >= 400),
+        })
+    return sorted(rows, key=lambda row: row["totalMs"], reverse=True)
+
+
+def build_report(results, duration_ms, top, lanes):
+    all_spans = [dict(span, testId=result["testId"]) for result in results for span in result["spans"]]
+    slowest = sorted(all_spans, key=lambda span: span.get("durationMs", 0), reverse=True)[:top]
+    return {
+        "generatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "durationMs": round(duration_ms, 1),
+        "slowStepMs": SLOW_STEP_MS,
+        "lanes": lanes,
+        "timeByKind": time_by_kind(all_spans),
+        "tests": [{
+            "testId": result["testId"],
+            "script": result["script"],
+            "testStatus": result["testStatus"],
+            "testError": result["testError"],
+            "durationMs": result["durationMs"],
+            "steps": len(result["spans"]),
+            "slowSteps": result["slowSteps"],
+            "timeByKind": time_by_kind(result["spans"]),
+            "artifacts": result["artifacts"],
+        } for result in results],
+        "slowestSteps": [{
+            "testId": span["testId"],
+            "kind": span["kind"],
+            "name": span["name"],
+            "target": span.get("target"),
+            "durationMs": span.get("durationMs", 0),
+            "error": span.get("error"),
+        } for span in slowest],
+        "apiCalls": aggregate_api_calls(results),
+    }
+
+
+def print_summary(report):
+    for test in report["tests"]:
+        print(f"{test['testStatus']:<6} {test['testId']} {test['durationMs'] / 1000:.1f}s "
+              f"({test['steps']} steps, {test['slowSteps']} slow)")
+    print("\nSlowest steps:")
+    for step in report["slowestSteps"][:10]:
+        print(f"  {step['durationMs']:>9.1f}ms  {step['testId']}  {step['kind']}:{step['name']}  {step['target'] or ''}")
+    print(f"\nTime by kind: {report['timeByKind']}")
+    print("Lanes: " + ", ".join(
+        f"{'+'.join(lane['tests'])} {lane['actualMs'] / 1000:.1f}s (expected {lane['expectedMs'] / 1000:.1f}s)"
+        for lane in report["lanes"]
+    ))
+    print(f"Wall clock: {report['durationMs'] / 1000:.1f}s")
+    print(f"Report: {REPORT_PATH}")
+
+
+def merge_shards():
+    """Combines the shard files of a split run (copied into tmp/shards/)."""
+    shards = [json.loads(path.read_text()) for path in sorted(SHARDS_DIR.glob("shard-*.json"))]
+    results = [result for shard in shards for result in shard["results"]]
+    lanes = [dict(lane, shard=shard["shard"]) for shard in shards for lane in shard["lanes"]]
+    duration_ms = max((shard["durationMs"] for shard in shards), default=0)
+    return results, lanes, duration_ms
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run TC scripts with per-step timing and trace capture")
+    parser.add_argument("tests", nargs="*", help="test id prefixes, e.g. TC003 TC010 (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=int(os.environ.get("TESTSPRITE_WORKERS", "1")),
+                        help="scripts running at once; tests are spread over the lanes by past duration")
+    parser.add_argument("--shard", type=parse_shard, metavar="I/N",
+                        help="run only the I-th of N duration-balanced shards (e.g. one per CI machine)")
+    parser.add_argument("--merge", action="store_true",
+                        help="build the report from the shard files in tmp/shards instead of running tests")
+    parser.add_argument("--changed", nargs="?", const=os.environ.get("TESTSPRITE_DIFF_BASE", "main"), metavar="REF",
+                        help="run only tests impacted by changes since REF (default main), per impact_map.json")
+    parser.add_argument("--timeout", type=int, default=300, help="seconds per script")
+    parser.add_argument("--top", type=int, default=25, help="slowest steps to list in the report")
+    parser.add_argument("--isolate", action="store_true",
+                        help="give every script its own clone of the seeded template database and server")
+    parser.add_argument("--record-api", action="store_true",
+                        help="save each script's /api traffic to testsprite_tests/recordings/<TC>/")
+    parser.add_argument("--replay-api", choices=["lenient", "strict"], nargs="?", const="strict",
+                        help="serve /api from the recordings and the UI from dist/public, with no backend; "
+                             "strict (default) fails tests that make unrecorded requests")
+    args = parser.parse_args()
+    if args.replay_api and (args.isolate or args.record_api):
+        parser.error("--replay-api runs without a backend; it can't be combined with --isolate or --record-api")
+
+    if args.merge:
+        results, lanes, duration_ms = merge_shards()
+        if not results:
+            print(f"No shard results in {SHARDS_DIR}", file=sys.stderr)
+            return 2
+    else:
+        scripts = discover(args.tests)
+        if args.changed:
+            scripts, reasons = select(scripts, args.changed)
+            print(f"Changes since {args.changed} select {len(scripts)} test(s):")
+            for test_id, reason in sorted(reasons.items()):
+                print(f"  {test_id}: {reason}")
+            if not scripts:
+                return 0
+        durations = load_durations()
+        if args.shard:
+            index, total = args.shard
+            shards = pack(scripts, durations, total)
+            scripts = shards[index - 1]["scripts"] if index <= len(shards) else []
+        if not scripts:
+            print("No TC scripts matched", file=sys.stderr)
+            return 0 if args.shard else 2
+
+        if args.isolate:
+            from testsprite_tests.snapshots import ensure_template
+            await ensure_template()
+
+        extra_env = {}
+        async with contextlib.AsyncExitStack() as stack:
+            if args.record_api:
+                extra_env["TESTSPRITE_API_MODE"] = "record"
+            elif args.replay_api:
+                from testsprite_tests.replay import serve_static
+                extra_env["TESTSPRITE_API_MODE"] = "replay-strict" if args.replay_api == "strict" else "replay"
+                extra_env["TESTSPRITE_BASE_URL"] = stack.enter_context(serve_static())
+
+            started = time.perf_counter()
+            runs = await asyncio.gather(*(run_lane(lane, args.timeout, args.isolate, extra_env)
+                                          for lane in pack(scripts, durations, args.jobs)))
+            duration_ms = (time.perf_counter() - started) * 1000
+        results = [result for lane_results, _ in runs for result in lane_results]
+        lanes = [lane for _, lane in runs]
+
+        if args.shard:
+            # Partial run: the merge step writes the report and the history
+            index, total = args.shard
+            SHARDS_DIR.mkdir(parents=True, exist_ok=True)
+            shard_path = SHARDS_DIR / f"shard-{index}-of-{total}.json"
+            shard_path.write_text(json.dumps({
+                "shard": f"{index}/{total}", "durationMs": round(duration_ms, 1), "lanes": lanes, "results": results,
+            }, indent=2))
+            for result in results:
+                print(f"{result['testStatus']:<6} {result['testId']} {result['durationMs'] / 1000:.1f}s")
+            print(f"Shard {index}/{total}: {shard_path}")
+            return 0 if all(result["testStatus"] == "PASSED" for result in results) else 1
+
+    results.sort(key=lambda result: result["testId"])
+    report = build_report(results, duration_ms, args.top, lanes)
+    REPORT_PATH.write_text(json.dumps(report, indent=2))
+    if not args.replay_api:
+        # Replayed runs skip the backend, so their timings would skew the lanes
+        record_durations(results)
+    update_impact_map(results)
+    print_summary(report)
+    return 0 if all(test["testStatus"] == "PASSED" for test in report["tests"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
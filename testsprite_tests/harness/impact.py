@@ -0,0 +1,342 @@
+"""Change-aware test selection.
+
+Every passing run records which client pages and API routes each TC script
+touched (impact_map.json). Given a git diff, changed files are traced to
+pages (through the client import graph) and to API routes (through the
+route handlers and the helpers and storage methods they call), and only the
+scripts that touched one of them are selected. Changes that can affect any
+test, and changes that can't be traced, select everything.
+"""
+import json
+import re
+import subprocess
+from collections import defaultdict
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT = TESTS_DIR.parent
+IMPACT_MAP_PATH = TESTS_DIR / "impact_map.json"
+CLIENT_SRC = REPO_ROOT / "client" / "src"
+ROUTES_FILE = "server/routes.ts"
+# Route groups registerRoutes mounts lazily, with their mount path
+ROUTE_MODULES = {
+    "server/route-modules/reports.ts": "/api/institution/report",
+    "server/route-modules/exports.ts": "/api/export",
+}
+
+# /api/events/3f2c...-... and /api/teams/12 aggregate as /api/events/:id
+ID_SEGMENT = re.compile(r"/(?:[0-9a-f]{8}-[0-9a-f-]{27}|\d+)(?=/|$)", re.IGNORECASE)
+
+# Schema, auth, app wiring and the runner itself: any change runs everything
+FULL_RUN_PATHS = (
+    "shared/schema.ts",
+    "shared/permissions.ts",
+    "migrations/",
+    "server/app.ts",
+    "server/index.ts",
+    "server/db.ts",
+    "client/index.html",
+    "client/src/main.tsx",
+    "client/src/index.css",
+    "client/src/lib/auth.tsx",
+    "client/src/lib/queryClient.ts",
+    "package.json",
+    "package-lock.json",
+    "vite.config.ts",
+    "tailwind.config.ts",
+    "testsprite_tests/harness/",
+    "testsprite_tests/snapshots/",
+)
+# Middleware in routes.ts that every authenticated request runs through
+AUTH_SYMBOLS = {
+    "getRolePermissionMask",
+    "authenticateToken",
+    "authenticateInstitutionToken",
+    "requirePermission",
+    "requireInstitutionRole",
+}
+# Server modules whose exports routes.ts calls; changes map to the handlers
+# using them. Other server modules (dispatcher, cluster, vite) run everything.
+ROUTE_DEPENDENCIES = {
+    "server/storage.ts",
+    "server/memory-storage.ts",
+    "server/ai.ts",
+    "server/analytics.ts",
+    "server/club-import.ts",
+    "server/invalidation.ts",
+    "server/metrics.ts",
+    "server/rate-limit.ts",
+}
+ROUTE_ENTRIES = ("client/src/App.tsx", "client/src/PublicApp.tsx")
+
+ROUTE_REGISTRATION = re.compile(r"^\s*(?:app|router)\.(get|post|put|patch|delete)\(\s*['\"]([^'\"]+)['\"]")
+DECLARATION = re.compile(r"^(?:export\s+)?(?:async\s+)?(?:function\s+(\w+)|(?:const|let)\s+(\w+)\s*=)")
+LOCAL_DECLARATION = re.compile(r"^  (?:async\s+)?(?:function\s+(\w+)|(?:const|let)\s+(\w+)\s*=)")
+CLASS_START = re.compile(r"^(?:export\s+)?(?:default\s+)?(?:class|interface)\b")
+CLASS_MEMBER = re.compile(r"^  (?:private\s+|public\s+|async\s+)*(\w+)\s*[(<]")
+KEYWORDS = {"if", "for", "while", "switch", "return", "catch", "await", "constructor"}
+IMPORT = re.compile(r"""(?:import|from)\s*\(?\s*['"]([^'"]+)['"]""")
+LAZY_PAGE = re.compile(r"""const\s+(\w+)\s*=\s*lazy\(\(\)\s*=>\s*import\(['"]@/pages/([^'"]+)['"]\)\)""")
+CLIENT_ROUTE = re.compile(r"""<Route\s+path=['"]([^'"]+)['"]""")
+HUNK = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@", re.MULTILINE)
+
+
+class FullRun(Exception):
+    """A change that may affect any test, or that can't be traced."""
+
+
+def normalize_path(path):
+    return ID_SEGMENT.sub("/:id", path)
+
+
+def load_impact_map():
+    try:
+        return json.loads(IMPACT_MAP_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def update_impact_map(results):
+    """Replaces the entries of tests that passed; failed runs may have
+    stopped early and would under-report what the test covers."""
+    impact = load_impact_map()
+    for result in results:
+        if result["testStatus"] != "PASSED":
+            continue
+        impact[result["testId"]] = {
+            "pages": sorted({normalize_path(page) for page in result.get("pages", [])}),
+            "apiRoutes": sorted({f"{call['method']} {normalize_path(call['path'])}" for call in result["apiCalls"]}),
+        }
+    IMPACT_MAP_PATH.write_text(json.dumps(dict(sorted(impact.items())), indent=2) + "\n")
+
+
+# --- git ---------------------------------------------------------------------
+
+def _git(*args):
+    return subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout
+
+
+def changed_files(base):
+    """Files changed between the merge base with `base` and the working
+    tree (uncommitted and untracked files included), with the changed line
+    numbers of the current version of each file."""
+    merge_base = _git("merge-base", base, "HEAD").strip()
+    files = {}
+    for path in _git("diff", "--name-only", merge_base).splitlines():
+        lines = set()
+        for match in HUNK.finditer(_git("diff", "-U0", merge_base, "--", path)):
+            start, count = int(match.group(1)), int(match.group(2) or 1)
+            # Pure deletions report the line before the gap
+            lines.update(range(start, start + count) if count else (start, start + 1))
+        files[path] = lines
+    for path in _git("ls-files", "--others", "--exclude-standard").splitlines():
+        files[path] = None  # new file: every line is new
+    return files
+
+
+# --- server ------------------------------------------------------------------
+
+def _anchors(text, prefix=""):
+    """(line, name) for each top-level declaration, class or interface
+    member, and route registration or local helper inside registerRoutes
+    (or a route module's create...Router), in file order. Route names
+    contain a space, symbols don't; `prefix` is the module's mount path."""
+    anchors, block = [], None
+    lines = text.splitlines()
+    for number, line in enumerate(lines, start=1):
+        if line.startswith("}"):
+            block = None
+        elif CLASS_START.match(line):
+            block = "class"
+        elif match := DECLARATION.match(line):
+            name = next(group for group in match.groups() if group)
+            anchors.append((number, name))
+            block = "routes" if name == "registerRoutes" or re.fullmatch(r"create\w+Router", name) else None
+        elif block == "class" and (match := CLASS_MEMBER.match(line)) and match.group(1) not in KEYWORDS:
+            anchors.append((number, match.group(1)))
+        elif block == "routes" and (match := ROUTE_REGISTRATION.match(
+            # app.post(\n    '/api/...' registrations put the path on the next line
+            line + (lines[number].strip() if line.rstrip().endswith("(") and number < len(lines) else "")
+        )):
+            anchors.append((number, f"{match.group(1).upper()} {prefix}{match.group(2)}"))
+        elif block == "routes" and (match := LOCAL_DECLARATION.match(line)):
+            anchors.append((number, next(group for group in match.groups() if group)))
+    return anchors
+
+
+def _bodies(text, anchors):
+    lines = text.splitlines()
+    ends = [line - 1 for line, _ in anchors[1:]] + [len(lines)]
+    return {name: "\n".join(lines[start - 1:end]) for (start, name), end in zip(anchors, ends)}
+
+
+def _enclosing(anchors, changed_lines):
+    if changed_lines is None:
+        raise FullRun("new file")
+    names = set()
+    for changed in changed_lines:
+        owners = [name for line, name in anchors if line <= changed]
+        if not owners:
+            raise FullRun("imports or module header changed")
+        names.add(owners[-1])
+    return names
+
+
+def _closure(names, bodies):
+    """`names` plus every declaration that references one of them, transitively."""
+    affected = set(names)
+    while True:
+        symbols = [re.compile(rf"\b{re.escape(name)}\b") for name in affected if " " not in name]
+        found = {
+            name for name, body in bodies.items()
+            if name not in affected and any(symbol.search(body) for symbol in symbols)
+        }
+        if not found:
+            return affected
+        affected |= found
+
+
+def _route_index():
+    bodies = {}
+    for path, prefix in {ROUTES_FILE: "", **ROUTE_MODULES}.items():
+        text = (REPO_ROOT / path).read_text()
+        bodies.update(_bodies(text, _anchors(text, prefix)))
+    return bodies
+
+
+def affected_api_routes(path, changed_lines):
+    """Route templates ("GET /api/events/:id") a server change can reach."""
+    route_bodies = _route_index()
+    if path == ROUTES_FILE or path in ROUTE_MODULES:
+        text = (REPO_ROOT / path).read_text()
+        names = _enclosing(_anchors(text, ROUTE_MODULES.get(path, "")), changed_lines)
+    elif path in ROUTE_DEPENDENCIES:
+        text = (REPO_ROOT / path).read_text()
+        anchors = _anchors(text)
+        names = _closure(_enclosing(anchors, changed_lines), _bodies(text, anchors))
+    else:
+        raise FullRun("server module outside the route handlers")
+
+    affected = _closure(names, route_bodies)
+    if affected & AUTH_SYMBOLS:
+        raise FullRun("authentication middleware changed")
+    return {name for name in affected if " " in name}
+
+
+def _route_pattern(template):
+    return re.compile("^" + re.sub(r":\w+", "[^/]+", template) + "$")
+
+
+# --- client ------------------------------------------------------------------
+
+def _resolve_import(source, spec):
+    if spec.startswith("@/"):
+        base = CLIENT_SRC / spec[2:]
+    elif spec.startswith("."):
+        base = (source.parent / spec).resolve()
+    else:
+        return None
+    for candidate in (base, *(base.with_name(base.name + ext) for ext in (".tsx", ".ts")),
+                      base / "index.tsx", base / "index.ts"):
+        if candidate.is_file():
+            return candidate.relative_to(REPO_ROOT).as_posix()
+    return None
+
+
+def _importers():
+    importers = defaultdict(set)
+    for source in CLIENT_SRC.rglob("*.ts*"):
+        for spec in IMPORT.findall(source.read_text()):
+            target = _resolve_import(source, spec)
+            if target:
+                importers[target].add(source.relative_to(REPO_ROOT).as_posix())
+    return importers
+
+
+def _page_routes():
+    """Page file -> client route patterns, read from the router entries."""
+    routes = defaultdict(set)
+    for entry in ROUTE_ENTRIES:
+        text = (REPO_ROOT / entry).read_text()
+        pages = {name: f"client/src/pages/{module}" for name, module in LAZY_PAGE.findall(text)}
+        for chunk in text.split("<Route ")[1:]:
+            path = CLIENT_ROUTE.match("<Route " + chunk)
+            if not path:
+                continue
+            used = [(chunk.find(name), name) for name in pages if re.search(rf"\b{name}\b", chunk)]
+            if used:
+                module = pages[min(used)[1]]
+                file = next(f"{module}{ext}" for ext in (".tsx", ".ts") if (REPO_ROOT / f"{module}{ext}").exists())
+                routes[file].add(path.group(1))
+    return routes
+
+
+def affected_pages(path, importers, page_routes):
+    """Client route patterns whose page (transitively) imports `path`."""
+    seen, queue, patterns = {path}, [path], set()
+    while queue:
+        current = queue.pop()
+        if current in page_routes:
+            patterns |= page_routes[current]
+            continue  # pages are leaves: their importers are the routers
+        if current in ROUTE_ENTRIES:
+            raise FullRun("shared by every page")
+        for importer in importers.get(current, ()):
+            if importer not in seen:
+                seen.add(importer)
+                queue.append(importer)
+    return patterns
+
+
+# --- selection -----------------------------------------------------------------
+
+def select(scripts, base):
+    """Returns (selected scripts, reason per selected test id)."""
+    impact = load_impact_map()
+    changes = changed_files(base)
+    all_ids = [script.name.split("_")[0] for script in scripts]
+
+    def everything(reason):
+        return scripts, {test_id: reason for test_id in all_ids}
+
+    reasons = defaultdict(list)
+    api_routes, page_patterns = {}, {}
+    importers = page_routes = None
+    for path, lines in sorted(changes.items()):
+        if path.startswith(FULL_RUN_PATHS):
+            return everything(f"{path} affects every test")
+        try:
+            if path.startswith("testsprite_tests/TC"):
+                reasons[Path(path).name.split("_")[0]].append(f"{path} changed")
+            elif path.startswith("testsprite_tests/perf/"):
+                reasons["TC011"].append(f"{path} changed")  # TC011's perf mode
+            elif path.startswith(("server/", "shared/")):
+                for route in affected_api_routes(path, lines):
+                    api_routes[route] = path
+            elif path.startswith("client/src/"):
+                if importers is None:
+                    importers, page_routes = _importers(), _page_routes()
+                for pattern in affected_pages(path, importers, page_routes):
+                    page_patterns[pattern] = path
+        except FullRun as reason:
+            return everything(f"{path}: {reason}")
+
+    route_matchers = {route: (route.split(" ")[0], _route_pattern(route.split(" ", 1)[1])) for route in api_routes}
+    page_matchers = {pattern: _route_pattern(pattern) for pattern in page_patterns}
+    for test_id in all_ids:
+        entry = impact.get(test_id)
+        if entry is None:
+            reasons[test_id].append("no recorded impact yet")
+            continue
+        for recorded in entry["apiRoutes"]:
+            method, recorded_path = recorded.split(" ", 1)
+            for route, (route_method, matcher) in route_matchers.items():
+                if method == route_method and matcher.match(recorded_path):
+                    reasons[test_id].append(f"{route} ({api_routes[route]})")
+        for page in entry["pages"]:
+            for pattern, matcher in page_matchers.items():
+                if matcher.match(page):
+                    reasons[test_id].append(f"page {pattern} ({page_patterns[pattern]})")
+
+    selected = [script for script, test_id in zip(scripts, all_ids) if reasons.get(test_id)]
+    return selected, {test_id: "; ".join(sorted(set(reasons[test_id]))) for test_id in all_ids if reasons.get(test_id)}
@@ -0,0 +1,72 @@
+"""Runs one TC script with instrumentation and writes its timing JSON.
+
+Invoked by the harness as a child process, one per script, because the
+scripts start their own event loop with asyncio.run at import time:
+
+    python -m testsprite_tests.harness.run_one <script.py> <output.json> <artifacts dir>
+"""
+import json
+import os
+import runpy
+import shutil
+import sys
+import time
+from pathlib import Path
+
+from .spans import Recorder, instrument
+
+
+def main(script, output, artifacts_dir):
+    base_url = os.environ.get("TESTSPRITE_BASE_URL")
+    if base_url:
+        from testsprite_tests.snapshots import retarget
+        retarget(base_url)
+
+    # "record" saves the script's /api traffic, "replay"/"replay-strict" serve it
+    api_mode = os.environ.get("TESTSPRITE_API_MODE")
+    unrecorded = []
+    if api_mode:
+        from testsprite_tests.replay import install
+        from testsprite_tests.replay.har import RECORDINGS_DIR
+        unrecorded = install("record" if api_mode == "record" else "replay",
+                             RECORDINGS_DIR / Path(script).name.split("_")[0])
+
+    recorder = Recorder(artifacts_dir)
+    instrument(recorder)
+
+    status, error = "PASSED", ""
+    started = time.perf_counter()
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except AssertionError as exc:
+        status, error = "FAILED", str(exc)
+    except Exception as exc:
+        status, error = "ERROR", f"{type(exc).__name__}: {exc}"
+    duration_ms = (time.perf_counter() - started) * 1000
+    if api_mode == "replay-strict" and unrecorded and status == "PASSED":
+        status, error = "FAILED", f"{len(unrecorded)} request(s) not in the recording: {', '.join(sorted(set(unrecorded)))}"
+
+    slow = recorder.slow_spans()
+    keep_artifacts = status != "PASSED" or bool(slow)
+    if not keep_artifacts:
+        shutil.rmtree(artifacts_dir, ignore_errors=True)
+
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    Path(output).write_text(json.dumps({
+        "script": Path(script).name,
+        "testId": Path(script).name.split("_")[0],
+        "testStatus": status,
+        "testError": error,
+        "durationMs": round(duration_ms, 1),
+        "slowSteps": len(slow),
+        "artifacts": [path for path in recorder.artifacts if Path(path).exists()] if keep_artifacts else [],
+        "spans": recorder.spans,
+        "apiCalls": recorder.api_calls,
+        "pages": sorted(recorder.pages),
+        "unrecordedRequests": unrecorded,
+    }, indent=2))
+    return 0 if status == "PASSED" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:4]))
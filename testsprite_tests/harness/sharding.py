@@ -0,0 +1,80 @@
+import json
+import statistics
+from datetime import datetime
+from pathlib import Path
+
+TMP_DIR = Path(__file__).resolve().parent.parent / "tmp"
+DURATIONS_PATH = TMP_DIR / "test_durations.json"
+# Results exported by TestSprite; its created/modified stamps seed the
+# history before the harness has timed anything itself
+TESTSPRITE_RESULTS_PATH = TMP_DIR / "test_results.json"
+# Weight of the newest run in the moving average
+SMOOTHING = 0.5
+FALLBACK_DURATION_MS = 60_000.0
+
+
+def _testsprite_durations():
+    try:
+        entries = json.loads(TESTSPRITE_RESULTS_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+    durations = {}
+    for entry in entries:
+        try:
+            started = datetime.fromisoformat(entry["created"].replace("Z", "+00:00"))
+            finished = datetime.fromisoformat(entry["modified"].replace("Z", "+00:00"))
+        except (KeyError, AttributeError, ValueError):
+            continue
+        test_id = entry.get("title", "").split("-")[0]
+        if test_id.startswith("TC") and finished > started:
+            durations[test_id] = (finished - started).total_seconds() * 1000
+    return durations
+
+
+def load_durations():
+    """testId -> expected duration in ms."""
+    durations = _testsprite_durations()
+    try:
+        recorded = json.loads(DURATIONS_PATH.read_text())
+    except (OSError, ValueError):
+        recorded = {}
+    durations.update({test_id: entry["durationMs"] for test_id, entry in recorded.items()})
+    return durations
+
+
+def record_durations(results):
+    try:
+        recorded = json.loads(DURATIONS_PATH.read_text())
+    except (OSError, ValueError):
+        recorded = {}
+    for result in results:
+        if not result["durationMs"]:
+            continue  # never started, nothing learned
+        previous = recorded.get(result["testId"])
+        duration = result["durationMs"]
+        if previous:
+            duration = SMOOTHING * duration + (1 - SMOOTHING) * previous["durationMs"]
+        recorded[result["testId"]] = {
+            "durationMs": round(duration, 1),
+            "runs": (previous or {}).get("runs", 0) + 1,
+        }
+    DURATIONS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    DURATIONS_PATH.write_text(json.dumps(dict(sorted(recorded.items())), indent=2))
+
+
+def pack(scripts, durations, shards):
+    """Splits scripts into `shards` lists with near-equal expected total
+    time: longest first, each onto the currently lightest shard. Tests with
+    no history are assumed to take the median of those that have one."""
+    known = [durations[s.name.split("_")[0]] for s in scripts if s.name.split("_")[0] in durations]
+    default = statistics.median(known) if known else FALLBACK_DURATION_MS
+
+    def expected(script):
+        return durations.get(script.name.split("_")[0], default)
+
+    bins = [{"scripts": [], "expectedMs": 0.0} for _ in range(max(1, shards))]
+    for script in sorted(scripts, key=lambda script: (-expected(script), script.name)):
+        lightest = min(bins, key=lambda shard: shard["expectedMs"])
+        lightest["scripts"].append(script)
+        lightest["expectedMs"] += expected(script)
+    return [shard for shard in bins if shard["scripts"]]
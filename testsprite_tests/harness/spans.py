@@ -0,0 +1,193 @@
+import asyncio
+import functools
+import os
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+SLOW_STEP_MS = float(os.environ.get("TESTSPRITE_SLOW_STEP_MS", "2000"))
+# Fixed sleeps shorter than this are Playwright internals, not test waits
+MIN_SLEEP_SPAN_S = 0.05
+
+
+class Recorder:
+    """Collects the spans and API calls of one test run."""
+
+    def __init__(self, artifacts_dir):
+        self.artifacts_dir = Path(artifacts_dir)
+        self.started = time.perf_counter()
+        self.spans = []
+        self.api_calls = []
+        self.pages = set()
+        self.artifacts = []
+        self._contexts = 0
+
+    def span(self, kind, name, target=None):
+        return _Span(self, kind, name, target)
+
+    def add_api_call(self, method, url, status, duration_ms):
+        self.api_calls.append({
+            "method": method,
+            "path": urlsplit(url).path,
+            "status": status,
+            "durationMs": round(duration_ms, 1),
+        })
+
+    def add_page(self, url):
+        parts = urlsplit(url)
+        if parts.scheme in ("http", "https"):
+            self.pages.add(parts.path or "/")
+
+    def next_artifact_paths(self):
+        self._contexts += 1
+        self.artifacts_dir.mkdir(parents=True, exist_ok=True)
+        suffix = "" if self._contexts == 1 else f"-{self._contexts}"
+        return self.artifacts_dir / f"trace{suffix}.zip", self.artifacts_dir / f"network{suffix}.har"
+
+    def slow_spans(self):
+        return [span for span in self.spans if span["durationMs"] >= SLOW_STEP_MS]
+
+
+class _Span:
+    def __init__(self, recorder, kind, name, target):
+        self.recorder = recorder
+        self.entry = {"kind": kind, "name": name, "target": target}
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, _tb):
+        finished = time.perf_counter()
+        self.entry["startMs"] = round((self.started - self.recorder.started) * 1000, 1)
+        self.entry["durationMs"] = round((finished - self.started) * 1000, 1)
+        if exc is not None:
+            self.entry["error"] = f"{exc_type.__name__}: {str(exc).splitlines()[0] if str(exc) else ''}"
+        self.recorder.spans.append(self.entry)
+        return False
+
+
+def _timed(recorder, kind, name, describe=None):
+    """Wraps an async Playwright method so each call records a span."""
+    def decorate(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            target = describe(self, args, kwargs) if describe else None
+            with recorder.span(kind, name, target):
+                return await method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _first_arg(_self, args, kwargs):
+    return str(args[0]) if args else None
+
+
+def _locator_target(locator, _args=None, _kwargs=None):
+    # Locator's repr is "<Locator frame=... selector='...'>"; the selector is what matters
+    text = repr(locator)
+    marker = "selector='"
+    return text[text.index(marker) + len(marker):-2] if marker in text else text
+
+
+def instrument(recorder):
+    """Patches the Playwright async API in this process. Must run before the
+    test script starts Playwright."""
+    from playwright.async_api import Browser, BrowserContext, Frame, Locator, LocatorAssertions, Page
+
+    # Navigation and explicit waits
+    for cls in (Page, Frame):
+        cls.goto = _timed(recorder, "navigation", "goto", _first_arg)(cls.goto)
+        cls.wait_for_load_state = _timed(recorder, "wait", "wait_for_load_state", _first_arg)(cls.wait_for_load_state)
+        cls.wait_for_timeout = _timed(recorder, "wait", "wait_for_timeout", _first_arg)(cls.wait_for_timeout)
+        cls.wait_for_selector = _timed(recorder, "wait", "wait_for_selector", _first_arg)(cls.wait_for_selector)
+
+    # Actions: resolving the element and acting on it are timed separately,
+    # so a slow selector is not mistaken for a slow click handler
+    def with_resolution(name):
+        original = getattr(Locator, name)
+
+        @functools.wraps(original)
+        async def wrapper(self, *args, **kwargs):
+            target = _locator_target(self)
+            timeout = kwargs.get("timeout")
+            try:
+                with recorder.span("locator", "resolve", target):
+                    await self.wait_for(state="attached", timeout=timeout)
+            except Exception:
+                pass  # the action below reports the real failure
+            with recorder.span("action", name, target):
+                return await original(self, *args, **kwargs)
+        return wrapper
+
+    for name in ("click", "dblclick", "fill", "press", "check", "select_option", "hover", "type"):
+        setattr(Locator, name, with_resolution(name))
+
+    for name in ("to_be_visible", "to_be_hidden", "to_have_text", "to_contain_text", "to_have_count"):
+        original = getattr(LocatorAssertions, name, None)
+        if original is not None:
+            setattr(LocatorAssertions, name, _timed(
+                recorder, "assertion", name,
+                lambda self, _a, _k: _locator_target(getattr(self, "_actual_locator", self)),
+            )(original))
+
+    # Fixed sleeps in the generated scripts are often the biggest cost
+    real_sleep = asyncio.sleep
+
+    async def timed_sleep(delay, *args, **kwargs):
+        if delay < MIN_SLEEP_SPAN_S:
+            return await real_sleep(delay, *args, **kwargs)
+        with recorder.span("wait", "sleep", f"{delay}s"):
+            return await real_sleep(delay, *args, **kwargs)
+
+    asyncio.sleep = timed_sleep
+
+    # Every context records a HAR and a trace; the runner keeps them only
+    # for failed or slow tests
+    original_new_context = Browser.new_context
+
+    @functools.wraps(original_new_context)
+    async def new_context(self, *args, **kwargs):
+        trace_path, har_path = recorder.next_artifact_paths()
+        kwargs.setdefault("record_har_path", str(har_path))
+        context = await original_new_context(self, *args, **kwargs)
+        context._harness_trace_path = trace_path
+        await context.tracing.start(screenshots=True, snapshots=True, sources=False)
+
+        async def on_request_finished(request):
+            if "/api/" not in request.url:
+                return
+            response = await request.response()
+            duration = request.timing.get("responseEnd", -1)
+            recorder.add_api_call(
+                request.method, request.url, response.status if response else None, max(duration, 0)
+            )
+
+        context.on("requestfinished", on_request_finished)
+
+        # Client-side route changes included, for change-aware selection
+        def track_pages(page):
+            def on_navigated(frame):
+                if frame == page.main_frame:
+                    recorder.add_page(frame.url)
+            page.on("framenavigated", on_navigated)
+
+        context.on("page", track_pages)
+        recorder.artifacts.extend([str(trace_path), str(har_path)])
+        return context
+
+    Browser.new_context = new_context
+
+    original_close = BrowserContext.close
+
+    @functools.wraps(original_close)
+    async def close(self, *args, **kwargs):
+        trace_path = getattr(self, "_harness_trace_path", None)
+        if trace_path is not None:
+            try:
+                await self.tracing.stop(path=str(trace_path))
+            except Exception as exc:
+                recorder.spans.append({"kind": "harness", "name": "tracing.stop", "error": str(exc), "durationMs": 0})
+        return await original_close(self, *args, **kwargs)
+
+    BrowserContext.close = close
@@ -0,0 +1 @@
+"""Page-load performance budgets for TC011's perf mode."""
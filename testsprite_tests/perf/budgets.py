@@ -0,0 +1,38 @@
+"""Per-page budgets under mobile emulation (4x CPU slowdown, slow 4G).
+
+Limits follow the Core Web Vitals "good" thresholds for LCP and CLS and
+the Lighthouse mobile target for total blocking time. JS bytes are
+compressed transfer sizes of every script the page loaded; heap is the
+used JS heap once the page has settled. PERF_BUDGET_SCALE stretches the
+time-based budgets, e.g. 2 on a slow CI runner.
+"""
+import os
+
+DEFAULT_BUDGET = {"lcpMs": 2500, "cls": 0.1, "tbtMs": 300, "jsBytes": 350_000, "heapBytes": 40_000_000}
+
+PAGE_BUDGETS = {
+    "landing": {"lcpMs": 2500, "jsBytes": 300_000},
+    "login": {"lcpMs": 2000, "jsBytes": 250_000},
+    "vote": {"lcpMs": 2000, "jsBytes": 250_000},
+    # Charts and tables: more script and heap, same user-facing limits
+    "dashboard": {"tbtMs": 400, "jsBytes": 450_000, "heapBytes": 50_000_000},
+    "institution-dashboard": {"tbtMs": 500, "jsBytes": 550_000, "heapBytes": 60_000_000},
+}
+
+TIME_METRICS = {"lcpMs", "tbtMs"}
+BUDGET_SCALE = float(os.environ.get("PERF_BUDGET_SCALE", "1"))
+
+
+def budget_for(page):
+    budget = {**DEFAULT_BUDGET, **PAGE_BUDGETS.get(page, {})}
+    return {metric: limit * BUDGET_SCALE if metric in TIME_METRICS else limit for metric, limit in budget.items()}
+
+
+def check_budget(page, metrics):
+    """Returns the metrics over budget as {metric: (value, limit)}."""
+    budget = budget_for(page)
+    return {
+        metric: (metrics[metric], limit)
+        for metric, limit in budget.items()
+        if metrics.get(metric) is not None and metrics[metric] > limit
+    }
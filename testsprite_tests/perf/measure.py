@@ -0,0 +1,188 @@
+"""Loads key pages under mobile emulation and measures them over CDP.
+
+Each page gets a fresh context (cold cache) on an emulated Moto G4 with
+Lighthouse's mobile throttling: 4x CPU slowdown and slow 4G. LCP, layout
+shifts, paint and long-task entries come from PerformanceObservers
+installed before any page script runs; script bytes come from the
+Network domain and heap size from Performance.getMetrics.
+"""
+import json
+import os
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from .budgets import budget_for, check_budget
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+REPORT_PATH = TESTS_DIR / "tmp" / "perf_report.json"
+BASE_URL = os.environ.get("TESTSPRITE_BASE_URL", "http://localhost:5000")
+
+DEVICE = "Moto G4"
+CPU_SLOWDOWN = 4
+NETWORK_CONDITIONS = {
+    "offline": False,
+    "latency": 150,  # ms RTT
+    "downloadThroughput": 1.6 * 1024 * 1024 / 8,  # bytes/s
+    "uploadThroughput": 750 * 1024 / 8,
+}
+# Quiet time after network idle so late long tasks and shifts are counted
+SETTLE_MS = 2000
+LONG_TASK_BLOCKING_MS = 50
+
+# Accounts from the seeded template (testsprite_tests/snapshots/seed.py)
+SESSIONS = {
+    "club": ("/api/auth/login",
+             os.environ.get("PERF_CLUB_EMAIL", "testuser@college.edu"),
+             os.environ.get("PERF_CLUB_PASSWORD", "TestPassword123")),
+    "institution": ("/api/auth/institution/login",
+                    os.environ.get("PERF_INSTITUTION_EMAIL", "admin@university.edu"),
+                    os.environ.get("PERF_INSTITUTION_PASSWORD", "SecurePassword123")),
+}
+
+# (budget name, path, session); the vote page renders its "not found"
+# state for an unknown access code, which still loads the whole route
+PAGES = [
+    ("landing", "/", None),
+    ("login", "/login", None),
+    ("vote", f"/vote/{os.environ.get('PERF_VOTE_ACCESS_CODE', 'perf-check')}", None),
+    ("dashboard", "/dashboard", "club"),
+    ("institution-dashboard", "/institution/dashboard", "institution"),
+]
+
+# CLS here is the plain sum of unexpected shifts, which is never lower than
+# the session-window value Chrome reports, so the budget errs strict
+OBSERVERS = """
+window.__perf = { lcp: null, cls: 0, fcp: null, longTasks: [] };
+const observe = (type, onEntry) => {
+  try {
+    new PerformanceObserver((list) => list.getEntries().forEach(onEntry)).observe({ type, buffered: true });
+  } catch (error) {}
+};
+observe('largest-contentful-paint', (entry) => { window.__perf.lcp = entry.startTime; });
+observe('layout-shift', (entry) => { if (!entry.hadRecentInput) window.__perf.cls += entry.value; });
+observe('paint', (entry) => { if (entry.name === 'first-contentful-paint') window.__perf.fcp = entry.startTime; });
+observe('longtask', (entry) => { window.__perf.longTasks.push([entry.startTime, entry.duration]); });
+"""
+
+
+async def _login(pw, kind):
+    path, email, password = SESSIONS[kind]
+    request = await pw.request.new_context(base_url=BASE_URL)
+    try:
+        response = await request.post(path, data={"email": email, "password": password})
+        if not response.ok:
+            raise AssertionError(f"{kind} login for perf run failed: {response.status} {await response.text()}")
+        data = await response.json()
+    finally:
+        await request.dispose()
+    # Same shape the Login page stores, see client/src/lib/auth.tsx
+    return data["token"], {**data["user"], "kind": kind}
+
+
+def _total_blocking_time(observed):
+    start = observed["fcp"] or 0
+    return sum(
+        max(0, duration - LONG_TASK_BLOCKING_MS)
+        for task_start, duration in observed["longTasks"]
+        if task_start >= start
+    )
+
+
+async def measure_page(pw, browser, name, path, session):
+    context = await browser.new_context(**pw.devices[DEVICE])
+    try:
+        if session:
+            token, user = session
+            await context.add_init_script(
+                f"localStorage.setItem('auth_token', {json.dumps(token)});"
+                f"localStorage.setItem('auth_user', {json.dumps(json.dumps(user))});"
+            )
+        await context.add_init_script(OBSERVERS)
+        page = await context.new_page()
+
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Network.enable")
+        await cdp.send("Network.emulateNetworkConditions", NETWORK_CONDITIONS)
+        await cdp.send("Emulation.setCPUThrottlingRate", {"rate": CPU_SLOWDOWN})
+        await cdp.send("Performance.enable")
+
+        scripts = {"ids": set(), "bytes": 0}
+
+        def on_response(event):
+            if event.get("type") == "Script":
+                scripts["ids"].add(event["requestId"])
+
+        def on_finished(event):
+            if event["requestId"] in scripts["ids"]:
+                scripts["bytes"] += event["encodedDataLength"]
+
+        cdp.on("Network.responseReceived", on_response)
+        cdp.on("Network.loadingFinished", on_finished)
+
+        started = time.perf_counter()
+        await page.goto(BASE_URL + path, wait_until="load", timeout=60_000)
+        try:
+            await page.wait_for_load_state("networkidle", timeout=20_000)
+        except Exception:
+            pass  # long-polling or a slow API call; measure what has loaded
+        await page.wait_for_timeout(SETTLE_MS)
+
+        observed = await page.evaluate("window.__perf")
+        counters = {metric["name"]: metric["value"] for metric in (await cdp.send("Performance.getMetrics"))["metrics"]}
+        metrics = {
+            "lcpMs": round(observed["lcp"], 1) if observed["lcp"] is not None else None,
+            "cls": round(observed["cls"], 4),
+            "tbtMs": round(_total_blocking_time(observed), 1),
+            "jsBytes": scripts["bytes"],
+            "heapBytes": int(counters.get("JSHeapUsedSize", 0)),
+        }
+        landed = urlsplit(page.url).path
+        return {
+            "page": name,
+            "path": path,
+            "landedOn": landed,
+            "loadMs": round((time.perf_counter() - started) * 1000, 1),
+            "metrics": metrics,
+            "budget": budget_for(name),
+            # A protected page bouncing to /login measured the wrong page
+            "error": f"redirected to {landed}" if session and landed != urlsplit(path).path else None,
+            "overBudget": {metric: list(values) for metric, values in check_budget(name, metrics).items()},
+        }
+    finally:
+        await context.close()
+
+
+async def run_perf_budgets(pw, browser):
+    """Measures every page, writes tmp/perf_report.json and raises
+    AssertionError if any page failed to load as itself or broke a budget."""
+    sessions = {}
+    results = []
+    for name, path, kind in PAGES:
+        if kind and kind not in sessions:
+            sessions[kind] = await _login(pw, kind)
+        results.append(await measure_page(pw, browser, name, path, sessions.get(kind)))
+
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(json.dumps({
+        "device": DEVICE,
+        "cpuSlowdown": CPU_SLOWDOWN,
+        "network": NETWORK_CONDITIONS,
+        "pages": results,
+    }, indent=2))
+
+    for result in results:
+        metrics = result["metrics"]
+        print(f"{result['page']:<22} LCP {metrics['lcpMs']}ms  CLS {metrics['cls']}  TBT {metrics['tbtMs']}ms  "
+              f"JS {metrics['jsBytes'] / 1024:.0f}KB  heap {metrics['heapBytes'] / 1e6:.1f}MB")
+
+    failures = [
+        f"{result['page']}: {result['error']}" for result in results if result["error"]
+    ] + [
+        f"{result['page']}: {metric} {value} > {limit}"
+        for result in results
+        for metric, (value, limit) in result["overBudget"].items()
+    ]
+    if failures:
+        raise AssertionError("Performance budgets exceeded:\n  " + "\n  ".join(failures))
+    return results
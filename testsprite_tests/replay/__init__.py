@@ -0,0 +1,4 @@
+"""Record /api traffic to HAR on a reference run and replay it in place of
+the backend, so UI scripts can run against the static client build."""
+from .har import install
+from .static_server import serve_static
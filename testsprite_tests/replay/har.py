@@ -0,0 +1,117 @@
+import base64
+import functools
+import json
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import urlsplit
+
+RECORDINGS_DIR = Path(__file__).resolve().parent.parent / "recordings"
+API_ROUTES = "**/api/**"
+# Recorded bodies are stored decoded, so these no longer describe them
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def _request_key(method, url):
+    parts = urlsplit(url)
+    return f"{method} {parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+
+def _normalize_body(text):
+    if not text:
+        return ""
+    try:
+        return json.dumps(json.loads(text), sort_keys=True)
+    except ValueError:
+        return text
+
+
+class Recording:
+    """Recorded /api exchanges of one browser context.
+
+    Requests match on method, path and query, whatever the origin, so a
+    recording made against localhost:5000 replays behind any base URL.
+    Repeated requests get their recorded responses in order (a list fetched
+    before and after a create differs), the last one repeating once they
+    run out; among candidates, one with the same JSON body is preferred.
+    """
+
+    def __init__(self, har_path):
+        self.entries = defaultdict(list)
+        self.served = defaultdict(int)
+        if har_path.exists():
+            for entry in json.loads(har_path.read_text())["log"]["entries"]:
+                request = entry["request"]
+                self.entries[_request_key(request["method"], request["url"])].append(entry)
+
+    def match(self, method, url, body):
+        key = _request_key(method, url)
+        candidates = self.entries.get(key)
+        if not candidates:
+            return None
+        wanted = _normalize_body(body)
+        remaining = candidates[self.served[key]:] or candidates[-1:]
+        entry = next(
+            (entry for entry in remaining
+             if _normalize_body((entry["request"].get("postData") or {}).get("text")) == wanted),
+            remaining[0],
+        )
+        self.served[key] = min(len(candidates), candidates.index(entry) + 1)
+        return entry["response"]
+
+
+async def _fulfill(route, response):
+    content = response.get("content", {})
+    text = content.get("text", "")
+    body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode()
+    headers = {
+        header["name"]: header["value"]
+        for header in response.get("headers", [])
+        if header["name"].lower() not in DROPPED_HEADERS
+    }
+    await route.fulfill(status=response["status"], headers=headers, body=body)
+
+
+def install(mode, har_dir):
+    """Patches Browser.new_context so every context records its /api
+    traffic to har_dir/context-N.har ("record") or is served from those
+    files with no backend behind it ("replay"). Must run before the script
+    starts Playwright. Returns the list that collects replayed requests
+    missing from the recording; they get a 501."""
+    from playwright.async_api import Browser
+
+    har_dir = Path(har_dir)
+    unrecorded = []
+    contexts = {"count": 0}
+    original_new_context = Browser.new_context
+
+    @functools.wraps(original_new_context)
+    async def new_context(self, *args, **kwargs):
+        context = await original_new_context(self, *args, **kwargs)
+        contexts["count"] += 1
+        har_path = har_dir / f"context-{contexts['count']}.har"
+
+        if mode == "record":
+            har_dir.mkdir(parents=True, exist_ok=True)
+            # Written when the context closes
+            await context.route_from_har(str(har_path), url=API_ROUTES, update=True, update_content="embed")
+            return context
+
+        recording = Recording(har_path)
+
+        async def replay(route):
+            request = route.request
+            response = recording.match(request.method, request.url, request.post_data)
+            if response is not None:
+                return await _fulfill(route, response)
+            unrecorded.append(_request_key(request.method, request.url))
+            await route.fulfill(
+                status=501,
+                content_type="application/json",
+                body=json.dumps({"message": "Request not in the HAR recording"}),
+            )
+
+        await context.route(API_ROUTES, replay)
+        return context
+
+    Browser.new_context = new_context
+    return unrecorded
@@ -0,0 +1,35 @@
+import contextlib
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+BUILD_DIR = Path(__file__).resolve().parents[2] / "dist" / "public"
+
+
+class _SpaHandler(SimpleHTTPRequestHandler):
+    """Serves the Vite build; unknown paths get index.html so client-side
+    routes like /dashboard load the app, as server/vite.ts does."""
+
+    def send_head(self):
+        if not Path(self.translate_path(self.path)).exists():
+            self.path = "/index.html"
+        return super().send_head()
+
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def serve_static(build_dir=BUILD_DIR):
+    """Serves the client build on a free local port; yields its base URL."""
+    if not (build_dir / "index.html").exists():
+        raise FileNotFoundError(f"{build_dir}/index.html not found, run `npm run build` first")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(_SpaHandler, directory=str(build_dir)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
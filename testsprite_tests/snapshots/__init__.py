@@ -0,0 +1,8 @@
+"""Seeded Postgres snapshots for isolated TC runs.
+
+A template database is built once (schema plus the accounts the TC scripts
+log in with) and every test clones it with CREATE DATABASE ... TEMPLATE,
+then gets its own server instance pointed at the clone.
+"""
+from .database import clone_database, drop_database, ensure_template
+from .server import isolated_server, retarget
@@ -0,0 +1,37 @@
+"""python -m testsprite_tests.snapshots build|rebuild|serve|prune"""
+import argparse
+import asyncio
+import sys
+
+from .database import TEMPLATE_NAME, ensure_template, prune_clones
+from .server import isolated_server
+
+
+async def serve():
+    async with isolated_server("manual") as base_url:
+        print(f"Serving a fresh clone of {TEMPLATE_NAME} at {base_url} (Ctrl+C to stop and drop it)")
+        await asyncio.Event().wait()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Manage the seeded template database for TC runs")
+    parser.add_argument("command", choices=["build", "rebuild", "serve", "prune"])
+    args = parser.parse_args()
+
+    if args.command in ("build", "rebuild"):
+        built = await ensure_template(rebuild=args.command == "rebuild")
+        print(f"{TEMPLATE_NAME}: {'built' if built else 'up to date'}")
+    elif args.command == "serve":
+        await ensure_template()
+        await serve()
+    else:
+        dropped = await asyncio.to_thread(prune_clones)
+        print(f"Dropped {len(dropped)} leftover clone(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(asyncio.run(main()))
+    except KeyboardInterrupt:
+        sys.exit(130)
@@ -0,0 +1,79 @@
+"""Data baked into the template database.
+
+Accounts mirror the credentials the TC scripts type in, so the scripts log
+in instead of failing (or looping) on accounts nobody created. Everything
+is created through the API, so passwords are hashed and rows are shaped
+exactly as the server writes them. Editing this file changes the template
+fingerprint and triggers a rebuild.
+"""
+from datetime import datetime, timedelta, timezone
+
+from testsprite_tests.api_tests.client import expect_status
+
+INSTITUTION = {
+    "institutionName": "Test University",
+    "institutionType": "College",
+    "adminName": "Institution Admin",
+    "adminEmail": "admin@university.edu",
+    "password": "SecurePassword123",
+}
+
+CLUB = {
+    "clubName": "ClubCentral Test Club",
+    "department": "Computer Science",
+    "presidentName": "Club President",
+    "presidentEmail": "president@clubcentral.com",
+    "presidentPassword": "PresidentPass!2025",
+}
+
+# (name, email, password); approved as Council Head so they can log in
+MEMBERS = [
+    ("Authorized User", "authorized.user@clubcentral.edu", "SecurePassword123"),
+    ("Test User", "testuser@college.edu", "TestPassword123"),
+    ("Valid User", "validuser@college.edu", "ValidPassword123"),
+    ("Valid Example User", "validuser@example.com", "ValidPassword123"),
+]
+
+EVENTS = [
+    ("Orientation Night", "Planning", 14),
+    ("Hackathon", "Ongoing", 2),
+    ("Alumni Meetup", "Completed", -30),
+]
+
+
+async def seed(api):
+    institution = expect_status(await api.post("/api/institution/create", json=INSTITUTION), 201).json()
+    club = expect_status(
+        await api.post("/api/institution/club/create", token=institution["token"], json=CLUB), 201,
+    ).json()["club"]
+
+    president = expect_status(await api.post("/api/auth/login", json={
+        "email": CLUB["presidentEmail"],
+        "password": CLUB["presidentPassword"],
+    }), 200).json()
+    token = president["token"]
+
+    for name, email, password in MEMBERS:
+        expect_status(await api.post("/api/members/apply", json={
+            "clubCode": club["clubCode"], "name": name, "email": email, "password": password,
+        }), 200)
+    pending = expect_status(await api.get("/api/members/pending", token=token), 200).json()
+    for applicant in pending:
+        expect_status(await api.post(
+            f"/api/members/approve/{applicant['id']}", token=token, json={"role": "Council Head"},
+        ), 200)
+
+    now = datetime.now(timezone.utc)
+    for title, status, days in EVENTS:
+        event = expect_status(await api.post("/api/events", token=token, json={
+            "title": title,
+            "description": f"{title} (seeded)",
+            "date": (now + timedelta(days=days)).isoformat(),
+            "status": status,
+            "budget": "5000",
+        }), 200).json()
+        expect_status(await api.post("/api/tasks", token=token, json={
+            "title": f"Prepare {title.lower()}",
+            "eventId": event["id"],
+            "status": "Pending",
+        }), 200)
@@ -0,0 +1,106 @@
+import asyncio
+import contextlib
+import functools
+import os
+import socket
+import time
+
+import httpx
+
+from .database import REPO_ROOT, clone_database, drop_database
+
+# The TC scripts hard-code this origin; retarget() rewrites it per test
+SCRIPT_ORIGIN = "http://localhost:5000"
+STARTUP_TIMEOUT_S = float(os.environ.get("TEST_SERVER_STARTUP_TIMEOUT", "60"))
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _server_command():
+    # A production build boots in well under a second; tsx + Vite take a few
+    if (REPO_ROOT / "dist" / "index.js").exists():
+        return ["node", "dist/index.js"], "production"
+    return ["npx", "tsx", "server/index.ts"], "development"
+
+
+async def _wait_until_ready(base_url, process):
+    deadline = time.monotonic() + STARTUP_TIMEOUT_S
+    async with httpx.AsyncClient(base_url=base_url, timeout=2.0) as client:
+        while time.monotonic() < deadline:
+            if process.returncode is not None:
+                raise RuntimeError(f"test server exited with {process.returncode} during startup")
+            try:
+                await client.get("/api/club")  # any answer, 401 included, means it is serving
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"test server not ready after {STARTUP_TIMEOUT_S}s")
+
+
+@contextlib.asynccontextmanager
+async def running_server(database_url):
+    """One server process on a free port, backed by the given database.
+    Yields its base URL."""
+    port = _free_port()
+    command, node_env = _server_command()
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        cwd=REPO_ROOT,
+        env={
+            **os.environ,
+            "DATABASE_URL": database_url,
+            "DB_DRIVER": "pg",
+            "STORAGE_BACKEND": "postgres",
+            "NODE_ENV": node_env,
+            "PORT": str(port),
+            "CLUSTER_WORKERS": "",
+            "SOCIAL_DISPATCHER": "off",
+            "RATE_LIMIT": "off",
+        },
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    base_url = f"http://localhost:{port}"
+    try:
+        await _wait_until_ready(base_url, process)
+        yield base_url
+    finally:
+        if process.returncode is None:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), 10)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+
+
+@contextlib.asynccontextmanager
+async def isolated_server(label="run"):
+    """Fresh clone of the template plus a server for it; both are gone on exit."""
+    name, url = await asyncio.to_thread(clone_database, label)
+    try:
+        async with running_server(url) as base_url:
+            yield base_url
+    finally:
+        await asyncio.to_thread(drop_database, name)
+
+
+def retarget(base_url):
+    """Points the TC scripts' hard-coded localhost:5000 navigations at
+    base_url. Must run before the script starts Playwright."""
+    from playwright.async_api import Frame, Page
+
+    def rewrite(original):
+        @functools.wraps(original)
+        async def goto(self, url, *args, **kwargs):
+            if url.startswith(SCRIPT_ORIGIN):
+                url = base_url + url[len(SCRIPT_ORIGIN):]
+            return await original(self, url, *args, **kwargs)
+        return goto
+
+    for cls in (Page, Frame):
+        cls.goto = rewrite(cls.goto)